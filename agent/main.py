@@ -9,6 +9,7 @@ is a shared execution engine — one instance serves all families.
 """
 
 import os
+from functools import lru_cache
 
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 from strands import Agent
@@ -23,6 +24,17 @@ DEFAULT_SYSTEM_PROMPT = (
 )
 
 
+@lru_cache(maxsize=16)
+def _get_model(model_id: str, max_tokens: int, temperature: float) -> BedrockModel:
+    """Reuse one BedrockModel (and its boto3 client) per model configuration."""
+    return BedrockModel(
+        model_id=model_id,
+        region_name=os.environ.get("AWS_REGION", "us-east-1"),
+        max_tokens=max_tokens,
+        temperature=temperature,
+    )
+
+
 @app.entrypoint
 def invoke(payload: dict) -> dict:
     """Handle an invocation from the Flask backend.
@@ -42,7 +54,7 @@ def invoke(payload: dict) -> dict:
     This runtime just executes the agent with the provided context.
 
     Returns:
-        {"result": "assistant response text"}
+        {"result": "assistant response text", "usage": {"inputTokens": ..., ...}}
     """
     user_message = payload.get("prompt", "Hello!")
     system_prompt = payload.get("system_prompt", DEFAULT_SYSTEM_PROMPT)
@@ -54,15 +66,8 @@ def invoke(payload: dict) -> dict:
     max_tokens = payload.get("max_tokens", 4096)
     temperature = payload.get("temperature", 0.7)
 
-    model = BedrockModel(
-        model_id=model_id,
-        region_name=os.environ.get("AWS_REGION", "us-east-1"),
-        max_tokens=max_tokens,
-        temperature=temperature,
-    )
-
     agent_kwargs = {
-        "model": model,
+        "model": _get_model(model_id, int(max_tokens), float(temperature)),
         "system_prompt": system_prompt,
     }
     if messages:
@@ -76,7 +81,7 @@ def invoke(payload: dict) -> dict:
     except (KeyError, IndexError, TypeError):
         text = str(result)
 
-    return {"result": text}
+    return {"result": text, "usage": dict(result.metrics.accumulated_usage)}
 
 
 if __name__ == "__main__":
@@ -2,10 +2,10 @@ from flask import Flask
 from flask_cors import CORS
 from flask_sock import Sock
 
-import boto3
-
+from app import aws
 from app.config import Config
 from app.dal import DAL
+from app.dal.metrics import start_flusher
 from app.models.dynamo import init_tables
 from app.routes.agent_config_routes import agent_config_bp
 from app.routes.agent_template_routes import agent_template_bp
@@ -21,23 +21,21 @@ from app.routes.health_reports import health_reports_bp
 from app.routes.health_documents import admin_health_documents_bp
 from app.routes.member_agent_routes import member_agent_bp
 from app.routes.memory_routes import memory_bp
+from app.routes.metrics import metrics_bp
 from app.routes.permission_routes import permission_bp
 from app.routes.profiles import admin_profiles_bp, profiles_bp
 from app.routes.session_routes import session_bp
 from app.routes.storage_routes import storage_bp
 from app.routes.agentcore_agent_routes import agentcore_agents_bp
 from app.routes.storage_migration_routes import storage_migration_bp
+from app.routes.usage_routes import usage_bp
 from app.services.agent_management import AgentManagementClient
 from app.services.agent_template import seed_builtin_templates
 
 
 def _init_dal(app: Flask) -> None:
     """Initialize the Data Access Layer and store on app.extensions."""
-    kwargs: dict[str, str] = {"region_name": app.config["AWS_REGION"]}
-    endpoint_url = app.config.get("DYNAMODB_ENDPOINT")
-    if endpoint_url:
-        kwargs["endpoint_url"] = endpoint_url
-    dynamodb_resource = boto3.resource("dynamodb", **kwargs)
+    dynamodb_resource = aws.dal_dynamodb_resource(app.config)
     table_prefix = app.config.get("TABLE_PREFIX", "")
     app.extensions["dal"] = DAL(dynamodb_resource, table_prefix)
 
@@ -57,16 +55,24 @@ def create_app(config: Config | None = None) -> Flask:
         config = Config()
     app.config.from_object(config)
     CORS(app)
+    aws.configure(
+        max_pool_connections=app.config["AWS_MAX_POOL_CONNECTIONS"],
+        max_attempts=app.config["AWS_MAX_ATTEMPTS"],
+    )
 
     init_tables(app)
 
     # Initialize DAL (coexists with legacy get_table() during migration)
     _init_dal(app)
+    metrics_dir = app.config.get("METRICS_MULTIPROC_DIR")
+    if metrics_dir:
+        start_flusher(metrics_dir, app.config["METRICS_FLUSH_SECONDS"])
 
     seed_builtin_templates(app)
     _seed_agentcore_templates(app)
 
     app.register_blueprint(health_bp)
+    app.register_blueprint(metrics_bp)
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(admin_bp, url_prefix="/api/admin")
     app.register_blueprint(chat_bp, url_prefix="/api")
@@ -89,6 +95,7 @@ def create_app(config: Config | None = None) -> Flask:
     app.register_blueprint(storage_bp, url_prefix="/api")
     app.register_blueprint(storage_migration_bp, url_prefix="/api")
     app.register_blueprint(agentcore_agents_bp, url_prefix="/api")
+    app.register_blueprint(usage_bp, url_prefix="/api/admin")
 
     # AgentCore Identity middleware (Cognito JWT + device-token fallback)
     cognito_pool_id = app.config.get("COGNITO_USER_POOL_ID")
@@ -1,13 +1,17 @@
 """Generic custom agent factory — creates a Strands sub-agent from a template.
 
 Used for admin-created agents that don't have a registered Python factory.
-The template's system_prompt drives the agent's behavior.
+The template's system_prompt drives the agent's behavior. The tool streams
+the agent's progress (see :mod:`app.agents.sub_agent_stream`).
 """
 
 import logging
+from collections.abc import AsyncIterator
 
-from strands import Agent, tool
-from strands.models import BedrockModel
+from strands import tool
+
+from app.agents.model_pool import build_agent
+from app.agents.sub_agent_stream import stream_sub_agent
 
 logger = logging.getLogger(__name__)
 
@@ -26,27 +30,28 @@ def create_custom_agent_tool(
     system_prompt = template.get("system_prompt", "")
 
     @tool(name=tool_name, description=description)
-    def ask_custom_agent(query: str) -> str:
+    async def ask_custom_agent(query: str) -> AsyncIterator[dict | str]:
         """Send a query to this custom agent.
 
         Args:
             query: The question or request for this agent.
         """
-        model = BedrockModel(
-            model_id=model_id,
-            streaming=False,
+        agent = build_agent(
+            model_id,
+            streaming=True,
             max_tokens=4096,
             temperature=0.5,
+            system_prompt=system_prompt,
         )
-        agent = Agent(model=model, system_prompt=system_prompt)
-        try:
-            result = agent(query)
-            return str(result.message)
-        except Exception:
-            logger.exception("Custom agent %s failed", agent_type)
-            return (
+        async for update in stream_sub_agent(
+            agent,
+            query,
+            agent_type,
+            failure_message=(
                 f"I'm sorry, the {template['name']} agent wasn't able to "
                 "process your request right now. Please try again."
-            )
+            ),
+        ):
+            yield update
 
     return ask_custom_agent
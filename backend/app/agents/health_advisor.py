@@ -5,12 +5,14 @@ mines past conversations for health insights, and saves long-term observations.
 """
 
 import logging
+from collections.abc import AsyncIterator
 
-from strands import Agent, tool
-from strands.models import BedrockModel
+from strands import tool
 
 from app.agents.health_tools import build_health_tools
+from app.agents.model_pool import build_agent
 from app.agents.registry import register_agent
+from app.agents.sub_agent_stream import stream_sub_agent
 from app.storage.resolver import get_request_storage
 
 logger = logging.getLogger(__name__)
@@ -109,36 +111,33 @@ def create_health_advisor_tool(
             "any health-related question about any family member."
         ),
     )
-    def ask_health_advisor(query: str) -> str:
+    async def ask_health_advisor(query: str) -> AsyncIterator[dict | str]:
         """Get comprehensive family health guidance.
 
         Args:
             query: The health-related question or topic to get advice on.
         """
-        model = BedrockModel(
-            model_id=model_id,
-            streaming=False,
-            max_tokens=4096,
-            temperature=0.5,
-        )
-
         storage = get_request_storage()
         agent_tools = build_health_tools(user_id, config, storage=storage)
 
-        agent = Agent(
-            model=model,
+        agent = build_agent(
+            model_id,
+            streaming=True,
+            max_tokens=4096,
+            temperature=0.5,
             system_prompt=HEALTH_SYSTEM_PROMPT,
             tools=agent_tools,
         )
 
-        try:
-            result = agent(query)
-            return str(result.message)
-        except Exception:
-            logger.exception("Health advisor agent failed")
-            return (
+        async for update in stream_sub_agent(
+            agent,
+            query,
+            "health_advisor",
+            failure_message=(
                 "I'm sorry, I wasn't able to process your health question "
                 "right now. Please try again."
-            )
+            ),
+        ):
+            yield update
 
     return ask_health_advisor
@@ -2,12 +2,19 @@
 
 build_health_tools(user_id, config, storage) returns a list of Strands tool
 functions. All tools use closures capturing user_id and optional storage provider.
+
+The tools share one :class:`HealthToolContext` per advisor invocation. The
+advisor's workflow calls several tools per question, often for the same
+family member. The context resolves the authorized member set once and
+memoizes profile, record and observation reads, so each distinct read
+happens at most once per turn.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Hashable
 
 from strands import tool
 
@@ -16,11 +23,103 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+ACCESS_DENIED = "Access denied: the target user is not in your family."
+
+
+class HealthToolContext:
+    """Reads shared by the health tools during one advisor invocation.
+
+    Values are memoized by exact call arguments, so a memoized read returns
+    the same result the underlying service call would have. Tools may run
+    concurrently (Strands executes a turn's tool calls in parallel);
+    concurrent requests for the same key wait for a single fetch.
+    """
+
+    def __init__(self, user_id: str, storage: StorageProvider | None = None) -> None:
+        self.user_id = user_id
+        self.storage = storage
+        self._lock = threading.Lock()
+        self._values: dict[Hashable, Any] = {}
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+
+    def _memo(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._values:
+                    return self._values[key]
+            value = load()
+            with self._lock:
+                self._values[key] = value
+            return value
+
+    def forget(self, kind: str, target_user_id: str) -> None:
+        """Drop memoized *kind* reads for a member after a write."""
+        with self._lock:
+            for key in [k for k in self._values if k[:2] == (kind, target_user_id)]:
+                del self._values[key]
+
+    # -- access ------------------------------------------------------------
+
+    def relationships(self) -> list[dict]:
+        from app.services.family_tree import get_relationships
+
+        return self._memo(("relationships",), lambda: get_relationships(self.user_id))
+
+    def authorized_ids(self) -> frozenset[str]:
+        """The user plus every member they have a relationship with."""
+        return self._memo(
+            ("authorized",),
+            lambda: frozenset(
+                [self.user_id] + [r["related_user_id"] for r in self.relationships()]
+            ),
+        )
+
+    def can_access(self, target_user_id: str) -> bool:
+        if target_user_id == self.user_id:
+            return True
+        return target_user_id in self.authorized_ids()
+
+    # -- data --------------------------------------------------------------
+
+    def profile(self, user_id: str) -> dict | None:
+        from app.services.profile import get_profile
+
+        return self._memo(("profile", user_id), lambda: get_profile(user_id))
+
+    def records(
+        self, target_user_id: str, record_type: str | None = None
+    ) -> list[dict]:
+        from app.services.health_records import list_health_records
+
+        return self._memo(
+            ("records", target_user_id, record_type),
+            lambda: list_health_records(
+                target_user_id, record_type=record_type, storage=self.storage
+            ),
+        )
+
+    def observations(
+        self, target_user_id: str, category: str | None = None
+    ) -> list[dict]:
+        from app.services.health_observations import list_observations
+
+        return self._memo(
+            ("observations", target_user_id, category),
+            lambda: list_observations(
+                target_user_id, category=category, storage=self.storage
+            ),
+        )
+
 
 def build_health_tools(
     user_id: str,
     config: dict,
     storage: StorageProvider | None = None,
+    context: HealthToolContext | None = None,
 ) -> list:
     """Build and return health advisor tools for the given user.
 
@@ -28,7 +127,11 @@ def build_health_tools(
         user_id: The user requesting health advice.
         config: Agent config dict (controls feature flags).
         storage: Optional storage provider for the user's data.
+        context: Shared read context; a fresh one is created when omitted.
+            Build the tools once per advisor invocation so the memoized
+            reads never outlive a single turn.
     """
+    ctx = context or HealthToolContext(user_id, storage)
     tools = []
 
     # ── Tool 1: get_family_health_records ────────────────────────
@@ -50,19 +153,11 @@ def build_health_tools(
             target_user_id: The user_id of the family member.
             record_type: Optional filter by record type.
         """
-        from app.services.family_tree import get_relationships
-        from app.services.health_records import list_health_records
-
         # Validate family access: user can access own records or family members'
-        if target_user_id != user_id:
-            relationships = get_relationships(user_id)
-            family_ids = {r["related_user_id"] for r in relationships}
-            if target_user_id not in family_ids:
-                return "Access denied: the target user is not in your family."
-
-        records = list_health_records(
-            target_user_id, record_type=record_type or None, storage=storage
-        )
+        if not ctx.can_access(target_user_id):
+            return ACCESS_DENIED
+
+        records = ctx.records(target_user_id, record_type or None)
         if not records:
             return f"No health records found for user {target_user_id}."
 
@@ -90,16 +185,12 @@ def build_health_tools(
         Args:
             target_user_id: The user_id to get the summary for.
         """
-        from app.services.family_tree import get_relationships
-        from app.services.health_records import get_health_summary
+        from app.services.health_records import summarize_health_records
 
-        if target_user_id != user_id:
-            relationships = get_relationships(user_id)
-            family_ids = {r["related_user_id"] for r in relationships}
-            if target_user_id not in family_ids:
-                return "Access denied: the target user is not in your family."
+        if not ctx.can_access(target_user_id):
+            return ACCESS_DENIED
 
-        summary = get_health_summary(target_user_id, storage=storage)
+        summary = summarize_health_records(target_user_id, ctx.records(target_user_id))
         if summary["record_count"] == 0:
             return f"No health records found for user {target_user_id}."
 
@@ -123,11 +214,8 @@ def build_health_tools(
     )
     def get_family_health_context() -> str:
         """Get family context including roles and health notes."""
-        from app.services.family_tree import get_relationships
-        from app.services.profile import get_profile
-
-        profile = get_profile(user_id)
-        relationships = get_relationships(user_id)
+        profile = ctx.profile(user_id)
+        relationships = ctx.relationships()
 
         parts = []
         if profile:
@@ -142,7 +230,7 @@ def build_health_tools(
         if relationships:
             parts.append("\nFamily members:")
             for rel in relationships:
-                related_profile = get_profile(rel["related_user_id"])
+                related_profile = ctx.profile(rel["related_user_id"])
                 name = (
                     related_profile.get("display_name", rel["related_user_id"])
                     if related_profile
@@ -201,6 +289,7 @@ def build_health_tools(
                     confidence=confidence,
                     storage=storage,
                 )
+                ctx.forget("observations", target_user_id)
                 return f"Observation saved (id: {obs['observation_id']})."
             except ValueError as e:
                 return f"Error: {e}"
@@ -225,18 +314,10 @@ def build_health_tools(
             target_user_id: The user_id to get observations for.
             category: Optional category filter.
         """
-        from app.services.family_tree import get_relationships
-        from app.services.health_observations import list_observations
+        if not ctx.can_access(target_user_id):
+            return ACCESS_DENIED
 
-        if target_user_id != user_id:
-            relationships = get_relationships(user_id)
-            family_ids = {r["related_user_id"] for r in relationships}
-            if target_user_id not in family_ids:
-                return "Access denied: the target user is not in your family."
-
-        observations = list_observations(
-            target_user_id, category=category or None, storage=storage
-        )
+        observations = ctx.observations(target_user_id, category or None)
         if not observations:
             return f"No health observations found for user {target_user_id}."
 
@@ -259,7 +340,7 @@ def build_health_tools(
             name="search_health_conversations",
             description=(
                 "Search past conversations for health-related topics. "
-                "Scans recent conversations for keyword matches. "
+                "Searches the user's full message history for keyword matches. "
                 "Use to find past discussions about symptoms, diet, exercise, etc."
             ),
         )
@@ -269,40 +350,23 @@ def build_health_tools(
             Args:
                 keywords: Comma-separated keywords to search for.
             """
-            from app.services.conversation import (
-                get_messages,
-                list_conversations,
-            )
+            from app.services.message_search import search_messages, split_phrases
 
-            keyword_list = [k.strip().lower() for k in keywords.split(",") if k.strip()]
+            keyword_list = split_phrases(keywords)
             if not keyword_list:
                 return "No keywords provided."
 
-            convos = list_conversations(user_id, limit=20)
-            matches = []
-
-            for convo in convos.get("conversations", []):
-                cid = convo["conversation_id"]
-                msgs = get_messages(cid, limit=50)
-                for msg in msgs.get("messages", []):
-                    content = msg.get("content", "").lower()
-                    matched_kw = [kw for kw in keyword_list if kw in content]
-                    if matched_kw:
-                        snippet = msg["content"][:200]
-                        matches.append(
-                            f"- [{', '.join(matched_kw)}] "
-                            f"(conv: {cid[:8]}..., {msg.get('created_at', '')}): "
-                            f"{snippet}"
-                        )
-
-            if not matches:
+            hits = search_messages(user_id, keyword_list, limit=20)
+            if not hits:
                 return f"No conversations found matching: {', '.join(keyword_list)}"
 
-            # Limit results to avoid overwhelming context
-            return (
-                f"Found {len(matches)} matches:\n"
-                + "\n".join(matches[:20])
-            )
+            matches = [
+                f"- [{', '.join(hit['matched'])}] "
+                f"(conv: {hit['conversation_id'][:8]}..., {hit['created_at']}): "
+                f"{hit['snippet']}"
+                for hit in hits
+            ]
+            return f"Found {len(matches)} matches:\n" + "\n".join(matches)
 
         tools.append(search_health_conversations)
 
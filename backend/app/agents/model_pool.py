@@ -0,0 +1,112 @@
+"""Shared BedrockModel pool and Agent factory.
+
+``BedrockModel`` wraps its own boto3 bedrock-runtime client, so building
+one per message pays for client construction and credential resolution
+every time. Models are immutable once configured and boto3 clients are
+thread-safe, so one instance per ``(model_id, streaming, temperature,
+max_tokens)`` is shared by the orchestrator and every sub-agent tool.
+
+``Agent`` objects hold conversation state and stay per call;
+:func:`build_agent` just assembles one around a pooled model.
+
+The pool is process-wide and is reset after a fork so children never
+reuse a parent's HTTP connections.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ModelKey = tuple[str, bool, float, int]
+
+
+class ModelPool:
+    """Thread-safe cache of BedrockModel instances keyed by model settings."""
+
+    def __init__(self) -> None:
+        self._models: dict[ModelKey, Any] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def get(
+        self,
+        model_id: str,
+        *,
+        streaming: bool,
+        temperature: float,
+        max_tokens: int,
+    ) -> Any:
+        """Return the pooled BedrockModel for these settings, creating it once."""
+        key: ModelKey = (model_id, streaming, float(temperature), int(max_tokens))
+        with self._lock:
+            if self._pid != os.getpid():
+                self._models.clear()
+                self._pid = os.getpid()
+            model = self._models.get(key)
+            if model is None:
+                from strands.models import BedrockModel
+
+                model = BedrockModel(
+                    model_id=model_id,
+                    streaming=streaming,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+                self._models[key] = model
+                logger.debug("Created pooled BedrockModel %s", key)
+            return model
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+
+_POOL = ModelPool()
+
+
+def get_model(
+    model_id: str,
+    *,
+    streaming: bool = True,
+    temperature: float = 0.7,
+    max_tokens: int = 4096,
+) -> Any:
+    """Return a shared BedrockModel from the process-wide pool."""
+    return _POOL.get(
+        model_id, streaming=streaming, temperature=temperature, max_tokens=max_tokens
+    )
+
+
+def build_agent(
+    model_id: str,
+    *,
+    streaming: bool = True,
+    temperature: float = 0.7,
+    max_tokens: int = 4096,
+    **agent_kwargs: Any,
+) -> Any:
+    """Create a Strands Agent backed by a pooled model.
+
+    ``agent_kwargs`` are passed straight to ``Agent`` (system_prompt, tools,
+    messages, session_manager, ...).
+    """
+    from strands import Agent
+
+    model = get_model(
+        model_id, streaming=streaming, temperature=temperature, max_tokens=max_tokens
+    )
+    return Agent(model=model, **agent_kwargs)
+
+
+def get_model_pool() -> ModelPool:
+    """Return the process-wide pool (for inspection and tests)."""
+    return _POOL
@@ -8,6 +8,7 @@ import logging
 from typing import Callable
 
 from app.agents.registry import create_agent_tool
+from app.agents.tool_cache import get_tool_cache, tool_set_fingerprint
 from app.services.agent_config import get_agent_configs
 from app.services.agent_template import get_template_by_type
 
@@ -27,14 +28,27 @@ def build_sub_agent_tools(
     @tool function for each one. Tries the registry first (built-in agents
     with custom Python factories), then falls back to the generic custom
     agent factory for template-defined agents.
+
+    Built tool lists are cached per user (see :mod:`app.agents.tool_cache`);
+    a fresh cache entry is returned without any DynamoDB reads.
     """
-    configs = get_agent_configs(user_id)
-    tools = []
+    cache = get_tool_cache()
+    entry, fresh = cache.get(user_id, model_id)
+    if entry is not None and fresh:
+        return list(entry.tools)
 
-    for agent_cfg in configs:
-        if not agent_cfg.get("enabled", False):
-            continue
+    enabled = [c for c in get_agent_configs(user_id) if c.get("enabled", False)]
+    templates = {
+        c["agent_type"]: get_template_by_type(c["agent_type"]) for c in enabled
+    }
+    fingerprint = tool_set_fingerprint(enabled, templates)
 
+    if entry is not None and entry.fingerprint == fingerprint:
+        cache.touch(user_id, model_id)
+        return list(entry.tools)
+
+    tools = []
+    for agent_cfg in enabled:
         agent_type = agent_cfg["agent_type"]
         config = agent_cfg.get("config", {})
 
@@ -48,7 +62,7 @@ def build_sub_agent_tools(
 
         # Fall back to generic custom agent factory
         if tool_fn is None:
-            template = get_template_by_type(agent_type)
+            template = templates.get(agent_type)
             if template and template.get("system_prompt"):
                 from app.agents.custom_agent import create_custom_agent_tool
 
@@ -65,4 +79,5 @@ def build_sub_agent_tools(
                 "Enabled sub-agent %s for user %s", agent_type, user_id
             )
 
+    cache.put(user_id, model_id, fingerprint, set(templates), tools)
     return tools
@@ -0,0 +1,83 @@
+"""Streaming execution for sub-agent tools.
+
+Sub-agent tools (``ask_health_advisor``, ``ask_<custom>``) are async
+generators. Strands runs the tool calls of one model turn concurrently on
+the agent's event loop (its default ``ConcurrentToolExecutor``), so two
+sub-agents asked in the same turn no longer run back to back. Every value
+a tool yields surfaces on the orchestrator's ``stream_async`` as a
+``tool_stream_event``; the last value is used as the tool result.
+
+:func:`stream_sub_agent` yields progress dicts while a sub-agent works and
+its final answer last. The orchestrator forwards the dicts to the client as
+``tool_progress`` SSE events:
+
+    {"agent": str, "status": "started"}
+    {"agent": str, "status": "tool", "tool": str}          # sub-agent tool call
+    {"agent": str, "status": "streaming", "content": str}  # partial text
+    {"agent": str, "status": "done" | "error"}
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Partial text is coalesced into chunks of at least this many characters
+# so a chatty sub-agent does not flood the SSE stream.
+PROGRESS_FLUSH_CHARS = 40
+
+
+async def stream_sub_agent(
+    agent: Any,
+    query: str,
+    agent_name: str,
+    failure_message: str,
+) -> AsyncIterator[dict | str]:
+    """Run *agent* on *query*, yielding progress dicts then the answer.
+
+    Failures are logged and answered with *failure_message* so one broken
+    sub-agent never fails the orchestrator's turn.
+    """
+    yield {"agent": agent_name, "status": "started"}
+
+    text = ""
+    pending = ""
+    result = None
+    seen_tools: set[str] = set()
+    try:
+        async for event in agent.stream_async(query):
+            if "data" in event:
+                text += event["data"]
+                pending += event["data"]
+                if len(pending) >= PROGRESS_FLUSH_CHARS:
+                    yield {
+                        "agent": agent_name,
+                        "status": "streaming",
+                        "content": pending,
+                    }
+                    pending = ""
+            elif "current_tool_use" in event:
+                tool_use = event["current_tool_use"] or {}
+                tool_use_id = tool_use.get("toolUseId")
+                if tool_use_id and tool_use_id not in seen_tools:
+                    seen_tools.add(tool_use_id)
+                    yield {
+                        "agent": agent_name,
+                        "status": "tool",
+                        "tool": tool_use.get("name", ""),
+                    }
+            elif "result" in event:
+                result = event["result"]
+    except Exception:
+        logger.exception("Sub-agent %s failed", agent_name)
+        yield {"agent": agent_name, "status": "error"}
+        yield failure_message
+        return
+
+    if pending:
+        yield {"agent": agent_name, "status": "streaming", "content": pending}
+    yield {"agent": agent_name, "status": "done"}
+    yield str(result.message) if result is not None else text
@@ -0,0 +1,148 @@
+"""Per-user cache of built sub-agent tool lists.
+
+``build_sub_agent_tools`` runs on every orchestrator message. Building the
+tool list needs the user's AgentConfigs, a template lookup per enabled
+agent, and fresh Strands ``@tool`` closures. The cache keeps the built list
+per ``(user_id, model_id)`` together with a fingerprint of the configs and
+template versions it was built from:
+
+- While an entry is fresh (within the TTL) it is returned with no reads.
+- Once stale, the configs and templates are re-read and the fingerprint
+  recomputed; if nothing changed the existing tools are reused as-is.
+- ``put_agent_config`` / ``delete_agent_config`` invalidate the user, and
+  template updates/deletes invalidate every user with that agent type.
+
+The cache lives on ``app.extensions`` so each app (and each test) gets its
+own. It has no Strands dependency so services can invalidate it cheaply.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from flask import current_app, has_app_context
+
+
+@dataclass
+class _ToolSetEntry:
+    """A built tool list with the fingerprint it was built from."""
+
+    fingerprint: str
+    agent_types: frozenset[str]
+    tools: list[Callable]
+    checked_at: float  # time.monotonic() value
+
+
+def tool_set_fingerprint(configs: list[dict], templates: dict[str, dict | None]) -> str:
+    """Hash enabled configs and the versions of the templates they use."""
+    parts = []
+    for cfg in sorted(configs, key=lambda c: c["agent_type"]):
+        template = templates.get(cfg["agent_type"]) or {}
+        parts.append(
+            [
+                cfg["agent_type"],
+                cfg.get("config", {}),
+                template.get("template_id"),
+                template.get("updated_at"),
+            ]
+        )
+    payload = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SubAgentToolCache:
+    """Thread-safe store of built tool lists keyed by (user_id, model_id)."""
+
+    def __init__(self, ttl_seconds: float = 300.0) -> None:
+        self._ttl = ttl_seconds
+        self._entries: dict[tuple[str, str], _ToolSetEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, model_id: str) -> tuple[_ToolSetEntry | None, bool]:
+        """Return ``(entry, is_fresh)`` for a user, or ``(None, False)``."""
+        with self._lock:
+            entry = self._entries.get((user_id, model_id))
+        if entry is None:
+            return None, False
+        return entry, (time.monotonic() - entry.checked_at) < self._ttl
+
+    def put(
+        self,
+        user_id: str,
+        model_id: str,
+        fingerprint: str,
+        agent_types: set[str],
+        tools: list[Callable],
+    ) -> None:
+        entry = _ToolSetEntry(
+            fingerprint=fingerprint,
+            agent_types=frozenset(agent_types),
+            tools=list(tools),
+            checked_at=time.monotonic(),
+        )
+        with self._lock:
+            self._entries[(user_id, model_id)] = entry
+
+    def touch(self, user_id: str, model_id: str) -> None:
+        """Mark an entry as re-validated without rebuilding it."""
+        with self._lock:
+            entry = self._entries.get((user_id, model_id))
+            if entry is not None:
+                entry.checked_at = time.monotonic()
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+
+    def invalidate_agent_type(self, agent_type: str) -> None:
+        with self._lock:
+            for key in [
+                k for k, e in self._entries.items() if agent_type in e.agent_types
+            ]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def get_tool_cache() -> SubAgentToolCache:
+    """Return the app's SubAgentToolCache, creating it on first use."""
+    cache = current_app.extensions.get("sub_agent_tool_cache")
+    if cache is None:
+        cache = current_app.extensions.setdefault(
+            "sub_agent_tool_cache",
+            SubAgentToolCache(
+                ttl_seconds=float(
+                    current_app.config.get("SUB_AGENT_TOOL_CACHE_TTL_SECONDS", 300)
+                )
+            ),
+        )
+    return cache
+
+
+def invalidate_user_tools(user_id: str) -> None:
+    """Drop cached tools for a user (no-op outside an app context)."""
+    if has_app_context():
+        get_tool_cache().invalidate_user(user_id)
+
+
+def invalidate_agent_type_tools(agent_type: str | None = None) -> None:
+    """Drop cached tools that use *agent_type*, or everything if None."""
+    if not has_app_context():
+        return
+    cache = get_tool_cache()
+    if agent_type is None:
+        cache.clear()
+    else:
+        cache.invalidate_agent_type(agent_type)
@@ -0,0 +1,221 @@
+"""Shared boto3 clients and resources.
+
+Building a boto3 client resolves credentials, loads service models and
+opens a fresh connection pool, which is far too slow for a request path.
+Every module gets its clients from here instead: one per
+``(service, region, endpoint, credentials)`` per worker process, built from
+a private ``boto3`` session with a larger connection pool (a gevent worker
+runs many requests at once) and botocore's standard retry mode.
+
+The DAL is the exception: it gets its own DynamoDB resource from
+:func:`dal_dynamodb_resource`, which makes a single attempt per call. The
+DAL retries throttled and transient failures itself and feeds every
+throttle to the table's adaptive rate limiter (:mod:`app.dal.throttle`),
+so botocore retries on top would multiply the sends per DAL call and hide
+throttles from the limiter until botocore had given up. Everything else
+that talks to DynamoDB directly uses :func:`dynamodb_resource` and keeps
+botocore's retries.
+
+Clients are thread-safe and shared freely. Resources are shared the same
+way the DAL already shares its DynamoDB resource. After ``fork`` the child
+drops everything it inherited and builds its own clients, so gunicorn
+workers never share sockets with the master or each other.
+
+A ``memory://`` DynamoDB endpoint selects the in-process backend from
+:mod:`app.dal.memory` instead of a real client; everything that gets its
+DynamoDB resource or client here then shares that database.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Mapping
+
+import boto3
+from botocore.config import Config as BotoConfig
+
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+DEFAULT_MAX_ATTEMPTS = 3
+# app.dal.throttle owns the DAL's retries; see the module docstring.
+DAL_MAX_ATTEMPTS = 1
+
+_lock = threading.Lock()
+_pid = os.getpid()
+_session: boto3.session.Session | None = None
+_cache: dict[tuple, Any] = {}
+_settings = {
+    "max_pool_connections": DEFAULT_MAX_POOL_CONNECTIONS,
+    "max_attempts": DEFAULT_MAX_ATTEMPTS,
+}
+
+
+def configure(
+    max_pool_connections: int | None = None, max_attempts: int | None = None
+) -> None:
+    """Change the pool size / retry attempts used for new clients.
+
+    *max_attempts* applies to every client but the DAL's DynamoDB
+    resource. Cached clients built with other settings are dropped.
+    """
+    with _lock:
+        changed = False
+        for name, value in (
+            ("max_pool_connections", max_pool_connections),
+            ("max_attempts", max_attempts),
+        ):
+            if value is not None and _settings[name] != value:
+                _settings[name] = value
+                changed = True
+        if changed:
+            _cache.clear()
+
+
+def client(
+    service: str,
+    region_name: str | None = None,
+    endpoint_url: str | None = None,
+    *,
+    path_style: bool = False,
+    aws_access_key_id: str | None = None,
+    aws_secret_access_key: str | None = None,
+) -> Any:
+    """The shared boto3 client for *service*.
+
+    *path_style* selects S3 path-style addressing (MinIO). Explicit keys are
+    only for local S3; everything else uses the default credential chain.
+    """
+    return _get(
+        "client",
+        service,
+        region_name,
+        endpoint_url,
+        path_style,
+        aws_access_key_id,
+        aws_secret_access_key,
+        None,
+    )
+
+
+def resource(
+    service: str,
+    region_name: str | None = None,
+    endpoint_url: str | None = None,
+    *,
+    max_attempts: int | None = None,
+) -> Any:
+    """The shared boto3 resource for *service*.
+
+    *max_attempts* overrides the configured attempts per call.
+    """
+    return _get(
+        "resource", service, region_name, endpoint_url, False, None, None, max_attempts
+    )
+
+
+def dynamodb_resource(config: Mapping[str, Any] | None = None) -> Any:
+    """DynamoDB resource for an app config (``AWS_REGION``/``DYNAMODB_ENDPOINT``).
+
+    Without *config*, region and credentials come from the environment.
+    """
+    return _dynamodb_resource(config, None)
+
+
+def dal_dynamodb_resource(config: Mapping[str, Any] | None = None) -> Any:
+    """Like :func:`dynamodb_resource`, but without botocore retries.
+
+    Only for the DAL's repositories, which retry calls themselves.
+    """
+    return _dynamodb_resource(config, DAL_MAX_ATTEMPTS)
+
+
+def _dynamodb_resource(
+    config: Mapping[str, Any] | None, max_attempts: int | None
+) -> Any:
+    if config is None:
+        return resource("dynamodb", max_attempts=max_attempts)
+    return resource(
+        "dynamodb",
+        region_name=config["AWS_REGION"],
+        endpoint_url=config.get("DYNAMODB_ENDPOINT") or None,
+        max_attempts=max_attempts,
+    )
+
+
+def reset() -> None:
+    """Drop every cached client (after fork, and in tests)."""
+    global _session, _pid
+    with _lock:
+        _cache.clear()
+        _session = None
+        _pid = os.getpid()
+
+
+def _get(
+    kind: str,
+    service: str,
+    region_name: str | None,
+    endpoint_url: str | None,
+    path_style: bool,
+    access_key: str | None,
+    secret_key: str | None,
+    max_attempts: int | None,
+) -> Any:
+    global _session
+    if os.getpid() != _pid:
+        reset()
+    endpoint_url = endpoint_url or None
+    if service == "dynamodb" and endpoint_url and endpoint_url.startswith("memory://"):
+        from app.dal import memory
+
+        database = memory.database(endpoint_url)
+        return database if kind == "resource" else database.meta.client
+    key = (
+        kind,
+        service,
+        region_name,
+        endpoint_url,
+        path_style,
+        access_key,
+        secret_key,
+        max_attempts,
+    )
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+        if _session is None:
+            _session = boto3.session.Session()
+        attempts = max_attempts or _settings["max_attempts"]
+        config = BotoConfig(
+            max_pool_connections=_settings["max_pool_connections"],
+            retries={"mode": "standard", "total_max_attempts": attempts},
+            tcp_keepalive=True,
+        )
+        if path_style:
+            config = config.merge(BotoConfig(s3={"addressing_style": "path"}))
+        kwargs: dict[str, Any] = {"region_name": region_name, "config": config}
+        if endpoint_url:
+            kwargs["endpoint_url"] = endpoint_url
+        if access_key is not None:
+            kwargs["aws_access_key_id"] = access_key
+            kwargs["aws_secret_access_key"] = secret_key
+        factory = _session.client if kind == "client" else _session.resource
+        built = _cache[key] = factory(service, **kwargs)
+        return built
+
+
+def _after_fork() -> None:
+    # Another thread may have held the lock at fork time; never wait on it.
+    global _lock, _session, _pid
+    _lock = threading.Lock()
+    _cache.clear()
+    _session = None
+    _pid = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
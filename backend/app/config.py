@@ -3,6 +3,13 @@ import os
 
 class Config:
     AWS_REGION: str = os.environ.get("AWS_REGION", "us-east-1")
+    # Shared boto3 clients (app.aws): HTTP connections per client and
+    # attempts per call, sized for a gevent worker's concurrency. The DAL's
+    # DynamoDB resource ignores AWS_MAX_ATTEMPTS: the DAL does its own retries.
+    AWS_MAX_POOL_CONNECTIONS: int = int(
+        os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50")
+    )
+    AWS_MAX_ATTEMPTS: int = int(os.environ.get("AWS_MAX_ATTEMPTS", "3"))
     DYNAMODB_ENDPOINT: str | None = os.environ.get("DYNAMODB_ENDPOINT")
     TABLE_PREFIX: str = os.environ.get("TABLE_PREFIX", "")
     BEDROCK_MODEL_ID: str = os.environ.get(
@@ -60,6 +67,54 @@ class Config:
     WEB_SEARCH_ENABLED: bool = (
         os.environ.get("WEB_SEARCH_ENABLED", "true").lower() == "true"
     )
+    WEB_SEARCH_URL: str = os.environ.get(
+        "WEB_SEARCH_URL", "https://html.duckduckgo.com/html/"
+    )
+    WEB_SEARCH_CACHE_TTL_SECONDS: float = float(
+        os.environ.get("WEB_SEARCH_CACHE_TTL_SECONDS", "300")
+    )
+    WEB_SEARCH_TIMEOUT_SECONDS: float = float(
+        os.environ.get("WEB_SEARCH_TIMEOUT_SECONDS", "5")
+    )
+    FAMILY_SETTINGS_CACHE_TTL_SECONDS: float = float(
+        os.environ.get("FAMILY_SETTINGS_CACHE_TTL_SECONDS", "60")
+    )
+    SUB_AGENT_TOOL_CACHE_TTL_SECONDS: float = float(
+        os.environ.get("SUB_AGENT_TOOL_CACHE_TTL_SECONDS", "300")
+    )
+    TEMPLATE_CATALOG_CHECK_SECONDS: float = float(
+        os.environ.get("TEMPLATE_CATALOG_CHECK_SECONDS", "5")
+    )
+    AGENT_MAX_CONCURRENCY: int = int(os.environ.get("AGENT_MAX_CONCURRENCY", "16"))
+    AGENT_MAX_QUEUE: int = int(os.environ.get("AGENT_MAX_QUEUE", "32"))
+    AGENT_QUEUE_TIMEOUT_SECONDS: float = float(
+        os.environ.get("AGENT_QUEUE_TIMEOUT_SECONDS", "30")
+    )
+    PROMPT_CONTEXT_BUDGET_SECONDS: float = float(
+        os.environ.get("PROMPT_CONTEXT_BUDGET_SECONDS", "1.5")
+    )
+
+    # /metrics: bearer token for scrapers (admins can always read it), and
+    # a shared directory so every gunicorn worker's DAL metrics are merged.
+    METRICS_TOKEN: str | None = os.environ.get("METRICS_TOKEN")
+    METRICS_MULTIPROC_DIR: str | None = os.environ.get("METRICS_MULTIPROC_DIR")
+    METRICS_FLUSH_SECONDS: float = float(os.environ.get("METRICS_FLUSH_SECONDS", "5"))
+
+    # Vector recall over past conversations (local, per-host index)
+    VECTOR_MEMORY_ENABLED: bool = (
+        os.environ.get("VECTOR_MEMORY_ENABLED", "false").lower() == "true"
+    )
+    VECTOR_INDEX_DIR: str = os.environ.get(
+        "VECTOR_INDEX_DIR", "/var/lib/homeagent/vector-index"
+    )
+    VECTOR_INDEX_DTYPE: str = os.environ.get("VECTOR_INDEX_DTYPE", "float32")
+    EMBEDDER: str = os.environ.get("EMBEDDER", "hashed")
+    EMBEDDING_DIM: int = int(os.environ.get("EMBEDDING_DIM", "256"))
+    EMBEDDING_MODEL_ID: str = os.environ.get(
+        "EMBEDDING_MODEL_ID", "amazon.titan-embed-text-v2:0"
+    )
+    RECALL_TOP_K: int = int(os.environ.get("RECALL_TOP_K", "4"))
+    RECALL_MIN_SCORE: float = float(os.environ.get("RECALL_MIN_SCORE", "0.25"))
 
     # Storage providers
     STORAGE_PROVIDERS_ENABLED: bool = (
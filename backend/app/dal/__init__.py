@@ -4,6 +4,10 @@ from typing import Any
 
 from flask import current_app
 
+from app.dal.base import BaseRepository
+from app.dal.identity_map import request_identity_map
+from app.dal.memory import MemoryDynamoDB
+from app.dal.metrics import DAL_METRICS, Sample
 from app.dal.repositories import (
     AgentConfigRepository,
     AgentTemplateRepository,
@@ -21,10 +25,12 @@ from app.dal.repositories import (
     MembershipRepository,
     MemorySharingConfigRepository,
     MessageRepository,
+    MessageSearchRepository,
     OAuthStateRepository,
     OAuthTokenRepository,
     ProfileRepository,
     StorageConfigRepository,
+    TokenUsageRepository,
     UserRepository,
 )
 
@@ -33,9 +39,20 @@ class DAL:
     """Container for all repository instances.
 
     Instantiated once per Flask app and stored in ``app.extensions["dal"]``.
+    Unless ``identity_map`` is off, item reads inside a request are
+    memoized per request (see :mod:`app.dal.identity_map`).
+
+    Given a :class:`~app.dal.memory.MemoryDynamoDB`, the tables (and GSIs)
+    the repositories need are created in it, so the DAL runs entirely in
+    memory.
+
+    The item cache counters of the most recently created DAL are exported
+    on ``/metrics`` (see :meth:`cache_samples`).
     """
 
-    def __init__(self, dynamodb_resource: Any, table_prefix: str = "") -> None:
+    def __init__(
+        self, dynamodb_resource: Any, table_prefix: str = "", identity_map: bool = True
+    ) -> None:
         self.users = UserRepository(dynamodb_resource, table_prefix)
         self.devices = DeviceRepository(dynamodb_resource, table_prefix)
         self.invite_codes = InviteCodeRepository(dynamodb_resource, table_prefix)
@@ -67,6 +84,57 @@ class DAL:
         self.storage_config = StorageConfigRepository(dynamodb_resource, table_prefix)
         self.oauth_tokens = OAuthTokenRepository(dynamodb_resource, table_prefix)
         self.oauth_state = OAuthStateRepository(dynamodb_resource, table_prefix)
+        self.token_usage = TokenUsageRepository(dynamodb_resource, table_prefix)
+        self.message_search = MessageSearchRepository(dynamodb_resource, table_prefix)
+
+        if isinstance(dynamodb_resource, MemoryDynamoDB):
+            for repo in self.repositories():
+                dynamodb_resource.ensure_table(repo.table_name, repo.config)
+
+        if identity_map:
+            for repo in self.repositories():
+                repo.identity_map_provider = request_identity_map
+
+        DAL_METRICS.register_collector("dal_item_cache", self.cache_samples)
+
+    def repositories(self) -> list[BaseRepository]:
+        """Every repository in the container."""
+        return [r for r in vars(self).values() if isinstance(r, BaseRepository)]
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """Item cache counters per table, for repositories that cache."""
+        stats = {}
+        for repo in self.repositories():
+            repo_stats = repo.cache_stats()
+            if repo_stats is not None:
+                stats[repo.config.table_name] = repo_stats
+        return stats
+
+    def cache_samples(self) -> list[Sample]:
+        """:meth:`cache_stats` as Prometheus samples, labelled by table."""
+        series = [
+            ("hits_total", "counter", "Item cache hits.", "hits"),
+            (
+                "negative_hits_total",
+                "counter",
+                "Item cache hits for items known not to exist.",
+                "negative_hits",
+            ),
+            ("misses_total", "counter", "Item cache misses.", "misses"),
+            ("evictions_total", "counter", "Item cache evictions.", "evictions"),
+            ("entries", "gauge", "Items held in the item cache.", "entries"),
+        ]
+        return [
+            (
+                f"homeagent_dal_item_cache_{name}",
+                kind,
+                help_text,
+                {"table": table},
+                stats[key],
+            )
+            for table, stats in sorted(self.cache_stats().items())
+            for name, kind, help_text, key in series
+        ]
 
 
 def get_dal() -> DAL:
@@ -7,13 +7,24 @@ from __future__ import annotations
 
 import logging
 import time
+from functools import partial
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable, Iterator, TypeVar
 
 from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 
+from app.dal.batch import (
+    THROTTLE_CODES as _THROTTLE_CODES,
+    BatchGetResult,
+    BatchWriteFailure,
+    BatchWriteResult,
+)
+from app.dal.cache import MISSING, ItemCache
+from app.dal.identity_map import IdentityMap
+from app.dal.metrics import DAL_METRICS, consumed_units
 from app.dal.cursor import CursorCodec
 from app.dal.exceptions import (
     ConditionalCheckError,
@@ -23,9 +34,25 @@ from app.dal.exceptions import (
     ThrottlingError,
 )
 from app.dal.pagination import PaginatedResult
+from app.dal.projection import project, projection_kwargs
+from app.dal.scan import DEFAULT_SEGMENTS
+from app.dal.scan import parallel_scan as _parallel_scan
+from app.dal.throttle import (
+    AdaptiveRateLimiter,
+    RateLimitPolicy,
+    RetryPolicy,
+    limiter_for,
+    send,
+    send_with_retry,
+)
 
 logger = logging.getLogger(__name__)
 
+_R = TypeVar("_R")
+
+# Shared by batch operations; each call bounds its own in-flight chunks.
+_BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="dal-batch")
+
 
 @dataclass(frozen=True)
 class GSIConfig:
@@ -45,6 +72,15 @@ class RepositoryConfig:
     sort_key: str | None = None
     gsi_definitions: list[GSIConfig] = field(default_factory=list)
     has_version: bool = False
+    # Read-through item cache for get_by_id/batch_get; 0 disables it.
+    cache_ttl_seconds: float = 0.0
+    cache_max_entries: int = 1024
+    cache_misses: bool = True
+    # Backoff for throttled calls, and the table's adaptive rate limiter
+    # (None disables client-side limiting). The limiter is shared by every
+    # repository on the table, so they must all use the same policy.
+    retry: RetryPolicy = RetryPolicy()
+    rate_limit: RateLimitPolicy | None = RateLimitPolicy()
 
 
 class BaseRepository:
@@ -52,12 +88,16 @@ class BaseRepository:
 
     Provides typed CRUD, query, and batch operations with automatic
     timestamp management, optimistic locking, pagination, and
-    exception translation.
+    exception translation. Throttled calls are rate limited and retried
+    (see :mod:`app.dal.throttle`).
     """
 
     BATCH_GET_LIMIT = 100
     BATCH_WRITE_LIMIT = 25
-    UNPROCESSED_RETRIES = 3
+    BATCH_GET_CONCURRENCY = 8
+
+    # Set by the DAL container; returns the current request's identity map.
+    identity_map_provider: Callable[[], IdentityMap | None] | None = None
 
     def __init__(
         self,
@@ -70,6 +110,17 @@ class BaseRepository:
         self._table_prefix = table_prefix
         self._full_table_name = f"{table_prefix}{config.table_name}"
         self._table = dynamodb_resource.Table(self._full_table_name)
+        self._cache: ItemCache | None = None
+        if config.cache_ttl_seconds > 0:
+            self._cache = ItemCache(
+                config.cache_ttl_seconds,
+                max_entries=config.cache_max_entries,
+                cache_misses=config.cache_misses,
+            )
+        self._retry = config.retry
+        self._limiter: AdaptiveRateLimiter | None = None
+        if config.rate_limit is not None:
+            self._limiter = limiter_for(self._full_table_name, config.rate_limit)
 
     @property
     def config(self) -> RepositoryConfig:
@@ -79,6 +130,58 @@ class BaseRepository:
     def table_name(self) -> str:
         return self._full_table_name
 
+    # ------------------------------------------------------------------
+    # Identity map and item cache
+    # ------------------------------------------------------------------
+
+    def invalidate(self, key: dict[str, Any]) -> None:
+        """Drop a remembered item after writing it without this repository."""
+        self._forget(self._key_tuple(key))
+
+    def cache_stats(self) -> dict[str, int] | None:
+        """Item cache counters, or None when caching is off."""
+        return self._cache.stats() if self._cache is not None else None
+
+    def rate_limit_stats(self) -> dict[str, Any] | None:
+        """The table's rate limiter state, or None when limiting is off."""
+        return self._limiter.stats() if self._limiter is not None else None
+
+    def _identity_map(self) -> IdentityMap | None:
+        provider = self.identity_map_provider
+        return provider() if provider is not None else None
+
+    def _lookup(self, key_tuple: tuple) -> Any:
+        """Item (or None if known missing) from the identity map or cache.
+
+        Returns ``MISSING`` when neither layer knows the key.
+        """
+        identity_map = self._identity_map()
+        if identity_map is not None:
+            item = identity_map.get(self._full_table_name, key_tuple)
+            if item is not MISSING:
+                return item
+        if self._cache is not None:
+            item = self._cache.get(key_tuple)
+            if item is not MISSING:
+                if identity_map is not None:
+                    identity_map.put(self._full_table_name, key_tuple, item)
+                return item
+        return MISSING
+
+    def _remember(self, key_tuple: tuple, item: dict[str, Any] | None) -> None:
+        identity_map = self._identity_map()
+        if identity_map is not None:
+            identity_map.put(self._full_table_name, key_tuple, item)
+        if self._cache is not None:
+            self._cache.put(key_tuple, item)
+
+    def _forget(self, key_tuple: tuple) -> None:
+        identity_map = self._identity_map()
+        if identity_map is not None:
+            identity_map.discard(self._full_table_name, key_tuple)
+        if self._cache is not None:
+            self._cache.invalidate(key_tuple)
+
     # ------------------------------------------------------------------
     # Create
     # ------------------------------------------------------------------
@@ -96,13 +199,16 @@ class BaseRepository:
 
         start = time.monotonic()
         try:
-            self._table.put_item(
+            response = self._call(
+                self._table.put_item,
                 Item=item,
                 ConditionExpression="attribute_not_exists(#pk)",
                 ExpressionAttributeNames={"#pk": self._config.partition_key},
+                ReturnConsumedCapacity="TOTAL",
             )
         except ClientError as exc:
             if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                self._record_error("create", DuplicateEntityError)
                 raise DuplicateEntityError(
                     f"Item already exists in {self._config.table_name}",
                     table_name=self._config.table_name,
@@ -113,22 +219,70 @@ class BaseRepository:
         finally:
             self._log_timing("create", start)
 
+        self._record_capacity("create", response)
+        self._remember(self._key_tuple(item), item)
+        return item
+
+    # ------------------------------------------------------------------
+    # Put
+    # ------------------------------------------------------------------
+
+    def put(self, item: dict[str, Any]) -> dict[str, Any]:
+        """Unconditionally write *item* as given (upsert, no timestamps)."""
+        start = time.monotonic()
+        try:
+            response = self._call(
+                self._table.put_item, Item=item, ReturnConsumedCapacity="TOTAL"
+            )
+        except ClientError as exc:
+            self._translate_client_error(exc, "put", self._extract_key(item))
+        finally:
+            self._log_timing("put", start)
+
+        self._record_capacity("put", response)
+
+        self._remember(self._key_tuple(item), item)
         return item
 
     # ------------------------------------------------------------------
     # Get
     # ------------------------------------------------------------------
 
-    def get_by_id(self, key: dict[str, Any]) -> dict[str, Any] | None:
-        """Get a single item by primary key. Returns None if not found."""
+    def get_by_id(
+        self, key: dict[str, Any], projection: list[str] | None = None
+    ) -> dict[str, Any] | None:
+        """Get a single item by primary key. Returns None if not found.
+
+        With *projection*, only those top-level attributes are returned.
+        On a cached table the full item is read anyway, so it can be
+        remembered and serve later reads; partial items are never
+        remembered.
+        """
+        cached = self._lookup(self._key_tuple(key))
+        if cached is not MISSING:
+            if projection and cached is not None:
+                return project(cached, projection)
+            return cached
+
+        read_projection = projection if self._cache is None else None
+        kwargs: dict[str, Any] = {"Key": key, "ReturnConsumedCapacity": "TOTAL"}
+        if read_projection:
+            kwargs.update(projection_kwargs(read_projection))
         start = time.monotonic()
         try:
-            result = self._table.get_item(Key=key)
+            result = self._call(self._table.get_item, **kwargs)
         except ClientError as exc:
             self._translate_client_error(exc, "get", key)
         finally:
             self._log_timing("get", start)
-        return result.get("Item")
+
+        self._record_capacity("get", result)
+        item = result.get("Item")
+        if not read_projection or item is None:
+            self._remember(self._key_tuple(key), item)
+        if projection and not read_projection and item is not None:
+            return project(item, projection)
+        return item
 
     # ------------------------------------------------------------------
     # Query
@@ -143,11 +297,103 @@ class BaseRepository:
         limit: int = 20,
         scan_forward: bool = True,
         filter_expression: Any | None = None,
+        projection: list[str] | None = None,
     ) -> PaginatedResult[dict[str, Any]]:
         """Query items by partition key with optional sort condition.
 
         Returns a PaginatedResult with opaque cursor for the next page.
+        *projection* limits the top-level attributes returned.
+        """
+        kwargs = self._query_kwargs(
+            partition_value,
+            sort_condition,
+            index_name,
+            scan_forward,
+            filter_expression,
+            projection,
+        )
+        kwargs["Limit"] = limit
+        exclusive_start_key = CursorCodec.decode(cursor)
+        if exclusive_start_key is not None:
+            kwargs["ExclusiveStartKey"] = exclusive_start_key
+
+        items, last_key = self._query_page(kwargs, partition_value)
+        next_cursor = CursorCodec.encode(last_key)
+
+        return PaginatedResult(items=items, next_cursor=next_cursor, count=len(items))
+
+    def query_iter(
+        self,
+        partition_value: str,
+        sort_condition: Any | None = None,
+        index_name: str | None = None,
+        scan_forward: bool = True,
+        filter_expression: Any | None = None,
+        page_size: int = 100,
+        max_items: int | None = None,
+        prefetch: bool = True,
+        projection: list[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Lazily yield every matching item, page by page.
+
+        While the caller works through one page, the next is already being
+        fetched (unless *prefetch* is off). Stops after *max_items* items.
+        Pages are not fetched until the generator is advanced.
         """
+        if max_items is not None and max_items <= 0:
+            return
+        base_kwargs = self._query_kwargs(
+            partition_value,
+            sort_condition,
+            index_name,
+            scan_forward,
+            filter_expression,
+            projection,
+        )
+        remaining = max_items
+
+        def fetch(start_key: dict[str, Any] | None) -> tuple[list, dict | None]:
+            kwargs = dict(base_kwargs)
+            if "ExpressionAttributeNames" in kwargs:
+                # boto3 merges a filter's generated names into this dict.
+                kwargs["ExpressionAttributeNames"] = dict(
+                    kwargs["ExpressionAttributeNames"]
+                )
+            kwargs["Limit"] = page_size
+            if remaining is not None and filter_expression is None:
+                kwargs["Limit"] = min(page_size, remaining)
+            if start_key is not None:
+                kwargs["ExclusiveStartKey"] = start_key
+            return self._query_page(kwargs, partition_value)
+
+        items, last_key = fetch(None)
+        while True:
+            pending: Future | None = None
+            if last_key is not None and prefetch:
+                pending = _BATCH_EXECUTOR.submit(fetch, last_key)
+            for item in items:
+                yield item
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+            if last_key is None:
+                return
+            items, last_key = pending.result() if pending else fetch(last_key)
+
+    def query_all(self, partition_value: str, **kwargs: Any) -> list[dict[str, Any]]:
+        """Every matching item as a list; takes the arguments of :meth:`query_iter`."""
+        return list(self.query_iter(partition_value, **kwargs))
+
+    def _query_kwargs(
+        self,
+        partition_value: str,
+        sort_condition: Any | None,
+        index_name: str | None,
+        scan_forward: bool,
+        filter_expression: Any | None,
+        projection: list[str] | None = None,
+    ) -> dict[str, Any]:
         pk_attr = self._config.partition_key
         if index_name:
             gsi = self._find_gsi(index_name)
@@ -160,32 +406,75 @@ class BaseRepository:
 
         kwargs: dict[str, Any] = {
             "KeyConditionExpression": key_expr,
-            "Limit": limit,
             "ScanIndexForward": scan_forward,
         }
         if index_name:
             kwargs["IndexName"] = index_name
         if filter_expression is not None:
             kwargs["FilterExpression"] = filter_expression
+        if projection:
+            kwargs.update(projection_kwargs(projection))
+        return kwargs
 
-        exclusive_start_key = CursorCodec.decode(cursor)
-        if exclusive_start_key is not None:
-            kwargs["ExclusiveStartKey"] = exclusive_start_key
-
+    def _query_page(
+        self, kwargs: dict[str, Any], partition_value: str
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
         start = time.monotonic()
         try:
-            result = self._table.query(**kwargs)
+            result = self._call(
+                self._table.query, **kwargs, ReturnConsumedCapacity="TOTAL"
+            )
         except ClientError as exc:
             self._translate_client_error(
                 exc, "query", {"partition_value": partition_value}
             )
         finally:
-            self._log_timing("query", start, index=index_name)
+            self._log_timing("query", start, index=kwargs.get("IndexName"))
+        self._record_capacity("query", result)
+        return result.get("Items", []), result.get("LastEvaluatedKey")
 
-        items = result.get("Items", [])
-        next_cursor = CursorCodec.encode(result.get("LastEvaluatedKey"))
+    # ------------------------------------------------------------------
+    # Scan
+    # ------------------------------------------------------------------
 
-        return PaginatedResult(items=items, next_cursor=next_cursor, count=len(items))
+    def parallel_scan(
+        self,
+        total_segments: int = DEFAULT_SEGMENTS,
+        max_workers: int | None = None,
+        filter_expression: Any | None = None,
+        projection: list[str] | None = None,
+        page_size: int | None = None,
+        max_capacity_per_second: float | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream every item in the table using a segmented parallel scan.
+
+        For admin views and migrations only; see ``app.dal.scan`` for the
+        arguments. Items arrive in no particular order and bypass the item
+        cache and identity map.
+        """
+        start = time.monotonic()
+        count = 0
+        try:
+            for item in _parallel_scan(
+                self._table,
+                total_segments=total_segments,
+                max_workers=max_workers,
+                filter_expression=filter_expression,
+                projection=projection,
+                page_size=page_size,
+                max_capacity_per_second=max_capacity_per_second,
+                on_consumed=partial(
+                    DAL_METRICS.record_capacity, self._config.table_name, "scan"
+                ),
+                retry=self._retry,
+                limiter=self._limiter,
+            ):
+                count += 1
+                yield item
+        except ClientError as exc:
+            self._translate_client_error(exc, "scan", {})
+        finally:
+            self._log_timing("scan", start, count=count)
 
     # ------------------------------------------------------------------
     # Update
@@ -234,17 +523,20 @@ class BaseRepository:
 
         start = time.monotonic()
         try:
-            result = self._table.update_item(
+            result = self._call(
+                self._table.update_item,
                 Key=key,
                 UpdateExpression="SET " + ", ".join(expr_parts),
                 ExpressionAttributeNames=expr_names,
                 ExpressionAttributeValues=expr_values,
                 ConditionExpression=condition,
                 ReturnValues="ALL_NEW",
+                ReturnConsumedCapacity="TOTAL",
             )
         except ClientError as exc:
             if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
                 if expected_version is not None:
+                    self._record_error("update", ConditionalCheckError)
                     raise ConditionalCheckError(
                         f"Version conflict in {self._config.table_name}",
                         table_name=self._config.table_name,
@@ -252,6 +544,7 @@ class BaseRepository:
                         key=key,
                         expected_version=expected_version,
                     ) from exc
+                self._record_error("update", EntityNotFoundError)
                 raise EntityNotFoundError(
                     f"Item not found in {self._config.table_name}",
                     table_name=self._config.table_name,
@@ -262,6 +555,8 @@ class BaseRepository:
         finally:
             self._log_timing("update", start)
 
+        self._record_capacity("update", result)
+        self._remember(self._key_tuple(key), result["Attributes"])
         return result["Attributes"]
 
     # ------------------------------------------------------------------
@@ -272,58 +567,130 @@ class BaseRepository:
         """Delete a single item by primary key."""
         start = time.monotonic()
         try:
-            self._table.delete_item(Key=key)
+            response = self._call(
+                self._table.delete_item, Key=key, ReturnConsumedCapacity="TOTAL"
+            )
         except ClientError as exc:
             self._translate_client_error(exc, "delete", key)
         finally:
             self._log_timing("delete", start)
+        self._record_capacity("delete", response)
+        self.invalidate(key)
 
     # ------------------------------------------------------------------
     # Batch Get
     # ------------------------------------------------------------------
 
-    def batch_get(self, keys: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def batch_get(
+        self,
+        keys: list[dict[str, Any]],
+        max_workers: int | None = None,
+        projection: list[str] | None = None,
+    ) -> BatchGetResult:
         """Batch get items by keys. Missing keys are silently omitted.
 
-        Handles DynamoDB's 100-item limit via chunking and retries
-        unprocessed keys with exponential backoff.
+        Keys are de-duplicated and split into 100-key chunks that are
+        fetched concurrently (at most *max_workers*, default
+        ``BATCH_GET_CONCURRENCY``, at a time). Each chunk retries its own
+        unprocessed keys per the repository's retry policy; keys still
+        unprocessed after that are returned in ``unprocessed_keys``.
+
+        With *projection*, items carry those attributes plus the primary
+        key, and only "not found" results are remembered.
         """
-        if not keys:
-            return []
+        attrs = None
+        if projection:
+            attrs = [*projection, self._config.partition_key]
+            if self._config.sort_key:
+                attrs.append(self._config.sort_key)
+            attrs = list(dict.fromkeys(attrs))
+
+        unique: dict[tuple, dict[str, Any]] = {}
+        for key in keys:
+            unique.setdefault(self._key_tuple(key), key)
+
+        cached_items: list[dict[str, Any]] = []
+        for key_tuple in list(unique):
+            cached = self._lookup(key_tuple)
+            if cached is not MISSING:
+                del unique[key_tuple]
+                if cached is not None:
+                    cached_items.append(project(cached, attrs) if attrs else cached)
+        if not unique:
+            return BatchGetResult(items=cached_items)
+
+        ordered = list(unique.values())
+        chunks = [
+            ordered[i : i + self.BATCH_GET_LIMIT]
+            for i in range(0, len(ordered), self.BATCH_GET_LIMIT)
+        ]
 
-        all_items: list[dict[str, Any]] = []
         start = time.monotonic()
-
-        for chunk_start in range(0, len(keys), self.BATCH_GET_LIMIT):
-            chunk = keys[chunk_start : chunk_start + self.BATCH_GET_LIMIT]
-            request_items = {self._full_table_name: {"Keys": chunk}}
-
+        try:
+            outcomes = self._map_chunks(
+                partial(self._get_chunk, projection=attrs),
+                chunks,
+                self.BATCH_GET_CONCURRENCY if max_workers is None else max_workers,
+            )
+        finally:
+            self._log_timing("batch_get", start, count=len(ordered))
+
+        items: list[dict[str, Any]] = []
+        unprocessed: list[dict[str, Any]] = []
+        for chunk_items, chunk_unprocessed in outcomes:
+            items.extend(chunk_items)
+            unprocessed.extend(chunk_unprocessed)
+        found = {self._key_tuple(item): item for item in items}
+        skipped = {self._key_tuple(key) for key in unprocessed}
+        for key_tuple in unique:
+            if key_tuple in skipped or (attrs and key_tuple in found):
+                continue
+            self._remember(key_tuple, found.get(key_tuple))
+        items = cached_items + items
+        if unprocessed:
+            logger.warning(
+                "DAL batch_get on %s left %d of %d keys unprocessed",
+                self._config.table_name,
+                len(unprocessed),
+                len(ordered),
+            )
+        return BatchGetResult(items=items, unprocessed_keys=unprocessed)
+
+    def _get_chunk(
+        self, keys: list[dict[str, Any]], projection: list[str] | None = None
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        items: list[dict[str, Any]] = []
+        pending = keys
+        extra = projection_kwargs(projection) if projection else {}
+        attempt = 0
+        while True:
             try:
-                response = self._dynamodb.batch_get_item(RequestItems=request_items)
+                response = self._send(
+                    self._dynamodb.batch_get_item,
+                    RequestItems={self._full_table_name: {"Keys": pending, **extra}},
+                    ReturnConsumedCapacity="TOTAL",
+                )
             except ClientError as exc:
-                self._translate_client_error(exc, "batch_get", {})
-
-            all_items.extend(
-                response.get("Responses", {}).get(self._full_table_name, [])
-            )
-
-            # Retry unprocessed keys
-            unprocessed = response.get("UnprocessedKeys", {})
-            retries = 0
-            while unprocessed and retries < self.UNPROCESSED_RETRIES:
-                time.sleep(0.1 * (2**retries))
-                try:
-                    response = self._dynamodb.batch_get_item(RequestItems=unprocessed)
-                except ClientError as exc:
+                if exc.response["Error"]["Code"] not in _THROTTLE_CODES:
                     self._translate_client_error(exc, "batch_get", {})
-                all_items.extend(
-                    response.get("Responses", {}).get(self._full_table_name, [])
-                )
-                unprocessed = response.get("UnprocessedKeys", {})
-                retries += 1
-
-        self._log_timing("batch_get", start, count=len(all_items))
-        return all_items
+                response = {
+                    "UnprocessedKeys": {self._full_table_name: {"Keys": pending}}
+                }
+            self._record_capacity("batch_get", response)
+
+            items.extend(response.get("Responses", {}).get(self._full_table_name, []))
+            pending = (
+                response.get("UnprocessedKeys", {})
+                .get(self._full_table_name, {})
+                .get("Keys", [])
+            )
+            if not pending:
+                return items, pending
+            self._throttled()
+            if attempt >= self._retry.max_attempts:
+                return items, pending
+            time.sleep(self._retry.delay(attempt))
+            attempt += 1
 
     # ------------------------------------------------------------------
     # Batch Delete
@@ -343,11 +710,178 @@ class BaseRepository:
             self._translate_client_error(exc, "batch_delete", {})
         finally:
             self._log_timing("batch_delete", start, count=len(keys))
+            for key in keys:
+                self.invalidate(key)
+
+    # ------------------------------------------------------------------
+    # Batch Write
+    # ------------------------------------------------------------------
+
+    def batch_put(
+        self, items: list[dict[str, Any]], max_workers: int = 1
+    ) -> BatchWriteResult:
+        """Upsert items in batches of 25. See :meth:`batch_write`."""
+        return self.batch_write(puts=items, max_workers=max_workers)
+
+    def batch_write(
+        self,
+        puts: list[dict[str, Any]] | None = None,
+        deletes: list[dict[str, Any]] | None = None,
+        max_workers: int = 1,
+    ) -> BatchWriteResult:
+        """Put and delete items with BatchWriteItem.
+
+        Items are written as given: no timestamps, version or uniqueness
+        check, like a plain ``put_item``. Requests for the same key are
+        collapsed, last one wins. Requests are sent in chunks of 25 (up to
+        *max_workers* chunks at a time); unprocessed items are retried per
+        the repository's retry policy. Anything still unwritten is reported in
+        ``failures`` rather than raised.
+        """
+        requests: dict[tuple, tuple[str, dict[str, Any]]] = {}
+        for item in puts or []:
+            requests[self._key_tuple(item)] = ("put", item)
+        for key in deletes or []:
+            requests[self._key_tuple(key)] = ("delete", key)
+        if not requests:
+            return BatchWriteResult()
+
+        ordered = list(requests.values())
+        chunks = [
+            ordered[i : i + self.BATCH_WRITE_LIMIT]
+            for i in range(0, len(ordered), self.BATCH_WRITE_LIMIT)
+        ]
+
+        start = time.monotonic()
+        result = BatchWriteResult()
+        try:
+            outcomes = self._map_chunks(self._write_chunk, chunks, max_workers)
+        finally:
+            self._log_timing("batch_write", start, count=len(ordered))
+            for key_tuple in requests:
+                self._forget(key_tuple)
+
+        for written, failures in outcomes:
+            result.written += written
+            result.failures.extend(failures)
+        if result.failures:
+            logger.warning(
+                "DAL batch_write on %s left %d of %d requests unwritten",
+                self._config.table_name,
+                len(result.failures),
+                len(ordered),
+            )
+        return result
+
+    def _write_chunk(
+        self, chunk: list[tuple[str, dict[str, Any]]]
+    ) -> tuple[int, list[BatchWriteFailure]]:
+        pending = [
+            {"PutRequest": {"Item": body}}
+            if action == "put"
+            else {"DeleteRequest": {"Key": body}}
+            for action, body in chunk
+        ]
+        attempt = 0
+        while True:
+            try:
+                response = self._send(
+                    self._dynamodb.batch_write_item,
+                    RequestItems={self._full_table_name: pending},
+                    ReturnConsumedCapacity="TOTAL",
+                )
+            except ClientError as exc:
+                reason = exc.response["Error"]["Code"]
+                if reason in _THROTTLE_CODES and attempt < self._retry.max_attempts:
+                    time.sleep(self._retry.delay(attempt))
+                    attempt += 1
+                    continue
+                return len(chunk) - len(pending), self._failures(pending, reason)
+
+            self._record_capacity("batch_write", response)
+            unprocessed = response.get("UnprocessedItems", {}).get(
+                self._full_table_name, []
+            )
+            if not unprocessed:
+                return len(chunk), []
+            self._throttled()
+            if attempt >= self._retry.max_attempts:
+                return len(chunk) - len(unprocessed), self._failures(
+                    unprocessed, "unprocessed"
+                )
+            pending = unprocessed
+            time.sleep(self._retry.delay(attempt))
+            attempt += 1
+
+    def _failures(
+        self, requests: list[dict[str, Any]], reason: str
+    ) -> list[BatchWriteFailure]:
+        failures = []
+        for request in requests:
+            if "PutRequest" in request:
+                item = request["PutRequest"]["Item"]
+                failures.append(
+                    BatchWriteFailure("put", self._extract_key(item), reason)
+                )
+            else:
+                key = request["DeleteRequest"]["Key"]
+                failures.append(BatchWriteFailure("delete", dict(key), reason))
+        return failures
 
     # ------------------------------------------------------------------
     # Internals
     # ------------------------------------------------------------------
 
+    def _send(self, fn: Callable[..., _R], **kwargs: Any) -> _R:
+        """Call *fn* through the table's rate limiter, without retrying."""
+        return send(fn, kwargs, self._limiter)
+
+    def _call(self, fn: Callable[..., _R], **kwargs: Any) -> _R:
+        """Call *fn* through the rate limiter, retrying throttled attempts.
+
+        A throttling ``ClientError`` only escapes once the retry policy is
+        exhausted; callers translate it into ``ThrottlingError``.
+        """
+        return send_with_retry(fn, kwargs, self._retry, self._limiter)
+
+    def _throttled(self) -> None:
+        """Report unprocessed batch items to the rate limiter."""
+        if self._limiter is not None:
+            self._limiter.on_throttle()
+
+    def _map_chunks(
+        self, fn: Callable[[list], _R], chunks: list[list], max_workers: int
+    ) -> list[_R]:
+        """Apply *fn* to each chunk, at most *max_workers* at a time.
+
+        Results keep chunk order. A single chunk runs on the calling thread.
+        """
+        if max_workers <= 1 or len(chunks) <= 1:
+            return [fn(chunk) for chunk in chunks]
+
+        results: list[Any] = [None] * len(chunks)
+        queued = iter(enumerate(chunks))
+        in_flight: dict[Future, int] = {}
+
+        def submit_next() -> None:
+            entry = next(queued, None)
+            if entry is not None:
+                index, chunk = entry
+                in_flight[_BATCH_EXECUTOR.submit(fn, chunk)] = index
+
+        for _ in range(max_workers):
+            submit_next()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[in_flight.pop(future)] = future.result()
+                submit_next()
+        return results
+
+    def _key_tuple(self, item: dict[str, Any]) -> tuple:
+        key = self._extract_key(item)
+        return (key[self._config.partition_key], key.get(self._config.sort_key))
+
     def _extract_key(self, item: dict[str, Any]) -> dict[str, Any]:
         """Extract the primary key fields from an item dict."""
         key = {self._config.partition_key: item[self._config.partition_key]}
@@ -369,11 +903,8 @@ class BaseRepository:
         code = exc.response["Error"]["Code"]
         msg = exc.response["Error"].get("Message", str(exc))
 
-        if code in (
-            "ProvisionedThroughputExceededException",
-            "ThrottlingException",
-            "RequestLimitExceeded",
-        ):
+        if code in _THROTTLE_CODES:
+            self._record_error(operation, ThrottlingError)
             raise ThrottlingError(
                 f"Throttled: {msg}",
                 table_name=self._config.table_name,
@@ -381,6 +912,7 @@ class BaseRepository:
                 key=key,
             ) from exc
 
+        self._record_error(operation, DataAccessError)
         raise DataAccessError(
             f"DynamoDB error in {self._config.table_name}.{operation}: {msg}",
             table_name=self._config.table_name,
@@ -396,7 +928,9 @@ class BaseRepository:
         count: int | None = None,
     ) -> None:
         """Emit structured timing log."""
-        elapsed_ms = (time.monotonic() - start) * 1000
+        elapsed = time.monotonic() - start
+        DAL_METRICS.observe(self._config.table_name, operation, elapsed)
+        elapsed_ms = elapsed * 1000
         extra: dict[str, Any] = {
             "table": self._config.table_name,
             "operation": operation,
@@ -407,5 +941,17 @@ class BaseRepository:
         if count is not None:
             extra["count"] = count
         logger.debug(
-            "DAL %s on %s (%.2fms)", operation, self._config.table_name, elapsed_ms
+            "DAL %s on %s (%.2fms)",
+            operation,
+            self._config.table_name,
+            elapsed_ms,
+            extra={"dal": extra},
+        )
+
+    def _record_error(self, operation: str, error: type[Exception]) -> None:
+        DAL_METRICS.record_error(self._config.table_name, operation, error.__name__)
+
+    def _record_capacity(self, operation: str, response: dict[str, Any]) -> None:
+        DAL_METRICS.record_capacity(
+            self._config.table_name, operation, consumed_units(response)
         )
@@ -0,0 +1,51 @@
+"""Result types and throttle error codes for DAL batch operations."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+THROTTLE_CODES = frozenset(
+    {
+        "ProvisionedThroughputExceededException",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+    }
+)
+
+
+@dataclass(frozen=True)
+class BatchWriteFailure:
+    """One put or delete that was not applied."""
+
+    action: str  # "put" or "delete"
+    key: dict[str, Any]
+    reason: str
+
+
+@dataclass
+class BatchWriteResult:
+    """Outcome of a batch write: how many requests landed and which did not."""
+
+    written: int = 0
+    failures: list[BatchWriteFailure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+@dataclass(frozen=True)
+class BatchGetResult:
+    """Items found by a batch get, plus keys DynamoDB never processed.
+
+    Missing items are simply absent from ``items``; ``unprocessed_keys``
+    are keys whose existence is unknown because retries ran out.
+    """
+
+    items: list[dict[str, Any]]
+    unprocessed_keys: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.unprocessed_keys
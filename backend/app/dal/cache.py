@@ -0,0 +1,85 @@
+"""Per-repository read-through item cache.
+
+Opt-in via ``RepositoryConfig.cache_ttl_seconds``. The cache lives in one
+worker process: writes made through the same repository update or drop the
+cached entry, and the TTL bounds staleness for writes made elsewhere
+(other workers, raw table access, other services).
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+MISSING = object()
+
+
+class ItemCache:
+    """TTL + LRU cache of primary key -> item, including "not found" results.
+
+    Items are deep-copied in and out so callers can mutate what they get.
+    """
+
+    def __init__(
+        self, ttl_seconds: float, max_entries: int = 1024, cache_misses: bool = True
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.cache_misses = cache_misses
+        self._entries: OrderedDict[tuple, tuple[dict | None, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: tuple) -> Any:
+        """Return the cached item, ``None`` for a cached miss, or ``MISSING``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return MISSING
+            item, cached_at = entry
+            if time.monotonic() - cached_at >= self.ttl_seconds:
+                del self._entries[key]
+                self._misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            if item is None:
+                self._negative_hits += 1
+                return None
+            self._hits += 1
+        return copy.deepcopy(item)
+
+    def put(self, key: tuple, item: dict | None) -> None:
+        if item is None and not self.cache_misses:
+            return
+        item = copy.deepcopy(item)
+        with self._lock:
+            self._entries[key] = (item, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: tuple) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+            }
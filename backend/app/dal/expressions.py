@@ -0,0 +1,670 @@
+"""DynamoDB expressions evaluated against plain Python items.
+
+The in-memory backend (:mod:`app.dal.memory`) uses this to answer requests
+the way DynamoDB would. Supported:
+
+* condition, filter and key-condition expressions, given as strings (with
+  ``ExpressionAttributeNames``/``ExpressionAttributeValues``) or as boto3
+  ``Key(...)``/``Attr(...)`` conditions: comparisons, ``BETWEEN``, ``IN``,
+  ``AND``/``OR``/``NOT``, ``attribute_exists``, ``attribute_not_exists``,
+  ``attribute_type``, ``begins_with``, ``contains`` and ``size``;
+* update expressions: ``SET`` (with ``+``/``-``, ``if_not_exists`` and
+  ``list_append``), ``REMOVE``, ``ADD`` and ``DELETE``;
+* projection expressions, including nested paths.
+
+Items and values are expected in boto3's deserialized form (``Decimal``
+numbers, ``set`` for string/number sets, ``Binary`` for binary).
+Malformed expressions raise :class:`ExpressionError`.
+"""
+
+from __future__ import annotations
+
+import copy
+import re
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Mapping
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.types import Binary
+
+# Marks an attribute path that resolves to nothing.
+MISSING: Any = type("Missing", (), {"__repr__": lambda self: "MISSING"})()
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<name>\#[A-Za-z0-9_]+)|(?P<value>:[A-Za-z0-9_]+)"
+    r"|(?P<number>\d+)|(?P<ident>[A-Za-z_][A-Za-z0-9_]*)"
+    r"|(?P<op><>|<=|>=|[=<>(),.\[\]+-]))"
+)
+_COMPARATORS = {"=", "<>", "<", "<=", ">", ">="}
+_CONDITION_FUNCTIONS = {
+    "attribute_exists",
+    "attribute_not_exists",
+    "attribute_type",
+    "begins_with",
+    "contains",
+}
+
+
+class ExpressionError(ValueError):
+    """An expression that DynamoDB would reject with ValidationException."""
+
+
+# ----------------------------------------------------------------------
+# Parsing
+# ----------------------------------------------------------------------
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ExpressionError(f"Invalid expression near {text[pos:]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(
+        self,
+        text: str,
+        names: Mapping[str, str] | None,
+        values: Mapping[str, Any] | None,
+    ) -> None:
+        self._tokens = _tokenize(text)
+        self._pos = 0
+        self._names = names or {}
+        self._values = values or {}
+
+    # -- token helpers -------------------------------------------------
+
+    def _peek(self, offset: int = 0) -> tuple[str, str] | None:
+        index = self._pos + offset
+        return self._tokens[index] if index < len(self._tokens) else None
+
+    def _next(self) -> tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise ExpressionError("Unexpected end of expression")
+        self._pos += 1
+        return token
+
+    def _accept(self, text: str) -> bool:
+        token = self._peek()
+        if token is not None and token[1] == text:
+            self._pos += 1
+            return True
+        return False
+
+    def _accept_keyword(self, word: str) -> bool:
+        token = self._peek()
+        if token is not None and token[0] == "ident" and token[1].upper() == word:
+            self._pos += 1
+            return True
+        return False
+
+    def _expect(self, text: str) -> None:
+        if not self._accept(text):
+            token = self._peek()
+            found = token[1] if token else "end of expression"
+            raise ExpressionError(f"Expected {text!r}, found {found!r}")
+
+    def done(self) -> None:
+        token = self._peek()
+        if token is not None:
+            raise ExpressionError(f"Unexpected token {token[1]!r}")
+
+    # -- operands ------------------------------------------------------
+
+    def path(self) -> tuple:
+        elements: list[str | int] = [self._segment()]
+        while True:
+            if self._accept("."):
+                elements.append(self._segment())
+            elif self._accept("["):
+                kind, text = self._next()
+                if kind != "number":
+                    raise ExpressionError(f"Invalid list index {text!r}")
+                elements.append(int(text))
+                self._expect("]")
+            else:
+                return ("path", tuple(elements))
+
+    def _segment(self) -> str:
+        kind, text = self._next()
+        if kind == "name":
+            if text not in self._names:
+                raise ExpressionError(
+                    f"An expression attribute name used in the document path "
+                    f"is not defined; attribute name: {text}"
+                )
+            return self._names[text]
+        if kind == "ident":
+            return text
+        raise ExpressionError(f"Invalid attribute name {text!r}")
+
+    def operand(self) -> tuple:
+        token = self._peek()
+        if token is None:
+            raise ExpressionError("Unexpected end of expression")
+        kind, text = token
+        if kind == "value":
+            self._pos += 1
+            if text not in self._values:
+                raise ExpressionError(
+                    f"An expression attribute value used in expression is not "
+                    f"defined; attribute value: {text}"
+                )
+            return ("value", self._values[text])
+        if kind == "ident" and text == "size" and self._is_call():
+            self._pos += 2
+            target = self.path()
+            self._expect(")")
+            return ("size", target)
+        return self.path()
+
+    def _is_call(self) -> bool:
+        following = self._peek(1)
+        return following is not None and following[1] == "("
+
+    # -- conditions ----------------------------------------------------
+
+    def condition(self) -> tuple:
+        node = self._and()
+        while self._accept_keyword("OR"):
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self) -> tuple:
+        node = self._not()
+        while self._accept_keyword("AND"):
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self) -> tuple:
+        if self._accept_keyword("NOT"):
+            return ("not", self._not())
+        return self._primary()
+
+    def _primary(self) -> tuple:
+        if self._accept("("):
+            node = self.condition()
+            self._expect(")")
+            return node
+        token = self._peek()
+        if (
+            token is not None
+            and token[0] == "ident"
+            and token[1] in _CONDITION_FUNCTIONS
+            and self._is_call()
+        ):
+            self._pos += 2
+            args = [self.operand()]
+            while self._accept(","):
+                args.append(self.operand())
+            self._expect(")")
+            return ("func", token[1], tuple(args))
+
+        left = self.operand()
+        if self._accept_keyword("BETWEEN"):
+            low = self.operand()
+            if not self._accept_keyword("AND"):
+                raise ExpressionError("BETWEEN requires AND")
+            return ("between", left, low, self.operand())
+        if self._accept_keyword("IN"):
+            self._expect("(")
+            options = [self.operand()]
+            while self._accept(","):
+                options.append(self.operand())
+            self._expect(")")
+            return ("in", left, tuple(options))
+        kind, text = self._next()
+        if text not in _COMPARATORS:
+            raise ExpressionError(f"Expected a comparator, found {text!r}")
+        return ("cmp", text, left, self.operand())
+
+    # -- update expressions --------------------------------------------
+
+    def update(self) -> list[tuple]:
+        actions: list[tuple] = []
+        seen: set[str] = set()
+        while self._peek() is not None:
+            kind, text = self._next()
+            clause = text.upper()
+            if kind != "ident" or clause not in ("SET", "REMOVE", "ADD", "DELETE"):
+                raise ExpressionError(f"Invalid update clause {text!r}")
+            if clause in seen:
+                raise ExpressionError(f"The {clause} section can only be used once")
+            seen.add(clause)
+            while True:
+                target = self.path()
+                if clause == "SET":
+                    self._expect("=")
+                    actions.append(("SET", target, self._set_value()))
+                elif clause == "REMOVE":
+                    actions.append(("REMOVE", target))
+                else:
+                    actions.append((clause, target, self.operand()))
+                if not self._accept(","):
+                    break
+        if not actions:
+            raise ExpressionError("Update expression is empty")
+        return actions
+
+    def _set_value(self) -> tuple:
+        left = self._set_operand()
+        if self._accept("+"):
+            return ("plus", left, self._set_operand())
+        if self._accept("-"):
+            return ("minus", left, self._set_operand())
+        return left
+
+    def _set_operand(self) -> tuple:
+        token = self._peek()
+        if token is not None and token[0] == "ident" and self._is_call():
+            if token[1] == "if_not_exists":
+                self._pos += 2
+                target = self.path()
+                self._expect(",")
+                fallback = self._set_operand()
+                self._expect(")")
+                return ("if_not_exists", target, fallback)
+            if token[1] == "list_append":
+                self._pos += 2
+                first = self._set_operand()
+                self._expect(",")
+                second = self._set_operand()
+                self._expect(")")
+                return ("list_append", first, second)
+        return self.operand()
+
+    # -- projections ---------------------------------------------------
+
+    def projection(self) -> list[tuple]:
+        paths = [self.path()]
+        while self._accept(","):
+            paths.append(self.path())
+        return paths
+
+
+# ----------------------------------------------------------------------
+# Values
+# ----------------------------------------------------------------------
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def type_code(value: Any) -> str:
+    """The DynamoDB type descriptor (``S``, ``N``, ``SS``...) of *value*."""
+    if isinstance(value, bool):
+        return "BOOL"
+    if value is None:
+        return "NULL"
+    if _is_number(value):
+        return "N"
+    if isinstance(value, str):
+        return "S"
+    if isinstance(value, (bytes, bytearray, Binary)):
+        return "B"
+    if isinstance(value, (set, frozenset)):
+        sample = next(iter(value), "")
+        return {"N": "NS", "B": "BS"}.get(type_code(sample), "SS")
+    if isinstance(value, Mapping):
+        return "M"
+    return "L"
+
+
+def _plain(value: Any) -> Any:
+    """Binary unwrapped to bytes, so binaries compare and slice like bytes."""
+    return value.value if isinstance(value, Binary) else value
+
+
+def resolve(item: Any, path: tuple) -> Any:
+    """The value at *path* (a ``path`` node's elements) or ``MISSING``."""
+    value = item
+    for element in path:
+        if isinstance(element, int):
+            if not isinstance(value, list) or element >= len(value):
+                return MISSING
+        elif not isinstance(value, Mapping) or element not in value:
+            return MISSING
+        value = value[element]
+    return value
+
+
+def _operand(node: tuple, item: Mapping[str, Any]) -> Any:
+    kind = node[0]
+    if kind == "value":
+        return node[1]
+    if kind == "path":
+        return resolve(item, node[1])
+    if kind == "size":
+        value = _plain(resolve(item, node[1][1]))
+        if isinstance(value, (str, bytes, bytearray, list, set, frozenset, Mapping)):
+            return Decimal(len(value))
+        return MISSING
+    raise ExpressionError(f"Invalid operand {node!r}")
+
+
+def _comparable(left: Any, right: Any) -> bool:
+    if _is_number(left) and _is_number(right):
+        return True
+    left_code = type_code(left)
+    return left_code in ("S", "B") and left_code == type_code(right)
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if left is MISSING or right is MISSING:
+        return False
+    left, right = _plain(left), _plain(right)
+    if op in ("=", "<>"):
+        same_type = type_code(left) == type_code(right) or (
+            _is_number(left) and _is_number(right)
+        )
+        equal = same_type and left == right
+        return equal if op == "=" else not equal
+    if not _comparable(left, right):
+        return False
+    if op == "<":
+        return left < right
+    if op == "<=":
+        return left <= right
+    if op == ">":
+        return left > right
+    return left >= right
+
+
+def _function(name: str, args: tuple, item: Mapping[str, Any]) -> bool:
+    if name in ("attribute_exists", "attribute_not_exists"):
+        if len(args) != 1 or args[0][0] != "path":
+            raise ExpressionError(f"{name} takes one attribute path")
+        exists = resolve(item, args[0][1]) is not MISSING
+        return exists if name == "attribute_exists" else not exists
+    if len(args) != 2 or args[0][0] != "path":
+        raise ExpressionError(f"{name} takes an attribute path and an operand")
+    target = _plain(_operand(args[0], item))
+    operand = _plain(_operand(args[1], item))
+    if target is MISSING or operand is MISSING:
+        return False
+    if name == "attribute_type":
+        return type_code(target) == operand
+    if name == "begins_with":
+        if isinstance(target, str) and isinstance(operand, str):
+            return target.startswith(operand)
+        if isinstance(target, (bytes, bytearray)) and isinstance(
+            operand, (bytes, bytearray)
+        ):
+            return target.startswith(operand)
+        return False
+    # contains
+    if isinstance(target, str):
+        return isinstance(operand, str) and operand in target
+    if isinstance(target, (bytes, bytearray)):
+        return isinstance(operand, (bytes, bytearray)) and operand in target
+    if isinstance(target, (set, frozenset)):
+        return operand in {_plain(member) for member in target}
+    if isinstance(target, list):
+        return any(_compare("=", member, operand) for member in target)
+    return False
+
+
+def evaluate(node: tuple, item: Mapping[str, Any]) -> bool:
+    """Whether *item* satisfies the condition *node*."""
+    kind = node[0]
+    if kind == "and":
+        return evaluate(node[1], item) and evaluate(node[2], item)
+    if kind == "or":
+        return evaluate(node[1], item) or evaluate(node[2], item)
+    if kind == "not":
+        return not evaluate(node[1], item)
+    if kind == "cmp":
+        return _compare(node[1], _operand(node[2], item), _operand(node[3], item))
+    if kind == "between":
+        value = _operand(node[1], item)
+        return _compare(">=", value, _operand(node[2], item)) and _compare(
+            "<=", value, _operand(node[3], item)
+        )
+    if kind == "in":
+        value = _operand(node[1], item)
+        return any(_compare("=", value, _operand(o, item)) for o in node[2])
+    if kind == "func":
+        return _function(node[1], node[2], item)
+    raise ExpressionError(f"Not a condition: {node!r}")
+
+
+# ----------------------------------------------------------------------
+# Public entry points
+# ----------------------------------------------------------------------
+
+
+class Condition:
+    """A parsed condition, filter or key-condition expression."""
+
+    def __init__(self, node: tuple) -> None:
+        self.node = node
+
+    def __call__(self, item: Mapping[str, Any] | None) -> bool:
+        return evaluate(self.node, item or {})
+
+    def conjuncts(self) -> list[tuple]:
+        """The terms of the top-level ``AND`` chain (key conditions)."""
+        terms: list[tuple] = []
+        pending = [self.node]
+        while pending:
+            node = pending.pop()
+            if node[0] == "and":
+                pending.extend((node[2], node[1]))
+            else:
+                terms.append(node)
+        return terms
+
+
+def compile_condition(
+    expression: str | ConditionBase,
+    names: Mapping[str, str] | None = None,
+    values: Mapping[str, Any] | None = None,
+    normalize: Callable[[Any], Any] | None = None,
+) -> Condition:
+    """Parse a condition given as a string or a boto3 condition object.
+
+    boto3 conditions carry their own names and values, so *names* and
+    *values* only apply to strings. *normalize* is applied to the values of
+    a boto3 condition (strings arrive with already-normalized values).
+    """
+    if isinstance(expression, ConditionBase):
+        built = ConditionExpressionBuilder().build_expression(expression)
+        names = built.attribute_name_placeholders
+        values = built.attribute_value_placeholders
+        if normalize is not None:
+            values = {k: normalize(v) for k, v in values.items()}
+        expression = built.condition_expression
+    parser = _Parser(expression, names, values)
+    node = parser.condition()
+    parser.done()
+    return Condition(node)
+
+
+def compile_update(
+    expression: str,
+    names: Mapping[str, str] | None = None,
+    values: Mapping[str, Any] | None = None,
+) -> list[tuple]:
+    """Parse an update expression into its list of actions."""
+    parser = _Parser(expression, names, values)
+    actions = parser.update()
+    parser.done()
+    return actions
+
+
+def compile_projection(
+    expression: str, names: Mapping[str, str] | None = None
+) -> list[tuple]:
+    """Parse a projection expression into attribute paths."""
+    parser = _Parser(expression, names, None)
+    paths = parser.projection()
+    parser.done()
+    return [path[1] for path in paths]
+
+
+def project_paths(item: Mapping[str, Any], paths: Iterable[tuple]) -> dict[str, Any]:
+    """The parts of *item* named by projection *paths*."""
+    result: dict[str, Any] = {}
+    for path in paths:
+        value = resolve(item, path)
+        if value is MISSING:
+            continue
+        if len(path) == 1:
+            result[path[0]] = value
+            continue
+        target: Any = result
+        for element, following in zip(path, path[1:]):
+            container = [] if isinstance(following, int) else {}
+            if isinstance(target, list):
+                target.append(container)
+            else:
+                container = target.setdefault(element, container)
+            target = container
+        if isinstance(target, list):
+            target.append(value)
+        else:
+            target[path[-1]] = value
+    return result
+
+
+# ----------------------------------------------------------------------
+# Updates
+# ----------------------------------------------------------------------
+
+_INVALID_PATH = (
+    "The document path provided in the update expression is invalid for update"
+)
+_BAD_OPERAND = "An operand in the update expression has an incorrect data type"
+
+
+def _set_value(node: tuple, item: Mapping[str, Any]) -> Any:
+    kind = node[0]
+    if kind in ("plus", "minus"):
+        left, right = _set_value(node[1], item), _set_value(node[2], item)
+        if not (_is_number(left) and _is_number(right)):
+            raise ExpressionError(_BAD_OPERAND)
+        left, right = Decimal(left), Decimal(right)
+        return left + right if kind == "plus" else left - right
+    if kind == "if_not_exists":
+        current = resolve(item, node[1][1])
+        return current if current is not MISSING else _set_value(node[2], item)
+    if kind == "list_append":
+        first, second = _set_value(node[1], item), _set_value(node[2], item)
+        if not (isinstance(first, list) and isinstance(second, list)):
+            raise ExpressionError(_BAD_OPERAND)
+        return first + second
+    value = _operand(node, item)
+    if value is MISSING:
+        raise ExpressionError(
+            "The provided expression refers to an attribute that does not exist "
+            "in the item"
+        )
+    return value
+
+
+def _parent(item: dict[str, Any], path: tuple) -> Any:
+    target: Any = item
+    for element in path[:-1]:
+        if isinstance(element, int):
+            if not isinstance(target, list) or element >= len(target):
+                return MISSING
+        elif not isinstance(target, dict) or element not in target:
+            return MISSING
+        target = target[element]
+    last = path[-1]
+    if isinstance(last, int) != isinstance(target, list):
+        return MISSING
+    return target
+
+
+def _assign(item: dict[str, Any], path: tuple, value: Any) -> None:
+    parent = _parent(item, path)
+    if parent is MISSING:
+        raise ExpressionError(_INVALID_PATH)
+    last = path[-1]
+    if isinstance(parent, list) and last >= len(parent):
+        parent.append(value)
+    else:
+        parent[last] = value
+
+
+def _remove(item: dict[str, Any], path: tuple) -> None:
+    parent = _parent(item, path)
+    if parent is MISSING:
+        return
+    last = path[-1]
+    if isinstance(parent, list):
+        if last < len(parent):
+            del parent[last]
+    else:
+        parent.pop(last, None)
+
+
+def apply_update(item: Mapping[str, Any], actions: list[tuple]) -> dict[str, Any]:
+    """A copy of *item* with the update *actions* applied.
+
+    Right-hand sides see the item as it was before the update, as in
+    DynamoDB.
+    """
+    updated = copy.deepcopy(dict(item))
+    sets = [
+        (action[1][1], _set_value(action[2], item))
+        for action in actions
+        if action[0] == "SET"
+    ]
+    for path, value in sets:
+        _assign(updated, path, copy.deepcopy(value))
+    for action in actions:
+        kind, path = action[0], action[1][1]
+        if kind == "REMOVE":
+            _remove(updated, path)
+        elif kind == "ADD":
+            _add(updated, path, _operand(action[2], item))
+        elif kind == "DELETE":
+            _delete(updated, path, _operand(action[2], item))
+    return updated
+
+
+def _add(item: dict[str, Any], path: tuple, value: Any) -> None:
+    current = resolve(item, path)
+    if _is_number(value):
+        if current is MISSING:
+            _assign(item, path, Decimal(value))
+        elif _is_number(current):
+            _assign(item, path, Decimal(current) + Decimal(value))
+        else:
+            raise ExpressionError(_BAD_OPERAND)
+    elif isinstance(value, (set, frozenset)):
+        if current is MISSING:
+            _assign(item, path, set(value))
+        elif isinstance(current, (set, frozenset)):
+            _assign(item, path, set(current) | set(value))
+        else:
+            raise ExpressionError(_BAD_OPERAND)
+    else:
+        raise ExpressionError(_BAD_OPERAND)
+
+
+def _delete(item: dict[str, Any], path: tuple, value: Any) -> None:
+    if not isinstance(value, (set, frozenset)):
+        raise ExpressionError(_BAD_OPERAND)
+    current = resolve(item, path)
+    if current is MISSING:
+        return
+    if not isinstance(current, (set, frozenset)):
+        raise ExpressionError(_BAD_OPERAND)
+    remaining = set(current) - set(value)
+    if remaining:
+        _assign(item, path, remaining)
+    else:
+        _remove(item, path)
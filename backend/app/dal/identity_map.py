@@ -0,0 +1,57 @@
+"""Request-scoped identity map for DAL reads.
+
+One request often reads the same item several times: the user record in
+auth, the session endpoint, the family lookup and the feature gates; the
+profile several times while building a prompt. The identity map remembers
+every ``get_by_id``/``batch_get`` result (including "not found") for the
+rest of the request, and writes through the same repository update it, so
+repeat reads cost nothing.
+
+It lives on ``flask.g`` and is only used inside a request; scripts,
+background threads without a request and bare repositories read through.
+Prompt-context fan-out tasks run in a copy of the request context and
+share it.
+"""
+
+from __future__ import annotations
+
+import copy
+
+from flask import g, has_request_context
+
+from app.dal.cache import MISSING
+
+
+class IdentityMap:
+    """``(table, primary key) -> item`` for one request."""
+
+    def __init__(self) -> None:
+        self._items: dict[tuple[str, tuple], dict | None] = {}
+        self.hits = 0
+
+    def get(self, table: str, key: tuple):
+        """Return a copy of the item, ``None`` if known missing, or ``MISSING``."""
+        item = self._items.get((table, key), MISSING)
+        if item is MISSING:
+            return MISSING
+        self.hits += 1
+        return copy.deepcopy(item)
+
+    def put(self, table: str, key: tuple, item: dict | None) -> None:
+        self._items[(table, key)] = copy.deepcopy(item)
+
+    def discard(self, table: str, key: tuple) -> None:
+        self._items.pop((table, key), None)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def request_identity_map() -> IdentityMap | None:
+    """The current request's identity map, or None outside a request."""
+    if not has_request_context():
+        return None
+    identity_map = g.get("dal_identity_map")
+    if identity_map is None:
+        identity_map = g.dal_identity_map = IdentityMap()
+    return identity_map
@@ -1,28 +1,44 @@
 """In-memory repository for unit testing.
 
-Implements the same interface as BaseRepository but stores data in
-Python dicts. No DynamoDB dependency required.
+Implements the same interface as BaseRepository but stores data in a
+:class:`~app.dal.memory.MemoryTable`. No DynamoDB dependency required.
 """
 
 from __future__ import annotations
 
-import copy
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator
 
+from boto3.dynamodb.conditions import Key
+
+from app.dal.base import GSIConfig
+from app.dal.batch import BatchGetResult, BatchWriteResult
 from app.dal.cursor import CursorCodec
 from app.dal.exceptions import (
     ConditionalCheckError,
     DuplicateEntityError,
     EntityNotFoundError,
 )
+from app.dal.expressions import Condition, compile_condition
+from app.dal.memory import ConditionFailed, IndexSpec, MemoryTable
 from app.dal.pagination import PaginatedResult
+from app.dal.projection import project
+from app.dal.records import FrozenDict, freeze
 
 
 class InMemoryRepository:
-    """Dict-backed repository with the same interface as BaseRepository.
+    """Repository with the same interface as BaseRepository, kept in memory.
+
+    Queries behave as they do against DynamoDB: they read one partition in
+    sort-key order, honour *sort_condition* and *filter_expression*, can
+    use the GSIs given in *gsi_definitions*, and paginate with
+    ``LastEvaluatedKey`` cursors. Suitable for unit tests that don't need
+    real DynamoDB.
 
-    Suitable for unit tests that don't need real DynamoDB.
+    Items are stored as immutable records (see :mod:`app.dal.records`) and
+    every read returns the stored record itself, without copying. Updates
+    build a new record that shares the untouched attributes of the old.
+    Callers that want to edit an item build a new dict from it.
     """
 
     def __init__(
@@ -30,18 +46,20 @@ class InMemoryRepository:
         partition_key: str,
         sort_key: str | None = None,
         has_version: bool = False,
+        gsi_definitions: list[GSIConfig] | None = None,
     ) -> None:
         self._partition_key = partition_key
         self._sort_key = sort_key
         self._has_version = has_version
-        self._store: dict[str, dict[str, Any]] = {}
-
-    def _make_key_str(self, key: dict[str, Any]) -> str:
-        """Build a string key from PK (and SK if present)."""
-        pk = str(key[self._partition_key])
-        if self._sort_key and self._sort_key in key:
-            return f"{pk}##{key[self._sort_key]}"
-        return pk
+        self._gsi_definitions = list(gsi_definitions or [])
+        self._table = MemoryTable(
+            "InMemory",
+            IndexSpec(None, partition_key, sort_key),
+            [
+                IndexSpec(gsi.index_name, gsi.partition_key, gsi.sort_key)
+                for gsi in self._gsi_definitions
+            ],
+        )
 
     def _extract_key(self, item: dict[str, Any]) -> dict[str, Any]:
         key = {self._partition_key: item[self._partition_key]}
@@ -58,21 +76,25 @@ class InMemoryRepository:
         item = {**item, "created_at": now, "updated_at": now}
         if self._has_version:
             item["version"] = 1
+        record = freeze(item)
 
-        key_str = self._make_key_str(item)
-        if key_str in self._store:
+        try:
+            self._table.put(record, condition=lambda old: old is None)
+        except ConditionFailed:
             raise DuplicateEntityError(
                 "Item already exists",
                 operation="create",
                 key=self._extract_key(item),
-            )
-        self._store[key_str] = copy.deepcopy(item)
-        return copy.deepcopy(item)
+            ) from None
+        return record
 
-    def get_by_id(self, key: dict[str, Any]) -> dict[str, Any] | None:
-        key_str = self._make_key_str(key)
-        item = self._store.get(key_str)
-        return copy.deepcopy(item) if item else None
+    def get_by_id(
+        self, key: dict[str, Any], projection: list[str] | None = None
+    ) -> dict[str, Any] | None:
+        item = self._table.get(key)
+        if item is None:
+            return None
+        return self._project(item, projection)
 
     def update(
         self,
@@ -83,41 +105,49 @@ class InMemoryRepository:
         if not updates:
             raise ValueError("updates must be non-empty")
 
-        key_str = self._make_key_str(key)
-        item = self._store.get(key_str)
-        if item is None:
-            if expected_version is not None:
-                raise ConditionalCheckError(
-                    "Version conflict: item not found",
+        now = datetime.now(timezone.utc).isoformat()
+
+        changes = {name: freeze(value) for name, value in updates.items()}
+        changes["updated_at"] = now
+        if expected_version is not None:
+            changes["version"] = expected_version + 1
+
+        def apply(current: dict[str, Any]) -> dict[str, Any]:
+            return FrozenDict({**current, **changes})
+
+        def condition(current: dict[str, Any] | None) -> bool:
+            if current is None:
+                return False
+            if expected_version is None:
+                return True
+            return current.get("version") == expected_version
+
+        try:
+            _, item = self._table.update(key, apply, condition)
+        except ConditionFailed as exc:
+            if exc.item is None and expected_version is None:
+                raise EntityNotFoundError(
+                    "Item not found",
                     operation="update",
                     key=key,
-                    expected_version=expected_version,
+                ) from None
+            message = "Version conflict: item not found"
+            if exc.item is not None:
+                message = (
+                    f"Version conflict: expected {expected_version}, "
+                    f"got {exc.item.get('version')}"
                 )
-            raise EntityNotFoundError(
-                "Item not found",
-                operation="update",
-                key=key,
-            )
-
-        if expected_version is not None and item.get("version") != expected_version:
             raise ConditionalCheckError(
-                f"Version conflict: expected {expected_version}, got {item.get('version')}",
+                message,
                 operation="update",
                 key=key,
                 expected_version=expected_version,
-            )
-
-        now = datetime.now(timezone.utc).isoformat()
-        item.update(updates)
-        item["updated_at"] = now
-        if expected_version is not None:
-            item["version"] = expected_version + 1
+            ) from None
 
-        return copy.deepcopy(item)
+        return item
 
     def delete(self, key: dict[str, Any]) -> None:
-        key_str = self._make_key_str(key)
-        self._store.pop(key_str, None)
+        self._table.delete(key)
 
     # ------------------------------------------------------------------
     # Query
@@ -132,52 +162,160 @@ class InMemoryRepository:
         limit: int = 20,
         scan_forward: bool = True,
         filter_expression: Any | None = None,
+        projection: list[str] | None = None,
     ) -> PaginatedResult[dict[str, Any]]:
-        """Query by partition key with offset-based pagination.
+        """Query by partition key, one page of at most *limit* items.
 
-        Note: index_name, sort_condition, and filter_expression are
-        simplified — GSI queries do a linear scan over all items.
+        As in DynamoDB, *limit* counts items read before the filter is
+        applied, so a filtered page may be short (or empty) and still have
+        a next cursor.
         """
-        # Find matching items
-        matching = []
-        for item in self._store.values():
-            if str(item.get(self._partition_key)) == partition_value:
-                matching.append(copy.deepcopy(item))
-
-        # Sort by sort key if present
-        if self._sort_key:
-            matching.sort(
-                key=lambda x: str(x.get(self._sort_key, "")),
-                reverse=not scan_forward,
+        pk_attr = self._partition_key
+        if index_name:
+            for gsi in self._gsi_definitions:
+                if gsi.index_name == index_name:
+                    pk_attr = gsi.partition_key
+        key_condition = Key(pk_attr).eq(partition_value)
+        if sort_condition is not None:
+            key_condition = key_condition & sort_condition
+
+        items, last_key, _ = self._table.query(
+            compile_condition(key_condition),
+            index_name=index_name,
+            forward=scan_forward,
+            limit=limit,
+            start_key=CursorCodec.decode(cursor),
+            filter=self._filter(filter_expression),
+        )
+        page = [self._project(item, projection) for item in items]
+        return PaginatedResult(
+            items=page, next_cursor=CursorCodec.encode(last_key), count=len(page)
+        )
+
+    def query_iter(
+        self,
+        partition_value: str,
+        sort_condition: Any | None = None,
+        index_name: str | None = None,
+        scan_forward: bool = True,
+        filter_expression: Any | None = None,
+        page_size: int = 100,
+        max_items: int | None = None,
+        prefetch: bool = True,
+        projection: list[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        cursor = None
+        yielded = 0
+        while max_items is None or yielded < max_items:
+            page = self.query(
+                partition_value,
+                sort_condition=sort_condition,
+                index_name=index_name,
+                cursor=cursor,
+                limit=page_size,
+                scan_forward=scan_forward,
+                filter_expression=filter_expression,
+                projection=projection,
             )
+            for item in page.items[
+                : None if max_items is None else max_items - yielded
+            ]:
+                yield item
+                yielded += 1
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    def query_all(self, partition_value: str, **kwargs: Any) -> list[dict[str, Any]]:
+        return list(self.query_iter(partition_value, **kwargs))
 
-        # Decode cursor as offset
-        offset = 0
-        if cursor is not None:
-            decoded = CursorCodec.decode(cursor)
-            if decoded and "__offset" in decoded:
-                offset = decoded["__offset"]
+    def parallel_scan(
+        self,
+        total_segments: int = 4,
+        max_workers: int | None = None,
+        filter_expression: Any | None = None,
+        projection: list[str] | None = None,
+        page_size: int | None = None,
+        max_capacity_per_second: float | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every stored item, segment by segment."""
+        if total_segments < 1:
+            raise ValueError("total_segments must be at least 1")
+        condition = self._filter(filter_expression)
+        for segment in range(total_segments):
+            start_key = None
+            while True:
+                items, start_key, _ = self._table.scan(
+                    limit=page_size,
+                    start_key=start_key,
+                    filter=condition,
+                    segment=segment,
+                    total_segments=total_segments,
+                )
+                for item in items:
+                    yield self._project(item, projection)
+                if start_key is None:
+                    break
 
-        page = matching[offset : offset + limit]
-        next_offset = offset + limit
-        next_cursor = None
-        if next_offset < len(matching):
-            next_cursor = CursorCodec.encode({"__offset": next_offset})
+    @staticmethod
+    def _project(item: dict[str, Any], projection: list[str] | None) -> dict:
+        return FrozenDict(project(item, projection)) if projection else item
 
-        return PaginatedResult(items=page, next_cursor=next_cursor, count=len(page))
+    @staticmethod
+    def _filter(filter_expression: Any | None) -> Condition | None:
+        if filter_expression is None:
+            return None
+        return compile_condition(filter_expression)
 
     # ------------------------------------------------------------------
     # Batch operations
     # ------------------------------------------------------------------
 
-    def batch_get(self, keys: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def batch_get(
+        self,
+        keys: list[dict[str, Any]],
+        max_workers: int | None = None,
+        projection: list[str] | None = None,
+    ) -> BatchGetResult:
+        if projection:
+            projection = [*projection, self._partition_key]
+            if self._sort_key:
+                projection.append(self._sort_key)
         results = []
+        seen: set[tuple] = set()
         for key in keys:
-            item = self.get_by_id(key)
+            key_tuple = self._table.key_of(key)
+            if key_tuple in seen:
+                continue
+            seen.add(key_tuple)
+            item = self.get_by_id(key, projection=projection)
             if item is not None:
                 results.append(item)
-        return results
+        return BatchGetResult(items=results)
 
     def batch_delete(self, keys: list[dict[str, Any]]) -> None:
         for key in keys:
             self.delete(key)
+
+    def batch_put(
+        self, items: list[dict[str, Any]], max_workers: int = 1
+    ) -> BatchWriteResult:
+        return self.batch_write(puts=items, max_workers=max_workers)
+
+    def batch_write(
+        self,
+        puts: list[dict[str, Any]] | None = None,
+        deletes: list[dict[str, Any]] | None = None,
+        max_workers: int = 1,
+    ) -> BatchWriteResult:
+        requests: dict[tuple, tuple[str, dict[str, Any]]] = {}
+        for item in puts or []:
+            requests[self._table.key_of(item)] = ("put", item)
+        for key in deletes or []:
+            requests[self._table.key_of(key)] = ("delete", key)
+        for action, body in requests.values():
+            if action == "put":
+                self._table.put(freeze(body))
+            else:
+                self._table.delete(body)
+        return BatchWriteResult(written=len(requests))
@@ -0,0 +1,1084 @@
+"""In-process DynamoDB for tests and local development.
+
+``MemoryDynamoDB`` stands in for ``boto3.resource("dynamodb")``: its
+``Table`` handles answer ``get_item``/``put_item``/``update_item``/
+``delete_item``/``query``/``scan``/``batch_writer`` with DynamoDB's
+semantics, and ``batch_get_item``/``batch_write_item`` plus the control
+plane calls the app makes (``meta.client.list_tables``, ``create_table``,
+``describe_table``, ``update_table``...) are emulated too. Errors are
+``ClientError`` subclasses with DynamoDB's error codes, so the DAL's error
+translation works unchanged.
+
+Each partition is kept sorted by sort key and every global secondary index
+is maintained on write, so queries bisect straight to the requested key
+range instead of scanning the table. Key conditions, filters, condition
+expressions, update expressions and projections are evaluated by
+:mod:`app.dal.expressions`. Items round-trip through boto3's serializer,
+so the backend accepts and returns exactly what boto3 would (``Decimal``
+numbers, ``TypeError`` for floats).
+
+Setting ``DYNAMODB_ENDPOINT`` to ``memory://`` (or ``memory://<name>``)
+makes :mod:`app.aws` hand out a shared in-memory database for that name,
+so ``create_app`` and everything built on it run without DynamoDB.
+"""
+
+from __future__ import annotations
+
+import bisect
+import copy
+import threading
+import zlib
+from decimal import Decimal
+from operator import itemgetter
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping
+
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+from app.dal.expressions import (
+    Condition,
+    apply_update,
+    compile_condition,
+    compile_projection,
+    compile_update,
+    project_paths,
+)
+
+if TYPE_CHECKING:
+    from app.dal.base import RepositoryConfig
+
+MEMORY_SCHEME = "memory://"
+
+_SERIALIZER = TypeSerializer()
+_DESERIALIZER = TypeDeserializer()
+_first = itemgetter(0)
+
+
+def _error(code: str) -> type[ClientError]:
+    return type(code, (ClientError,), {})
+
+
+class MemoryExceptions:
+    """The ``client.exceptions`` namespace of the in-memory client."""
+
+    ClientError = ClientError
+    ConditionalCheckFailedException = _error("ConditionalCheckFailedException")
+    ResourceInUseException = _error("ResourceInUseException")
+    ResourceNotFoundException = _error("ResourceNotFoundException")
+    ValidationException = _error("ValidationException")
+
+
+def _raise(cls: type[ClientError], message: str, operation: str) -> None:
+    raise cls({"Error": {"Code": cls.__name__, "Message": message}}, operation)
+
+
+def normalize(value: Any) -> Any:
+    """*value* as boto3 would return it after a round trip to DynamoDB."""
+    return _DESERIALIZER.deserialize(_SERIALIZER.serialize(value))
+
+
+def normalize_item(item: Mapping[str, Any]) -> dict[str, Any]:
+    return {name: normalize(value) for name, value in item.items()}
+
+
+def _order(value: Any) -> tuple[int, Any] | None:
+    """Sort position of a key value; None if it cannot be a key."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        return (1, value)
+    if isinstance(value, (Binary, bytes, bytearray)):
+        return (2, bytes(value.value if isinstance(value, Binary) else value))
+    if isinstance(value, (int, float, Decimal)):
+        return (0, value)
+    return None
+
+
+class ConditionFailed(Exception):
+    """A write's condition rejected the current item (``.item``, or None)."""
+
+    def __init__(self, item: dict[str, Any] | None) -> None:
+        super().__init__("The conditional request failed")
+        self.item = item
+
+
+# ----------------------------------------------------------------------
+# Storage engine
+# ----------------------------------------------------------------------
+
+
+class IndexSpec:
+    """Key schema and projection of a table or secondary index."""
+
+    def __init__(
+        self,
+        name: str | None,
+        partition_key: str,
+        sort_key: str | None = None,
+        projection: str = "ALL",
+        non_key_attributes: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.partition_key = partition_key
+        self.sort_key = sort_key
+        self.projection = projection
+        self.non_key_attributes = non_key_attributes
+
+    @property
+    def key_attributes(self) -> tuple[str, ...]:
+        if self.sort_key:
+            return (self.partition_key, self.sort_key)
+        return (self.partition_key,)
+
+    def key_schema(self) -> list[dict[str, str]]:
+        schema = [{"AttributeName": self.partition_key, "KeyType": "HASH"}]
+        if self.sort_key:
+            schema.append({"AttributeName": self.sort_key, "KeyType": "RANGE"})
+        return schema
+
+
+class _Index:
+    """Sorted entries of one key schema, grouped by partition key.
+
+    Each partition is a list of ``(sort order, primary key)`` tuples kept in
+    order; the primary key breaks ties so entries are unique.
+    """
+
+    def __init__(self, spec: IndexSpec) -> None:
+        self.spec = spec
+        self.partitions: dict[tuple, list[tuple]] = {}
+
+    def entry(self, item: Mapping[str, Any], key: tuple) -> tuple | None:
+        """``(partition order, entry)`` for *item*, or None if not indexed."""
+        pk = _order(item.get(self.spec.partition_key))
+        if pk is None:
+            return None
+        sk = None
+        if self.spec.sort_key:
+            sk = _order(item.get(self.spec.sort_key))
+            if sk is None:
+                return None
+        return pk, (sk, key)
+
+    def add(self, item: Mapping[str, Any], key: tuple) -> None:
+        located = self.entry(item, key)
+        if located is not None:
+            bisect.insort(self.partitions.setdefault(located[0], []), located[1])
+
+    def remove(self, item: Mapping[str, Any], key: tuple) -> None:
+        located = self.entry(item, key)
+        if located is None:
+            return
+        entries = self.partitions.get(located[0], [])
+        position = bisect.bisect_left(entries, located[1])
+        if position < len(entries) and entries[position] == located[1]:
+            del entries[position]
+            if not entries:
+                del self.partitions[located[0]]
+
+    def count(self) -> int:
+        return sum(len(entries) for entries in self.partitions.values())
+
+
+class MemoryTable:
+    """One table: items by primary key plus sorted table and GSI entries.
+
+    Stored items are owned by the table and never mutated; writes replace
+    them. Callers copy on the way in and out as their contract requires.
+    All methods are thread-safe.
+    """
+
+    def __init__(
+        self, name: str, key: IndexSpec, indexes: Iterable[IndexSpec] = ()
+    ) -> None:
+        self.name = name
+        self.key = key
+        self._lock = threading.RLock()
+        self._items: dict[tuple, dict[str, Any]] = {}
+        self._primary = _Index(key)
+        self._indexes: dict[str, _Index] = {}
+        self.ttl: dict[str, Any] | None = None
+        for spec in indexes:
+            self.add_index(spec)
+
+    # -- schema --------------------------------------------------------
+
+    @property
+    def indexes(self) -> list[IndexSpec]:
+        return [index.spec for index in self._indexes.values()]
+
+    def add_index(self, spec: IndexSpec) -> None:
+        """Add a secondary index and backfill it from existing items."""
+        with self._lock:
+            index = _Index(spec)
+            for key, item in self._items.items():
+                index.add(item, key)
+            self._indexes[spec.name] = index
+
+    def drop_index(self, name: str) -> None:
+        with self._lock:
+            self._indexes.pop(name, None)
+
+    def item_count(self, index_name: str | None = None) -> int:
+        with self._lock:
+            if index_name is None:
+                return len(self._items)
+            return self._index(index_name).count()
+
+    # -- keys ----------------------------------------------------------
+
+    def key_of(self, item: Mapping[str, Any]) -> tuple:
+        """The primary key tuple of *item*; ValueError if it has none."""
+        key = []
+        for name in self.key.key_attributes:
+            if name not in item:
+                raise ValueError(f"Missing the key {name} in the item")
+            order = _order(item[name])
+            if order is None:
+                raise ValueError(f"Invalid type for key attribute {name}")
+            key.append(order)
+        return tuple(key) if self.key.sort_key else (key[0], None)
+
+    def key_dict(self, item: Mapping[str, Any], index: str | None = None) -> dict:
+        """The attributes a ``LastEvaluatedKey`` carries for *item*."""
+        names = list(self.key.key_attributes)
+        if index is not None:
+            names.extend(self._index(index).spec.key_attributes)
+        return {name: item[name] for name in dict.fromkeys(names)}
+
+    # -- single-item operations ----------------------------------------
+
+    def get(self, key: Mapping[str, Any]) -> dict[str, Any] | None:
+        with self._lock:
+            return self._items.get(self.key_of(key))
+
+    def put(
+        self,
+        item: dict[str, Any],
+        condition: Callable[[dict[str, Any] | None], bool] | None = None,
+    ) -> dict[str, Any] | None:
+        """Store *item*; returns the item it replaced.
+
+        Raises ConditionFailed when *condition* rejects the current item.
+        """
+        key = self.key_of(item)
+        with self._lock:
+            old = self._items.get(key)
+            if condition is not None and not condition(old):
+                raise ConditionFailed(old)
+            self._store(key, old, item)
+            return old
+
+    def update(
+        self,
+        key: Mapping[str, Any],
+        updater: Callable[[dict[str, Any] | None], dict[str, Any]],
+        condition: Callable[[dict[str, Any] | None], bool] | None = None,
+    ) -> tuple[dict[str, Any] | None, dict[str, Any]]:
+        """Replace the item at *key* with ``updater(current)``.
+
+        Returns ``(old, new)``. Raises ConditionFailed when *condition*
+        rejects the current item and ValueError if the update changes the
+        key.
+        """
+        key_tuple = self.key_of(key)
+        with self._lock:
+            old = self._items.get(key_tuple)
+            if condition is not None and not condition(old):
+                raise ConditionFailed(old)
+            new = updater(old)
+            if self.key_of(new) != key_tuple:
+                raise ValueError("Cannot update attribute that is part of the key")
+            self._store(key_tuple, old, new)
+            return old, new
+
+    def delete(
+        self,
+        key: Mapping[str, Any],
+        condition: Callable[[dict[str, Any] | None], bool] | None = None,
+    ) -> dict[str, Any] | None:
+        """Remove the item at *key*; returns it (None if absent)."""
+        key_tuple = self.key_of(key)
+        with self._lock:
+            old = self._items.get(key_tuple)
+            if condition is not None and not condition(old):
+                raise ConditionFailed(old)
+            if old is not None:
+                self._store(key_tuple, old, None)
+            return old
+
+    def _store(
+        self, key: tuple, old: dict[str, Any] | None, new: dict[str, Any] | None
+    ) -> None:
+        for index in (self._primary, *self._indexes.values()):
+            if old is not None:
+                index.remove(old, key)
+            if new is not None:
+                index.add(new, key)
+        if new is None:
+            del self._items[key]
+        else:
+            self._items[key] = new
+
+    # -- reads ---------------------------------------------------------
+
+    def query(
+        self,
+        key_condition: Condition,
+        index_name: str | None = None,
+        forward: bool = True,
+        limit: int | None = None,
+        start_key: Mapping[str, Any] | None = None,
+        filter: Condition | None = None,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None, int]:
+        """One page of a query: ``(items, last evaluated key, scanned)``.
+
+        *limit* counts items read before *filter* is applied, as in
+        DynamoDB. The last evaluated key is only set when more remain.
+        """
+        with self._lock:
+            index = self._primary if index_name is None else self._index(index_name)
+            partition, bounds = self._key_range(index.spec, key_condition)
+            entries = index.partitions.get(partition, [])
+            start, end = bounds(entries)
+            if start_key is not None:
+                located = index.entry(start_key, self.key_of(start_key))
+                if located is None or located[0] != partition:
+                    raise ValueError("The provided starting key is invalid")
+                if forward:
+                    start = max(start, bisect.bisect_right(entries, located[1]))
+                else:
+                    end = min(end, bisect.bisect_left(entries, located[1]))
+            selected = entries[start:end]
+            if not forward:
+                selected.reverse()
+            return self._page(
+                (self._items[key] for _, key in selected),
+                len(selected),
+                limit,
+                filter,
+                index_name,
+            )
+
+    def scan(
+        self,
+        index_name: str | None = None,
+        limit: int | None = None,
+        start_key: Mapping[str, Any] | None = None,
+        filter: Condition | None = None,
+        segment: int = 0,
+        total_segments: int = 1,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None, int]:
+        """One page of a (segment of a) scan, like :meth:`query`."""
+        if not 0 <= segment < total_segments:
+            raise ValueError("Segment must be less than TotalSegments")
+        with self._lock:
+            index = self._primary if index_name is None else self._index(index_name)
+            positions = []
+            for partition, entries in index.partitions.items():
+                bucket = zlib.crc32(repr(partition).encode())
+                if bucket % total_segments != segment:
+                    continue
+                positions.extend((bucket, partition, entry) for entry in entries)
+            positions.sort()
+            if start_key is not None:
+                located = index.entry(start_key, self.key_of(start_key))
+                if located is None:
+                    raise ValueError("The provided starting key is invalid")
+                bucket = zlib.crc32(repr(located[0]).encode())
+                first = bisect.bisect_right(positions, (bucket, *located))
+                positions = positions[first:]
+            return self._page(
+                (self._items[entry[1]] for _, _, entry in positions),
+                len(positions),
+                limit,
+                filter,
+                index_name,
+            )
+
+    def items(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._items.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._primary.partitions.clear()
+            for index in self._indexes.values():
+                index.partitions.clear()
+
+    def _page(
+        self,
+        candidates: Iterator[dict[str, Any]],
+        available: int,
+        limit: int | None,
+        filter: Condition | None,
+        index_name: str | None,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None, int]:
+        items: list[dict[str, Any]] = []
+        scanned = 0
+        last = None
+        for item in candidates:
+            if limit is not None and scanned >= limit:
+                break
+            scanned += 1
+            last = item
+            if filter is None or filter(item):
+                items.append(item)
+        last_key = None
+        if scanned < available and last is not None:
+            last_key = self.key_dict(last, index_name)
+        return items, last_key, scanned
+
+    def _index(self, name: str) -> _Index:
+        try:
+            return self._indexes[name]
+        except KeyError:
+            raise ValueError(
+                f"The table does not have the specified index: {name}"
+            ) from None
+
+    @staticmethod
+    def _key_range(
+        spec: IndexSpec, key_condition: Condition
+    ) -> tuple[tuple, Callable[[list[tuple]], tuple[int, int]]]:
+        """The partition and a sort-key range finder for a key condition."""
+        partition = None
+        range_term = None
+        for term in key_condition.conjuncts():
+            attribute = _key_attribute(term)
+            if attribute == spec.partition_key and term[:2] == ("cmp", "="):
+                if partition is not None:
+                    raise ValueError("Key condition has multiple partition keys")
+                partition = _order(term[3][1])
+            elif attribute is not None and attribute == spec.sort_key:
+                if range_term is not None:
+                    raise ValueError("Key condition has multiple sort key terms")
+                range_term = term
+            else:
+                raise ValueError(
+                    "Query key condition not supported: key conditions may only "
+                    "use the partition key (=) and the sort key"
+                )
+        if partition is None:
+            raise ValueError("Query condition missed key schema element")
+
+        def bounds(entries: list[tuple]) -> tuple[int, int]:
+            if range_term is None:
+                return 0, len(entries)
+            return _sort_range(range_term, entries)
+
+        return partition, bounds
+
+
+def _key_attribute(term: tuple) -> str | None:
+    """The attribute a key-condition term constrains (None if malformed)."""
+    if term[0] == "cmp" and term[1] != "<>":
+        target, value = term[2], term[3]
+    elif term[0] == "between":
+        target, value = term[1], term[2]
+        if term[3][0] != "value":
+            return None
+    elif term[0] == "func" and term[1] == "begins_with" and len(term[2]) == 2:
+        target, value = term[2]
+    else:
+        return None
+    if target[0] != "path" or len(target[1]) != 1 or value[0] != "value":
+        return None
+    return target[1][0]
+
+
+def _sort_range(term: tuple, entries: list[tuple]) -> tuple[int, int]:
+    if term[0] == "between":
+        low, high = _order(term[2][1]), _order(term[3][1])
+        return (
+            bisect.bisect_left(entries, low, key=_first),
+            bisect.bisect_right(entries, high, key=_first),
+        )
+    if term[0] == "func":
+        prefix = _order(term[2][1][1])
+        start = end = bisect.bisect_left(entries, prefix, key=_first)
+        while (
+            end < len(entries)
+            and entries[end][0][0] == prefix[0]
+            and entries[end][0][1].startswith(prefix[1])
+        ):
+            end += 1
+        return start, end
+    op, value = term[1], _order(term[3][1])
+    left = bisect.bisect_left(entries, value, key=_first)
+    right = bisect.bisect_right(entries, value, key=_first)
+    return {
+        "=": (left, right),
+        "<": (0, left),
+        "<=": (0, right),
+        ">": (right, len(entries)),
+        ">=": (left, len(entries)),
+    }[op]
+
+
+# ----------------------------------------------------------------------
+# boto3 emulation
+# ----------------------------------------------------------------------
+
+
+def _consumed(table: str, units: float, kwargs: Mapping[str, Any]) -> dict:
+    if kwargs.get("ReturnConsumedCapacity", "NONE") == "NONE":
+        return {}
+    return {"ConsumedCapacity": {"TableName": table, "CapacityUnits": units}}
+
+
+def _read_units(count: int) -> float:
+    return max(0.5, 0.5 * count)
+
+
+class MemoryTableResource:
+    """The ``Table`` resource of :class:`MemoryDynamoDB`."""
+
+    def __init__(self, database: MemoryDynamoDB, name: str) -> None:
+        self._database = database
+        self.name = self.table_name = name
+        self.meta = SimpleNamespace(client=database.meta.client)
+
+    def __repr__(self) -> str:
+        return f"dynamodb.Table(name={self.name!r})"
+
+    @property
+    def _table(self) -> MemoryTable:
+        return self._database.table(self.name)
+
+    @property
+    def key_schema(self) -> list[dict[str, str]]:
+        return self._table.key.key_schema()
+
+    @property
+    def item_count(self) -> int:
+        return self._table.item_count()
+
+    @property
+    def global_secondary_indexes(self) -> list[dict[str, Any]] | None:
+        description = self._database.describe_table(self.name)
+        return description.get("GlobalSecondaryIndexes")
+
+    def load(self) -> None:
+        """Raise ``ResourceNotFoundException`` if the table does not exist."""
+        self._database.table(self.name)
+
+    reload = load
+
+    def put_item(self, **kwargs: Any) -> dict[str, Any]:
+        with self._request("PutItem") as request:
+            item = normalize_item(kwargs["Item"])
+            old = request.write(
+                lambda table, condition: table.put(item, condition), kwargs
+            )
+            response = request.return_values(kwargs, old, None, ("NONE", "ALL_OLD"))
+            return {**response, **_consumed(self.name, 1.0, kwargs)}
+
+    def get_item(self, **kwargs: Any) -> dict[str, Any]:
+        with self._request("GetItem") as request:
+            item = request.table.get(request.key(kwargs))
+            response: dict[str, Any] = {}
+            if item is not None:
+                response["Item"] = request.project(item, kwargs)
+            return {**response, **_consumed(self.name, 0.5, kwargs)}
+
+    def update_item(self, **kwargs: Any) -> dict[str, Any]:
+        with self._request("UpdateItem") as request:
+            key = request.key(kwargs)
+            actions = None
+            if kwargs.get("UpdateExpression"):
+                actions = compile_update(
+                    kwargs["UpdateExpression"],
+                    kwargs.get("ExpressionAttributeNames"),
+                    request.values(kwargs),
+                )
+
+            def updater(current: dict[str, Any] | None) -> dict[str, Any]:
+                base = current if current is not None else dict(key)
+                return apply_update(base, actions) if actions else dict(base)
+
+            old, new = request.write(
+                lambda table, condition: table.update(key, updater, condition), kwargs
+            )
+            response = request.return_values(
+                kwargs,
+                old,
+                new,
+                ("NONE", "ALL_OLD", "ALL_NEW", "UPDATED_OLD", "UPDATED_NEW"),
+                updated={action[1][1][0] for action in actions or ()},
+            )
+            return {**response, **_consumed(self.name, 1.0, kwargs)}
+
+    def delete_item(self, **kwargs: Any) -> dict[str, Any]:
+        with self._request("DeleteItem") as request:
+            key = request.key(kwargs)
+            old = request.write(
+                lambda table, condition: table.delete(key, condition), kwargs
+            )
+            response = request.return_values(kwargs, old, None, ("NONE", "ALL_OLD"))
+            return {**response, **_consumed(self.name, 1.0, kwargs)}
+
+    def query(self, **kwargs: Any) -> dict[str, Any]:
+        with self._request("Query") as request:
+            if "KeyConditionExpression" not in kwargs:
+                raise ValueError("KeyConditionExpression is required")
+            items, last_key, scanned = request.table.query(
+                request.condition(kwargs, "KeyConditionExpression"),
+                index_name=kwargs.get("IndexName"),
+                forward=kwargs.get("ScanIndexForward", True),
+                limit=kwargs.get("Limit"),
+                start_key=request.start_key(kwargs),
+                filter=request.condition(kwargs, "FilterExpression"),
+            )
+            return request.page(kwargs, items, last_key, scanned)
+
+    def scan(self, **kwargs: Any) -> dict[str, Any]:
+        with self._request("Scan") as request:
+            items, last_key, scanned = request.table.scan(
+                index_name=kwargs.get("IndexName"),
+                limit=kwargs.get("Limit"),
+                start_key=request.start_key(kwargs),
+                filter=request.condition(kwargs, "FilterExpression"),
+                segment=kwargs.get("Segment", 0),
+                total_segments=kwargs.get("TotalSegments", 1),
+            )
+            return request.page(kwargs, items, last_key, scanned)
+
+    def batch_writer(self, overwrite_by_pkeys: list[str] | None = None) -> _BatchWriter:
+        return _BatchWriter(self, overwrite_by_pkeys)
+
+    def _request(self, operation: str) -> _Request:
+        return _Request(self._database, self.name, operation)
+
+
+class _Request:
+    """Argument handling and error translation for one table request."""
+
+    def __init__(self, database: MemoryDynamoDB, table: str, operation: str) -> None:
+        self.operation = operation
+        self.table = database.table(table, operation)
+
+    def __enter__(self) -> _Request:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        # ExpressionError is a ValueError too.
+        if isinstance(exc, ValueError):
+            _raise(MemoryExceptions.ValidationException, str(exc), self.operation)
+
+    def key(self, kwargs: Mapping[str, Any]) -> dict[str, Any]:
+        key = normalize_item(kwargs["Key"])
+        if set(key) != set(self.table.key.key_attributes):
+            raise ValueError("The provided key element does not match the schema")
+        return key
+
+    def values(self, kwargs: Mapping[str, Any]) -> dict[str, Any]:
+        return {
+            name: normalize(value)
+            for name, value in (kwargs.get("ExpressionAttributeValues") or {}).items()
+        }
+
+    def condition(self, kwargs: Mapping[str, Any], argument: str) -> Condition | None:
+        expression = kwargs.get(argument)
+        if expression is None:
+            return None
+        return compile_condition(
+            expression,
+            kwargs.get("ExpressionAttributeNames"),
+            self.values(kwargs),
+            normalize=normalize,
+        )
+
+    def write(self, operation: Callable, kwargs: Mapping[str, Any]) -> Any:
+        condition = self.condition(kwargs, "ConditionExpression")
+        try:
+            return operation(self.table, condition)
+        except ConditionFailed as exc:
+            error = MemoryExceptions.ConditionalCheckFailedException(
+                {
+                    "Error": {
+                        "Code": "ConditionalCheckFailedException",
+                        "Message": "The conditional request failed",
+                    }
+                },
+                self.operation,
+            )
+            if (
+                kwargs.get("ReturnValuesOnConditionCheckFailure") == "ALL_OLD"
+                and exc.item is not None
+            ):
+                error.response["Item"] = copy.deepcopy(exc.item)
+            raise error from None
+
+    def return_values(
+        self,
+        kwargs: Mapping[str, Any],
+        old: dict[str, Any] | None,
+        new: dict[str, Any] | None,
+        allowed: tuple[str, ...],
+        updated: set[str] = frozenset(),
+    ) -> dict[str, Any]:
+        """``Attributes`` per ``ReturnValues``; *updated* names the top-level
+        attributes an update expression touched (for ``UPDATED_*``).
+        """
+        mode = kwargs.get("ReturnValues", "NONE")
+        if mode not in allowed:
+            raise ValueError(f"ReturnValues {mode} is not valid for {self.operation}")
+        if mode == "ALL_OLD":
+            source = old
+        elif mode == "ALL_NEW":
+            source = new
+        elif mode in ("UPDATED_OLD", "UPDATED_NEW"):
+            source = (old if mode == "UPDATED_OLD" else new) or {}
+            source = {name: value for name, value in source.items() if name in updated}
+        else:
+            return {}
+        if not source:
+            return {}
+        return {"Attributes": copy.deepcopy(source)}
+
+    def start_key(self, kwargs: Mapping[str, Any]) -> dict[str, Any] | None:
+        start = kwargs.get("ExclusiveStartKey")
+        return normalize_item(start) if start is not None else None
+
+    def project(self, item: dict[str, Any], kwargs: Mapping[str, Any]) -> dict:
+        expression = kwargs.get("ProjectionExpression")
+        if expression:
+            paths = compile_projection(
+                expression, kwargs.get("ExpressionAttributeNames")
+            )
+            return copy.deepcopy(project_paths(item, paths))
+        index_name = kwargs.get("IndexName")
+        if index_name is not None:
+            spec = self.table._index(index_name).spec
+            if spec.projection != "ALL":
+                keep = {
+                    *self.table.key.key_attributes,
+                    *spec.key_attributes,
+                    *spec.non_key_attributes,
+                }
+                item = {name: value for name, value in item.items() if name in keep}
+        return copy.deepcopy(item)
+
+    def page(
+        self,
+        kwargs: Mapping[str, Any],
+        items: list[dict[str, Any]],
+        last_key: dict[str, Any] | None,
+        scanned: int,
+    ) -> dict[str, Any]:
+        response: dict[str, Any] = {"Count": len(items), "ScannedCount": scanned}
+        if kwargs.get("Select") != "COUNT":
+            response["Items"] = [self.project(item, kwargs) for item in items]
+        if last_key is not None:
+            response["LastEvaluatedKey"] = copy.deepcopy(last_key)
+        units = _consumed(self.table.name, _read_units(scanned), kwargs)
+        return {**response, **units}
+
+
+class _BatchWriter:
+    """``Table.batch_writer()``: buffered puts and deletes."""
+
+    def __init__(
+        self, table: MemoryTableResource, overwrite_by_pkeys: list[str] | None
+    ) -> None:
+        self._table = table
+        self._keys = overwrite_by_pkeys
+        self._pending: list[tuple[str, dict[str, Any]]] = []
+
+    def __enter__(self) -> _BatchWriter:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self._flush()
+
+    def put_item(self, Item: dict[str, Any]) -> None:
+        self._add("put", Item)
+
+    def delete_item(self, Key: dict[str, Any]) -> None:
+        self._add("delete", Key)
+
+    def _add(self, action: str, body: dict[str, Any]) -> None:
+        if self._keys:
+            key = [body.get(name) for name in self._keys]
+            self._pending = [
+                entry
+                for entry in self._pending
+                if [entry[1].get(name) for name in self._keys] != key
+            ]
+        self._pending.append((action, body))
+        if len(self._pending) >= 25:
+            self._flush()
+
+    def _flush(self) -> None:
+        for action, body in self._pending:
+            if action == "put":
+                self._table.put_item(Item=body)
+            else:
+                self._table.delete_item(Key=body)
+        self._pending = []
+
+
+class MemoryDynamoDBClient:
+    """The ``meta.client`` of :class:`MemoryDynamoDB`: control plane calls.
+
+    Data-plane calls in the low-level (typed ``{"S": ...}``) format are not
+    emulated; use the resource API.
+    """
+
+    exceptions = MemoryExceptions
+
+    def __init__(self, database: MemoryDynamoDB) -> None:
+        self._database = database
+        self.meta = SimpleNamespace(endpoint_url=database.endpoint_url)
+
+    def list_tables(self, **kwargs: Any) -> dict[str, Any]:
+        return {"TableNames": self._database.table_names()}
+
+    def create_table(self, **kwargs: Any) -> dict[str, Any]:
+        self._database.create_table(**kwargs)
+        return {"TableDescription": self._database.describe_table(kwargs["TableName"])}
+
+    def delete_table(self, TableName: str) -> dict[str, Any]:
+        description = self._database.describe_table(TableName)
+        self._database.delete_table(TableName)
+        return {"TableDescription": description}
+
+    def describe_table(self, TableName: str) -> dict[str, Any]:
+        return {"Table": self._database.describe_table(TableName)}
+
+    def update_table(self, **kwargs: Any) -> dict[str, Any]:
+        self._database.update_table(**kwargs)
+        return {"TableDescription": self._database.describe_table(kwargs["TableName"])}
+
+    def update_time_to_live(
+        self, TableName: str, TimeToLiveSpecification: dict[str, Any]
+    ) -> dict[str, Any]:
+        self._database.table(TableName, "UpdateTimeToLive").ttl = dict(
+            TimeToLiveSpecification
+        )
+        return {"TimeToLiveSpecification": TimeToLiveSpecification}
+
+    def describe_time_to_live(self, TableName: str) -> dict[str, Any]:
+        ttl = self._database.table(TableName, "DescribeTimeToLive").ttl
+        if not ttl or not ttl.get("Enabled"):
+            return {"TimeToLiveDescription": {"TimeToLiveStatus": "DISABLED"}}
+        return {
+            "TimeToLiveDescription": {
+                "TimeToLiveStatus": "ENABLED",
+                "AttributeName": ttl["AttributeName"],
+            }
+        }
+
+    def get_waiter(self, name: str) -> Any:
+        # Tables are created and deleted synchronously.
+        return SimpleNamespace(wait=lambda **kwargs: None)
+
+
+class MemoryDynamoDB:
+    """A DynamoDB resource whose tables live in this process.
+
+    Thread-safe; share one per logical database.
+    """
+
+    def __init__(self, endpoint_url: str = MEMORY_SCHEME) -> None:
+        self.endpoint_url = endpoint_url
+        self._lock = threading.Lock()
+        self._tables: dict[str, MemoryTable] = {}
+        self.meta = SimpleNamespace(client=MemoryDynamoDBClient(self))
+
+    def __repr__(self) -> str:
+        return f"MemoryDynamoDB({self.endpoint_url!r})"
+
+    # -- resource API --------------------------------------------------
+
+    def Table(self, name: str) -> MemoryTableResource:
+        return MemoryTableResource(self, name)
+
+    def create_table(self, **kwargs: Any) -> MemoryTableResource:
+        name = kwargs["TableName"]
+        key = _spec(None, kwargs["KeySchema"])
+        indexes = [
+            _spec(
+                gsi["IndexName"],
+                gsi["KeySchema"],
+                gsi.get("Projection", {}),
+            )
+            for gsi in kwargs.get("GlobalSecondaryIndexes", [])
+        ]
+        with self._lock:
+            if name in self._tables:
+                _raise(
+                    MemoryExceptions.ResourceInUseException,
+                    f"Table already exists: {name}",
+                    "CreateTable",
+                )
+            self._tables[name] = MemoryTable(name, key, indexes)
+        return self.Table(name)
+
+    def batch_get_item(self, RequestItems: dict[str, Any], **kwargs: Any) -> dict:
+        responses: dict[str, list[dict[str, Any]]] = {}
+        capacity = []
+        for name, request in RequestItems.items():
+            table = self.Table(name)
+            found = []
+            for key in request["Keys"]:
+                item = table.get_item(
+                    Key=key,
+                    **{
+                        arg: request[arg]
+                        for arg in ("ProjectionExpression", "ExpressionAttributeNames")
+                        if arg in request
+                    },
+                ).get("Item")
+                if item is not None:
+                    found.append(item)
+            responses[name] = found
+            capacity.append(
+                {"TableName": name, "CapacityUnits": _read_units(len(request["Keys"]))}
+            )
+        response: dict[str, Any] = {"Responses": responses, "UnprocessedKeys": {}}
+        if kwargs.get("ReturnConsumedCapacity", "NONE") != "NONE":
+            response["ConsumedCapacity"] = capacity
+        return response
+
+    def batch_write_item(self, RequestItems: dict[str, Any], **kwargs: Any) -> dict:
+        capacity = []
+        for name, requests in RequestItems.items():
+            table = self.Table(name)
+            for request in requests:
+                if "PutRequest" in request:
+                    table.put_item(Item=request["PutRequest"]["Item"])
+                else:
+                    table.delete_item(Key=request["DeleteRequest"]["Key"])
+            capacity.append({"TableName": name, "CapacityUnits": float(len(requests))})
+        response: dict[str, Any] = {"UnprocessedItems": {}}
+        if kwargs.get("ReturnConsumedCapacity", "NONE") != "NONE":
+            response["ConsumedCapacity"] = capacity
+        return response
+
+    # -- control plane -------------------------------------------------
+
+    def table(self, name: str, operation: str = "DescribeTable") -> MemoryTable:
+        """The table named *name*; ResourceNotFoundException if absent."""
+        table = self._tables.get(name)
+        if table is None:
+            _raise(
+                MemoryExceptions.ResourceNotFoundException,
+                "Requested resource not found",
+                operation,
+            )
+        return table
+
+    def table_names(self) -> list[str]:
+        with self._lock:
+            return sorted(self._tables)
+
+    def delete_table(self, name: str) -> None:
+        with self._lock:
+            if self._tables.pop(name, None) is None:
+                _raise(
+                    MemoryExceptions.ResourceNotFoundException,
+                    "Requested resource not found",
+                    "DeleteTable",
+                )
+
+    def update_table(self, **kwargs: Any) -> None:
+        table = self.table(kwargs["TableName"], "UpdateTable")
+        for update in kwargs.get("GlobalSecondaryIndexUpdates", []):
+            if "Create" in update:
+                create = update["Create"]
+                table.add_index(
+                    _spec(
+                        create["IndexName"],
+                        create["KeySchema"],
+                        create.get("Projection", {}),
+                    )
+                )
+            elif "Delete" in update:
+                table.drop_index(update["Delete"]["IndexName"])
+
+    def describe_table(self, name: str) -> dict[str, Any]:
+        """``DescribeTable``'s ``Table`` for *name*."""
+        table = self.table(name)
+        description: dict[str, Any] = {
+            "TableName": name,
+            "TableStatus": "ACTIVE",
+            "KeySchema": table.key.key_schema(),
+            "ItemCount": table.item_count(),
+            "BillingModeSummary": {"BillingMode": "PAY_PER_REQUEST"},
+        }
+        if table.indexes:
+            description["GlobalSecondaryIndexes"] = [
+                {
+                    "IndexName": spec.name,
+                    "KeySchema": spec.key_schema(),
+                    "Projection": _projection(spec),
+                    "IndexStatus": "ACTIVE",
+                    "ItemCount": table.item_count(spec.name),
+                }
+                for spec in table.indexes
+            ]
+        return description
+
+    def ensure_table(self, name: str, config: RepositoryConfig) -> None:
+        """Create *name* for a repository, adding any GSIs it lacks."""
+        with self._lock:
+            table = self._tables.get(name)
+            if table is None:
+                table = self._tables[name] = MemoryTable(
+                    name, IndexSpec(None, config.partition_key, config.sort_key)
+                )
+        existing = {spec.name for spec in table.indexes}
+        for gsi in config.gsi_definitions:
+            if gsi.index_name not in existing:
+                table.add_index(
+                    IndexSpec(gsi.index_name, gsi.partition_key, gsi.sort_key)
+                )
+
+    def reset(self) -> None:
+        """Drop every table."""
+        with self._lock:
+            self._tables.clear()
+
+
+def _spec(
+    name: str | None,
+    key_schema: list[dict[str, str]],
+    projection: Mapping[str, Any] | None = None,
+) -> IndexSpec:
+    keys = {entry["KeyType"]: entry["AttributeName"] for entry in key_schema}
+    projection = projection or {}
+    return IndexSpec(
+        name,
+        keys["HASH"],
+        keys.get("RANGE"),
+        projection.get("ProjectionType", "ALL"),
+        tuple(projection.get("NonKeyAttributes", ())),
+    )
+
+
+def _projection(spec: IndexSpec) -> dict[str, Any]:
+    projection: dict[str, Any] = {"ProjectionType": spec.projection}
+    if spec.non_key_attributes:
+        projection["NonKeyAttributes"] = list(spec.non_key_attributes)
+    return projection
+
+
+_DATABASES: dict[str, MemoryDynamoDB] = {}
+_DATABASES_LOCK = threading.Lock()
+
+
+def is_memory_endpoint(endpoint_url: str | None) -> bool:
+    return bool(endpoint_url) and endpoint_url.startswith(MEMORY_SCHEME)
+
+
+def database(endpoint_url: str = MEMORY_SCHEME) -> MemoryDynamoDB:
+    """The process-wide in-memory database for a ``memory://`` endpoint."""
+    with _DATABASES_LOCK:
+        found = _DATABASES.get(endpoint_url)
+        if found is None:
+            found = _DATABASES[endpoint_url] = MemoryDynamoDB(endpoint_url)
+        return found
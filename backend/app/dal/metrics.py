@@ -0,0 +1,313 @@
+"""In-process metrics for DAL calls, exported in Prometheus text format.
+
+Every repository call records its latency in a per-table, per-operation
+histogram; failures count by DAL exception type; and DynamoDB's
+``ConsumedCapacity`` is summed per table and operation.
+
+Other components report through collectors: a component registers a
+function returning ``(name, type, help, labels, value)`` samples, and
+every snapshot includes what they return at that moment. Collected
+counters and gauges are summed across live workers like everything else,
+so a gauge reads as the server-wide total (e.g. agent runs queued on all
+workers).
+
+Gunicorn runs several worker processes, each with its own registry. When
+``METRICS_MULTIPROC_DIR`` is set, every worker periodically writes its
+snapshot to ``<dir>/dal-<pid>.json`` and ``/metrics`` merges all snapshot
+files, so a scrape of any worker reports the whole server. Files of exited
+workers are kept so their counters stay in the totals, but their gauges
+are dropped: a crashed worker's last "active" or "queued" reading no
+longer describes anything. The directory is cleared when the gunicorn
+master starts.
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import glob
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_PREFIX = "homeagent_dal"
+
+# (metric name, "counter" | "gauge", help text, labels, value)
+Sample = tuple[str, str, str, dict[str, str], float]
+
+
+class MetricsRegistry:
+    """Thread-safe counters and latency histograms keyed by table/operation."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # (table, operation) -> [per-bucket counts..., +Inf count, sum]
+        self._latency: dict[tuple[str, str], list[float]] = {}
+        self._errors: dict[tuple[str, str, str], int] = {}
+        self._capacity: dict[tuple[str, str], float] = {}
+        self._collectors: dict[str, Callable[[], Iterable[Sample]]] = {}
+
+    def register_collector(
+        self, name: str, collect: Callable[[], Iterable[Sample]]
+    ) -> None:
+        """Include *collect*'s samples in every snapshot.
+
+        Registering another collector under the same *name* replaces it.
+        """
+        with self._lock:
+            self._collectors[name] = collect
+
+    def _collect_samples(self) -> list[list]:
+        with self._lock:
+            collectors = dict(self._collectors)
+        samples = []
+        for name, collect in collectors.items():
+            try:
+                samples.extend(list(sample) for sample in collect())
+            except Exception:
+                logger.warning("Metrics collector %s failed", name, exc_info=True)
+        return samples
+
+    def observe(self, table: str, operation: str, seconds: float) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._latency.get((table, operation))
+            if series is None:
+                series = self._latency[(table, operation)] = [0] * (
+                    len(self.buckets) + 2
+                )
+            series[index] += 1
+            series[-1] += seconds
+
+    def record_error(self, table: str, operation: str, error: str) -> None:
+        with self._lock:
+            key = (table, operation, error)
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    def record_capacity(self, table: str, operation: str, units: float) -> None:
+        if not units:
+            return
+        with self._lock:
+            key = (table, operation)
+            self._capacity[key] = self._capacity.get(key, 0.0) + units
+
+    def snapshot(self) -> dict[str, list]:
+        """JSON-serializable copy of every series."""
+        samples = self._collect_samples()
+        with self._lock:
+            return {
+                "buckets": list(self.buckets),
+                "latency": [[t, op, list(s)] for (t, op), s in self._latency.items()],
+                "errors": [[t, op, e, n] for (t, op, e), n in self._errors.items()],
+                "capacity": [[t, op, u] for (t, op), u in self._capacity.items()],
+                "samples": samples,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latency.clear()
+            self._errors.clear()
+            self._capacity.clear()
+
+    # -- multiprocess mode ---------------------------------------------
+
+    def flush(self, directory: str) -> None:
+        """Write this process's snapshot for other workers to merge."""
+        path = os.path.join(directory, f"dal-{os.getpid()}.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+
+    def collect(self, directory: str | None = None) -> dict[str, list]:
+        """This process's snapshot, or every worker's merged when *directory*."""
+        if not directory:
+            return self.snapshot()
+        self.flush(directory)
+        snapshots = []
+        for path in glob.glob(os.path.join(directory, "dal-*.json")):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                logger.warning("Skipping unreadable metrics snapshot %s", path)
+                continue
+            if not _writer_alive(path):
+                snapshot["samples"] = [
+                    s for s in snapshot.get("samples", []) if s[1] != "gauge"
+                ]
+            snapshots.append(snapshot)
+        return merge_snapshots(snapshots)
+
+
+def _writer_alive(path: str) -> bool:
+    """Whether the worker that wrote snapshot *path* is still running."""
+    try:
+        pid = int(os.path.basename(path)[len("dal-") : -len(".json")])
+    except ValueError:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots: list[dict[str, list]]) -> dict[str, list]:
+    """Sum snapshots from several processes into one."""
+    latency: dict[tuple[str, str], list[float]] = {}
+    errors: dict[tuple[str, str, str], int] = {}
+    capacity: dict[tuple[str, str], float] = {}
+    samples: dict[tuple, list] = {}
+    buckets: list[float] = list(LATENCY_BUCKETS)
+    for snap in snapshots:
+        buckets = snap.get("buckets", buckets)
+        for table, op, series in snap.get("latency", []):
+            total = latency.setdefault((table, op), [0] * len(series))
+            for i, value in enumerate(series):
+                total[i] += value
+        for table, op, error, count in snap.get("errors", []):
+            errors[(table, op, error)] = errors.get((table, op, error), 0) + count
+        for table, op, units in snap.get("capacity", []):
+            capacity[(table, op)] = capacity.get((table, op), 0.0) + units
+        for name, kind, help_text, labels, value in snap.get("samples", []):
+            key = (name, tuple(sorted(labels.items())))
+            if key in samples:
+                samples[key][4] += value
+            else:
+                samples[key] = [name, kind, help_text, labels, value]
+    return {
+        "buckets": buckets,
+        "latency": [[t, op, s] for (t, op), s in latency.items()],
+        "errors": [[t, op, e, n] for (t, op, e), n in errors.items()],
+        "capacity": [[t, op, u] for (t, op), u in capacity.items()],
+        "samples": list(samples.values()),
+    }
+
+
+def _labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{name}="{escape(str(value))}"' for name, value in labels.items())
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(snapshot: dict[str, list]) -> str:
+    """Prometheus text exposition (format 0.0.4) for a snapshot."""
+    buckets = snapshot["buckets"]
+    lines = [
+        f"# HELP {_PREFIX}_request_duration_seconds DAL call latency.",
+        f"# TYPE {_PREFIX}_request_duration_seconds histogram",
+    ]
+    for table, op, series in sorted(snapshot["latency"]):
+        cumulative = 0
+        for bound, count in zip([*buckets, "+Inf"], series[:-1]):
+            cumulative += count
+            le = bound if bound == "+Inf" else _number(float(bound))
+            lines.append(
+                f"{_PREFIX}_request_duration_seconds_bucket"
+                f"{{{_labels(table=table, operation=op, le=le)}}} {int(cumulative)}"
+            )
+        labels = _labels(table=table, operation=op)
+        lines.append(
+            f"{_PREFIX}_request_duration_seconds_sum{{{labels}}} {_number(series[-1])}"
+        )
+        lines.append(
+            f"{_PREFIX}_request_duration_seconds_count{{{labels}}} {int(cumulative)}"
+        )
+
+    lines += [
+        f"# HELP {_PREFIX}_errors_total DAL calls that raised, by exception type.",
+        f"# TYPE {_PREFIX}_errors_total counter",
+    ]
+    for table, op, error, count in sorted(snapshot["errors"]):
+        labels = _labels(table=table, operation=op, error=error)
+        lines.append(f"{_PREFIX}_errors_total{{{labels}}} {int(count)}")
+
+    name = f"{_PREFIX}_consumed_capacity_units_total"
+    lines += [
+        f"# HELP {name} Capacity units reported by DynamoDB.",
+        f"# TYPE {name} counter",
+    ]
+    for table, op, units in sorted(snapshot["capacity"]):
+        labels = _labels(table=table, operation=op)
+        lines.append(f"{name}{{{labels}}} {_number(float(units))}")
+
+    described: set[str] = set()
+    for name, kind, help_text, labels, value in sorted(
+        snapshot.get("samples", []), key=lambda s: (s[0], sorted(s[3].items()))
+    ):
+        if name not in described:
+            described.add(name)
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        series = f"{name}{{{_labels(**labels)}}}" if labels else name
+        lines.append(f"{series} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def consumed_units(response: dict[str, Any]) -> float:
+    """Total ``CapacityUnits`` in a response (single or batch form)."""
+    consumed = response.get("ConsumedCapacity")
+    if not consumed:
+        return 0.0
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return float(sum(c.get("CapacityUnits", 0) for c in consumed))
+
+
+DAL_METRICS = MetricsRegistry()
+
+_flusher: threading.Thread | None = None
+_flusher_lock = threading.Lock()
+
+
+def start_flusher(directory: str, interval: float) -> None:
+    """Write this worker's snapshot every *interval* seconds and at exit."""
+    global _flusher
+    with _flusher_lock:
+        if _flusher is not None and _flusher.is_alive():
+            return
+        os.makedirs(directory, exist_ok=True)
+        stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval):
+                try:
+                    DAL_METRICS.flush(directory)
+                except OSError:
+                    logger.warning("Failed to flush DAL metrics to %s", directory)
+
+        def on_exit() -> None:
+            stop.set()
+            try:
+                DAL_METRICS.flush(directory)
+            except OSError:
+                pass
+
+        _flusher = threading.Thread(target=run, name="dal-metrics", daemon=True)
+        _flusher.start()
+        atexit.register(on_exit)
+
+
+def clear_multiproc_dir(directory: str) -> None:
+    """Remove snapshot files; call from the gunicorn master before forking."""
+    for path in glob.glob(os.path.join(directory, "dal-*.json*")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,24 @@
+"""Projection helpers for repository reads.
+
+Projections name top-level attributes only. Every name is escaped through
+``ExpressionAttributeNames`` so reserved words (``status``, ``name``,
+``role``, ``data``...) can be projected without callers knowing about it.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+
+def projection_kwargs(attributes: Iterable[str]) -> dict[str, Any]:
+    """``ProjectionExpression`` plus escaped names for *attributes*."""
+    names = {f"#p{i}": attr for i, attr in enumerate(dict.fromkeys(attributes))}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+
+
+def project(item: dict[str, Any], attributes: Iterable[str]) -> dict[str, Any]:
+    """The subset of *item* a projected read would have returned."""
+    return {attr: item[attr] for attr in attributes if attr in item}
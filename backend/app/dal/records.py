@@ -0,0 +1,97 @@
+"""Immutable item records.
+
+:func:`freeze` turns an item into a :class:`FrozenDict` whose nested maps,
+lists and sets are frozen as well. Frozen records are real ``dict`` and
+``list`` instances, so they compare, unpack (``{**item}``) and serialize
+(``json.dumps``, ``jsonify``) like the plain items BaseRepository returns,
+but every mutating method raises ``TypeError``.
+
+Because nobody can change a frozen record, a store can hand the stored
+record itself to every reader instead of a defensive deep copy, and an
+update can build the next version from the old one, sharing every
+attribute it does not touch.
+
+To edit a record, build a new one (``{**item, "name": "x"}``) or take a
+mutable copy: ``copy.copy`` gives a plain top-level ``dict``,
+``copy.deepcopy`` (or :func:`thaw`) a fully mutable one.
+"""
+
+from __future__ import annotations
+
+from typing import Any, NoReturn
+
+
+def _immutable(self: Any, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError(f"{type(self).__name__} is immutable")
+
+
+class FrozenDict(dict):
+    """A ``dict`` that cannot be modified after construction."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({dict.__repr__(self)})"
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return thaw(self)
+
+    def __reduce__(self) -> tuple:
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """A ``list`` that cannot be modified after construction."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __repr__(self) -> str:
+        return f"FrozenList({list.__repr__(self)})"
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return thaw(self)
+
+    def __reduce__(self) -> tuple:
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """*value* with every dict, list and set replaced by a frozen one.
+
+    Already-frozen values are returned as they are, so re-freezing a
+    record (or a new record built around frozen parts) copies nothing.
+    """
+    if isinstance(value, (FrozenDict, FrozenList, frozenset)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({name: freeze(item) for name, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList([freeze(item) for item in value])
+    if isinstance(value, set):
+        return frozenset(value)
+    if isinstance(value, bytearray):
+        return bytes(value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """A fully mutable copy of *value*: plain dicts, lists and sets."""
+    if isinstance(value, dict):
+        return {name: thaw(item) for name, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
@@ -18,10 +18,12 @@ from app.dal.repositories.memory_sharing_config_repo import (
     MemorySharingConfigRepository,
 )
 from app.dal.repositories.message_repo import MessageRepository
+from app.dal.repositories.message_search_repo import MessageSearchRepository
 from app.dal.repositories.oauth_state_repo import OAuthStateRepository
 from app.dal.repositories.oauth_token_repo import OAuthTokenRepository
 from app.dal.repositories.profile_repo import ProfileRepository
 from app.dal.repositories.storage_config_repo import StorageConfigRepository
+from app.dal.repositories.token_usage_repo import TokenUsageRepository
 from app.dal.repositories.user_repo import UserRepository
 
 __all__ = [
@@ -41,9 +43,11 @@ __all__ = [
     "MembershipRepository",
     "MemorySharingConfigRepository",
     "MessageRepository",
+    "MessageSearchRepository",
     "OAuthStateRepository",
     "OAuthTokenRepository",
     "ProfileRepository",
     "StorageConfigRepository",
+    "TokenUsageRepository",
     "UserRepository",
 ]
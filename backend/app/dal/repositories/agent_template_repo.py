@@ -36,6 +36,11 @@ class AgentTemplateRepository(BaseRepository):
 
     def list_all(self, limit: int = 100) -> PaginatedResult[dict[str, Any]]:
         """Scan all templates (bounded). For admin listing."""
-        result = self._table.scan(Limit=limit)
-        items = result.get("Items", [])
+        result = self._call(self._table.scan, Limit=limit)
+        # Skip the catalog version item kept alongside the templates.
+        items = [
+            item
+            for item in result.get("Items", [])
+            if item.get("template_id") != "__catalog_version__"
+        ]
         return PaginatedResult(items=items, next_cursor=None, count=len(items))
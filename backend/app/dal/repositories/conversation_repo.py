@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
 
 from app.dal.base import BaseRepository, GSIConfig, RepositoryConfig
 from app.dal.pagination import PaginatedResult
@@ -36,6 +36,7 @@ class ConversationRepository(BaseRepository):
         limit: int = 20,
         cursor: str | None = None,
         newest_first: bool = True,
+        projection: list[str] | None = None,
     ) -> PaginatedResult[dict[str, Any]]:
         """List conversations for a user, newest first by default."""
         return self.query(
@@ -44,4 +45,16 @@ class ConversationRepository(BaseRepository):
             limit=limit,
             cursor=cursor,
             scan_forward=not newest_first,
+            projection=projection,
+        )
+
+    def iter_by_user(
+        self, user_id: str, max_items: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Every conversation for a user, newest first, fetched page by page."""
+        return self.query_iter(
+            user_id,
+            index_name="user_conversations-index",
+            scan_forward=False,
+            max_items=max_items,
         )
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
 
 from app.dal.base import BaseRepository, GSIConfig, RepositoryConfig
 from app.dal.pagination import PaginatedResult
@@ -39,3 +39,7 @@ class DeviceRepository(BaseRepository):
         return self.query(
             user_id, index_name="user_id-index", limit=limit, cursor=cursor
         )
+
+    def iter_by_user(self, user_id: str) -> Iterator[dict[str, Any]]:
+        """Every device registered by a user, fetched page by page."""
+        return self.query_iter(user_id, index_name="user_id-index")
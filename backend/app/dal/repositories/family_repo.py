@@ -21,6 +21,7 @@ class FamilyRepository(BaseRepository):
         gsi_definitions=[
             GSIConfig(index_name="owner-index", partition_key="owner_user_id"),
         ],
+        cache_ttl_seconds=30,
     )
 
     def __init__(self, dynamodb_resource: Any, table_prefix: str = "") -> None:
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
 
 from app.dal.base import BaseRepository, GSIConfig, RepositoryConfig
 from app.dal.pagination import PaginatedResult
@@ -55,6 +55,25 @@ class HealthObservationRepository(BaseRepository):
             cursor=cursor,
         )
 
+    def iter_by_user(
+        self, user_id: str, max_items: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Every observation for a user, fetched page by page."""
+        return self.query_iter(user_id, max_items=max_items)
+
+    def iter_by_category(
+        self, user_id: str, category: str, max_items: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Every observation in one category for a user."""
+        from boto3.dynamodb.conditions import Key
+
+        return self.query_iter(
+            user_id,
+            sort_condition=Key("category").eq(category),
+            index_name="category-index",
+            max_items=max_items,
+        )
+
     def get_observation(
         self, user_id: str, observation_id: str
     ) -> dict[str, Any] | None:
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
 
 from app.dal.base import BaseRepository, GSIConfig, RepositoryConfig
 from app.dal.pagination import PaginatedResult
@@ -55,6 +55,33 @@ class HealthRecordRepository(BaseRepository):
             cursor=cursor,
         )
 
+    def iter_by_user(
+        self,
+        user_id: str,
+        max_items: int | None = None,
+        projection: list[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Every health record for a user, fetched page by page."""
+        return self.query_iter(user_id, max_items=max_items, projection=projection)
+
+    def iter_by_record_type(
+        self,
+        user_id: str,
+        record_type: str,
+        max_items: int | None = None,
+        projection: list[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Every health record of one type for a user."""
+        from boto3.dynamodb.conditions import Key
+
+        return self.query_iter(
+            user_id,
+            sort_condition=Key("record_type").eq(record_type),
+            index_name="record_type-index",
+            max_items=max_items,
+            projection=projection,
+        )
+
     def get_record(self, user_id: str, record_id: str) -> dict[str, Any] | None:
         """Get a specific health record."""
         return self.get_by_id({"user_id": user_id, "record_id": record_id})
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from app.dal.base import BaseRepository, RepositoryConfig
+from app.dal.base import BaseRepository, GSIConfig, RepositoryConfig
 from app.dal.pagination import PaginatedResult
 
 
@@ -12,6 +12,7 @@ class MembershipRepository(BaseRepository):
     """Repository for the FamilyMembers table.
 
     Key schema: family_id (HASH), user_id (RANGE)
+    GSIs: user_id-index (PK: user_id)
 
     Consolidates access to family membership data. Once the Memberships
     table migration (Phase 3) is complete, this will be retargeted to
@@ -22,6 +23,9 @@ class MembershipRepository(BaseRepository):
         table_name="FamilyMembers",
         partition_key="family_id",
         sort_key="user_id",
+        gsi_definitions=[
+            GSIConfig(index_name="user_id-index", partition_key="user_id"),
+        ],
     )
 
     def __init__(self, dynamodb_resource: Any, table_prefix: str = "") -> None:
@@ -37,6 +41,14 @@ class MembershipRepository(BaseRepository):
         """Get a specific membership record."""
         return self.get_by_id({"family_id": family_id, "user_id": user_id})
 
+    def get_family_id_for_user(self, user_id: str) -> str | None:
+        """Resolve the family a user belongs to via user_id-index GSI.
+
+        Returns None if the user has no membership record.
+        """
+        result = self.query(user_id, index_name="user_id-index", limit=1)
+        return result.items[0]["family_id"] if result.items else None
+
     def delete_membership(self, family_id: str, user_id: str) -> None:
         """Remove a member from a family."""
         self.delete({"family_id": family_id, "user_id": user_id})
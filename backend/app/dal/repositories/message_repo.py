@@ -31,6 +31,7 @@ class MessageRepository(BaseRepository):
         limit: int = 50,
         cursor: str | None = None,
         newest_first: bool = False,
+        projection: list[str] | None = None,
     ) -> PaginatedResult[dict[str, Any]]:
         """List messages in a conversation, oldest first by default."""
         return self.query(
@@ -38,6 +39,7 @@ class MessageRepository(BaseRepository):
             limit=limit,
             cursor=cursor,
             scan_forward=not newest_first,
+            projection=projection,
         )
 
     def query_by_conversation_after(
@@ -58,7 +60,12 @@ class MessageRepository(BaseRepository):
         all_keys: list[dict[str, Any]] = []
         cursor = None
         while True:
-            page = self.query(conversation_id, limit=100, cursor=cursor)
+            page = self.query(
+                conversation_id,
+                limit=100,
+                cursor=cursor,
+                projection=["conversation_id", "sort_key"],
+            )
             all_keys.extend(
                 {"conversation_id": m["conversation_id"], "sort_key": m["sort_key"]}
                 for m in page.items
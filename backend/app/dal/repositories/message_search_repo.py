@@ -0,0 +1,65 @@
+"""MessageSearchRepository — DynamoDB access for MessageSearchIndex table."""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from boto3.dynamodb.conditions import Key
+
+from app.dal.base import BaseRepository, RepositoryConfig
+from app.dal.batch import BatchWriteResult
+
+
+class MessageSearchRepository(BaseRepository):
+    """Repository for the MessageSearchIndex table (inverted message index).
+
+    Key schema: user_id (HASH), term_key (RANGE)
+
+    Each item is one posting: ``term_key`` is ``<term>#<message sort_key>``,
+    so a term's postings are one ``begins_with("<term>#")`` query in the
+    owner's partition, newest message first. Term characters all sort after
+    ``#``, so the postings of longer terms sharing the prefix follow as a
+    separate key range. Postings carry the conversation_id, message_id,
+    role, created_at and a snippet so a search needs no further reads.
+    """
+
+    CONFIG = RepositoryConfig(
+        table_name="MessageSearchIndex",
+        partition_key="user_id",
+        sort_key="term_key",
+    )
+
+    def __init__(self, dynamodb_resource: Any, table_prefix: str = "") -> None:
+        super().__init__(self.CONFIG, dynamodb_resource, table_prefix)
+
+    def put_postings(self, postings: list[dict[str, Any]]) -> BatchWriteResult:
+        """Write postings in batches (overwrites are idempotent)."""
+        return self.batch_put(postings, max_workers=4)
+
+    def iter_term(
+        self, user_id: str, term: str, page_size: int = 200
+    ) -> Iterator[dict[str, Any]]:
+        """Postings for exactly *term*, newest message first."""
+        return self.query_iter(
+            user_id,
+            sort_condition=Key("term_key").begins_with(f"{term}#"),
+            scan_forward=False,
+            page_size=page_size,
+            prefetch=False,
+        )
+
+    def iter_longer_terms(
+        self, user_id: str, term: str, page_size: int = 200
+    ) -> Iterator[dict[str, Any]]:
+        """Postings for the longer terms that start with *term*.
+
+        ``pain`` finds ``painkiller``. Ordered by term, then newest message
+        first.
+        """
+        return self.query_iter(
+            user_id,
+            sort_condition=Key("term_key").between(f"{term}$", f"{term}\U0010ffff"),
+            scan_forward=False,
+            page_size=page_size,
+            prefetch=False,
+        )
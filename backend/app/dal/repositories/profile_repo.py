@@ -16,6 +16,7 @@ class ProfileRepository(BaseRepository):
     CONFIG = RepositoryConfig(
         table_name="MemberProfiles",
         partition_key="user_id",
+        cache_ttl_seconds=30,
     )
 
     def __init__(self, dynamodb_resource: Any, table_prefix: str = "") -> None:
@@ -24,4 +25,4 @@ class ProfileRepository(BaseRepository):
     def batch_get_by_user_ids(self, user_ids: list[str]) -> list[dict[str, Any]]:
         """Batch fetch profiles for multiple users."""
         keys = [{"user_id": uid} for uid in user_ids]
-        return self.batch_get(keys)
+        return self.batch_get(keys).items
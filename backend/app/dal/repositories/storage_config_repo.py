@@ -16,6 +16,7 @@ class StorageConfigRepository(BaseRepository):
     CONFIG = RepositoryConfig(
         table_name="StorageConfig",
         partition_key="user_id",
+        cache_ttl_seconds=60,
     )
 
     def __init__(self, dynamodb_resource: Any, table_prefix: str = "") -> None:
@@ -0,0 +1,65 @@
+"""TokenUsageRepository — DynamoDB access for TokenUsage table."""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+from app.dal.base import BaseRepository, RepositoryConfig
+from app.dal.pagination import PaginatedResult
+
+
+class TokenUsageRepository(BaseRepository):
+    """Repository for the TokenUsage table.
+
+    Key schema: scope (HASH), period (RANGE)
+
+    ``scope`` is ``user#<user_id>`` or ``family#<family_id>``; ``period`` is
+    ``all`` or a ``YYYY-MM`` month. Every attribute other than the keys and
+    ``updated_at`` is a counter incremented atomically with ``ADD``.
+    """
+
+    CONFIG = RepositoryConfig(
+        table_name="TokenUsage",
+        partition_key="scope",
+        sort_key="period",
+    )
+
+    def __init__(self, dynamodb_resource: Any, table_prefix: str = "") -> None:
+        super().__init__(self.CONFIG, dynamodb_resource, table_prefix)
+
+    def add_usage(self, scope: str, period: str, counters: dict[str, int]) -> None:
+        """Atomically add *counters* to the (scope, period) row, creating it."""
+        if not counters:
+            return
+        key = {"scope": scope, "period": period}
+        names: dict[str, str] = {"#updated": "updated_at"}
+        values: dict[str, Any] = {":updated": datetime.now(timezone.utc).isoformat()}
+        adds: list[str] = []
+        for i, (name, amount) in enumerate(counters.items()):
+            names[f"#c{i}"] = name
+            values[f":c{i}"] = int(amount)
+            adds.append(f"#c{i} :c{i}")
+
+        start = time.monotonic()
+        try:
+            self._call(
+                self._table.update_item,
+                Key=key,
+                UpdateExpression="ADD " + ", ".join(adds) + " SET #updated = :updated",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+        except ClientError as exc:
+            self._translate_client_error(exc, "add_usage", key)
+        finally:
+            self._log_timing("add_usage", start)
+
+    def query_by_scope(
+        self, scope: str, limit: int = 24, cursor: str | None = None
+    ) -> PaginatedResult[dict[str, Any]]:
+        """List the all-time row, then monthly rows newest first."""
+        return self.query(scope, limit=limit, cursor=cursor, scan_forward=False)
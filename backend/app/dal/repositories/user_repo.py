@@ -22,6 +22,7 @@ class UserRepository(BaseRepository):
             GSIConfig(index_name="email-index", partition_key="email"),
             GSIConfig(index_name="cognito_sub-index", partition_key="cognito_sub"),
         ],
+        cache_ttl_seconds=30,
     )
 
     def __init__(self, dynamodb_resource: Any, table_prefix: str = "") -> None:
@@ -39,6 +40,6 @@ class UserRepository(BaseRepository):
 
     def list_all(self, limit: int = 100) -> PaginatedResult[dict[str, Any]]:
         """Scan all users (admin use only). Capped to limit."""
-        result = self._table.scan(Limit=limit)
+        result = self._call(self._table.scan, Limit=limit)
         items = result.get("Items", [])
         return PaginatedResult(items=items, next_cursor=None, count=len(items))
@@ -0,0 +1,148 @@
+"""Parallel segmented table scans.
+
+DynamoDB can split a scan into ``TotalSegments`` disjoint segments that are
+read independently. ``parallel_scan`` keeps one page request in flight per
+segment (bounded by ``max_workers``) and yields items as pages arrive, so a
+full-table read costs roughly one segment's worth of round trips and never
+holds more than a few pages in memory.
+
+Works on a plain boto3 ``Table`` so migration scripts can use it directly;
+repositories expose it as ``BaseRepository.parallel_scan``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator
+
+from app.dal.projection import projection_kwargs
+from app.dal.throttle import AdaptiveRateLimiter, RetryPolicy, send_with_retry
+
+DEFAULT_SEGMENTS = 4
+SCAN_RETRIES = 5
+
+
+class _CapacityBudget:
+    """Hold back new page requests while consumption runs ahead of *rate*.
+
+    Consumption is only known once a page returns, so with several pages in
+    flight the limit is approximate.
+    """
+
+    def __init__(self, units_per_second: float) -> None:
+        self._rate = units_per_second
+        self._started = time.monotonic()
+        self._consumed = 0.0
+
+    def consume(self, units: float) -> None:
+        self._consumed += units
+
+    def wait(self) -> None:
+        delay = self._consumed / self._rate - (time.monotonic() - self._started)
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _scan_page(
+    table: Any,
+    kwargs: dict[str, Any],
+    retry: RetryPolicy,
+    limiter: AdaptiveRateLimiter | None,
+) -> tuple[list[dict[str, Any]], dict[str, Any] | None, float]:
+    page = send_with_retry(table.scan, kwargs, retry, limiter)
+    consumed = page.get("ConsumedCapacity", {}).get("CapacityUnits", 0)
+    return page.get("Items", []), page.get("LastEvaluatedKey"), float(consumed)
+
+
+def parallel_scan(
+    table: Any,
+    total_segments: int = DEFAULT_SEGMENTS,
+    max_workers: int | None = None,
+    filter_expression: Any | None = None,
+    projection: Iterable[str] | None = None,
+    page_size: int | None = None,
+    max_capacity_per_second: float | None = None,
+    on_consumed: Callable[[float], None] | None = None,
+    retry: RetryPolicy | None = None,
+    limiter: AdaptiveRateLimiter | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield every item in *table*, scanning its segments concurrently.
+
+    Args:
+        total_segments: Number of segments to split the table into.
+        max_workers: Pages fetched at once; defaults to *total_segments*.
+        filter_expression: A boto3 condition (``Attr(...)``) applied
+            server-side. Filtered pages still consume read capacity.
+        projection: Top-level attribute names to return.
+        page_size: ``Limit`` for each page request.
+        max_capacity_per_second: Approximate read-capacity budget; new page
+            requests wait while consumption is ahead of it.
+        on_consumed: Called with the capacity units of each page.
+        retry: Backoff for throttled pages; ``SCAN_RETRIES`` retries by
+            default.
+        limiter: The table's adaptive rate limiter, if any.
+
+    Items arrive in no particular order. Throttled pages are retried with
+    backoff; other errors (and throttling that outlasts the retries)
+    propagate as ``ClientError``. Closing the generator early abandons the
+    remaining segments.
+    """
+    if total_segments < 1:
+        raise ValueError("total_segments must be at least 1")
+    if retry is None:
+        retry = RetryPolicy(max_attempts=SCAN_RETRIES)
+
+    base_kwargs: dict[str, Any] = {}
+    if filter_expression is not None:
+        base_kwargs["FilterExpression"] = filter_expression
+    if projection:
+        base_kwargs.update(projection_kwargs(projection))
+    if page_size:
+        base_kwargs["Limit"] = page_size
+    budget = None
+    if max_capacity_per_second:
+        budget = _CapacityBudget(max_capacity_per_second)
+    if budget is not None or on_consumed is not None:
+        base_kwargs["ReturnConsumedCapacity"] = "TOTAL"
+
+    def fetch(segment: int, start_key: dict[str, Any] | None):
+        kwargs = dict(base_kwargs)
+        if "ExpressionAttributeNames" in kwargs:
+            # boto3 merges the filter's generated names into this dict.
+            names = kwargs["ExpressionAttributeNames"]
+            kwargs["ExpressionAttributeNames"] = dict(names)
+        if total_segments > 1:
+            kwargs["Segment"] = segment
+            kwargs["TotalSegments"] = total_segments
+        if start_key is not None:
+            kwargs["ExclusiveStartKey"] = start_key
+        return _scan_page(table, kwargs, retry, limiter)
+
+    workers = max(1, min(max_workers or total_segments, total_segments))
+    queued: deque[tuple[int, dict[str, Any] | None]] = deque(
+        (segment, None) for segment in range(total_segments)
+    )
+    in_flight: dict[Future, int] = {}
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dal-scan")
+    try:
+        while queued or in_flight:
+            while queued and len(in_flight) < workers:
+                if budget is not None:
+                    budget.wait()
+                segment, start_key = queued.popleft()
+                in_flight[executor.submit(fetch, segment, start_key)] = segment
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                segment = in_flight.pop(future)
+                items, last_key, consumed = future.result()
+                if budget is not None:
+                    budget.consume(consumed)
+                if on_consumed is not None:
+                    on_consumed(consumed)
+                if last_key is not None:
+                    queued.append((segment, last_key))
+                yield from items
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
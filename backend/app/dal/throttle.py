@@ -0,0 +1,316 @@
+"""Client-side rate limiting and retries for throttled DynamoDB calls.
+
+Every repository call goes through the table's ``AdaptiveRateLimiter`` and
+is retried per the repository's ``RetryPolicy`` when DynamoDB throttles it
+or fails transiently (5xx, timeouts, dropped connections), so a burst shows
+up as extra latency rather than ``ThrottlingError``. The DAL's DynamoDB
+resource makes one attempt per call (:func:`app.aws.dal_dynamodb_resource`),
+so this is its only retry layer.
+
+The limiter is a token bucket whose refill rate follows AIMD. It lets
+everything through until the table is first throttled; from then on each
+throttle signal (a throttling error or unprocessed batch items) halves the
+rate and each success adds back a little, about ``increase`` requests per
+second for every second of traffic. Once the rate climbs back to
+``max_rate`` the limiter switches off again.
+
+Limiters are per process and per table: every repository (and every app)
+using a table shares one, so all operations on it back off together. The
+``RateLimitPolicy`` is therefore per table too, and repositories that
+configure different policies for the same table are rejected.
+Their throttle and wait counts and current rate are exported on
+``/metrics`` as ``homeagent_dal_rate_limit_*``.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+from botocore.exceptions import ClientError, ConnectionError, HTTPClientError
+
+from app.dal.batch import THROTTLE_CODES
+from app.dal.metrics import DAL_METRICS, Sample
+
+_R = TypeVar("_R")
+
+# What botocore's standard retry mode treats as transient.
+TRANSIENT_CODES = frozenset(
+    {"RequestTimeout", "RequestTimeoutException", "PriorRequestNotComplete"}
+)
+TRANSIENT_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long to back off from throttled requests."""
+
+    # Retries after the first attempt; 0 disables retrying.
+    max_attempts: int = 3
+    base_seconds: float = 0.05
+    cap_seconds: float = 1.0
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for retry *attempt* (0-based)."""
+        return random.uniform(0, min(self.cap_seconds, self.base_seconds * 2**attempt))
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Bounds and step sizes for a table's adaptive rate limiter."""
+
+    max_rate: float = 500.0
+    min_rate: float = 5.0
+    # Requests/second regained per second of successful traffic.
+    increase: float = 2.0
+    # Factor applied to the rate on a throttle signal.
+    decrease: float = 0.5
+    # Bucket size, in seconds' worth of the current rate.
+    burst_seconds: float = 1.0
+    # Throttle signals closer together than this count as one.
+    cooldown_seconds: float = 0.2
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate is adjusted by throttle signals."""
+
+    def __init__(
+        self,
+        policy: RateLimitPolicy = RateLimitPolicy(),
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.policy = policy
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._active = False
+        self._rate = policy.max_rate
+        self._tokens = 0.0
+        self._refilled_at = clock()
+        self._last_decrease = float("-inf")
+        # Observed send rate, used as the starting point on activation.
+        self._window_start = self._refilled_at
+        self._window_count = 0
+        self._observed_rate = 0.0
+        self._throttles = 0
+        self._waits = 0
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    @property
+    def rate(self) -> float | None:
+        """Current requests/second, or None while not limiting."""
+        return self._rate if self._active else None
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        with self._lock:
+            now = self._clock()
+            self._count(now)
+            if not self._active:
+                return
+            self._refill(now)
+            self._tokens -= 1
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            if delay:
+                self._waits += 1
+        if delay:
+            self._sleep(delay)
+
+    def on_success(self) -> None:
+        with self._lock:
+            if not self._active:
+                return
+            self._rate += self.policy.increase / self._rate
+            if self._rate >= self.policy.max_rate:
+                self._active = False
+                self._rate = self.policy.max_rate
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._throttles += 1
+            if now - self._last_decrease < self.policy.cooldown_seconds:
+                return
+            self._last_decrease = now
+            if self._active:
+                self._refill(now)
+                base = self._rate
+            else:
+                elapsed = max(now - self._window_start, 1.0)
+                base = max(self._observed_rate, self._window_count / elapsed)
+                self._active = True
+                self._refilled_at = now
+                self._tokens = 0.0
+            self._rate = min(
+                self.policy.max_rate,
+                max(self.policy.min_rate, base * self.policy.decrease),
+            )
+            self._tokens = min(self._tokens, self._capacity())
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "active": self._active,
+                "rate": round(self._rate, 2) if self._active else None,
+                "throttles": self._throttles,
+                "waits": self._waits,
+            }
+
+    def _capacity(self) -> float:
+        return max(1.0, self._rate * self.policy.burst_seconds)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._tokens = min(self._capacity(), self._tokens + elapsed * self._rate)
+
+    def _count(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self._observed_rate = self._window_count / elapsed
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+
+
+_LIMITERS: dict[str, AdaptiveRateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def limiter_for(table_name: str, policy: RateLimitPolicy) -> AdaptiveRateLimiter:
+    """The process-wide limiter for *table_name* (created with *policy*).
+
+    Raises ``ValueError`` if the table's limiter has a different policy.
+    """
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(table_name)
+        if limiter is None:
+            limiter = _LIMITERS[table_name] = AdaptiveRateLimiter(policy)
+        elif limiter.policy != policy:
+            raise ValueError(
+                f"Table {table_name} is already rate limited with "
+                f"{limiter.policy}, not {policy}"
+            )
+        return limiter
+
+
+def limiter_stats() -> dict[str, dict[str, Any]]:
+    with _LIMITERS_LOCK:
+        limiters = dict(_LIMITERS)
+    return {table: limiter.stats() for table, limiter in limiters.items()}
+
+
+def limiter_samples() -> list[Sample]:
+    """:func:`limiter_stats` as Prometheus samples, labelled by table."""
+    samples: list[Sample] = []
+    prefix = "homeagent_dal_rate_limit"
+    for table, stats in sorted(limiter_stats().items()):
+        labels = {"table": table}
+        samples += [
+            (
+                f"{prefix}_throttles_total",
+                "counter",
+                "Throttle signals (errors or unprocessed batch items) per table.",
+                labels,
+                stats["throttles"],
+            ),
+            (
+                f"{prefix}_waits_total",
+                "counter",
+                "Requests the rate limiter delayed.",
+                labels,
+                stats["waits"],
+            ),
+            (
+                f"{prefix}_active",
+                "gauge",
+                "1 while the table's rate limiter is limiting.",
+                labels,
+                int(stats["active"]),
+            ),
+        ]
+        if stats["active"]:
+            samples.append(
+                (
+                    f"{prefix}_requests_per_second",
+                    "gauge",
+                    "Current allowed request rate of an active limiter.",
+                    labels,
+                    stats["rate"],
+                )
+            )
+    return samples
+
+
+DAL_METRICS.register_collector("dal_rate_limit", limiter_samples)
+
+
+def reset_limiters() -> None:
+    """Forget every table's limiter state (tests)."""
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
+
+
+def is_throttle(exc: ClientError) -> bool:
+    return exc.response["Error"]["Code"] in THROTTLE_CODES
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Whether a failed call may succeed if sent again."""
+    if isinstance(exc, (ConnectionError, HTTPClientError)):
+        return True
+    if not isinstance(exc, ClientError):
+        return False
+    status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return (
+        is_throttle(exc)
+        or exc.response["Error"]["Code"] in TRANSIENT_CODES
+        or status in TRANSIENT_STATUS_CODES
+    )
+
+
+def send(
+    fn: Callable[..., _R],
+    kwargs: dict[str, Any],
+    limiter: AdaptiveRateLimiter | None,
+) -> _R:
+    """Call ``fn(**kwargs)`` through *limiter*, reporting the outcome to it."""
+    if limiter is None:
+        return fn(**kwargs)
+    limiter.acquire()
+    try:
+        result = fn(**kwargs)
+    except ClientError as exc:
+        if is_throttle(exc):
+            limiter.on_throttle()
+        raise
+    limiter.on_success()
+    return result
+
+
+def send_with_retry(
+    fn: Callable[..., _R],
+    kwargs: dict[str, Any],
+    retry: RetryPolicy,
+    limiter: AdaptiveRateLimiter | None = None,
+) -> _R:
+    """:func:`send`, retrying throttled and transient failures per *retry*.
+
+    The last error propagates once retries run out.
+    """
+    attempt = 0
+    while True:
+        try:
+            return send(fn, kwargs, limiter)
+        except (ClientError, ConnectionError, HTTPClientError) as exc:
+            if not is_retryable(exc) or attempt >= retry.max_attempts:
+                raise
+        time.sleep(retry.delay(attempt))
+        attempt += 1
@@ -1,5 +1,6 @@
-import boto3
-from flask import Flask, g, current_app
+from flask import Flask, current_app
+
+from app import aws
 
 TABLE_DEFINITIONS = {
     "Users": {
@@ -91,6 +92,15 @@ TABLE_DEFINITIONS = {
             {"AttributeName": "family_id", "AttributeType": "S"},
             {"AttributeName": "user_id", "AttributeType": "S"},
         ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "user_id-index",
+                "KeySchema": [
+                    {"AttributeName": "user_id", "KeyType": "HASH"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
     },
     "Conversations": {
         "KeySchema": [{"AttributeName": "conversation_id", "KeyType": "HASH"}],
@@ -309,18 +319,32 @@ TABLE_DEFINITIONS = {
             {"AttributeName": "family_id", "AttributeType": "S"},
         ],
     },
+    "TokenUsage": {
+        "KeySchema": [
+            {"AttributeName": "scope", "KeyType": "HASH"},
+            {"AttributeName": "period", "KeyType": "RANGE"},
+        ],
+        "AttributeDefinitions": [
+            {"AttributeName": "scope", "AttributeType": "S"},
+            {"AttributeName": "period", "AttributeType": "S"},
+        ],
+    },
+    "MessageSearchIndex": {
+        "KeySchema": [
+            {"AttributeName": "user_id", "KeyType": "HASH"},
+            {"AttributeName": "term_key", "KeyType": "RANGE"},
+        ],
+        "AttributeDefinitions": [
+            {"AttributeName": "user_id", "AttributeType": "S"},
+            {"AttributeName": "term_key", "AttributeType": "S"},
+        ],
+    },
 }
 
 
 def get_dynamodb():
-    """Get DynamoDB resource, cached per-request on Flask g."""
-    if "dynamodb" not in g:
-        endpoint_url = current_app.config.get("DYNAMODB_ENDPOINT")
-        kwargs = {"region_name": current_app.config["AWS_REGION"]}
-        if endpoint_url:
-            kwargs["endpoint_url"] = endpoint_url
-        g.dynamodb = boto3.resource("dynamodb", **kwargs)
-    return g.dynamodb
+    """Get the worker's shared DynamoDB resource for the current app."""
+    return aws.dynamodb_resource(current_app.config)
 
 
 def get_table(table_name: str):
@@ -330,14 +354,13 @@ def get_table(table_name: str):
 
 def _get_dynamo_resources(app: Flask):
     """Build boto3 DynamoDB resource + client from app config."""
-    region = app.config["AWS_REGION"]
-    endpoint_url = app.config.get("DYNAMODB_ENDPOINT")
-    kwargs = {"region_name": region}
-    if endpoint_url:
-        kwargs["endpoint_url"] = endpoint_url
     return (
-        boto3.resource("dynamodb", **kwargs),
-        boto3.client("dynamodb", **kwargs),
+        aws.dynamodb_resource(app.config),
+        aws.client(
+            "dynamodb",
+            region_name=app.config["AWS_REGION"],
+            endpoint_url=app.config.get("DYNAMODB_ENDPOINT"),
+        ),
     )
 
 
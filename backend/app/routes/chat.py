@@ -1,4 +1,5 @@
 import json
+import logging
 import threading
 from typing import Generator
 
@@ -13,19 +14,49 @@ from flask import (
 )
 
 from app.auth import require_auth
+from app.services.agent_runtime import AgentRuntimeBusy, get_agent_runtime
 from app.services.bedrock import stream_chat
 from app.services.chat_media import resolve_media_for_message
+from app.services.family import get_cached_family_id, is_family_feature_enabled
 from app.services.transcribe import transcribe_audio
+from app.services.usage import record_message_usage
 from app.services.conversation import (
     add_message,
     create_conversation,
     get_conversation,
     get_messages,
+    index_stored_message,
 )
 
 chat_bp = Blueprint("chat", __name__)
 
 
+@chat_bp.teardown_request
+def _release_agent_reservation(exc):
+    """Free an admission slot the orchestrator never took ownership of."""
+    reservation = g.pop("agent_reservation", None)
+    if reservation is not None:
+        reservation.release()
+
+
+def _record_usage(user_id: str, usage: dict) -> None:
+    """Add a message's usage to the user/family counters (best effort)."""
+    try:
+        record_message_usage(user_id, get_cached_family_id(user_id), usage)
+    except Exception:
+        logging.getLogger(__name__).warning(
+            "Failed to record token usage for user %s", user_id, exc_info=True
+        )
+
+
+def _uses_agent_runtime() -> bool:
+    """True when /api/chat streams through the local agent orchestrator."""
+    return bool(
+        current_app.config.get("USE_AGENT_ORCHESTRATOR")
+        and not current_app.config.get("AGENTCORE_RUNTIME_ARN")
+    )
+
+
 def _get_chat_stream(
     messages: list[dict],
     user_id: str,
@@ -72,7 +103,12 @@ def _stream_via_agentcore(
     from app.services.agentcore_memory import AgentCoreMemoryManager
     from app.services.agentcore_runtime import AgentCoreRuntimeClient
     from app.services.agent_management import AgentManagementClient
-    from app.services.agent_orchestrator import _build_system_prompt
+    from app.services.agent_orchestrator import (
+        _build_system_prompt,
+        _prompt_context_tasks,
+    )
+    from app.services.prompt_context import configured_budget, fan_out
+    from app.services.usage import GenerationTimer, build_usage, usage_from_bedrock
 
     logger = logging.getLogger(__name__)
     cfg = Config()
@@ -90,15 +126,13 @@ def _stream_via_agentcore(
         region=cfg.AWS_REGION,
     )
 
-    # Resolve sub-agent tools
-    sub_agent_tool_ids = agent_mgmt.build_sub_agent_tool_ids(user_id)
-
-    # Build memory config
     family_id = getattr(g, "family_id", None)
-    memory_config = None
-    if family_id:
+
+    def _build_memory_config():
+        if not family_id:
+            return None
         try:
-            memory_config = memory_manager.create_combined_session_manager(
+            return memory_manager.create_combined_session_manager(
                 family_id=family_id,
                 member_id=user_id,
                 session_id=conversation_id or "",
@@ -110,6 +144,15 @@ def _stream_via_agentcore(
                 user_id,
                 exc_info=True,
             )
+            return None
+
+    # Resolve sub-agent tools, memory config and prompt sections concurrently
+    context_tasks = _prompt_context_tasks(user_id)
+    context_tasks["sub_agent_tool_ids"] = lambda: agent_mgmt.build_sub_agent_tool_ids(
+        user_id
+    )
+    context_tasks["memory_config"] = _build_memory_config
+    context = fan_out(context_tasks, configured_budget())
 
     # Create or resume session
     session_id = conversation_id or "ephemeral"
@@ -119,19 +162,21 @@ def _stream_via_agentcore(
             "SYSTEM_PROMPT",
             "You are a helpful family assistant. Be warm, friendly, and supportive.",
         )
-        personalized_prompt = _build_system_prompt(user_id, base_prompt)
+        personalized_prompt = _build_system_prompt(user_id, base_prompt, context)
         session = runtime_client.create_session(
             session_id=session_id,
             user_id=user_id,
             family_id=family_id or "",
             system_prompt=personalized_prompt,
-            memory_config=memory_config,
-            sub_agent_tool_ids=sub_agent_tool_ids,
+            memory_config=context.get("memory_config"),
+            sub_agent_tool_ids=context.get("sub_agent_tool_ids", []),
         )
 
     # Invoke and stream — yield same format as stream_chat
     user_message = messages[-1]["content"] if messages else ""
     full_text = ""
+    tokens = usage_from_bedrock(None)
+    timer = GenerationTimer()
 
     for event in runtime_client.invoke_session(
         session_id=session_id,
@@ -140,7 +185,10 @@ def _stream_via_agentcore(
     ):
         if event.type == "text_delta":
             full_text += event.content
+            timer.mark_token()
             yield {"type": "text_delta", "content": event.content}
+        elif event.type == "message_done":
+            tokens = event.data.get("usage") or tokens
         elif event.type == "error":
             yield {"type": "error", "content": event.content}
             return
@@ -148,8 +196,9 @@ def _stream_via_agentcore(
     yield {
         "type": "message_done",
         "content": full_text,
-        "input_tokens": 0,
-        "output_tokens": 0,
+        "input_tokens": tokens["input_tokens"],
+        "output_tokens": tokens["output_tokens"],
+        "usage": build_usage(tokens, timer),
     }
 
 
@@ -238,21 +287,44 @@ def chat():
         conv = create_conversation(user_id=g.user_id, title=title)
         conversation_id = conv["conversation_id"]
 
-    # Store user message
-    add_message(
-        conversation_id=conversation_id,
-        role="user",
-        content=user_message,
-        media=media_metadata,
-    )
+    # Admit the agent run before storing the message so an overloaded
+    # worker answers 429 instead of queueing behind running agents.
+    if _uses_agent_runtime():
+        try:
+            g.agent_reservation = get_agent_runtime().reserve()
+        except AgentRuntimeBusy as e:
+            return jsonify({"error": str(e)}), 429, {"Retry-After": "5"}
+
+    # Store user message. Its index postings (up to a few hundred writes)
+    # and vector chunks are written after the response has streamed, not
+    # before the model call.
+    user_id = g.user_id
+    unindexed = [
+        add_message(
+            conversation_id=conversation_id,
+            role="user",
+            content=user_message,
+            media=media_metadata,
+            user_id=user_id,
+            index=False,
+        )
+    ]
 
     # Build message history for Bedrock
-    history = get_messages(conversation_id, limit=50)
+    history = get_messages(conversation_id, limit=50, projection=["role", "content"])
     messages = [
         {"role": m["role"], "content": m["content"]} for m in history["messages"]
     ]
 
     def generate():
+        try:
+            yield from _stream_events()
+        finally:
+            # Also runs when the client disconnects mid-stream.
+            for message in unindexed:
+                index_stored_message(user_id, message)
+
+    def _stream_events():
         full_content = ""
         total_tokens = 0
 
@@ -269,11 +341,16 @@ def chat():
                 )
                 yield f"data: {event_data}\n\n"
 
+            elif chunk["type"] == "tool_progress":
+                event_data = json.dumps({**chunk, "conversation_id": conversation_id})
+                yield f"data: {event_data}\n\n"
+
             elif chunk["type"] == "message_done":
                 full_content = chunk["content"]
                 total_tokens = chunk.get("input_tokens", 0) + chunk.get(
                     "output_tokens", 0
                 )
+                usage = chunk.get("usage")
 
                 # Store assistant message
                 msg = add_message(
@@ -282,10 +359,18 @@ def chat():
                     content=full_content,
                     model=request.json.get("model"),
                     tokens_used=total_tokens,
+                    usage=usage,
+                    user_id=g.user_id,
+                    index=False,
                 )
+                unindexed.append(msg)
+                if usage:
+                    _record_usage(g.user_id, usage)
 
                 # Fire-and-forget health extraction
-                if current_app.config.get("HEALTH_EXTRACTION_ENABLED"):
+                if current_app.config.get(
+                    "HEALTH_EXTRACTION_ENABLED"
+                ) and is_family_feature_enabled(g.user_id, "health_extraction_enabled"):
                     from app.services.health_extraction import (
                         extract_health_observations,
                     )
@@ -7,6 +7,7 @@ from app.services.conversation import (
     get_messages,
     list_conversations,
 )
+from app.services.message_search import search_messages, split_phrases
 
 conversations_bp = Blueprint("conversations", __name__)
 
@@ -21,6 +22,23 @@ def list_convos():
     return jsonify(result)
 
 
+@conversations_bp.route("/conversations/search", methods=["GET"])
+@require_auth
+def search_convos():
+    """Keyword search over the caller's messages.
+
+    ``q`` holds one or more comma-separated phrases; a message matches a
+    phrase when it contains every word of it (by prefix).
+    """
+    phrases = split_phrases(request.args.get("q", ""))
+    if not phrases:
+        return jsonify({"error": "q is required"}), 400
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 50)
+
+    results = search_messages(g.user_id, phrases, limit=limit)
+    return jsonify({"results": results})
+
+
 @conversations_bp.route("/conversations/<conversation_id>/messages", methods=["GET"])
 @require_auth
 def get_conv_messages(conversation_id: str):
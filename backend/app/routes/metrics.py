@@ -0,0 +1,28 @@
+"""Prometheus scrape endpoint for DAL metrics."""
+
+import hmac
+
+from flask import Blueprint, Response, current_app, request
+
+from app.auth import require_admin, require_auth
+from app.dal.metrics import DAL_METRICS, render_prometheus
+
+metrics_bp = Blueprint("metrics", __name__)
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _render() -> Response:
+    snapshot = DAL_METRICS.collect(current_app.config.get("METRICS_MULTIPROC_DIR"))
+    return Response(render_prometheus(snapshot), content_type=_CONTENT_TYPE)
+
+
+@metrics_bp.route("/metrics")
+def metrics():
+    """Scrapers authenticate with ``Bearer <METRICS_TOKEN>``; admins with
+    their usual token."""
+    token = current_app.config.get("METRICS_TOKEN")
+    header = request.headers.get("Authorization", "")
+    if token and hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+        return _render()
+    return require_auth(require_admin(_render))()
@@ -227,6 +227,7 @@ def oauth_callback(provider_id: str):
             ReturnValues="ALL_OLD",
         )
         state_item = resp.get("Attributes")
+        dal.oauth_state.invalidate({"state": state})
     except (
         dal.oauth_state._table.meta.client.exceptions.ConditionalCheckFailedException
     ):
@@ -0,0 +1,20 @@
+from flask import Blueprint, jsonify
+
+from app.auth import require_admin, require_auth
+from app.services.usage import get_usage
+
+usage_bp = Blueprint("usage", __name__)
+
+
+@usage_bp.route("/usage/users/<user_id>", methods=["GET"])
+@require_auth
+@require_admin
+def get_user_usage(user_id: str):
+    return jsonify({"user_id": user_id, "usage": get_usage("user", user_id)})
+
+
+@usage_bp.route("/usage/families/<family_id>", methods=["GET"])
+@require_auth
+@require_admin
+def get_family_usage(family_id: str):
+    return jsonify({"family_id": family_id, "usage": get_usage("family", family_id)})
@@ -82,6 +82,7 @@ def voice_ws(ws: "simple_websocket.Server") -> None:
                         conversation_id=conversation_id,
                         role=event.get("role", "assistant"),
                         content=event.get("content", ""),
+                        user_id=user_id,
                     )
         except Exception:
             logger.debug("Nova receive greenlet ended", exc_info=True)
@@ -135,6 +136,7 @@ def voice_ws(ws: "simple_websocket.Server") -> None:
                         conversation_id=conversation_id,
                         role="user",
                         content=content,
+                        user_id=user_id,
                     )
 
     except Exception:
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 
+from app.agents.tool_cache import invalidate_user_tools
 from app.dal import get_dal
 from app.services.agent_template import get_template_by_type, list_templates
 
@@ -63,7 +64,8 @@ def put_agent_config(
         "config": merged_config,
         "updated_at": now,
     }
-    dal.agent_configs._table.put_item(Item=item)
+    dal.agent_configs.put(item)
+    invalidate_user_tools(user_id)
     return item
 
 
@@ -75,8 +77,10 @@ def delete_agent_config(user_id: str, agent_type: str) -> bool:
             Key={"user_id": user_id, "agent_type": agent_type},
             ConditionExpression="attribute_exists(user_id)",
         )
-        return True
     except (
         dal.agent_configs._table.meta.client.exceptions.ConditionalCheckFailedException
     ):
         return False
+    dal.agent_configs.invalidate({"user_id": user_id, "agent_type": agent_type})
+    invalidate_user_tools(user_id)
+    return True
@@ -11,10 +11,20 @@ import logging
 import time
 from datetime import datetime, timezone
 
-import boto3
+from boto3.dynamodb.conditions import Attr
+from flask import has_app_context
 from ulid import ULID
 
+from app import aws
+from app.agents.tool_cache import invalidate_agent_type_tools, invalidate_user_tools
+from app.dal.scan import parallel_scan
 from app.models.agentcore import AgentConfig, AgentTemplate
+from app.services.template_catalog import (
+    TemplateCatalog,
+    bump_catalog_version,
+    get_template_catalog,
+    scan_templates,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -65,10 +75,9 @@ class AgentManagementClient:
     def __init__(self, region: str, endpoint_url: str | None = None) -> None:
         self._region = region
         self._endpoint_url = endpoint_url
-        kwargs: dict = {"region_name": region}
-        if endpoint_url:
-            kwargs["endpoint_url"] = endpoint_url
-        self._dynamodb = boto3.resource("dynamodb", **kwargs)
+        self._dynamodb = aws.resource(
+            "dynamodb", region_name=region, endpoint_url=endpoint_url
+        )
         self._templates_table = self._dynamodb.Table("AgentTemplates")
         self._configs_table = self._dynamodb.Table("AgentConfigs")
         # Cache for resolved sub-agent tool IDs: {user_id: (tool_ids, timestamp)}
@@ -151,17 +160,41 @@ class AgentManagementClient:
         )
         template.validate()
 
-        self._templates_table.put_item(Item=self._template_to_item(template))
+        item = self._template_to_item(template)
+        self._templates_table.put_item(Item=item)
+        version = bump_catalog_version(self._templates_table)
+        catalog = self._catalog()
+        if catalog is not None:
+            catalog.apply_put(item, version)
         return template
 
     def get_template(self, template_id: str) -> AgentTemplate | None:
-        """Get a single template by its primary key."""
+        """Get a single template by its primary key.
+
+        Inside a Flask app the read is served from the shared template
+        catalog, falling through to DynamoDB on a miss.
+        """
+        catalog = self._catalog()
+        if catalog is not None:
+            item = catalog.get(self._templates_table, template_id)
+            if item is not None:
+                return self._item_to_template(item)
         resp = self._templates_table.get_item(Key={"template_id": template_id})
         item = resp.get("Item")
+        if item and catalog is not None:
+            catalog.invalidate()
         return self._item_to_template(item) if item else None
 
     def get_template_by_type(self, agent_type: str) -> AgentTemplate | None:
-        """Look up a template by its agent_type slug via GSI."""
+        """Look up a template by its agent_type slug.
+
+        Served from the template catalog when available, else via the GSI.
+        """
+        catalog = self._catalog()
+        if catalog is not None:
+            item = catalog.get_by_type(self._templates_table, agent_type)
+            if item is not None:
+                return self._item_to_template(item)
         result = self._templates_table.query(
             IndexName="agent_type-index",
             KeyConditionExpression="agent_type = :at",
@@ -169,12 +202,18 @@ class AgentManagementClient:
             Limit=1,
         )
         items = result.get("Items", [])
+        if items and catalog is not None:
+            catalog.invalidate()
         return self._item_to_template(items[0]) if items else None
 
     def list_templates(self) -> list[AgentTemplate]:
         """Return all agent templates."""
-        result = self._templates_table.scan()
-        return [self._item_to_template(item) for item in result.get("Items", [])]
+        catalog = self._catalog()
+        if catalog is not None:
+            items = catalog.list(self._templates_table)
+        else:
+            items = scan_templates(self._templates_table)
+        return [self._item_to_template(item) for item in items]
 
     def get_available_templates(self, user_id: str) -> list[AgentTemplate]:
         """Return templates available to a specific user.
@@ -222,11 +261,16 @@ class AgentManagementClient:
             ReturnValues="ALL_NEW",
         )
         item = result.get("Attributes")
+        version = bump_catalog_version(self._templates_table)
         if item is None:
             return None
+        catalog = self._catalog()
+        if catalog is not None:
+            catalog.apply_put(item, version)
         # Template changes (especially available_to) can affect any user's
         # resolved tool set, so clear the entire tool cache.
         self._tool_cache.clear()
+        invalidate_agent_type_tools(item.get("agent_type"))
         return self._item_to_template(item)
 
     def delete_template(self, template_id: str) -> bool:
@@ -248,19 +292,24 @@ class AgentManagementClient:
         agent_type = template.agent_type
 
         # Cascade-delete all AgentConfigs referencing this agent_type
-        result = self._configs_table.scan(
-            FilterExpression="agent_type = :at",
-            ExpressionAttributeValues={":at": agent_type},
-        )
-        for item in result.get("Items", []):
+        for item in parallel_scan(
+            self._configs_table,
+            filter_expression=Attr("agent_type").eq(agent_type),
+            projection=["user_id", "agent_type"],
+        ):
             self._configs_table.delete_item(
                 Key={"user_id": item["user_id"], "agent_type": item["agent_type"]}
             )
 
         # Delete the template itself
         self._templates_table.delete_item(Key={"template_id": template_id})
+        version = bump_catalog_version(self._templates_table)
+        catalog = self._catalog()
+        if catalog is not None:
+            catalog.apply_delete(template_id, version)
         # Cascade-deleted configs invalidate tool resolution for affected users.
         self._tool_cache.clear()
+        invalidate_agent_type_tools(agent_type)
         return True
 
     # ------------------------------------------------------------------
@@ -469,11 +518,17 @@ class AgentManagementClient:
         recomputes the tool set.
         """
         self._tool_cache.pop(user_id, None)
+        invalidate_user_tools(user_id)
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _catalog() -> TemplateCatalog | None:
+        """Return the app's template catalog, or None outside Flask."""
+        return get_template_catalog() if has_app_context() else None
+
     @staticmethod
     def _is_available(template: AgentTemplate, user_id: str) -> bool:
         avail = template.available_to
@@ -1,17 +1,18 @@
-import asyncio
 import logging
-import queue
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Generator
+from typing import Any, Callable, Generator
 
-from flask import current_app
+from flask import current_app, g
 
+from app.services.agent_runtime import AgentRuntimeBusy, get_agent_runtime
 from app.services.bedrock import build_image_content_block
-from app.services.family import get_family_settings, get_user_family_id
+from app.services.family import is_family_feature_enabled
 from app.services.family_memory import get_family_shared_context
 from app.services.family_tree import build_family_context
 from app.services.profile import get_profile
+from app.services.prompt_context import configured_budget, fan_out
+from app.services.usage import GenerationTimer, build_usage, usage_from_bedrock
+from app.services.vector_index import is_vector_memory_enabled, recall
 
 logger = logging.getLogger(__name__)
 
@@ -20,24 +21,54 @@ def _is_web_search_enabled(user_id: str) -> bool:
     """Check if web search is enabled — server config AND family setting."""
     if not current_app.config.get("WEB_SEARCH_ENABLED", True):
         return False
-    family_id = get_user_family_id(user_id)
-    if not family_id:
-        return True  # No family yet, use server default
-    settings = get_family_settings(family_id)
-    return settings.get("web_search_enabled", True)
+    return is_family_feature_enabled(user_id, "web_search_enabled")
+
+
+def _prompt_context_tasks(user_id: str) -> dict[str, Callable[[], Any]]:
+    """Independent reads that feed the personalized system prompt."""
+    return {
+        "profile": lambda: get_profile(user_id),
+        "family_context": lambda: build_family_context(user_id),
+        "shared_context": lambda: get_family_shared_context(user_id),
+    }
+
+
+def _format_recall(snippets: list[dict]) -> str:
+    """Render recalled chunks from past conversations for the prompt."""
+    lines = [
+        "\nPossibly relevant excerpts from earlier conversations "
+        "(use them only if they help):"
+    ]
+    for s in snippets:
+        lines.append(
+            f"- [{s.get('created_at', '')[:10]}, {s.get('role', '')}] {s['text']}"
+        )
+    return "\n".join(lines)
+
 
-_executor = ThreadPoolExecutor(max_workers=4)
+def _build_system_prompt(
+    user_id: str, base_prompt: str, context: dict[str, Any] | None = None
+) -> str:
+    """Build a personalized system prompt by incorporating user profile data.
 
+    ``context`` holds pre-fetched sections from :func:`fan_out`; when omitted
+    the sections are fetched here. Sections that missed the latency budget
+    are simply left out of the prompt.
+    """
+    if context is None:
+        context = fan_out(_prompt_context_tasks(user_id), configured_budget())
 
-def _build_system_prompt(user_id: str, base_prompt: str) -> str:
-    """Build a personalized system prompt by incorporating user profile data."""
     parts = [base_prompt]
 
     # Always inject current time for temporal awareness
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC (%A)")
     parts.append(f"\nCurrent date and time: {now}.")
 
-    profile = get_profile(user_id)
+    recalled = context.get("recall")
+    if recalled:
+        parts.append(_format_recall(recalled))
+
+    profile = context.get("profile")
     if not profile:
         return " ".join(parts)
 
@@ -62,12 +93,12 @@ def _build_system_prompt(user_id: str, base_prompt: str) -> str:
         pref_str = ", ".join(f"{k}: {v}" for k, v in preferences.items())
         parts.append(f"Preferences: {pref_str}.")
 
-    family_ctx = build_family_context(user_id)
+    family_ctx = context.get("family_context")
     if family_ctx:
         parts.append(family_ctx)
 
     # Add family shared memory context
-    shared_ctx = get_family_shared_context(user_id)
+    shared_ctx = context.get("shared_context")
     if shared_ctx:
         parts.append(shared_ctx)
 
@@ -83,6 +114,24 @@ def _format_messages_for_agent(messages: list[dict]) -> list[dict]:
     return result
 
 
+def _tool_progress(stream_event: dict) -> dict | None:
+    """Turn a Strands ``tool_stream_event`` into a ``tool_progress`` chunk.
+
+    Only dict payloads are progress; the final string a sub-agent tool
+    yields is its result and goes back to the model, not the client.
+    """
+    data = stream_event.get("data")
+    if not isinstance(data, dict):
+        return None
+    tool_use = stream_event.get("tool_use") or {}
+    return {
+        "type": "tool_progress",
+        "tool_name": tool_use.get("name", ""),
+        "tool_use_id": tool_use.get("toolUseId", ""),
+        **data,
+    }
+
+
 def stream_agent_chat(
     messages: list[dict],
     user_id: str,
@@ -106,11 +155,16 @@ def stream_agent_chat(
         is_voice_message: Whether the current message originated from voice input.
 
     Yields:
-        Dicts with type "text_delta", "message_done", or "error".
+        Dicts with type "text_delta", "tool_progress", "message_done", or
+        "error". Sub-agent tools run concurrently and report progress as
+        "tool_progress" chunks while the orchestrator waits on them.
+
+    The run executes on the worker's shared agent runtime. A route that
+    already reserved an admission slot (to answer 429 before streaming)
+    hands it over via ``g.agent_reservation``; otherwise one is reserved
+    just before submitting.
     """
-    from strands import Agent
-    from strands.models import BedrockModel
-
+    from app.agents.model_pool import build_agent
     from app.agents.personal import build_sub_agent_tools
     from app.agents.search_tool import web_search
     from app.agents.time_tool import get_current_time
@@ -118,7 +172,28 @@ def stream_agent_chat(
 
     model_id = current_app.config["BEDROCK_MODEL_ID"]
     base_prompt = system_prompt or current_app.config["SYSTEM_PROMPT"]
-    personalized_prompt = _build_system_prompt(user_id, base_prompt)
+
+    # Issue every independent pre-model read concurrently under one budget.
+    # Anything that misses the deadline falls back to "not available".
+    context_tasks = _prompt_context_tasks(user_id)
+    context_tasks["web_search"] = lambda: _is_web_search_enabled(user_id)
+    if tools is None:
+        context_tasks["sub_agent_tools"] = lambda: build_sub_agent_tools(
+            user_id=user_id, model_id=model_id
+        )
+    if conversation_id:
+        context_tasks["session_manager"] = lambda: create_session_manager(
+            user_id, conversation_id
+        )
+    if messages and is_vector_memory_enabled():
+        # Past snippets similar to the new message; the current
+        # conversation is already in the history.
+        context_tasks["recall"] = lambda: recall(
+            user_id, messages[-1]["content"], exclude_conversation_id=conversation_id
+        )
+    context = fan_out(context_tasks, configured_budget())
+
+    personalized_prompt = _build_system_prompt(user_id, base_prompt, context)
 
     if is_voice_message:
         personalized_prompt += (
@@ -144,21 +219,13 @@ def stream_agent_chat(
         user_content.append({"text": user_message})
         user_message = user_content
 
-    # Create Strands Agent with BedrockModel
-    model = BedrockModel(
-        model_id=model_id,
-        streaming=True,
-        max_tokens=4096,
-        temperature=0.7,
-    )
-
     # Build sub-agent tools from user's agent configs
     if tools is None:
-        tools = build_sub_agent_tools(user_id=user_id, model_id=model_id)
+        tools = context.get("sub_agent_tools", [])
 
     # Add default tools (time + search) available to every agent session
     default_tools: list = [get_current_time]
-    if _is_web_search_enabled(user_id):
+    if context.get("web_search", False):
         default_tools.append(web_search)
     tools = default_tools + (tools or [])
 
@@ -170,80 +237,73 @@ def stream_agent_chat(
     )
     personalized_prompt += tool_hint
 
-    # Set up AgentCore Memory session manager if configured
-    session_manager = None
-    if conversation_id:
-        session_manager = create_session_manager(user_id, conversation_id)
+    # AgentCore Memory session manager, if configured and resolved in time
+    session_manager = context.get("session_manager")
 
-    q: queue.Queue[dict | None] = queue.Queue()
+    async def _run_agent(emit) -> None:
+        agent_kwargs: dict = {
+            "system_prompt": personalized_prompt,
+            "messages": list(history),
+        }
+        if session_manager is not None:
+            agent_kwargs["session_manager"] = session_manager
+        if tools:
+            agent_kwargs["tools"] = tools
 
-    async def _run_agent() -> None:
-        try:
-            agent_kwargs: dict = {
-                "model": model,
-                "system_prompt": personalized_prompt,
-                "messages": list(history),
-            }
-            if session_manager is not None:
-                agent_kwargs["session_manager"] = session_manager
-            if tools:
-                agent_kwargs["tools"] = tools
-
-            agent = Agent(**agent_kwargs)
-            async for event in agent.stream_async(user_message):
-                if "data" in event:
-                    q.put({"type": "text_delta", "content": event["data"]})
-        except Exception:
-            logger.exception("Agent streaming failed")
-            q.put(
-                {
-                    "type": "error",
-                    "content": "Failed to connect to AI service. Please try again.",
-                }
-            )
-        finally:
-            q.put(None)
-
-    def _thread_run() -> None:
-        loop = asyncio.new_event_loop()
+        agent = build_agent(
+            model_id, streaming=True, max_tokens=4096, temperature=0.7, **agent_kwargs
+        )
+        async for event in agent.stream_async(user_message):
+            if "data" in event:
+                await emit({"type": "text_delta", "content": event["data"]})
+            elif "tool_stream_event" in event:
+                progress = _tool_progress(event["tool_stream_event"])
+                if progress is not None:
+                    await emit(progress)
+            elif "result" in event:
+                await emit(
+                    {
+                        "type": "usage",
+                        "tokens": usage_from_bedrock(
+                            event["result"].metrics.accumulated_usage
+                        ),
+                    }
+                )
+
+    # Run on the shared agent loop; the runtime turns exceptions into an
+    # error event and releases the reservation when the run ends.
+    runtime = get_agent_runtime()
+    reservation = g.pop("agent_reservation", None)
+    if reservation is None:
         try:
-            loop.run_until_complete(_run_agent())
-        finally:
-            loop.close()
-
-    future = _executor.submit(_thread_run)
+            reservation = runtime.reserve()
+        except AgentRuntimeBusy as e:
+            yield {"type": "error", "content": str(e)}
+            return
+    timer = GenerationTimer()
+    job = runtime.submit(reservation, _run_agent)
 
     full_text = ""
-    input_tokens = 0
-    output_tokens = 0
-
-    while True:
-        try:
-            chunk = q.get(timeout=300)
-        except queue.Empty:
-            yield {"type": "error", "content": "Agent response timed out"}
-            break
-
-        if chunk is None:
-            break
+    tokens = usage_from_bedrock(None)
 
+    for chunk in job.events(idle_timeout=300):
         if chunk["type"] == "text_delta":
             full_text += chunk["content"]
+            timer.mark_token()
+            yield chunk
+        elif chunk["type"] == "tool_progress":
             yield chunk
+        elif chunk["type"] == "usage":
+            tokens = chunk["tokens"]
         elif chunk["type"] == "error":
             yield chunk
             break
 
-    # Wait for thread to finish and check for exceptions
-    try:
-        future.result(timeout=5)
-    except Exception:
-        logger.exception("Agent thread raised exception")
-
     if full_text:
         yield {
             "type": "message_done",
             "content": full_text,
-            "input_tokens": input_tokens,
-            "output_tokens": output_tokens,
+            "input_tokens": tokens["input_tokens"],
+            "output_tokens": tokens["output_tokens"],
+            "usage": build_usage(tokens, timer),
         }
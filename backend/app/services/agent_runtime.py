@@ -0,0 +1,324 @@
+"""Long-lived asyncio runtime for orchestrator agent runs.
+
+Each worker runs one event loop on a dedicated daemon thread. Agent runs
+are submitted to it as coroutines instead of spinning up a fresh event loop
+per request on a small thread pool:
+
+- ``reserve()`` admits a request up front. At most ``max_concurrency`` runs
+  execute at once and at most ``max_queue`` more may wait; anything beyond
+  that raises :class:`AgentRuntimeBusy` immediately so the route can answer
+  429 instead of queueing silently.
+- ``submit()`` schedules the run on the loop. The run waits for a
+  concurrency slot (up to ``queue_timeout`` seconds) and then pushes events
+  onto an ``asyncio.Queue``; :meth:`AgentJob.events` bridges that queue to
+  the synchronous SSE generator.
+- ``stats()`` exposes queue depth, active runs and admission wait times;
+  :func:`get_agent_runtime` also exports them on ``/metrics``.
+
+The loop thread starts lazily on first use and is restarted after a fork.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any
+
+from flask import current_app
+
+from app.dal.metrics import DAL_METRICS, Sample
+
+logger = logging.getLogger(__name__)
+
+# Events a job emits; ``None`` marks the end of the stream.
+Emit = Callable[[dict], Awaitable[None]]
+JobFn = Callable[[Emit], Awaitable[None]]
+
+BUSY_MESSAGE = "The assistant is busy right now. Please try again in a moment."
+
+
+class AgentRuntimeBusy(Exception):
+    """Raised when the runtime's admission queue is full."""
+
+
+class Reservation:
+    """A slot in the runtime's admission budget; release is idempotent."""
+
+    def __init__(self, runtime: AgentRuntime) -> None:
+        self._runtime = runtime
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._runtime._release()
+
+
+class AgentJob:
+    """Handle for a submitted run, consumed from a synchronous generator."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        events: asyncio.Queue,
+        task_future: Any,
+    ) -> None:
+        self._loop = loop
+        self._events = events
+        self._task_future = task_future
+
+    def events(self, idle_timeout: float = 300.0) -> Iterator[dict]:
+        """Yield events until the run finishes.
+
+        Yields an error event if no event arrives within *idle_timeout*.
+        Closing the iterator early (client disconnect) cancels the run.
+        """
+        finished = False
+        try:
+            while True:
+                get = asyncio.run_coroutine_threadsafe(self._events.get(), self._loop)
+                try:
+                    event = get.result(timeout=idle_timeout)
+                except FutureTimeoutError:
+                    get.cancel()
+                    yield {"type": "error", "content": "Agent response timed out"}
+                    return
+                if event is None:
+                    finished = True
+                    return
+                yield event
+        finally:
+            if not finished:
+                self.cancel()
+
+    def cancel(self) -> None:
+        self._task_future.cancel()
+
+    def result(self, timeout: float | None = None) -> None:
+        """Wait for the run's coroutine to finish."""
+        self._task_future.result(timeout=timeout)
+
+
+class AgentRuntime:
+    """One event loop thread running agent jobs under an admission limit."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        max_queue: int = 32,
+        queue_timeout: float = 30.0,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._pid: int | None = None
+
+        self._reserved = 0
+        self._active = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._queue_timeouts = 0
+        self._wait_count = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # -- admission -----------------------------------------------------
+
+    def reserve(self) -> Reservation:
+        """Claim an admission slot or raise :class:`AgentRuntimeBusy`."""
+        with self._lock:
+            if self._reserved >= self.max_concurrency + self.max_queue:
+                self._rejected += 1
+                raise AgentRuntimeBusy(BUSY_MESSAGE)
+            self._reserved += 1
+            self._admitted += 1
+        return Reservation(self)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._reserved -= 1
+
+    # -- execution -----------------------------------------------------
+
+    def submit(self, reservation: Reservation, job: JobFn) -> AgentJob:
+        """Run *job* on the loop once a concurrency slot is free.
+
+        *job* receives an ``emit`` coroutine function for pushing events.
+        Exceptions from the job become a generic error event. The
+        reservation is released when the run ends.
+        """
+        loop = self._ensure_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        queued_at = time.monotonic()
+
+        async def _run() -> None:
+            try:
+                await self._run_job(queued_at, job, events)
+            finally:
+                reservation.release()
+                events.put_nowait(None)
+
+        task_future = asyncio.run_coroutine_threadsafe(_run(), loop)
+        return AgentJob(loop, events, task_future)
+
+    async def _run_job(
+        self, queued_at: float, job: JobFn, events: asyncio.Queue
+    ) -> None:
+        assert self._semaphore is not None
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._queue_timeouts += 1
+            logger.warning(
+                "Agent run waited %.0fs for a slot, giving up", self.queue_timeout
+            )
+            await events.put({"type": "error", "content": BUSY_MESSAGE})
+            return
+
+        waited = time.monotonic() - queued_at
+        with self._lock:
+            self._active += 1
+            self._wait_count += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        try:
+            await job(events.put)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Agent streaming failed")
+            await events.put(
+                {
+                    "type": "error",
+                    "content": "Failed to connect to AI service. Please try again.",
+                }
+            )
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._semaphore.release()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def _serve() -> None:
+                asyncio.set_event_loop(loop)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                started.set()
+                loop.run_forever()
+
+            thread = threading.Thread(target=_serve, name="agent-runtime", daemon=True)
+            thread.start()
+            started.wait()
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            return loop
+
+    def shutdown(self) -> None:
+        """Stop the loop thread (used by tests)."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+
+    # -- metrics -------------------------------------------------------
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queue_depth": max(self._reserved - self._active, 0),
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "queue_timeouts": self._queue_timeouts,
+                "wait_avg_ms": (
+                    self._wait_total / self._wait_count * 1000
+                    if self._wait_count
+                    else 0.0
+                ),
+                "wait_max_ms": self._wait_max * 1000,
+            }
+
+    def samples(self) -> list[Sample]:
+        """This runtime's state as Prometheus samples."""
+        with self._lock:
+            series = [
+                ("active_runs", "gauge", "Agent runs executing.", self._active),
+                (
+                    "queue_depth",
+                    "gauge",
+                    "Admitted agent runs waiting for a slot.",
+                    max(self._reserved - self._active, 0),
+                ),
+                ("admitted_total", "counter", "Agent runs admitted.", self._admitted),
+                (
+                    "rejected_total",
+                    "counter",
+                    "Agent runs refused because the queue was full.",
+                    self._rejected,
+                ),
+                (
+                    "queue_timeouts_total",
+                    "counter",
+                    "Agent runs that gave up waiting for a slot.",
+                    self._queue_timeouts,
+                ),
+                (
+                    "started_total",
+                    "counter",
+                    "Agent runs that got a slot.",
+                    self._wait_count,
+                ),
+                (
+                    "queue_wait_seconds_total",
+                    "counter",
+                    "Time started agent runs spent waiting for a slot.",
+                    self._wait_total,
+                ),
+            ]
+        return [
+            (f"homeagent_agent_runtime_{name}", kind, help_text, {}, value)
+            for name, kind, help_text, value in series
+        ]
+
+
+def get_agent_runtime() -> AgentRuntime:
+    """Return the app's AgentRuntime, creating it on first use."""
+    runtime = current_app.extensions.get("agent_runtime")
+    if runtime is None:
+        cfg = current_app.config
+        runtime = current_app.extensions.setdefault(
+            "agent_runtime",
+            AgentRuntime(
+                max_concurrency=int(cfg.get("AGENT_MAX_CONCURRENCY", 16)),
+                max_queue=int(cfg.get("AGENT_MAX_QUEUE", 32)),
+                queue_timeout=float(cfg.get("AGENT_QUEUE_TIMEOUT_SECONDS", 30)),
+            ),
+        )
+        DAL_METRICS.register_collector("agent_runtime", runtime.samples)
+    return runtime
@@ -6,9 +6,13 @@ new agent types with custom system prompts at runtime.
 
 from datetime import datetime, timezone
 
+from boto3.dynamodb.conditions import Attr
 from ulid import ULID
 
+from app import aws
+from app.agents.tool_cache import invalidate_agent_type_tools
 from app.dal import get_dal
+from app.services.template_catalog import bump_catalog_version, get_template_catalog
 
 
 # Built-in agent definitions that get seeded as templates on startup
@@ -56,17 +60,10 @@ def seed_builtin_templates(app) -> None:
     Called during app initialization. Uses a standalone DynamoDB resource
     (not the Flask request-scoped one) since this runs outside requests.
     """
-    import boto3
-
-    region = app.config["AWS_REGION"]
-    endpoint_url = app.config.get("DYNAMODB_ENDPOINT")
-    kwargs = {"region_name": region}
-    if endpoint_url:
-        kwargs["endpoint_url"] = endpoint_url
-    dynamodb = boto3.resource("dynamodb", **kwargs)
-    table = dynamodb.Table("AgentTemplates")
+    table = aws.dynamodb_resource(app.config).Table("AgentTemplates")
 
     now = datetime.now(timezone.utc).isoformat()
+    changed = False
 
     for agent_type, info in _BUILTIN_AGENTS.items():
         # Check if template already exists for this agent_type via GSI
@@ -86,6 +83,7 @@ def seed_builtin_templates(app) -> None:
             if len(all_for_type) > 1:
                 for dup in all_for_type[1:]:
                     table.delete_item(Key={"template_id": dup["template_id"]})
+                changed = True
             continue
 
         # Use a deterministic template_id to prevent race condition duplicates
@@ -109,28 +107,51 @@ def seed_builtin_templates(app) -> None:
                 },
                 ConditionExpression="attribute_not_exists(template_id)",
             )
+            changed = True
         except Exception:
             pass  # Already exists (race condition with another worker)
 
+    if changed:
+        bump_catalog_version(table)
+
 
 def list_templates() -> list[dict]:
-    """Return all agent templates."""
+    """Return all agent templates (served from the template catalog)."""
     dal = get_dal()
-    result = dal.agent_templates._table.scan()
-    return result.get("Items", [])
+    return get_template_catalog().list(dal.agent_templates._table)
 
 
 def get_template(template_id: str) -> dict | None:
-    """Get a single template by its primary key."""
+    """Get a single template by its primary key.
+
+    Served from the template catalog. A miss falls through to DynamoDB so a
+    template just created by another worker is visible before the catalog's
+    next version check.
+    """
     dal = get_dal()
-    return dal.agent_templates.get_by_id({"template_id": template_id})
+    catalog = get_template_catalog()
+    template = catalog.get(dal.agent_templates._table, template_id)
+    if template is None:
+        template = dal.agent_templates.get_by_id({"template_id": template_id})
+        if template is not None:
+            catalog.invalidate()
+    return template
 
 
 def get_template_by_type(agent_type: str) -> dict | None:
-    """Look up a template by its agent_type slug via GSI."""
+    """Look up a template by its agent_type slug.
+
+    Served from the template catalog; a miss falls through to the GSI.
+    """
     dal = get_dal()
-    result = dal.agent_templates.query_by_agent_type(agent_type)
-    return result.items[0] if result.items else None
+    catalog = get_template_catalog()
+    template = catalog.get_by_type(dal.agent_templates._table, agent_type)
+    if template is None:
+        result = dal.agent_templates.query_by_agent_type(agent_type)
+        template = result.items[0] if result.items else None
+        if template is not None:
+            catalog.invalidate()
+    return template
 
 
 def create_template(
@@ -166,7 +187,9 @@ def create_template(
         "created_at": now,
         "updated_at": now,
     }
-    dal.agent_templates._table.put_item(Item=item)
+    table = dal.agent_templates._table
+    dal.agent_templates.put(item)
+    get_template_catalog().apply_put(item, bump_catalog_version(table))
     return item
 
 
@@ -200,14 +223,21 @@ def update_template(template_id: str, **updates) -> dict | None:
         attr_values[val_placeholder] = value
 
     dal = get_dal()
-    result = dal.agent_templates._table.update_item(
+    table = dal.agent_templates._table
+    result = table.update_item(
         Key={"template_id": template_id},
         UpdateExpression="SET " + ", ".join(update_parts),
         ExpressionAttributeNames=attr_names,
         ExpressionAttributeValues=attr_values,
         ReturnValues="ALL_NEW",
     )
-    return result.get("Attributes")
+    updated = result.get("Attributes")
+    dal.agent_templates.invalidate({"template_id": template_id})
+    version = bump_catalog_version(table)
+    if updated is not None:
+        get_template_catalog().apply_put(updated, version)
+    invalidate_agent_type_tools(template["agent_type"])
+    return updated
 
 
 def delete_template(template_id: str) -> bool:
@@ -226,17 +256,20 @@ def delete_template(template_id: str) -> bool:
 
     # Cascade-delete all AgentConfigs referencing this agent_type
     dal = get_dal()
-    configs_result = dal.agent_configs._table.scan(
-        FilterExpression="agent_type = :at",
-        ExpressionAttributeValues={":at": agent_type},
-    )
-    for item in configs_result.get("Items", []):
-        dal.agent_configs._table.delete_item(
-            Key={"user_id": item["user_id"], "agent_type": item["agent_type"]}
+    config_keys = list(
+        dal.agent_configs.parallel_scan(
+            filter_expression=Attr("agent_type").eq(agent_type),
+            projection=["user_id", "agent_type"],
         )
+    )
+    dal.agent_configs.batch_delete(config_keys)
 
     # Delete the template itself
     dal.agent_templates.delete({"template_id": template_id})
+    get_template_catalog().apply_delete(
+        template_id, bump_catalog_version(dal.agent_templates._table)
+    )
+    invalidate_agent_type_tools(agent_type)
     return True
 
 
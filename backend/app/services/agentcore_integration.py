@@ -245,7 +245,7 @@ def stream_agent_chat_v2(
 
     # Step 5: Persist and finalize
     if full_text:
-        add_message(conversation_id, "assistant", full_text)
+        add_message(conversation_id, "assistant", full_text, user_id=user_id)
         yield {
             "type": "message_done",
             "content": full_text,
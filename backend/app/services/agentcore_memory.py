@@ -19,8 +19,7 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-import boto3
-
+from app import aws
 from app.models.agentcore import (
     CombinedSessionManager,
     FamilyMemoryRecord,
@@ -73,7 +72,7 @@ class AgentCoreMemoryManager:
     def _get_client(self) -> Any:
         """Return the bedrock-agentcore data plane client."""
         if self._client is None and self._region:
-            self._client = boto3.client("bedrock-agentcore", region_name=self._region)
+            self._client = aws.client("bedrock-agentcore", region_name=self._region)
         return self._client
 
     @property
@@ -14,7 +14,10 @@ import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
+from flask import current_app
+
 from app.services.agentcore_memory import AgentCoreMemoryManager
+from app.services.prompt_context import configured_budget
 
 logger = logging.getLogger(__name__)
 
@@ -98,7 +101,11 @@ def get_performance_config() -> dict[str, Any]:
     """Return the performance configuration summary.
 
     Documents the caching and parallelism settings used across the system.
+    Tunable settings are read from the app config (so this needs an app
+    context) and match what the running worker uses.
     """
+    cfg = current_app.config
+    runtime = current_app.extensions.get("agent_runtime")
     return {
         "memory_retrieval": {
             "parallel": True,
@@ -115,4 +122,17 @@ def get_performance_config() -> dict[str, Any]:
             "location": "agent_management.AgentManagementClient._tool_cache",
             "invalidation": "automatic on config change",
         },
+        "prompt_context": {
+            "parallel": True,
+            "budget_seconds": configured_budget(),
+            "location": "prompt_context.fan_out",
+        },
+        "agent_runtime": {
+            "shared_event_loop": True,
+            "max_concurrency": int(cfg.get("AGENT_MAX_CONCURRENCY", 16)),
+            "max_queue": int(cfg.get("AGENT_MAX_QUEUE", 32)),
+            "queue_timeout_seconds": float(cfg.get("AGENT_QUEUE_TIMEOUT_SECONDS", 30)),
+            "location": "agent_runtime.AgentRuntime",
+            "stats": runtime.stats() if runtime is not None else None,
+        },
     }
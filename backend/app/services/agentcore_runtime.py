@@ -19,14 +19,14 @@ import time
 from dataclasses import dataclass, field
 from typing import Any, Generator
 
-import boto3
-
+from app import aws
 from app.models.agentcore import (
     CombinedSessionManager,
     MemoryConfig,
     StreamEvent,
     StreamEventType,
 )
+from app.services.usage import usage_from_bedrock
 
 logger = logging.getLogger(__name__)
 
@@ -154,14 +154,14 @@ class AgentCoreRuntimeClient:
 
     def _get_agentcore_client(self) -> Any:
         if self._agentcore_client is None:
-            self._agentcore_client = boto3.client(
+            self._agentcore_client = aws.client(
                 "bedrock-agentcore", region_name=self._region
             )
         return self._agentcore_client
 
     def _get_bedrock_client(self) -> Any:
         if self._bedrock_client is None:
-            self._bedrock_client = boto3.client(
+            self._bedrock_client = aws.client(
                 "bedrock-runtime", region_name=self._region
             )
         return self._bedrock_client
@@ -337,6 +337,7 @@ class AgentCoreRuntimeClient:
 
                 # Parse response — may be JSON or chunked
                 full_text = self._parse_runtime_response(raw)
+                tokens = self._parse_runtime_usage(raw)
 
                 if full_text:
                     # Emit as text_delta for SSE streaming
@@ -362,6 +363,7 @@ class AgentCoreRuntimeClient:
                         type=StreamEventType.MESSAGE_DONE.value,
                         content=full_text,
                         conversation_id=session.session_id,
+                        data={"usage": tokens},
                     )
                 return
 
@@ -421,6 +423,16 @@ class AgentCoreRuntimeClient:
         except (json.JSONDecodeError, TypeError):
             return raw
 
+    @staticmethod
+    def _parse_runtime_usage(raw: str) -> dict[str, int]:
+        """Extract token usage (Bedrock ``Usage`` shape) from a runtime response."""
+        try:
+            data = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            data = None
+        usage = data.get("usage") if isinstance(data, dict) else None
+        return usage_from_bedrock(usage if isinstance(usage, dict) else None)
+
     def _invoke_bedrock_direct(
         self, session: AgentSession, message: str
     ) -> Generator[StreamEvent, None, None]:
@@ -462,6 +474,7 @@ class AgentCoreRuntimeClient:
             return
 
         full_text = ""
+        tokens = usage_from_bedrock(None)
         for event in response["stream"]:
             if "contentBlockDelta" in event:
                 delta = event["contentBlockDelta"]["delta"]
@@ -472,6 +485,8 @@ class AgentCoreRuntimeClient:
                         type=StreamEventType.TEXT_DELTA.value,
                         content=chunk,
                     )
+            elif "metadata" in event:
+                tokens = usage_from_bedrock(event["metadata"].get("usage"))
 
         if full_text:
             session.messages.append({"role": "assistant", "content": full_text})
@@ -491,6 +506,7 @@ class AgentCoreRuntimeClient:
                 type=StreamEventType.MESSAGE_DONE.value,
                 content=full_text,
                 conversation_id=session.session_id,
+                data={"usage": tokens},
             )
 
     # ------------------------------------------------------------------
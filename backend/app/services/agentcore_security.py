@@ -15,7 +15,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import boto3
+from app import aws
 
 logger = logging.getLogger(__name__)
 
@@ -178,10 +178,9 @@ def verify_family_membership(
         return False
 
     try:
-        kwargs: dict = {"region_name": region}
-        if endpoint_url:
-            kwargs["endpoint_url"] = endpoint_url
-        dynamodb = boto3.resource("dynamodb", **kwargs)
+        dynamodb = aws.resource(
+            "dynamodb", region_name=region, endpoint_url=endpoint_url
+        )
         table = dynamodb.Table("FamilyGroups")
 
         response = table.get_item(
@@ -1,21 +1,15 @@
 import logging
 from typing import Generator
 
-import boto3
 from flask import current_app
 
-logger = logging.getLogger(__name__)
-
-_client = None
+from app import aws
+from app.services.usage import GenerationTimer, build_usage, usage_from_bedrock
 
+logger = logging.getLogger(__name__)
 
 def _get_client():
-    global _client
-    if _client is None:
-        _client = boto3.client(
-            "bedrock-runtime", region_name=current_app.config["AWS_REGION"]
-        )
-    return _client
+    return aws.client("bedrock-runtime", region_name=current_app.config["AWS_REGION"])
 
 
 def build_image_content_block(img: dict) -> dict:
@@ -105,6 +99,7 @@ def stream_chat(
         },
     }
 
+    timer = GenerationTimer()
     try:
         response = client.converse_stream(**kwargs)
     except Exception:
@@ -116,8 +111,7 @@ def stream_chat(
         return
 
     full_text = ""
-    input_tokens = 0
-    output_tokens = 0
+    tokens = usage_from_bedrock(None)
 
     for event in response["stream"]:
         if "contentBlockDelta" in event:
@@ -125,16 +119,16 @@ def stream_chat(
             if "text" in delta:
                 chunk = delta["text"]
                 full_text += chunk
+                timer.mark_token()
                 yield {"type": "text_delta", "content": chunk}
 
         elif "metadata" in event:
-            usage = event["metadata"].get("usage", {})
-            input_tokens = usage.get("inputTokens", 0)
-            output_tokens = usage.get("outputTokens", 0)
+            tokens = usage_from_bedrock(event["metadata"].get("usage"))
 
     yield {
         "type": "message_done",
         "content": full_text,
-        "input_tokens": input_tokens,
-        "output_tokens": output_tokens,
+        "input_tokens": tokens["input_tokens"],
+        "output_tokens": tokens["output_tokens"],
+        "usage": build_usage(tokens, timer),
     }
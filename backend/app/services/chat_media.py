@@ -3,10 +3,12 @@
 import time
 from datetime import datetime, timezone
 
-import boto3
+from typing import Any
+
 from flask import current_app
 from ulid import ULID
 
+from app import aws
 from app.dal import get_dal
 
 CHAT_MEDIA_MAX_PER_MESSAGE = 5
@@ -14,23 +16,25 @@ UPLOAD_TTL_SECONDS = 3600  # 1 hour for orphaned uploads
 PRESIGNED_URL_EXPIRY = 300  # 5 minutes for presigned upload URLs
 
 
-def _get_s3_client() -> "boto3.client":
-    kwargs = {"region_name": current_app.config["AWS_REGION"]}
+def _get_s3_client() -> Any:
+    region = current_app.config["AWS_REGION"]
     endpoint = current_app.config.get("S3_ENDPOINT")
     if endpoint:
-        kwargs["endpoint_url"] = endpoint
-        kwargs["config"] = boto3.session.Config(s3={"addressing_style": "path"})
         # Use local S3 credentials (MinIO) when endpoint is overridden
-        kwargs["aws_access_key_id"] = current_app.config.get(
-            "S3_ACCESS_KEY_ID", "local"
-        )
-        kwargs["aws_secret_access_key"] = current_app.config.get(
-            "S3_SECRET_ACCESS_KEY", "locallocal"
+        return aws.client(
+            "s3",
+            region_name=region,
+            endpoint_url=endpoint,
+            path_style=True,
+            aws_access_key_id=current_app.config.get("S3_ACCESS_KEY_ID", "local"),
+            aws_secret_access_key=current_app.config.get(
+                "S3_SECRET_ACCESS_KEY", "locallocal"
+            ),
         )
-    return boto3.client("s3", **kwargs)
+    return aws.client("s3", region_name=region)
 
 
-def _get_presigned_s3_client() -> "boto3.client":
+def _get_presigned_s3_client() -> Any:
     """Get S3 client configured for presigned URL generation.
 
     Uses S3_PRESIGNED_ENDPOINT if set (for local dev where the Docker-internal
@@ -43,11 +47,11 @@ def _get_presigned_s3_client() -> "boto3.client":
             raise ValueError(
                 f"S3_PRESIGNED_ENDPOINT must be an HTTP(S) URL, got: {presigned_endpoint}"
             )
-        return boto3.client(
+        return aws.client(
             "s3",
             region_name=current_app.config["AWS_REGION"],
             endpoint_url=presigned_endpoint,
-            config=boto3.session.Config(s3={"addressing_style": "path"}),
+            path_style=True,
             aws_access_key_id=current_app.config.get("S3_ACCESS_KEY_ID", "local"),
             aws_secret_access_key=current_app.config.get(
                 "S3_SECRET_ACCESS_KEY", "locallocal"
@@ -155,6 +159,7 @@ def mark_attached(media_id: str) -> bool:
             ExpressionAttributeValues={":attached": "attached"},
             ConditionExpression="attribute_exists(media_id)",
         )
+        dal.chat_media.invalidate({"media_id": media_id})
         return True
     except dal.chat_media._table.meta.client.exceptions.ConditionalCheckFailedException:
         return False
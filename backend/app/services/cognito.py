@@ -2,12 +2,13 @@ import logging
 import time
 from typing import Any, TypedDict
 
-import boto3
 import requests
 from botocore.exceptions import ClientError
 from flask import current_app
 from jose import JWTError, jwk, jwt
 
+from app import aws
+
 logger = logging.getLogger(__name__)
 
 # Cache JWKS keys per user pool to avoid repeated fetches
@@ -33,7 +34,7 @@ class CognitoError(Exception):
 def _get_cognito_client() -> Any:
     """Get a boto3 cognito-idp client."""
     region = current_app.config["COGNITO_REGION"]
-    return boto3.client("cognito-idp", region_name=region)
+    return aws.client("cognito-idp", region_name=region)
 
 
 def _get_user_pool_id() -> str:
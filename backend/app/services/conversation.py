@@ -3,6 +3,17 @@ from datetime import datetime, timezone
 from ulid import ULID
 
 from app.dal import get_dal
+from app.services.message_search import index_message, unindex_conversation
+from app.services.vector_index import forget_conversation, remember_message
+
+# Attributes a conversation list entry carries (the client's Conversation type).
+CONVERSATION_LIST_FIELDS = [
+    "conversation_id",
+    "user_id",
+    "title",
+    "created_at",
+    "updated_at",
+]
 
 
 def create_conversation(user_id: str, title: str) -> dict:
@@ -48,7 +59,11 @@ def list_conversations(
         # Try DAL cursor first; if it fails, use legacy approach
         try:
             result = dal.conversations.query_by_user(
-                user_id, limit=limit, cursor=cursor, newest_first=True
+                user_id,
+                limit=limit,
+                cursor=cursor,
+                newest_first=True,
+                projection=CONVERSATION_LIST_FIELDS,
             )
             response: dict = {"conversations": result.items}
             if result.next_cursor:
@@ -78,7 +93,9 @@ def list_conversations(
             response["next_cursor"] = result_raw["LastEvaluatedKey"]["updated_at"]
         return response
 
-    result = dal.conversations.query_by_user(user_id, limit=limit, newest_first=True)
+    result = dal.conversations.query_by_user(
+        user_id, limit=limit, newest_first=True, projection=CONVERSATION_LIST_FIELDS
+    )
     response = {"conversations": result.items}
     if result.next_cursor:
         response["next_cursor"] = result.next_cursor
@@ -86,8 +103,12 @@ def list_conversations(
 
 
 def delete_conversation(conversation_id: str) -> None:
-    """Delete a conversation and all its messages."""
+    """Delete a conversation, all its messages and their index entries."""
     dal = get_dal()
+    conv = dal.conversations.get_by_id({"conversation_id": conversation_id})
+    if conv:
+        unindex_conversation(conv["user_id"], conversation_id)
+        forget_conversation(conv["user_id"], conversation_id)
     dal.messages.delete_by_conversation(conversation_id)
     dal.conversations.delete({"conversation_id": conversation_id})
 
@@ -99,8 +120,19 @@ def add_message(
     model: str | None = None,
     tokens_used: int | None = None,
     media: list[dict] | None = None,
+    usage: dict | None = None,
+    user_id: str | None = None,
+    index: bool = True,
 ) -> dict:
-    """Add a message to a conversation. Returns the message item."""
+    """Add a message to a conversation. Returns the message item.
+
+    The message is also added to the owner's search index (and vector
+    index, when enabled). Pass the owner's *user_id* when known to skip
+    looking up the conversation. With ``index=False`` indexing is left to
+    the caller, which passes the returned item to :func:`index_stored_message`
+    once it is off the latency-sensitive path (the chat route does so after
+    streaming).
+    """
     dal = get_dal()
     now = datetime.now(timezone.utc)
     message_id = str(ULID())
@@ -120,9 +152,17 @@ def add_message(
         item["tokens_used"] = tokens_used
     if media:
         item["media"] = media
+    if usage:
+        item["usage"] = {k: v for k, v in usage.items() if v is not None}
 
     dal.messages.create(item)
 
+    if user_id is None:
+        conv = get_conversation(conversation_id)
+        user_id = conv["user_id"] if conv else None
+    if user_id and index:
+        index_stored_message(user_id, item)
+
     # Update conversation's updated_at
     dal.conversations.update(
         {"conversation_id": conversation_id},
@@ -132,12 +172,25 @@ def add_message(
     return item
 
 
+def index_stored_message(user_id: str, message: dict) -> None:
+    """Add a stored message to its owner's search and vector indexes.
+
+    Both are best effort, so this never raises for an indexing failure.
+    """
+    index_message(user_id, message)
+    remember_message(user_id, message)
+
+
 def get_messages(
-    conversation_id: str, limit: int = 50, cursor: str | None = None
+    conversation_id: str,
+    limit: int = 50,
+    cursor: str | None = None,
+    projection: list[str] | None = None,
 ) -> dict:
     """Get messages for a conversation in chronological order.
 
-    Returns dict with 'messages' and optional 'next_cursor'.
+    Returns dict with 'messages' and optional 'next_cursor'. *projection*
+    limits the message attributes read.
     """
     dal = get_dal()
 
@@ -145,7 +198,7 @@ def get_messages(
     if cursor:
         try:
             result = dal.messages.query_by_conversation(
-                conversation_id, limit=limit, cursor=cursor
+                conversation_id, limit=limit, cursor=cursor, projection=projection
             )
             response: dict = {"messages": result.items}
             if result.next_cursor:
@@ -173,7 +226,9 @@ def get_messages(
             response["next_cursor"] = result_raw["LastEvaluatedKey"]["sort_key"]
         return response
 
-    result = dal.messages.query_by_conversation(conversation_id, limit=limit)
+    result = dal.messages.query_by_conversation(
+        conversation_id, limit=limit, projection=projection
+    )
     response = {"messages": result.items}
     if result.next_cursor:
         response["next_cursor"] = result.next_cursor
@@ -0,0 +1,139 @@
+"""Text embedders for the conversation vector index.
+
+An embedder turns texts into an ``(n, dim)`` float32 matrix of
+L2-normalized rows, so a dot product is a cosine similarity. Embedders are
+looked up by name (config ``EMBEDDER``) in a small registry:
+
+- ``hashed`` — :class:`HashedNgramEmbedder`, deterministic and local: word
+  features and character n-grams hashed into ``dim`` signed buckets. No
+  model or network, so it is the default and what tests use.
+- ``bedrock`` — :class:`BedrockEmbedder`, Amazon Titan Text Embeddings v2.
+
+Register another implementation with :func:`register_embedder`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from collections.abc import Callable, Sequence
+from typing import Any, Protocol
+
+import numpy as np
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+class Embedder(Protocol):
+    """Maps texts to L2-normalized float32 vectors of length ``dim``."""
+
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class HashedNgramEmbedder:
+    """Deterministic feature-hashing embedder (no model required).
+
+    Each lowercased word contributes itself plus its character n-grams
+    (of the word padded with spaces). Features are hashed with BLAKE2b —
+    stable across processes, unlike ``hash()`` — into a bucket and a sign.
+    """
+
+    name = "hashed"
+
+    def __init__(self, dim: int = 256, ngram_sizes: tuple[int, ...] = (3, 4)) -> None:
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+
+    def _features(self, text: str) -> list[str]:
+        features = []
+        for word in _WORD_RE.findall(text.lower()):
+            features.append(word)
+            padded = f" {word} "
+            for n in self.ngram_sizes:
+                features.extend(padded[i : i + n] for i in range(len(padded) - n + 1))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(
+                    feature.encode("utf-8"), digest_size=8
+                ).digest()
+                value = int.from_bytes(digest, "little")
+                matrix[row, value % self.dim] += 1.0 if value >> 63 else -1.0
+        return _normalize(matrix)
+
+
+class BedrockEmbedder:
+    """Amazon Titan Text Embeddings v2 via bedrock-runtime ``invoke_model``."""
+
+    name = "bedrock"
+
+    def __init__(
+        self,
+        dim: int = 256,
+        model_id: str = "amazon.titan-embed-text-v2:0",
+        region: str = "us-east-1",
+    ) -> None:
+        from app import aws
+
+        self.dim = dim
+        self.model_id = model_id
+        self._client = aws.client("bedrock-runtime", region_name=region)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows = []
+        for text in texts:
+            response = self._client.invoke_model(
+                modelId=self.model_id,
+                body=json.dumps(
+                    {"inputText": text, "dimensions": self.dim, "normalize": True}
+                ),
+            )
+            rows.append(json.loads(response["body"].read())["embedding"])
+        return _normalize(
+            np.asarray(rows, dtype=np.float32).reshape(len(texts), self.dim)
+        )
+
+
+_REGISTRY: dict[str, Callable[[Any], Embedder]] = {
+    "hashed": lambda cfg: HashedNgramEmbedder(dim=int(cfg.get("EMBEDDING_DIM", 256))),
+    "bedrock": lambda cfg: BedrockEmbedder(
+        dim=int(cfg.get("EMBEDDING_DIM", 256)),
+        model_id=cfg.get("EMBEDDING_MODEL_ID", "amazon.titan-embed-text-v2:0"),
+        region=cfg.get("AWS_REGION", "us-east-1"),
+    ),
+}
+
+
+def register_embedder(name: str, factory: Callable[[Any], Embedder]) -> None:
+    """Register *factory* (called with the app config) under *name*."""
+    _REGISTRY[name] = factory
+
+
+def get_embedder() -> Embedder:
+    """Return the app's configured embedder, creating it on first use."""
+    embedder = current_app.extensions.get("embedder")
+    if embedder is None:
+        name = current_app.config.get("EMBEDDER", "hashed")
+        if name not in _REGISTRY:
+            raise ValueError(f"Unknown embedder: {name}")
+        embedder = current_app.extensions.setdefault(
+            "embedder", _REGISTRY[name](current_app.config)
+        )
+    return embedder
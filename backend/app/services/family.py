@@ -1,6 +1,10 @@
 import logging
+import threading
+import time
 from datetime import datetime, timezone
+from typing import Any
 
+from flask import current_app
 from ulid import ULID
 
 from app.dal import get_dal
@@ -8,6 +12,86 @@ from app.dal.exceptions import DuplicateEntityError
 
 logger = logging.getLogger(__name__)
 
+# Family-level feature gates and their defaults when a family has not set them.
+DEFAULT_FAMILY_SETTINGS: dict[str, Any] = {
+    "web_search_enabled": True,
+    "health_extraction_enabled": True,
+}
+
+_MISSING = object()
+
+
+class FamilySettingsCache:
+    """Per-worker TTL cache of user -> family_id and family_id -> settings.
+
+    Feature gates are checked on every chat turn but change rarely, so they
+    are served from memory. Writes through :func:`update_family_settings`
+    and membership changes invalidate the affected entries explicitly; the
+    TTL bounds staleness for changes made by other workers.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0) -> None:
+        self._ttl = ttl_seconds
+        self._family_ids: dict[str, tuple[str | None, float]] = {}
+        self._settings: dict[str, tuple[dict, float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, store: dict[str, tuple[Any, float]], key: str) -> Any:
+        with self._lock:
+            entry = store.get(key)
+            if entry is None:
+                return _MISSING
+            value, cached_at = entry
+            if time.monotonic() - cached_at >= self._ttl:
+                del store[key]
+                return _MISSING
+            return value
+
+    def _set(self, store: dict[str, tuple[Any, float]], key: str, value: Any) -> None:
+        with self._lock:
+            store[key] = (value, time.monotonic())
+
+    def get_family_id(self, user_id: str) -> Any:
+        return self._get(self._family_ids, user_id)
+
+    def set_family_id(self, user_id: str, family_id: str | None) -> None:
+        self._set(self._family_ids, user_id, family_id)
+
+    def get_settings(self, family_id: str) -> Any:
+        settings = self._get(self._settings, family_id)
+        return dict(settings) if settings is not _MISSING else _MISSING
+
+    def set_settings(self, family_id: str, settings: dict) -> None:
+        self._set(self._settings, family_id, dict(settings))
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            self._family_ids.pop(user_id, None)
+
+    def invalidate_family(self, family_id: str) -> None:
+        with self._lock:
+            self._settings.pop(family_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._family_ids.clear()
+            self._settings.clear()
+
+
+def get_settings_cache() -> FamilySettingsCache:
+    """Return the app's FamilySettingsCache, creating it on first use."""
+    cache = current_app.extensions.get("family_settings_cache")
+    if cache is None:
+        cache = current_app.extensions.setdefault(
+            "family_settings_cache",
+            FamilySettingsCache(
+                ttl_seconds=float(
+                    current_app.config.get("FAMILY_SETTINGS_CACHE_TTL_SECONDS", 60)
+                )
+            ),
+        )
+    return cache
+
 
 def create_family(owner_user_id: str, family_name: str) -> dict:
     """Create a new family record and add the owner as the first member.
@@ -65,6 +149,16 @@ def get_user_family_id(user_id: str) -> str | None:
     return user.get("family_id")
 
 
+def get_cached_family_id(user_id: str) -> str | None:
+    """Resolve a user's family_id through the settings cache."""
+    cache = get_settings_cache()
+    family_id = cache.get_family_id(user_id)
+    if family_id is _MISSING:
+        family_id = get_user_family_id(user_id)
+        cache.set_family_id(user_id, family_id)
+    return family_id
+
+
 def get_family_members(family_id: str) -> list[dict]:
     """List all members of a family."""
     dal = get_dal()
@@ -75,7 +169,7 @@ def get_family_members(family_id: str) -> list[dict]:
     user_ids = [m["user_id"] for m in members]
     if user_ids:
         users = dal.users.batch_get([{"user_id": uid} for uid in user_ids])
-        user_map = {u["user_id"]: u for u in users}
+        user_map = {u["user_id"]: u for u in users.items}
     else:
         user_map = {}
 
@@ -106,31 +200,57 @@ def add_member_to_family(family_id: str, user_id: str, role: str = "member") ->
 
     # Update user record with family_id
     dal.users.update({"user_id": user_id}, {"family_id": family_id})
+    get_settings_cache().invalidate_user(user_id)
 
     return item
 
 
 def get_family_settings(family_id: str) -> dict:
-    """Get the settings map for a family. Returns defaults if not set."""
+    """Get the settings map for a family. Returns defaults if not set.
+
+    Served from the per-worker settings cache when fresh.
+    """
+    cache = get_settings_cache()
+    settings = cache.get_settings(family_id)
+    if settings is not _MISSING:
+        return settings
+
     family = get_family(family_id)
-    if not family:
-        return {"web_search_enabled": True}
-    return family.get("settings", {"web_search_enabled": True})
+    settings = {**DEFAULT_FAMILY_SETTINGS, **((family or {}).get("settings") or {})}
+    cache.set_settings(family_id, settings)
+    return dict(settings)
+
+
+def get_user_family_settings(user_id: str) -> dict:
+    """Get the settings of the user's family, or defaults if not in one."""
+    family_id = get_cached_family_id(user_id)
+    if not family_id:
+        return dict(DEFAULT_FAMILY_SETTINGS)
+    return get_family_settings(family_id)
+
+
+def is_family_feature_enabled(user_id: str, setting: str) -> bool:
+    """Check a family-level feature gate for the user's family."""
+    settings = get_user_family_settings(user_id)
+    return bool(settings.get(setting, DEFAULT_FAMILY_SETTINGS.get(setting, False)))
 
 
 def update_family_settings(family_id: str, settings: dict) -> dict:
     """Update family settings. Merges with existing settings."""
     dal = get_dal()
-    allowed_keys = {"web_search_enabled"}
+    allowed_keys = set(DEFAULT_FAMILY_SETTINGS)
     filtered = {k: v for k, v in settings.items() if k in allowed_keys}
     if not filtered:
         raise ValueError(f"No valid settings provided. Allowed: {allowed_keys}")
 
     # Merge with existing
+    cache = get_settings_cache()
+    cache.invalidate_family(family_id)
     current = get_family_settings(family_id)
     current.update(filtered)
 
     dal.families.update({"family_id": family_id}, {"settings": current})
+    cache.invalidate_family(family_id)
     return current
 
 
@@ -144,3 +264,5 @@ def remove_member_from_family(family_id: str, user_id: str) -> None:
         Key={"user_id": user_id},
         UpdateExpression="REMOVE family_id",
     )
+    dal.users.invalidate({"user_id": user_id})
+    get_settings_cache().invalidate_user(user_id)
@@ -9,6 +9,7 @@ import logging
 from datetime import datetime, timezone
 
 from app.dal import get_dal
+from app.dal.exceptions import DataAccessError
 from app.services.profile import get_profile
 
 logger = logging.getLogger(__name__)
@@ -65,7 +66,7 @@ def update_sharing_config(user_id: str, updates: dict) -> dict:
     existing = get_sharing_config(user_id)
     existing.update(filtered)
     existing["user_id"] = user_id
-    dal.memory_sharing_config._table.put_item(Item=existing)
+    dal.memory_sharing_config.put(existing)
     return existing
 
 
@@ -73,24 +74,18 @@ def _get_family_member_ids(user_id: str) -> list[str]:
     """Get all family member user_ids for the same family as user_id."""
     dal = get_dal()
 
-    # Scan FamilyMembers to find this user's family_id
-    # (FamilyMembers has composite key: family_id HASH, user_id RANGE)
-    from boto3.dynamodb.conditions import Attr
-
-    table = dal.memberships._table
-    result = table.scan(FilterExpression=Attr("user_id").eq(user_id))
-    items = result.get("Items", [])
-    while "LastEvaluatedKey" in result:
-        result = table.scan(
-            FilterExpression=Attr("user_id").eq(user_id),
-            ExclusiveStartKey=result["LastEvaluatedKey"],
-        )
-        items.extend(result.get("Items", []))
-    if not items:
+    try:
+        family_id = dal.memberships.get_family_id_for_user(user_id)
+    except DataAccessError:
+        # user_id-index not provisioned yet (see
+        # scripts/backfill_membership_user_index.py) — fall back to the
+        # family_id denormalized onto the Users record.
+        logger.warning("FamilyMembers user_id-index lookup failed", exc_info=True)
+        user = dal.users.get_by_id({"user_id": user_id})
+        family_id = user.get("family_id") if user else None
+    if not family_id:
         return []
 
-    family_id = items[0]["family_id"]
-
     # Get all members of this family
     members_result = dal.memberships.query_by_family(family_id)
     member_ids = [m["user_id"] for m in members_result.items if m["user_id"] != user_id]
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 
 from app.dal import get_dal
+from app.dal.exceptions import DataAccessError
 from app.services.profile import get_profile
 
 VALID_RELATIONSHIP_TYPES = {"parent_of", "child_of", "spouse_of", "sibling_of"}
@@ -38,24 +39,27 @@ def set_relationship(
     dal = get_dal()
     now = datetime.now(timezone.utc).isoformat()
 
-    # Forward direction (upsert — put_item without condition)
+    # Both directions in one round trip (upsert — no uniqueness condition)
     forward_item = {
         "user_id": user_id,
         "related_user_id": related_user_id,
         "relationship_type": relationship_type,
         "created_at": now,
     }
-    dal.family_relationships._table.put_item(Item=forward_item)
-
-    # Inverse direction
-    inverse_type = INVERSE_MAP[relationship_type]
     inverse_item = {
         "user_id": related_user_id,
         "related_user_id": user_id,
-        "relationship_type": inverse_type,
+        "relationship_type": INVERSE_MAP[relationship_type],
         "created_at": now,
     }
-    dal.family_relationships._table.put_item(Item=inverse_item)
+    result = dal.family_relationships.batch_put([forward_item, inverse_item])
+    if not result.ok:
+        raise DataAccessError(
+            "Failed to write family relationship",
+            table_name="FamilyRelationships",
+            operation="set_relationship",
+            key=result.failures[0].key,
+        )
 
     return forward_item
 
@@ -83,8 +87,7 @@ def delete_all_relationships(user_id: str) -> None:
 def get_family_tree() -> list[dict]:
     """Get all relationships (full scan) for the tree view."""
     dal = get_dal()
-    result = dal.family_relationships._table.scan()
-    items = result.get("Items", [])
+    items = list(dal.family_relationships.parallel_scan())
 
     # Enrich with display names
     user_ids = {item["user_id"] for item in items} | {
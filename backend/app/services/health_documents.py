@@ -9,10 +9,10 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-import boto3
 from flask import current_app
 from ulid import ULID
 
+from app import aws
 from app.dal import get_dal
 
 if TYPE_CHECKING:
@@ -32,12 +32,13 @@ _COLLECTION = "health_documents_meta"
 
 
 def _get_s3_client():
-    kwargs = {"region_name": current_app.config["AWS_REGION"]}
     endpoint = current_app.config.get("S3_ENDPOINT")
-    if endpoint:
-        kwargs["endpoint_url"] = endpoint
-        kwargs["config"] = boto3.session.Config(s3={"addressing_style": "path"})
-    return boto3.client("s3", **kwargs)
+    return aws.client(
+        "s3",
+        region_name=current_app.config["AWS_REGION"],
+        endpoint_url=endpoint,
+        path_style=bool(endpoint),
+    )
 
 
 def create_document_metadata(
@@ -9,7 +9,7 @@ from __future__ import annotations
 import json
 import logging
 
-import boto3
+from app import aws
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +50,7 @@ def extract_health_observations(
     """Extract health observations from a chat exchange and save them.
 
     This runs in a background thread — failures are logged, never raised.
-    Creates its own boto3 clients to avoid Flask request-context dependencies.
+    Uses the shared AWS clients (no Flask request-context dependencies).
 
     When storage_provider_type is not "local", attempts to use the storage
     provider abstraction. Falls back to DynamoDB if the module is unavailable.
@@ -61,7 +61,7 @@ def extract_health_observations(
             assistant_response=assistant_response,
         )
 
-        bedrock = boto3.client("bedrock-runtime", region_name=region)
+        bedrock = aws.client("bedrock-runtime", region_name=region)
         response = bedrock.converse(
             modelId=model_id,
             messages=[{"role": "user", "content": [{"text": prompt}]}],
@@ -123,10 +123,9 @@ def extract_health_observations(
                 storage.put_record("health_observations", item)
         else:
             # Default: write directly to DynamoDB
-            dynamo_kwargs: dict = {"region_name": region}
-            if dynamodb_endpoint:
-                dynamo_kwargs["endpoint_url"] = dynamodb_endpoint
-            dynamodb = boto3.resource("dynamodb", **dynamo_kwargs)
+            dynamodb = aws.resource(
+                "dynamodb", region_name=region, endpoint_url=dynamodb_endpoint
+            )
             table = dynamodb.Table("HealthObservations")
             for item in items:
                 table.put_item(Item=item)
@@ -86,11 +86,8 @@ def list_observations(
     dal = get_dal()
 
     if category:
-        result = dal.health_observations.query_by_category(user_id, category)
-    else:
-        result = dal.health_observations.query_by_user(user_id)
-
-    return result.items
+        return list(dal.health_observations.iter_by_category(user_id, category))
+    return list(dal.health_observations.iter_by_user(user_id))
 
 
 def delete_all_observations(
@@ -103,14 +100,9 @@ def delete_all_observations(
         return
 
     dal = get_dal()
-    result = dal.health_observations.query_by_user(user_id)
-    if result.items:
-        dal.health_observations.batch_delete(
-            [
-                {
-                    "user_id": item["user_id"],
-                    "observation_id": item["observation_id"],
-                }
-                for item in result.items
-            ]
-        )
+    keys = [
+        {"user_id": item["user_id"], "observation_id": item["observation_id"]}
+        for item in dal.health_observations.iter_by_user(user_id)
+    ]
+    if keys:
+        dal.health_observations.batch_delete(keys)
@@ -29,6 +29,9 @@ VALID_RECORD_TYPES = {
 
 _COLLECTION = "health_records"
 
+# Attributes summarize_health_records reads.
+_SUMMARY_FIELDS = ["record_id", "record_type", "data", "created_at", "updated_at"]
+
 
 def create_health_record(
     user_id: str,
@@ -97,8 +100,13 @@ def list_health_records(
     user_id: str,
     record_type: str | None = None,
     storage: StorageProvider | None = None,
+    projection: list[str] | None = None,
 ) -> list[dict]:
-    """List health records for a user, optionally filtered by record_type."""
+    """List health records for a user, optionally filtered by record_type.
+
+    *projection* limits the attributes read from the DAL; storage
+    providers always return whole records.
+    """
     if storage is not None:
         key_condition: dict = {"user_id": user_id}
         if record_type:
@@ -113,11 +121,12 @@ def list_health_records(
     dal = get_dal()
 
     if record_type:
-        result = dal.health_records.query_by_record_type(user_id, record_type)
-    else:
-        result = dal.health_records.query_by_user(user_id)
-
-    return result.items
+        return list(
+            dal.health_records.iter_by_record_type(
+                user_id, record_type, projection=projection
+            )
+        )
+    return list(dal.health_records.iter_by_user(user_id, projection=projection))
 
 
 def update_health_record(
@@ -184,6 +193,7 @@ def update_health_record(
             ReturnValues="ALL_NEW",
         )
         updated = result["Attributes"]
+        dal.health_records.invalidate({"user_id": user_id, "record_id": record_id})
 
         if actor_id and before:
             log_audit_event(
@@ -232,6 +242,7 @@ def delete_health_record(
             Key={"user_id": user_id, "record_id": record_id},
             ConditionExpression="attribute_exists(user_id)",
         )
+        dal.health_records.invalidate({"user_id": user_id, "record_id": record_id})
         if actor_id and snapshot:
             log_audit_event(
                 record_id=record_id,
@@ -257,14 +268,12 @@ def delete_all_health_records(
         return
 
     dal = get_dal()
-    result = dal.health_records.query_by_user(user_id)
-    if result.items:
-        dal.health_records.batch_delete(
-            [
-                {"user_id": item["user_id"], "record_id": item["record_id"]}
-                for item in result.items
-            ]
-        )
+    keys = [
+        {"user_id": item["user_id"], "record_id": item["record_id"]}
+        for item in dal.health_records.iter_by_user(user_id)
+    ]
+    if keys:
+        dal.health_records.batch_delete(keys)
 
 
 def get_health_summary(
@@ -272,7 +281,14 @@ def get_health_summary(
     storage: StorageProvider | None = None,
 ) -> dict:
     """Build a structured health summary grouped by record type."""
-    records = list_health_records(user_id, storage=storage)
+    return summarize_health_records(
+        user_id,
+        list_health_records(user_id, storage=storage, projection=_SUMMARY_FIELDS),
+    )
+
+
+def summarize_health_records(user_id: str, records: list[dict]) -> dict:
+    """Group already-fetched records into the health summary shape."""
     summary: dict[str, list[dict]] = {}
     for record in records:
         rt = record["record_type"]
@@ -48,8 +48,7 @@ def grant_permission(
         "granted_by": granted_by or user_id,
         "status": "active",
     }
-    dal.member_permissions._table.put_item(Item=item)
-    return item
+    return dal.member_permissions.put(item)
 
 
 def revoke_permission(user_id: str, permission_type: str) -> bool:
@@ -71,6 +70,9 @@ def revoke_permission(user_id: str, permission_type: str) -> bool:
             ExpressionAttributeValues={":revoked": "revoked", ":now": now},
             ConditionExpression="attribute_exists(user_id)",
         )
+        dal.member_permissions.invalidate(
+            {"user_id": user_id, "permission_type": permission_type}
+        )
         return True
     except dal.member_permissions._table.meta.client.exceptions.ConditionalCheckFailedException:
         return False
@@ -0,0 +1,239 @@
+"""Full-text search over a user's conversation history.
+
+Messages are indexed as they are stored: ``add_message`` calls
+:func:`index_message`, which writes one posting per distinct term into the
+MessageSearchIndex table under the conversation owner's partition. A
+posting's sort key is ``<term>#<message sort_key>`` and it carries a
+snippet, so answering a keyword needs no message reads. The chat route
+indexes its messages itself (see ``index_stored_message``) once the
+response has streamed, so those writes never delay the first token.
+
+Tokenization:
+
+- Words are lowercased; words shorter than two characters and a few
+  common English stopwords are skipped.
+- Runs of CJK characters have no spaces to split on, so they are indexed
+  as overlapping character bigrams (a lone character as itself). A CJK
+  keyword is tokenized the same way, which keeps substring-style matching.
+
+Queries: a phrase matches a message when all of its terms match, and each
+term matches by prefix (``diab`` finds ``diabetes``). Commas separate
+alternative phrases; the result is their union, newest first.
+
+A term's postings are read newest first: exact matches before any longer
+term, whose postings are a separate step capped at
+``PREFIX_POSTINGS_LIMIT``, so a frequent ``painkiller`` never crowds out
+``pain``. Postings are read ``TERM_POSTINGS_LIMIT`` at a time, and a
+multi-term phrase keeps reading further back until it has enough matches
+or each term has read ``MAX_TERM_POSTINGS``.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from itertools import chain, islice
+from typing import Any
+
+from app.dal import get_dal
+
+logger = logging.getLogger(__name__)
+
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 40
+MAX_TERMS_PER_MESSAGE = 256
+TERM_POSTINGS_LIMIT = 200
+PREFIX_POSTINGS_LIMIT = 200
+MAX_TERM_POSTINGS = 2000
+SNIPPET_CHARS = 200
+SNIPPET_LEAD = 60
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its me my of "
+    "on or so that the their them they this to was we were what when which "
+    "who will with you your".split()
+)
+
+# Hiragana/Katakana, CJK ideographs (incl. extension A and compatibility)
+# and Hangul syllables.
+_CJK_RE = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+"
+)
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Distinct index terms in *text*, in first-seen order."""
+    terms: dict[str, None] = {}
+    for run in _CJK_RE.findall(text):
+        if len(run) == 1:
+            terms[run] = None
+        for i in range(len(run) - 1):
+            terms[run[i : i + 2]] = None
+    for word in _WORD_RE.findall(_CJK_RE.sub(" ", text).lower()):
+        if len(word) >= MIN_TERM_LENGTH and word not in STOPWORDS:
+            terms[word[:MAX_TERM_LENGTH]] = None
+    return list(terms)
+
+
+def split_phrases(query: str) -> list[str]:
+    """Split a comma-separated query into its alternative phrases."""
+    return [p.strip().lower() for p in query.split(",") if p.strip()]
+
+
+def _snippet(content: str, position: int) -> str:
+    start = max(0, position - SNIPPET_LEAD)
+    return content[start : start + SNIPPET_CHARS]
+
+
+def _term_key(term: str, message: dict) -> str:
+    return f"{term}#{message['sort_key']}"
+
+
+def build_postings(user_id: str, message: dict) -> list[dict[str, Any]]:
+    """Index items for one stored message (also used by the backfill)."""
+    content = message.get("content") or ""
+    lowered = content.lower()
+    return [
+        {
+            "user_id": user_id,
+            "term_key": _term_key(term, message),
+            "conversation_id": message["conversation_id"],
+            "message_id": message["message_id"],
+            "role": message.get("role", ""),
+            "created_at": message.get("created_at", ""),
+            "snippet": _snippet(content, max(lowered.find(term), 0)),
+        }
+        for term in tokenize(content)[:MAX_TERMS_PER_MESSAGE]
+    ]
+
+
+def index_message(user_id: str, message: dict) -> None:
+    """Add a stored message to its owner's index.
+
+    Best effort: a failed index write is logged and never fails the
+    message itself.
+    """
+    try:
+        result = get_dal().message_search.put_postings(build_postings(user_id, message))
+        if not result.ok:
+            logger.warning(
+                "Message %s: %d postings not indexed",
+                message.get("message_id"),
+                len(result.failures),
+            )
+    except Exception:
+        logger.warning(
+            "Failed to index message %s", message.get("message_id"), exc_info=True
+        )
+
+
+def unindex_conversation(user_id: str, conversation_id: str) -> None:
+    """Remove the postings of every message in a conversation.
+
+    Posting keys are derived from each message's content, so this reads
+    only the conversation's own messages, not the user's whole index.
+    """
+    dal = get_dal()
+    keys: list[dict[str, str]] = []
+    cursor = None
+    while True:
+        page = dal.messages.query_by_conversation(
+            conversation_id,
+            limit=100,
+            cursor=cursor,
+            projection=["sort_key", "content"],
+        )
+        for message in page.items:
+            terms = tokenize(message.get("content") or "")[:MAX_TERMS_PER_MESSAGE]
+            keys.extend(
+                {"user_id": user_id, "term_key": _term_key(term, message)}
+                for term in terms
+            )
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    dal.message_search.batch_delete(keys)
+
+
+class _TermPostings:
+    """A term's postings by message_id, read lazily in rounds."""
+
+    def __init__(self, user_id: str, term: str) -> None:
+        repo = get_dal().message_search
+        self.found: dict[str, dict] = {}
+        self._read = 0
+        self._done = False
+        self._postings = chain(
+            repo.iter_term(user_id, term, page_size=TERM_POSTINGS_LIMIT),
+            islice(
+                repo.iter_longer_terms(user_id, term, page_size=PREFIX_POSTINGS_LIMIT),
+                PREFIX_POSTINGS_LIMIT,
+            ),
+        )
+        self.read_more()
+
+    def read_more(self) -> bool:
+        """Read up to ``TERM_POSTINGS_LIMIT`` more; False if none were left."""
+        if self._done:
+            return False
+        budget = min(TERM_POSTINGS_LIMIT, MAX_TERM_POSTINGS - self._read)
+        read = 0
+        for posting in islice(self._postings, budget):
+            read += 1
+            self.found.setdefault(posting["message_id"], posting)
+        self._read += read
+        self._done = read < budget or self._read >= MAX_TERM_POSTINGS
+        return read > 0
+
+
+def _intersect(terms: list[_TermPostings]) -> dict[str, dict]:
+    """Postings (of the first term) for messages that every term matched."""
+    if not terms:
+        return {}
+    first, *rest = terms
+    return {
+        message_id: posting
+        for message_id, posting in first.found.items()
+        if all(message_id in term.found for term in rest)
+    }
+
+
+def search_messages(user_id: str, phrases: list[str], limit: int = 20) -> list[dict]:
+    """Messages matching any phrase, newest first.
+
+    Each hit has conversation_id, message_id, role, created_at, snippet and
+    ``matched`` (the phrases it matched). Every distinct term costs at
+    least one query.
+    """
+    postings_by_term: dict[str, _TermPostings] = {}
+
+    def postings(term: str) -> _TermPostings:
+        if term not in postings_by_term:
+            postings_by_term[term] = _TermPostings(user_id, term)
+        return postings_by_term[term]
+
+    hits: dict[str, dict] = {}
+    for phrase in phrases:
+        terms = [postings(term) for term in tokenize(phrase)]
+        matched = _intersect(terms)
+        # Matches may lie further back than the postings read so far.
+        while len(terms) > 1 and len(matched) < limit and all(t.found for t in terms):
+            if not any([term.read_more() for term in terms]):
+                break
+            matched = _intersect(terms)
+        for message_id, posting in matched.items():
+            hit = hits.setdefault(
+                message_id,
+                {
+                    "conversation_id": posting["conversation_id"],
+                    "message_id": message_id,
+                    "role": posting.get("role", ""),
+                    "created_at": posting.get("created_at", ""),
+                    "snippet": posting.get("snippet", ""),
+                    "matched": [],
+                },
+            )
+            hit["matched"].append(phrase)
+
+    return sorted(hits.values(), key=lambda h: h["created_at"], reverse=True)[:limit]
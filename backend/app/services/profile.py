@@ -60,5 +60,4 @@ def update_profile(user_id: str, updates: dict) -> dict | None:
 def list_profiles() -> list[dict]:
     """List all member profiles (admin use)."""
     dal = get_dal()
-    result = dal.profiles._table.scan()
-    return result.get("Items", [])
+    return list(dal.profiles.parallel_scan())
@@ -0,0 +1,165 @@
+"""Concurrent fan-out for prompt-context reads under a latency budget.
+
+Building the orchestrator prompt needs several independent reads (profile,
+relationships, shared family memory, feature gates, sub-agent config,
+AgentCore memory). ``fan_out`` issues them concurrently and waits at most
+``budget_seconds`` in total (``PROMPT_CONTEXT_BUDGET_SECONDS``, see
+:func:`configured_budget`); sections that miss the deadline or fail are
+omitted from the result and counted, so one slow table or memory API cannot
+stall time-to-first-token. The counts are exported on ``/metrics`` as
+``homeagent_prompt_context_sections_total``.
+
+A running thread cannot be cancelled, so a section that misses the deadline
+keeps its pool thread until the read returns. To keep a slow backend from
+starving every other request's fan-out, at most
+``MAX_STRAGGLERS_PER_SECTION`` such overdue reads are allowed per section;
+while a section is at that limit, new fan-outs skip it without submitting
+it. Sections that have not started by the deadline are cancelled.
+
+Workers are ordinary threads, which become greenlets under gunicorn's gevent
+worker. Each task runs in a copy of the caller's ``contextvars`` context so
+Flask's app/request context (``current_app``, ``g``) is visible to it.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from flask import current_app
+
+from app.dal.metrics import DAL_METRICS, Sample
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_SECONDS = 1.5
+# With the handful of prompt sections this leaves pool threads for
+# healthy sections even when every backend is slow.
+MAX_STRAGGLERS_PER_SECTION = 4
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="prompt-ctx")
+
+_stats_lock = threading.Lock()
+_stats: dict[str, dict[str, int]] = {}
+# Section -> its reads that missed a deadline and are still running.
+_stragglers: dict[str, set[Future]] = {}
+
+
+def configured_budget() -> float:
+    """``PROMPT_CONTEXT_BUDGET_SECONDS`` of the current app, in seconds."""
+    return float(
+        current_app.config.get("PROMPT_CONTEXT_BUDGET_SECONDS", DEFAULT_BUDGET_SECONDS)
+    )
+
+
+def _record(section: str, outcome: str) -> None:
+    with _stats_lock:
+        counters = _stats.setdefault(
+            section, {"completed": 0, "timed_out": 0, "failed": 0, "skipped": 0}
+        )
+        counters[outcome] += 1
+
+
+def _is_saturated(section: str) -> bool:
+    with _stats_lock:
+        return len(_stragglers.get(section, ())) >= MAX_STRAGGLERS_PER_SECTION
+
+
+def _mark_straggler(section: str, future: Future) -> None:
+    with _stats_lock:
+        if not future.done():
+            _stragglers.setdefault(section, set()).add(future)
+
+
+def _release_straggler(section: str, future: Future) -> None:
+    with _stats_lock:
+        _stragglers.get(section, set()).discard(future)
+
+
+def fan_out(
+    tasks: dict[str, Callable[[], Any]],
+    budget_seconds: float = DEFAULT_BUDGET_SECONDS,
+) -> dict[str, Any]:
+    """Run independent zero-arg callables concurrently under one deadline.
+
+    Returns a dict of section name -> result for every task that finished
+    successfully within the budget. Sections that time out, raise or are
+    skipped (see the module docstring) are left out; callers supply their
+    own defaults via ``dict.get``.
+    """
+    if not tasks:
+        return {}
+
+    start = time.monotonic()
+    futures: dict[Future, str] = {}
+    for name, fn in tasks.items():
+        if _is_saturated(name):
+            _record(name, "skipped")
+            logger.warning(
+                "Prompt context section %s skipped: %d earlier reads still running",
+                name,
+                MAX_STRAGGLERS_PER_SECTION,
+            )
+            continue
+        future = _EXECUTOR.submit(contextvars.copy_context().run, fn)
+        future.add_done_callback(lambda f, name=name: _release_straggler(name, f))
+        futures[future] = name
+    done, not_done = wait(futures, timeout=budget_seconds)
+
+    results: dict[str, Any] = {}
+    for future in done:
+        name = futures[future]
+        try:
+            results[name] = future.result()
+        except Exception:
+            logger.warning("Prompt context section %s failed", name, exc_info=True)
+            _record(name, "failed")
+            continue
+        _record(name, "completed")
+
+    for future in not_done:
+        name = futures[future]
+        if not future.cancel():
+            _mark_straggler(name, future)
+        _record(name, "timed_out")
+        logger.warning(
+            "Prompt context section %s missed %.0fms budget, omitting",
+            name,
+            budget_seconds * 1000,
+        )
+
+    logger.debug(
+        "Prompt context fan-out of %d sections (%.2fms)",
+        len(tasks),
+        (time.monotonic() - start) * 1000,
+    )
+    return results
+
+
+def get_fan_out_stats() -> dict[str, dict[str, int]]:
+    """Return per-section completed/timed_out/failed/skipped counters."""
+    with _stats_lock:
+        return {name: dict(counters) for name, counters in _stats.items()}
+
+
+def fan_out_samples() -> list[Sample]:
+    """:func:`get_fan_out_stats` as Prometheus samples."""
+    return [
+        (
+            "homeagent_prompt_context_sections_total",
+            "counter",
+            "Prompt context sections by outcome "
+            "(completed, timed_out, failed, skipped).",
+            {"section": section, "outcome": outcome},
+            count,
+        )
+        for section, counters in sorted(get_fan_out_stats().items())
+        for outcome, count in counters.items()
+    ]
+
+
+DAL_METRICS.register_collector("prompt_context", fan_out_samples)
@@ -33,24 +33,14 @@ def set_storage_config(
         "connected_at": now,
         "updated_at": now,
     }
-    dal.storage_config._table.put_item(Item=item)
-    return item
+    return dal.storage_config.put(item)
 
 
 def update_storage_status(user_id: str, status: str) -> dict | None:
     """Update the status field."""
     dal = get_dal()
-    now = datetime.now(timezone.utc).isoformat()
     try:
-        result = dal.storage_config._table.update_item(
-            Key={"user_id": user_id},
-            UpdateExpression="SET #s = :s, updated_at = :u",
-            ExpressionAttributeNames={"#s": "status"},
-            ExpressionAttributeValues={":s": status, ":u": now},
-            ConditionExpression="attribute_exists(user_id)",
-            ReturnValues="ALL_NEW",
-        )
-        return result.get("Attributes")
+        return dal.storage_config.update({"user_id": user_id}, {"status": status})
     except Exception:
         return None
 
@@ -53,6 +53,10 @@ class MigrationProgress:
         }
 
 
+# Records handed to StorageProvider.put_records at a time; progress is
+# reported after each batch.
+RECORD_BATCH_SIZE = 100
+
 # Limits for ZIP import to prevent zip bombs
 _MAX_DECOMPRESSED_SIZE = 500 * 1024 * 1024  # 500 MB total
 _MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB per file
@@ -103,24 +107,12 @@ class StorageMigrator:
             doc_records = source.query_records("health_documents_meta", key_cond)
             progress.total_files = len(doc_records)  # Each doc may have a file
 
-            # Phase 2: Migrate structured records
+            # Phase 2: Migrate structured records, in batches
             for collection in MIGRATED_COLLECTIONS:
                 records = source.query_records(collection, key_cond)
-                for record in records:
-                    try:
-                        target.put_record(collection, record)
-                        progress.migrated_records += 1
-                        if progress_callback:
-                            progress_callback(
-                                collection,
-                                progress.migrated_records,
-                                progress.total_records,
-                            )
-                    except Exception as e:
-                        progress.errors.append(
-                            f"Failed to migrate {collection}/{record.get('record_id', '?')}: {e}"
-                        )
-                        logger.warning("Migration error for %s: %s", collection, e)
+                self._write_records(
+                    target, collection, records, progress, progress_callback
+                )
 
             # Phase 3: Migrate files
             for doc in doc_records:
@@ -227,6 +219,32 @@ class StorageMigrator:
             return None
         return filepath  # Return original (used as ZIP key)
 
+    @staticmethod
+    def _write_records(
+        target: StorageProvider,
+        collection: str,
+        records: list[dict],
+        progress: MigrationProgress,
+        progress_callback: Callable[[str, int, int], None] | None = None,
+    ) -> None:
+        """Write *records* with batched ``put_records``, tracking progress."""
+        for start in range(0, len(records), RECORD_BATCH_SIZE):
+            batch = records[start : start + RECORD_BATCH_SIZE]
+            try:
+                failed = target.put_records(collection, batch)
+            except Exception as e:
+                logger.warning("Migration error for %s: %s", collection, e)
+                failed = batch
+            progress.migrated_records += len(batch) - len(failed)
+            for record in failed:
+                progress.errors.append(
+                    f"Failed to migrate {collection}/{record.get('record_id', '?')}"
+                )
+            if progress_callback:
+                progress_callback(
+                    collection, progress.migrated_records, progress.total_records
+                )
+
     def import_data(
         self, user_id: str, target: StorageProvider, archive_data: bytes
     ) -> MigrationProgress:
@@ -272,6 +290,7 @@ class StorageMigrator:
                     ]
                     progress.total_records += len(files)
 
+                    records = []
                     for filepath in files:
                         try:
                             info = zf.getinfo(filepath)
@@ -280,11 +299,10 @@ class StorageMigrator:
                                     f"Skipped {filepath}: exceeds per-file size limit"
                                 )
                                 continue
-                            data = json.loads(zf.read(filepath))
-                            target.put_record(collection, data)
-                            progress.migrated_records += 1
+                            records.append(json.loads(zf.read(filepath)))
                         except Exception as e:
                             progress.errors.append(f"Import error {filepath}: {e}")
+                    self._write_records(target, collection, records, progress)
 
                 # Import files
                 file_prefix = "homeagent_export/health_documents_files/"
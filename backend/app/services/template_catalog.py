@@ -0,0 +1,177 @@
+"""In-process catalog of agent templates, kept fresh by a catalog version item.
+
+Templates change rarely but are read on hot paths: every orchestrator
+message resolves the user's sub-agent templates, and ``/api/session`` lists
+the available templates on every app start. The catalog loads the whole
+AgentTemplates table once per worker and indexes it by ``template_id`` and
+``agent_type`` so those reads become dictionary lookups.
+
+Freshness is tracked with a single item in the AgentTemplates table
+(``template_id == CATALOG_VERSION_ID``) holding a monotonically increasing
+``version``. Every template write bumps it with an atomic ``ADD``:
+
+- A write made through this worker is applied to the catalog in place;
+  if the bumped version is exactly one ahead of the cached version no
+  reload is needed.
+- At most once per ``check_interval`` a read does a single consistent
+  ``GetItem`` on the version item; if another worker bumped it, the
+  catalog is reloaded.
+
+The version item has no ``agent_type`` so it never appears in the
+``agent_type-index`` GSI; full scans skip it explicitly.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+import time
+from typing import Any
+
+from flask import current_app
+
+from app.dal.scan import parallel_scan
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_ID = "__catalog_version__"
+
+
+def bump_catalog_version(table: Any) -> int:
+    """Atomically increment the catalog version and return the new value."""
+    result = table.update_item(
+        Key={"template_id": CATALOG_VERSION_ID},
+        UpdateExpression="ADD #v :one",
+        ExpressionAttributeNames={"#v": "version"},
+        ExpressionAttributeValues={":one": 1},
+        ReturnValues="UPDATED_NEW",
+    )
+    return int(result["Attributes"]["version"])
+
+
+def read_catalog_version(table: Any) -> int:
+    """Return the current catalog version (0 if never bumped)."""
+    item = table.get_item(
+        Key={"template_id": CATALOG_VERSION_ID}, ConsistentRead=True
+    ).get("Item")
+    return int(item["version"]) if item else 0
+
+
+def scan_templates(table: Any) -> list[dict]:
+    """Scan every template item, skipping the catalog version item."""
+    return [
+        item
+        for item in parallel_scan(table)
+        if item.get("template_id") != CATALOG_VERSION_ID
+    ]
+
+
+class TemplateCatalog:
+    """Thread-safe template index keyed by template_id and agent_type."""
+
+    def __init__(self, check_interval: float = 5.0) -> None:
+        self._check_interval = check_interval
+        self._by_id: dict[str, dict] = {}
+        self._by_type: dict[str, dict] = {}
+        self._version: int | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    # -- reads ---------------------------------------------------------
+
+    def get(self, table: Any, template_id: str) -> dict | None:
+        self._ensure_fresh(table)
+        with self._lock:
+            item = self._by_id.get(template_id)
+        return copy.deepcopy(item) if item is not None else None
+
+    def get_by_type(self, table: Any, agent_type: str) -> dict | None:
+        self._ensure_fresh(table)
+        with self._lock:
+            item = self._by_type.get(agent_type)
+        return copy.deepcopy(item) if item is not None else None
+
+    def list(self, table: Any) -> list[dict]:
+        self._ensure_fresh(table)
+        with self._lock:
+            items = list(self._by_id.values())
+        return copy.deepcopy(items)
+
+    # -- local writes --------------------------------------------------
+
+    def apply_put(self, item: dict, version: int) -> None:
+        """Record a template written by this worker at catalog *version*."""
+        with self._lock:
+            previous = self._by_id.get(item["template_id"])
+            if previous is not None:
+                self._by_type.pop(previous.get("agent_type"), None)
+            stored = copy.deepcopy(item)
+            self._by_id[stored["template_id"]] = stored
+            self._by_type[stored["agent_type"]] = stored
+            self._advance(version)
+
+    def apply_delete(self, template_id: str, version: int) -> None:
+        """Record a template deleted by this worker at catalog *version*."""
+        with self._lock:
+            previous = self._by_id.pop(template_id, None)
+            if previous is not None:
+                self._by_type.pop(previous.get("agent_type"), None)
+            self._advance(version)
+
+    def invalidate(self) -> None:
+        """Force a version check on the next read."""
+        with self._lock:
+            self._checked_at = 0.0
+
+    # -- internals -----------------------------------------------------
+
+    def _advance(self, version: int) -> None:
+        # Caller holds the lock. A gap means another worker wrote in between,
+        # so leave the cached version behind and let the next read reload.
+        if self._version is not None and version == self._version + 1:
+            self._version = version
+        else:
+            self._checked_at = 0.0
+
+    def _ensure_fresh(self, table: Any) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and (
+                now - self._checked_at < self._check_interval
+            ):
+                return
+            cached_version = self._version
+
+        version = read_catalog_version(table)
+        if version == cached_version:
+            with self._lock:
+                self._checked_at = now
+            return
+
+        items = scan_templates(table)
+        by_id = {item["template_id"]: item for item in items}
+        by_type = {item["agent_type"]: item for item in items}
+        with self._lock:
+            self._by_id = by_id
+            self._by_type = by_type
+            self._version = version
+            self._checked_at = now
+        logger.info(
+            "Loaded %d agent templates at catalog version %d", len(by_id), version
+        )
+
+
+def get_template_catalog() -> TemplateCatalog:
+    """Return the app's TemplateCatalog, creating it on first use."""
+    catalog = current_app.extensions.get("template_catalog")
+    if catalog is None:
+        catalog = current_app.extensions.setdefault(
+            "template_catalog",
+            TemplateCatalog(
+                check_interval=float(
+                    current_app.config.get("TEMPLATE_CATALOG_CHECK_SECONDS", 5)
+                )
+            ),
+        )
+    return catalog
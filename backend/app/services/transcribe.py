@@ -9,10 +9,12 @@ import json
 import logging
 import time
 import uuid
+from typing import Any
 
-import boto3
 from flask import current_app
 
+from app import aws
+
 logger = logging.getLogger(__name__)
 
 TRANSCRIPTION_TIMEOUT_SECONDS = 120
@@ -21,34 +23,30 @@ _TRANSCRIBE_TEMP_BUCKET = "homeagent-transcribe-temp"
 
 
 def _get_transcribe_client():
-    return boto3.client(
-        "transcribe", region_name=current_app.config["AWS_REGION"]
-    )
+    return aws.client("transcribe", region_name=current_app.config["AWS_REGION"])
 
 
 def _get_local_s3_client():
     """S3 client for local MinIO."""
     endpoint = current_app.config.get("S3_ENDPOINT")
-    return boto3.client(
+    return aws.client(
         "s3",
         region_name=current_app.config["AWS_REGION"],
         endpoint_url=endpoint,
+        path_style=True,
         aws_access_key_id=current_app.config.get("S3_ACCESS_KEY_ID", "local"),
         aws_secret_access_key=current_app.config.get(
             "S3_SECRET_ACCESS_KEY", "locallocal"
         ),
-        config=boto3.session.Config(s3={"addressing_style": "path"}),
     )
 
 
 def _get_real_s3_client():
     """S3 client for real AWS (uses default credentials chain)."""
-    return boto3.client(
-        "s3", region_name=current_app.config["AWS_REGION"]
-    )
+    return aws.client("s3", region_name=current_app.config["AWS_REGION"])
 
 
-def _ensure_temp_bucket(s3_client: "boto3.client") -> None:
+def _ensure_temp_bucket(s3_client: Any) -> None:
     """Create the temp transcription bucket if it doesn't exist."""
     try:
         s3_client.head_bucket(Bucket=_TRANSCRIBE_TEMP_BUCKET)
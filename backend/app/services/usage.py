@@ -0,0 +1,129 @@
+"""Token usage and latency accounting for assistant messages.
+
+Every chat path (direct Bedrock, the local agent orchestrator and AgentCore
+Runtime) attaches a ``usage`` dict to its ``message_done`` event:
+
+    {
+        "input_tokens": int,
+        "output_tokens": int,
+        "cache_read_tokens": int,
+        "ttft_ms": int | None,      # time to first text delta
+        "generation_ms": int,       # model start to final event
+    }
+
+The dict is stored on the assistant message and added to per-user and
+per-family counters in the TokenUsage table (all-time and per month) with
+atomic ``ADD`` updates, so concurrent workers never lose increments.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from app.dal import get_dal
+
+logger = logging.getLogger(__name__)
+
+ALL_TIME = "all"
+
+_COUNTER_FIELDS = ("input_tokens", "output_tokens", "cache_read_tokens")
+
+
+def usage_from_bedrock(usage: dict | None) -> dict[str, int]:
+    """Convert a Bedrock/Strands ``Usage`` dict to snake_case token counts."""
+    usage = usage or {}
+    return {
+        "input_tokens": int(usage.get("inputTokens", 0) or 0),
+        "output_tokens": int(usage.get("outputTokens", 0) or 0),
+        "cache_read_tokens": int(usage.get("cacheReadInputTokens", 0) or 0),
+    }
+
+
+class GenerationTimer:
+    """Measures time-to-first-token and total generation time."""
+
+    def __init__(self) -> None:
+        self._start = time.monotonic()
+        self._first_token: float | None = None
+
+    def mark_token(self) -> None:
+        """Record a text delta; only the first call matters."""
+        if self._first_token is None:
+            self._first_token = time.monotonic()
+
+    def timings(self) -> dict[str, int | None]:
+        now = time.monotonic()
+        return {
+            "ttft_ms": (
+                int((self._first_token - self._start) * 1000)
+                if self._first_token is not None
+                else None
+            ),
+            "generation_ms": int((now - self._start) * 1000),
+        }
+
+
+def build_usage(tokens: dict[str, int] | None, timer: GenerationTimer) -> dict:
+    """Combine token counts and timer readings into a message usage dict."""
+    usage: dict[str, Any] = {field: 0 for field in _COUNTER_FIELDS}
+    usage.update(tokens or {})
+    usage.update(timer.timings())
+    return usage
+
+
+def total_tokens(usage: dict | None) -> int:
+    """Input plus output tokens, as stored in a message's ``tokens_used``."""
+    if not usage:
+        return 0
+    return int(usage.get("input_tokens", 0)) + int(usage.get("output_tokens", 0))
+
+
+def _counters(usage: dict) -> dict[str, int]:
+    counters = {field: int(usage.get(field) or 0) for field in _COUNTER_FIELDS}
+    counters["messages"] = 1
+    counters["generation_ms_total"] = int(usage.get("generation_ms") or 0)
+    if usage.get("ttft_ms") is not None:
+        counters["ttft_ms_total"] = int(usage["ttft_ms"])
+        counters["ttft_samples"] = 1
+    return counters
+
+
+def record_message_usage(user_id: str, family_id: str | None, usage: dict) -> None:
+    """Add one message's usage to the user's and family's counters."""
+    dal = get_dal()
+    counters = _counters(usage)
+    month = datetime.now(timezone.utc).strftime("%Y-%m")
+    scopes = [f"user#{user_id}"]
+    if family_id:
+        scopes.append(f"family#{family_id}")
+    for scope in scopes:
+        for period in (ALL_TIME, month):
+            dal.token_usage.add_usage(scope, period, counters)
+
+
+def _summarize(row: dict) -> dict:
+    summary = {
+        key: int(value)
+        for key, value in row.items()
+        if key not in ("scope", "period", "updated_at")
+    }
+    messages = summary.get("messages", 0)
+    samples = summary.get("ttft_samples", 0)
+    summary["avg_generation_ms"] = (
+        summary.get("generation_ms_total", 0) / messages if messages else 0.0
+    )
+    summary["avg_ttft_ms"] = (
+        summary.get("ttft_ms_total", 0) / samples if samples else 0.0
+    )
+    summary["updated_at"] = row.get("updated_at")
+    return summary
+
+
+def get_usage(scope_type: str, scope_id: str) -> dict:
+    """Return ``{"all": {...}, "YYYY-MM": {...}}`` counters for a scope."""
+    dal = get_dal()
+    result = dal.token_usage.query_by_scope(f"{scope_type}#{scope_id}")
+    return {row["period"]: _summarize(row) for row in result.items}
@@ -3,10 +3,10 @@ import secrets
 import uuid
 from datetime import datetime, timezone
 
-import boto3
 from flask import current_app
 from ulid import ULID
 
+from app import aws
 from app.dal import get_dal
 from app.dal.exceptions import DuplicateEntityError
 from app.services.agent_config import put_agent_config
@@ -190,7 +190,7 @@ def send_invite_email(
 
     try:
         region = current_app.config.get("AWS_REGION", "us-east-1")
-        ses_client = boto3.client("ses", region_name=region)
+        ses_client = aws.client("ses", region_name=region)
         ses_client.send_email(
             Source=from_email,
             Destination={"ToAddresses": [email]},
@@ -216,24 +216,15 @@ def get_pending_invites_by_creator(created_by: str) -> list[dict]:
     created_by. Consider adding a created_by-status-index GSI if this
     becomes a performance bottleneck.
     """
-    dal = get_dal()
-    items = []
-    last_key = None
-    while True:
-        from boto3.dynamodb.conditions import Attr
+    from boto3.dynamodb.conditions import Attr
 
-        kwargs: dict = {
-            "FilterExpression": Attr("created_by").eq(created_by)
+    dal = get_dal()
+    return list(
+        dal.invite_codes.parallel_scan(
+            filter_expression=Attr("created_by").eq(created_by)
             & Attr("status").eq("active"),
-        }
-        if last_key:
-            kwargs["ExclusiveStartKey"] = last_key
-        result = dal.invite_codes._table.scan(**kwargs)
-        items.extend(result.get("Items", []))
-        last_key = result.get("LastEvaluatedKey")
-        if not last_key:
-            break
-    return items
+        )
+    )
 
 
 def cancel_invite_code(code: str, user_id: str) -> bool:
@@ -325,24 +316,27 @@ def delete_member(user_id: str) -> None:
         raise ValueError("Cannot delete an admin user")
 
     # 2. Delete Devices (query user_id-index GSI)
-    devices = dal.devices.query_by_user(user_id, limit=100)
-    if devices.items:
-        dal.devices.batch_delete([{"device_id": d["device_id"]} for d in devices.items])
-
-    # 3. Delete Conversations + Messages
-    convos = dal.conversations.query_by_user(user_id, limit=100)
-    for item in convos.items:
-        delete_conversation(item["conversation_id"])
+    device_keys = [
+        {"device_id": d["device_id"]} for d in dal.devices.iter_by_user(user_id)
+    ]
+    if device_keys:
+        dal.devices.batch_delete(device_keys)
+
+    # 3. Delete Conversations + Messages (collect ids first: deleting while
+    #    paging the same index would shift the pages)
+    conversation_ids = [
+        c["conversation_id"] for c in dal.conversations.iter_by_user(user_id)
+    ]
+    for conversation_id in conversation_ids:
+        delete_conversation(conversation_id)
 
     # 4. Delete AgentConfigs
-    configs = dal.agent_configs.query_by_user(user_id, limit=100)
-    if configs.items:
-        dal.agent_configs.batch_delete(
-            [
-                {"user_id": c["user_id"], "agent_type": c["agent_type"]}
-                for c in configs.items
-            ]
-        )
+    config_keys = [
+        {"user_id": c["user_id"], "agent_type": c["agent_type"]}
+        for c in dal.agent_configs.query_iter(user_id)
+    ]
+    if config_keys:
+        dal.agent_configs.batch_delete(config_keys)
 
     # 5. Delete FamilyRelationships (both directions)
     delete_all_relationships(user_id)
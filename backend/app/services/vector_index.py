@@ -0,0 +1,503 @@
+"""Per-user vector index over message chunks, for long-range recall.
+
+Long conversations only reach the model as the last 50 raw messages (plus
+AgentCore memory when configured). When ``VECTOR_MEMORY_ENABLED`` is set,
+``add_message`` also splits each message into chunks, embeds them (see
+:mod:`app.services.embeddings`) and appends them to the owner's index (for
+chat messages, after the response has streamed). The
+orchestrator then asks :func:`recall` for the few chunks most similar to
+the new message and adds them to the system prompt.
+
+On-disk layout, one directory per user under ``VECTOR_INDEX_DIR``
+(``<user_id[:2]>/<user_id>/``):
+
+- ``header.json``  — embedder name, dimension and storage dtype
+- ``vectors.bin``  — row-major matrix, one row per chunk (float32 or int8)
+- ``scales.bin``   — float32 per-row scales (int8 only; row ≈ int8 * scale)
+- ``chunks.jsonl`` — one JSON line per row: text and message metadata
+- ``rewrite``      — present only while a rewrite is being installed
+
+Search is brute force: the matrix is memory-mapped and scored in blocks,
+then ``argpartition`` picks the top k. int8 storage cuts the matrix to a
+quarter of its float32 size at a small cost in accuracy.
+
+Appends write the vector rows before the metadata line and readers use
+``min(rows, lines)``, so a crash mid-append leaves at most an orphan row,
+which the next append truncates. Removing a conversation rewrites all
+three data files: the new versions are written as ``*.tmp`` files, then
+the ``rewrite`` marker commits them and they are moved into place. Whoever
+next takes the lock and finds the marker (after a crash mid-install)
+finishes moving them, so vectors and chunks are never paired across
+versions. Writers take an exclusive ``fcntl`` lock
+on the directory's ``lock`` file and readers a shared one, so gunicorn
+workers on one host can share an index. If the header no longer matches
+the configured embedder, the index is re-embedded from ``chunks.jsonl``.
+The index lives on local disk, so every API host keeps its own copy.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from flask import current_app
+
+from app.services.embeddings import Embedder, get_embedder
+
+logger = logging.getLogger(__name__)
+
+CHUNK_CHARS = 600
+CHUNK_OVERLAP = 100
+SEARCH_BLOCK_ROWS = 8192
+
+_USER_ID_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def chunk_text(
+    text: str, size: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP
+) -> list[str]:
+    """Split *text* into overlapping chunks, breaking at whitespace."""
+    text = " ".join(text.split())
+    if len(text) <= size:
+        return [text] if text else []
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            space = text.rfind(" ", start + overlap, end)
+            if space > start:
+                end = space
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        next_start = text.find(" ", end - overlap, end)
+        start = next_start + 1 if next_start != -1 else end
+    return [c for c in chunks if c]
+
+
+class VectorIndex:
+    """Append-only, memory-mapped embedding matrix for one user."""
+
+    def __init__(self, path: Path, embedder: Embedder, dtype: str = "float32") -> None:
+        if dtype not in ("float32", "int8"):
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        self.path = path
+        self.embedder = embedder
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.RLock()
+        self._chunks: list[dict[str, Any]] = []
+        self._chunks_bytes = 0
+        self._chunks_inode: int | None = None
+        self._rows = 0
+        self._vectors: np.ndarray | None = None
+        self._scales: np.ndarray | None = None
+
+        path.mkdir(parents=True, exist_ok=True)
+        self._check_header()
+
+    # -- files -------------------------------------------------------------
+
+    @property
+    def _vectors_file(self) -> Path:
+        return self.path / "vectors.bin"
+
+    @property
+    def _scales_file(self) -> Path:
+        return self.path / "scales.bin"
+
+    @property
+    def _chunks_file(self) -> Path:
+        return self.path / "chunks.jsonl"
+
+    @property
+    def _rewrite_marker(self) -> Path:
+        return self.path / "rewrite"
+
+    @property
+    def _data_files(self) -> tuple[Path, Path, Path]:
+        return (self._vectors_file, self._scales_file, self._chunks_file)
+
+    @staticmethod
+    def _tmp(target: Path) -> Path:
+        return target.with_suffix(target.suffix + ".tmp")
+
+    @property
+    def _quantized(self) -> bool:
+        return self.dtype == np.int8
+
+    def _row_bytes(self) -> int:
+        return self.embedder.dim * self.dtype.itemsize
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False) -> Iterator[None]:
+        with self._lock, open(self.path / "lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _check_header(self) -> None:
+        header = {
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "dtype": self.dtype.name,
+        }
+        header_file = self.path / "header.json"
+        with self._file_lock():
+            try:
+                current = json.loads(header_file.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                current = None
+            if current == header:
+                return
+
+            self._sync()
+            chunks = list(self._chunks)
+            for f in self._data_files:
+                f.unlink(missing_ok=True)
+                self._tmp(f).unlink(missing_ok=True)
+            header_file.write_text(json.dumps(header))
+            self._reset()
+            if chunks:
+                logger.info(
+                    "Re-embedding %d chunks in %s for %s",
+                    len(chunks),
+                    self.path,
+                    header,
+                )
+                self._append_locked(
+                    chunks, self.embedder.embed([c["text"] for c in chunks])
+                )
+
+    def _reset(self) -> None:
+        self._chunks = []
+        self._chunks_bytes = 0
+        self._chunks_inode = None
+        self._rows = 0
+        self._vectors = None
+        self._scales = None
+
+    def _install_rewrite(self) -> None:
+        """Move a committed rewrite's ``*.tmp`` files over the data files.
+
+        Idempotent, so it also completes a rewrite whose writer crashed
+        part-way (the lock is held, shared or exclusive, and any holders
+        finishing it concurrently move the same files).
+        """
+        for target in self._data_files:
+            try:
+                os.replace(self._tmp(target), target)
+            except FileNotFoundError:
+                pass
+        self._rewrite_marker.unlink(missing_ok=True)
+
+    def _sync(self) -> None:
+        """Pick up rows appended (or files rewritten) since the last sync."""
+        if self._rewrite_marker.exists():
+            self._install_rewrite()
+        try:
+            stat = self._chunks_file.stat()
+        except FileNotFoundError:
+            self._reset()
+            return
+        if stat.st_ino != self._chunks_inode:
+            self._reset()
+            self._chunks_inode = stat.st_ino
+        if stat.st_size > self._chunks_bytes:
+            with open(self._chunks_file, "rb") as f:
+                f.seek(self._chunks_bytes)
+                data = f.read(stat.st_size - self._chunks_bytes)
+            complete = data.rfind(b"\n") + 1
+            self._chunks.extend(
+                json.loads(line) for line in data[:complete].splitlines()
+            )
+            self._chunks_bytes += complete
+
+        try:
+            rows = self._vectors_file.stat().st_size // self._row_bytes()
+        except FileNotFoundError:
+            rows = 0
+        if rows != self._rows or self._vectors is None:
+            self._rows = rows
+            if rows == 0:
+                self._vectors = np.empty((0, self.embedder.dim), dtype=self.dtype)
+                self._scales = np.empty(0, dtype=np.float32)
+            else:
+                self._vectors = np.memmap(
+                    self._vectors_file,
+                    dtype=self.dtype,
+                    mode="r",
+                    shape=(rows, self.embedder.dim),
+                )
+                self._scales = (
+                    np.memmap(
+                        self._scales_file, dtype=np.float32, mode="r", shape=(rows,)
+                    )
+                    if self._quantized
+                    else None
+                )
+
+    def __len__(self) -> int:
+        with self._file_lock(shared=True):
+            self._sync()
+            return min(len(self._chunks), self._rows)
+
+    # -- writes ------------------------------------------------------------
+
+    def _encode(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not self._quantized:
+            return vectors, None
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(
+            np.int8
+        )
+        return quantized, scales.astype(np.float32)
+
+    def _append_locked(self, chunks: list[dict], vectors: np.ndarray) -> None:
+        count = len(self._chunks)
+        if self._rows > count:  # orphan rows from an interrupted append
+            os.truncate(self._vectors_file, count * self._row_bytes())
+            if self._quantized:
+                os.truncate(self._scales_file, count * 4)
+        encoded, scales = self._encode(vectors)
+        with open(self._vectors_file, "ab") as f:
+            f.write(encoded.tobytes())
+        if scales is not None:
+            with open(self._scales_file, "ab") as f:
+                f.write(scales.tobytes())
+        with open(self._chunks_file, "ab") as f:
+            f.write(
+                b"".join(
+                    json.dumps(c, ensure_ascii=False).encode("utf-8") + b"\n"
+                    for c in chunks
+                )
+            )
+        self._sync()
+
+    def add(self, chunks: list[dict[str, Any]]) -> None:
+        """Embed and append chunks; each needs ``text`` plus any metadata."""
+        if not chunks:
+            return
+        vectors = self.embedder.embed([c["text"] for c in chunks])
+        with self._file_lock():
+            self._sync()
+            self._append_locked(chunks, vectors)
+
+    def remove_conversation(self, conversation_id: str) -> int:
+        """Rewrite the index without a conversation's chunks."""
+        with self._file_lock():
+            self._sync()
+            n = min(len(self._chunks), self._rows)
+            keep = [
+                i
+                for i in range(n)
+                if self._chunks[i].get("conversation_id") != conversation_id
+            ]
+            removed = n - len(keep)
+            if removed == 0:
+                return 0
+
+            self._tmp(self._scales_file).unlink(missing_ok=True)
+            files = [(self._vectors_file, np.asarray(self._vectors[keep]).tobytes())]
+            if self._quantized:
+                files.append(
+                    (self._scales_file, np.asarray(self._scales[keep]).tobytes())
+                )
+            files.append(
+                (
+                    self._chunks_file,
+                    b"".join(
+                        json.dumps(self._chunks[i], ensure_ascii=False).encode("utf-8")
+                        + b"\n"
+                        for i in keep
+                    ),
+                )
+            )
+            for target, data in files:
+                self._tmp(target).write_bytes(data)
+            # The marker is the commit point: from here on the new files
+            # win, even if this process dies before installing them all.
+            self._rewrite_marker.touch()
+            self._install_rewrite()
+            self._reset()
+            self._sync()
+            return removed
+
+    # -- search ------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        k: int = 4,
+        min_score: float = 0.0,
+        exclude_conversation_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Top-*k* chunks by cosine similarity, best first, with ``score``."""
+        q = self.embedder.embed([query])[0]
+        with self._file_lock(shared=True):
+            self._sync()
+            n = min(len(self._chunks), self._rows)
+            if n == 0 or k <= 0:
+                return []
+            vectors, scales, chunks = self._vectors, self._scales, self._chunks[:n]
+
+        scores = np.empty(n, dtype=np.float32)
+        for start in range(0, n, SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, n)
+            block = np.asarray(vectors[start:end], dtype=np.float32) @ q
+            if scales is not None:
+                block *= scales[start:end]
+            scores[start:end] = block
+        if exclude_conversation_id:
+            excluded = np.fromiter(
+                (c.get("conversation_id") == exclude_conversation_id for c in chunks),
+                dtype=bool,
+                count=n,
+            )
+            scores[excluded] = -np.inf
+
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {**chunks[i], "score": float(scores[i])}
+            for i in top
+            if np.isfinite(scores[i]) and scores[i] >= min_score
+        ]
+
+
+class VectorStore:
+    """Opens per-user indexes under one root, keeping recent ones open."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        embedder: Embedder,
+        dtype: str = "float32",
+        max_open: int = 128,
+    ) -> None:
+        self.root = Path(root)
+        self.embedder = embedder
+        self.dtype = dtype
+        self.max_open = max_open
+        self._lock = threading.Lock()
+        self._open: OrderedDict[str, VectorIndex] = OrderedDict()
+
+    def index_for(self, user_id: str) -> VectorIndex:
+        if not _USER_ID_RE.fullmatch(user_id):
+            raise ValueError(f"Invalid user_id for vector index: {user_id!r}")
+        with self._lock:
+            index = self._open.get(user_id)
+            if index is not None:
+                self._open.move_to_end(user_id)
+                return index
+            index = VectorIndex(
+                self.root / user_id[:2] / user_id, self.embedder, self.dtype
+            )
+            self._open[user_id] = index
+            while len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+            return index
+
+
+# ---------------------------------------------------------------------------
+# App integration
+# ---------------------------------------------------------------------------
+
+
+def is_vector_memory_enabled() -> bool:
+    return bool(current_app.config.get("VECTOR_MEMORY_ENABLED", False))
+
+
+def get_vector_store() -> VectorStore:
+    """Return the app's VectorStore, creating it on first use."""
+    store = current_app.extensions.get("vector_store")
+    if store is None:
+        cfg = current_app.config
+        store = current_app.extensions.setdefault(
+            "vector_store",
+            VectorStore(
+                cfg["VECTOR_INDEX_DIR"],
+                get_embedder(),
+                dtype=cfg.get("VECTOR_INDEX_DTYPE", "float32"),
+            ),
+        )
+    return store
+
+
+def remember_message(user_id: str, message: dict) -> None:
+    """Chunk, embed and append a stored message to its owner's index.
+
+    Best effort: failures are logged and never fail the message itself.
+    """
+    if not is_vector_memory_enabled():
+        return
+    try:
+        chunks = [
+            {
+                "text": text,
+                "conversation_id": message["conversation_id"],
+                "message_id": message["message_id"],
+                "role": message.get("role", ""),
+                "created_at": message.get("created_at", ""),
+            }
+            for text in chunk_text(message.get("content") or "")
+        ]
+        get_vector_store().index_for(user_id).add(chunks)
+    except Exception:
+        logger.warning(
+            "Failed to add message %s to vector index",
+            message.get("message_id"),
+            exc_info=True,
+        )
+
+
+def forget_conversation(user_id: str, conversation_id: str) -> None:
+    """Drop a deleted conversation's chunks from the owner's index.
+
+    Best effort, like :func:`remember_message`: a failure is logged and
+    never stops the conversation itself from being deleted.
+    """
+    if not is_vector_memory_enabled():
+        return
+    try:
+        get_vector_store().index_for(user_id).remove_conversation(conversation_id)
+    except Exception:
+        logger.warning(
+            "Failed to remove conversation %s from vector index",
+            conversation_id,
+            exc_info=True,
+        )
+
+
+def recall(
+    user_id: str, query: str, exclude_conversation_id: str | None = None
+) -> list[dict[str, Any]]:
+    """Chunks from past conversations most relevant to *query*."""
+    if not is_vector_memory_enabled() or not query.strip():
+        return []
+    cfg = current_app.config
+    return (
+        get_vector_store()
+        .index_for(user_id)
+        .search(
+            query,
+            k=int(cfg.get("RECALL_TOP_K", 4)),
+            min_score=float(cfg.get("RECALL_MIN_SCORE", 0.25)),
+            exclude_conversation_id=exclude_conversation_id,
+        )
+    )
@@ -0,0 +1,285 @@
+"""Cached, coalesced web search backed by DuckDuckGo's HTML endpoint.
+
+Family members often ask the same thing within minutes of each other
+("weather tomorrow", "school closures"), so :class:`WebSearchService`
+keeps parsed results in a per-worker TTL cache keyed by the normalized
+query. Concurrent identical queries share one upstream request
+(single-flight), and requests go through a pooled ``requests.Session`` so
+repeat searches reuse a warm TLS connection.
+
+Responses are streamed into an incremental parser that stops parsing once
+enough results are seen. Failed searches are not cached.
+
+Agent tools run on the agent runtime's loop thread without a Flask app
+context, so the shared service is a module-level singleton configured from
+:class:`app.config.Config` rather than ``current_app``. Its cache counters
+are exported on ``/metrics`` as ``homeagent_web_search_*``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import Config
+from app.dal.metrics import DAL_METRICS, Sample
+
+logger = logging.getLogger(__name__)
+
+DDG_HTML_URL = "https://html.duckduckgo.com/html/"
+USER_AGENT = "Mozilla/5.0 (compatible; HomeAgent/1.0; +https://github.com/homeagent)"
+
+# Results kept per query; the tool asks for at most this many.
+MAX_RESULTS = 10
+_CHUNK_SIZE = 16 * 1024
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for *query*: case-folded with whitespace collapsed."""
+    return " ".join(query.casefold().split())
+
+
+class DDGResultParser(HTMLParser):
+    """Incremental parser for DuckDuckGo HTML result anchors.
+
+    Feed it chunks as they arrive; ``done`` turns true once ``limit``
+    results have been collected so the caller can stop feeding.
+    """
+
+    def __init__(self, limit: int = MAX_RESULTS) -> None:
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.results: list[dict] = []
+        self._current: dict | None = None
+        self._field: str | None = None
+        self._parts: list[str] = []
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) >= self.limit
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag != "a":
+            return
+        classes = ""
+        href = ""
+        for name, value in attrs:
+            if name == "class":
+                classes = value or ""
+            elif name == "href":
+                href = value or ""
+        if "result__a" in classes:
+            self._current = {"title": "", "url": href, "snippet": ""}
+            self._field = "title"
+            self._parts = []
+        elif "result__snippet" in classes and self._current is not None:
+            self._field = "snippet"
+            self._parts = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag != "a" or self._field is None or self._current is None:
+            return
+        self._current[self._field] = " ".join(self._parts)
+        if self._field == "snippet":
+            if self._current["title"]:
+                self.results.append(self._current)
+            self._current = None
+        self._field = None
+
+    def handle_data(self, data: str) -> None:
+        if self._field is not None:
+            stripped = data.strip()
+            if stripped:
+                self._parts.append(stripped)
+
+
+def parse_results(html: str, limit: int = MAX_RESULTS) -> list[dict]:
+    """Parse a complete DuckDuckGo HTML page."""
+    parser = DDGResultParser(limit)
+    parser.feed(html)
+    return parser.results[:limit]
+
+
+class _Flight:
+    """An in-progress upstream search that identical queries wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.results: list[dict] | None = None
+        self.error: BaseException | None = None
+
+
+class WebSearchService:
+    """Pooled, cached and coalesced web search for one worker process."""
+
+    def __init__(
+        self,
+        base_url: str = DDG_HTML_URL,
+        ttl_seconds: float = 300.0,
+        timeout: float = 5.0,
+        max_entries: int = 512,
+        pool_size: int = 16,
+    ) -> None:
+        self.base_url = base_url
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+        self.max_entries = max_entries
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers["User-Agent"] = USER_AGENT
+
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, tuple[list[dict], float]] = OrderedDict()
+        self._flights: dict[str, _Flight] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._errors = 0
+
+    def search(self, query: str, max_results: int = 5) -> list[dict]:
+        """Return up to *max_results* results for *query*.
+
+        Raises ``requests.RequestException`` when the upstream request
+        fails; every caller coalesced onto that request sees the error.
+        """
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                results, cached_at = entry
+                if time.monotonic() - cached_at < self.ttl_seconds:
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    return results[:max_results]
+                del self._cache[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._misses += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            if not flight.done.wait(self.timeout * 2):
+                raise requests.Timeout("Timed out waiting for a shared search")
+            if flight.error is not None:
+                raise flight.error
+            return flight.results[:max_results]
+
+        try:
+            flight.results = self._fetch(query)
+        except BaseException as exc:
+            flight.error = exc
+            with self._lock:
+                self._errors += 1
+            raise
+        else:
+            with self._lock:
+                self._cache[key] = (flight.results, time.monotonic())
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return flight.results[:max_results]
+
+    def _fetch(self, query: str) -> list[dict]:
+        start = time.monotonic()
+        with self._session.get(
+            self.base_url,
+            params={"q": query},
+            timeout=self.timeout,
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            resp.encoding = resp.encoding or "utf-8"
+            parser = DDGResultParser(MAX_RESULTS)
+            for chunk in resp.iter_content(_CHUNK_SIZE, decode_unicode=True):
+                # Keep draining once done so the connection returns to the pool.
+                if not parser.done:
+                    parser.feed(chunk)
+        logger.debug(
+            "Web search fetched %d results (%.2fms)",
+            len(parser.results),
+            (time.monotonic() - start) * 1000,
+        )
+        return parser.results[:MAX_RESULTS]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses + self._coalesced
+            served = self._hits + self._coalesced
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "errors": self._errors,
+                "entries": len(self._cache),
+                "hit_rate": served / lookups if lookups else 0.0,
+            }
+
+
+_service: WebSearchService | None = None
+_service_lock = threading.Lock()
+
+
+def get_search_service() -> WebSearchService:
+    """Return the process-wide search service, creating it on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = WebSearchService(
+                base_url=Config.WEB_SEARCH_URL,
+                ttl_seconds=Config.WEB_SEARCH_CACHE_TTL_SECONDS,
+                timeout=Config.WEB_SEARCH_TIMEOUT_SECONDS,
+            )
+        return _service
+
+
+def get_web_search_stats() -> dict[str, Any]:
+    """Cache hit/miss/coalesced counters for the process-wide service."""
+    return get_search_service().stats()
+
+
+def web_search_samples() -> list[Sample]:
+    """The shared service's counters as Prometheus samples."""
+    with _service_lock:
+        service = _service
+    if service is None:
+        return []
+    stats = service.stats()
+    series = [
+        ("cache_hits_total", "counter", "Searches answered from the cache.", "hits"),
+        ("cache_misses_total", "counter", "Searches sent upstream.", "misses"),
+        (
+            "coalesced_total",
+            "counter",
+            "Searches that joined an identical in-flight search.",
+            "coalesced",
+        ),
+        ("errors_total", "counter", "Upstream searches that failed.", "errors"),
+        ("cache_entries", "gauge", "Queries held in the cache.", "entries"),
+    ]
+    return [
+        (f"homeagent_web_search_{name}", kind, help_text, {}, stats[key])
+        for name, kind, help_text, key in series
+    ]
+
+
+DAL_METRICS.register_collector("web_search", web_search_samples)
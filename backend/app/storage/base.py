@@ -15,6 +15,18 @@ class StorageProvider(ABC):
         condition_expression: str | None = None,
     ) -> dict[str, Any] | None: ...
 
+    def put_records(
+        self,
+        collection: str,
+        records: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Write several records; returns the ones that were not written.
+
+        Bulk paths (migration, import) use this. The default writes one
+        record at a time; providers with a batch API override it.
+        """
+        return [r for r in records if self.put_record(collection, r) is None]
+
     @abstractmethod
     def get_record(
         self,
@@ -5,9 +5,10 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import boto3
 from boto3.dynamodb.conditions import Attr, Key
 
+from app import aws
+from app.dal.base import BaseRepository, RepositoryConfig
 from app.storage.base import (
     COLLECTION_HEALTH_AUDIT_LOG,
     COLLECTION_HEALTH_DOCUMENTS,
@@ -60,49 +61,51 @@ class LocalProvider(StorageProvider):
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _get_table(self, collection: str) -> Any:
-        """Return a DynamoDB Table resource.
+    def _get_dynamodb(self, *, for_dal: bool = False) -> Any:
+        """Return the DynamoDB resource (the DAL's one with *for_dal*).
 
-        Tries Flask request-scoped helpers first, falls back to direct boto3
-        so the provider works in background threads too.
+        Uses the app's DynamoDB settings when there is an app context and
+        the environment otherwise, so the provider works in background
+        threads too.
         """
+        factory = aws.dal_dynamodb_resource if for_dal else aws.dynamodb_resource
+        try:
+            from flask import current_app  # noqa: WPS433
+
+            return factory(current_app.config)
+        except RuntimeError:
+            # Outside Flask application context – use the environment.
+            return factory()
+
+    def _get_table(self, collection: str) -> Any:
+        """Return a DynamoDB Table resource."""
         table_info = _TABLE_MAP.get(collection)
         if not table_info:
             raise ValueError(f"Unknown collection: {collection}")
-
-        table_name = table_info["table"]
-
-        try:
-            from flask import current_app, g  # noqa: WPS433
-
-            if "dynamodb" not in g:
-                endpoint_url = current_app.config.get("DYNAMODB_ENDPOINT")
-                kwargs: dict[str, Any] = {
-                    "region_name": current_app.config["AWS_REGION"]
-                }
-                if endpoint_url:
-                    kwargs["endpoint_url"] = endpoint_url
-                g.dynamodb = boto3.resource("dynamodb", **kwargs)
-            return g.dynamodb.Table(table_name)
-        except RuntimeError:
-            # Outside Flask application context – use plain boto3.
-            dynamodb = boto3.resource("dynamodb")
-            return dynamodb.Table(table_name)
+        return self._get_dynamodb().Table(table_info["table"])
+
+    def _get_repository(self, collection: str) -> BaseRepository:
+        """Return a DAL repository over a collection's table (batch writes)."""
+        pk_attr, sk_attr = self._key_info(collection)
+        config = RepositoryConfig(
+            table_name=_TABLE_MAP[collection]["table"],
+            partition_key=pk_attr,
+            sort_key=sk_attr,
+        )
+        return BaseRepository(config, self._get_dynamodb(for_dal=True))
 
     def _get_s3_client(self) -> Any:
         """Return an S3 client."""
         try:
             from flask import current_app  # noqa: WPS433
 
-            kwargs: dict[str, Any] = {
-                "region_name": current_app.config["AWS_REGION"]
-            }
-            endpoint_url = current_app.config.get("S3_ENDPOINT")
-            if endpoint_url:
-                kwargs["endpoint_url"] = endpoint_url
-            return boto3.client("s3", **kwargs)
+            return aws.client(
+                "s3",
+                region_name=current_app.config["AWS_REGION"],
+                endpoint_url=current_app.config.get("S3_ENDPOINT"),
+            )
         except RuntimeError:
-            return boto3.client("s3")
+            return aws.client("s3")
 
     def _get_bucket_name(self) -> str:
         """Return the S3 bucket name for health documents."""
@@ -148,6 +151,25 @@ class LocalProvider(StorageProvider):
             logger.exception("put_record failed for %s", collection)
             return None
 
+    def put_records(
+        self,
+        collection: str,
+        records: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Write records with BatchWriteItem, 25 per request."""
+        if not records:
+            return []
+        try:
+            pk_attr, sk_attr = self._key_info(collection)
+            result = self._get_repository(collection).batch_put(records)
+        except Exception:
+            logger.exception("put_records failed for %s", collection)
+            return list(records)
+        if result.ok:
+            return []
+        failed = {(f.key.get(pk_attr), f.key.get(sk_attr)) for f in result.failures}
+        return [r for r in records if (r.get(pk_attr), r.get(sk_attr)) in failed]
+
     def get_record(
         self,
         collection: str,
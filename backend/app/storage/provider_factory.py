@@ -5,8 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import boto3
-
+from app import aws
 from app.storage.base import StorageProvider
 
 logger = logging.getLogger(__name__)
@@ -24,20 +23,12 @@ _PROVIDER_MAP: dict[str, tuple[str, str]] = {
 def _get_storage_config_table() -> Any:
     """Return the StorageConfig DynamoDB table resource."""
     try:
-        from flask import current_app, g  # noqa: WPS433
-
-        if "dynamodb" not in g:
-            endpoint_url = current_app.config.get("DYNAMODB_ENDPOINT")
-            kwargs: dict[str, Any] = {
-                "region_name": current_app.config["AWS_REGION"]
-            }
-            if endpoint_url:
-                kwargs["endpoint_url"] = endpoint_url
-            g.dynamodb = boto3.resource("dynamodb", **kwargs)
-        return g.dynamodb.Table("StorageConfig")
+        from flask import current_app  # noqa: WPS433
+
+        dynamodb = aws.dynamodb_resource(current_app.config)
     except RuntimeError:
-        dynamodb = boto3.resource("dynamodb")
-        return dynamodb.Table("StorageConfig")
+        dynamodb = aws.dynamodb_resource()
+    return dynamodb.Table("StorageConfig")
 
 
 def _load_provider_class(provider_name: str) -> type[StorageProvider]:
@@ -6,9 +6,10 @@ import logging
 import time
 from typing import Any
 
-import boto3
 import requests
 
+from app import aws
+
 logger = logging.getLogger(__name__)
 
 # Provider-specific token refresh endpoints
@@ -33,20 +34,12 @@ class OAuthTokenManager:
     def _get_table(self) -> Any:
         """Return the OAuthTokens DynamoDB Table resource."""
         try:
-            from flask import current_app, g  # noqa: WPS433
-
-            if "dynamodb" not in g:
-                endpoint_url = current_app.config.get("DYNAMODB_ENDPOINT")
-                kwargs: dict[str, Any] = {
-                    "region_name": current_app.config["AWS_REGION"]
-                }
-                if endpoint_url:
-                    kwargs["endpoint_url"] = endpoint_url
-                g.dynamodb = boto3.resource("dynamodb", **kwargs)
-            return g.dynamodb.Table("OAuthTokens")
+            from flask import current_app  # noqa: WPS433
+
+            dynamodb = aws.dynamodb_resource(current_app.config)
         except RuntimeError:
-            dynamodb = boto3.resource("dynamodb")
-            return dynamodb.Table("OAuthTokens")
+            dynamodb = aws.dynamodb_resource()
+        return dynamodb.Table("OAuthTokens")
 
     def _get_config(self, provider: str) -> dict[str, str]:
         """Return OAuth client_id / client_secret for *provider*."""
@@ -8,3 +8,14 @@ keepalive = 5
 accesslog = "-"
 errorlog = "-"
 loglevel = "info"
+
+
+def on_starting(server):
+    """Drop DAL metrics snapshots left by a previous master."""
+    import os
+
+    metrics_dir = os.environ.get("METRICS_MULTIPROC_DIR")
+    if metrics_dir:
+        from app.dal.metrics import clear_multiproc_dir
+
+        clear_multiproc_dir(metrics_dir)
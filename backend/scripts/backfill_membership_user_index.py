@@ -0,0 +1,251 @@
+"""Provision the FamilyMembers ``user_id-index`` GSI and backfill Users.family_id.
+
+Family lookups by member (``MembershipRepository.get_family_id_for_user``)
+query the ``user_id-index`` GSI instead of scanning the whole FamilyMembers
+table. Tables created before the index was added to ``TABLE_DEFINITIONS`` /
+the CDK data stack do not have it, so this tool:
+
+1. Adds the GSI to an existing FamilyMembers table (no-op if present) and
+   waits until it is ACTIVE. DynamoDB backfills the index from the base
+   table automatically.
+2. Reconciles the ``family_id`` attribute on Users records with their
+   FamilyMembers row, which is the fallback used while the index builds.
+
+Supports dry-run mode for validation before execution.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from app import aws
+from app.dal.scan import DEFAULT_SEGMENTS, parallel_scan
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "user_id-index"
+
+
+# ---------------------------------------------------------------------------
+# BackfillReport
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class BackfillReport:
+    """Summary of a backfill run."""
+
+    index_created: bool = False
+    scanned: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+
+# ---------------------------------------------------------------------------
+# Index provisioning
+# ---------------------------------------------------------------------------
+
+
+def ensure_user_index(
+    dynamodb_client: Any,
+    table_name: str = "FamilyMembers",
+    dry_run: bool = False,
+    wait_timeout: float = 600.0,
+    poll_interval: float = 5.0,
+) -> bool:
+    """Create ``user_id-index`` on *table_name* if it does not exist.
+
+    Returns True if the index was created (or would be, in dry-run mode).
+    Blocks until the index reports ACTIVE or *wait_timeout* elapses.
+    """
+    description = dynamodb_client.describe_table(TableName=table_name)["Table"]
+    existing = {
+        gsi["IndexName"] for gsi in description.get("GlobalSecondaryIndexes", [])
+    }
+    if INDEX_NAME in existing:
+        logger.info("%s already has %s", table_name, INDEX_NAME)
+        return False
+
+    if dry_run:
+        logger.info("[DRY RUN] Would create %s on %s", INDEX_NAME, table_name)
+        return True
+
+    logger.info("Creating %s on %s", INDEX_NAME, table_name)
+    dynamodb_client.update_table(
+        TableName=table_name,
+        AttributeDefinitions=[{"AttributeName": "user_id", "AttributeType": "S"}],
+        GlobalSecondaryIndexUpdates=[
+            {
+                "Create": {
+                    "IndexName": INDEX_NAME,
+                    "KeySchema": [{"AttributeName": "user_id", "KeyType": "HASH"}],
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+            }
+        ],
+    )
+
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        description = dynamodb_client.describe_table(TableName=table_name)["Table"]
+        for gsi in description.get("GlobalSecondaryIndexes", []):
+            if gsi["IndexName"] == INDEX_NAME and gsi.get("IndexStatus") == "ACTIVE":
+                logger.info("%s on %s is ACTIVE", INDEX_NAME, table_name)
+                return True
+        time.sleep(poll_interval)
+
+    logger.warning(
+        "%s on %s not ACTIVE after %.0fs; lookups fall back to Users.family_id",
+        INDEX_NAME,
+        table_name,
+        wait_timeout,
+    )
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Users.family_id backfill
+# ---------------------------------------------------------------------------
+
+
+def backfill_user_family_ids(
+    dynamodb_resource: Any,
+    table_prefix: str = "",
+    dry_run: bool = False,
+    report: BackfillReport | None = None,
+    total_segments: int = DEFAULT_SEGMENTS,
+) -> BackfillReport:
+    """Set Users.family_id from each FamilyMembers row where it differs."""
+    report = report or BackfillReport()
+    members_table = dynamodb_resource.Table(f"{table_prefix}FamilyMembers")
+    users_table = dynamodb_resource.Table(f"{table_prefix}Users")
+
+    for member in parallel_scan(
+        members_table,
+        total_segments=total_segments,
+        projection=["family_id", "user_id"],
+    ):
+        report.scanned += 1
+        user_id = member["user_id"]
+        family_id = member["family_id"]
+        try:
+            user = users_table.get_item(Key={"user_id": user_id}).get("Item")
+            if user is None or user.get("family_id") == family_id:
+                report.unchanged += 1
+                continue
+            if dry_run:
+                logger.info(
+                    "[DRY RUN] Would set family_id=%s on user %s",
+                    family_id,
+                    user_id,
+                )
+            else:
+                users_table.update_item(
+                    Key={"user_id": user_id},
+                    UpdateExpression="SET family_id = :fid",
+                    ExpressionAttributeValues={":fid": family_id},
+                )
+            report.updated += 1
+        except Exception:
+            logger.exception("Failed to backfill family_id for user %s", user_id)
+            report.failed += 1
+
+    return report
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    """CLI entry point for the membership index backfill."""
+    parser = argparse.ArgumentParser(
+        description="Provision FamilyMembers user_id-index and backfill Users.family_id"
+    )
+    parser.add_argument(
+        "--region",
+        default="us-east-1",
+        help="AWS region (default: us-east-1)",
+    )
+    parser.add_argument(
+        "--dynamodb-endpoint",
+        help="DynamoDB endpoint URL (for local dev)",
+    )
+    parser.add_argument(
+        "--table-prefix",
+        default="",
+        help="Table name prefix (default: none)",
+    )
+    parser.add_argument(
+        "--skip-index",
+        action="store_true",
+        help="Only reconcile Users.family_id; do not touch the GSI",
+    )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=DEFAULT_SEGMENTS,
+        help=f"Parallel scan segments (default: {DEFAULT_SEGMENTS})",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Preview changes without updating the table or Users records",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable debug logging",
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    ddb_kwargs: dict = {"region_name": args.region}
+    if args.dynamodb_endpoint:
+        ddb_kwargs["endpoint_url"] = args.dynamodb_endpoint
+    dynamodb_resource = aws.resource("dynamodb", **ddb_kwargs)
+    dynamodb_client = aws.client("dynamodb", **ddb_kwargs)
+
+    report = BackfillReport()
+    if not args.skip_index:
+        report.index_created = ensure_user_index(
+            dynamodb_client,
+            table_name=f"{args.table_prefix}FamilyMembers",
+            dry_run=args.dry_run,
+        )
+    backfill_user_family_ids(
+        dynamodb_resource,
+        table_prefix=args.table_prefix,
+        dry_run=args.dry_run,
+        report=report,
+        total_segments=args.segments,
+    )
+
+    mode = "DRY RUN " if args.dry_run else ""
+    print(
+        f"\n{mode}Backfill complete: "
+        f"index {'created' if report.index_created else 'present'}, "
+        f"{report.scanned} memberships scanned, "
+        f"{report.updated} users updated, "
+        f"{report.unchanged} unchanged, "
+        f"{report.failed} failed"
+    )
+
+    if report.failed > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Backfill the MessageSearchIndex table from existing conversation history.
+
+New messages are indexed by ``add_message``. Messages stored before the
+index existed are not, so this tool walks every conversation, builds the
+postings for each of its messages with the same tokenizer the app uses
+(:func:`app.services.message_search.build_postings`) and writes them.
+Postings are keyed deterministically, so re-running it is safe.
+
+Supports dry-run mode for validation before execution.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+from boto3.dynamodb.conditions import Key
+
+from app import aws
+from app.dal.scan import DEFAULT_SEGMENTS, parallel_scan
+from app.services.message_search import build_postings
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# BackfillReport
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class BackfillReport:
+    """Summary of a backfill run."""
+
+    conversations: int = 0
+    messages: int = 0
+    postings: int = 0
+    failed: int = 0
+
+
+# ---------------------------------------------------------------------------
+# Backfill
+# ---------------------------------------------------------------------------
+
+
+def _conversation_messages(messages_table: Any, conversation_id: str):
+    kwargs: dict[str, Any] = {
+        "KeyConditionExpression": Key("conversation_id").eq(conversation_id)
+    }
+    while True:
+        page = messages_table.query(**kwargs)
+        yield from page.get("Items", [])
+        last_key = page.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def backfill_message_index(
+    dynamodb_resource: Any,
+    table_prefix: str = "",
+    dry_run: bool = False,
+    report: BackfillReport | None = None,
+    total_segments: int = DEFAULT_SEGMENTS,
+) -> BackfillReport:
+    """Index every message of every conversation."""
+    report = report or BackfillReport()
+    conversations_table = dynamodb_resource.Table(f"{table_prefix}Conversations")
+    messages_table = dynamodb_resource.Table(f"{table_prefix}Messages")
+    index_table = dynamodb_resource.Table(f"{table_prefix}MessageSearchIndex")
+
+    for conv in parallel_scan(
+        conversations_table,
+        total_segments=total_segments,
+        projection=["conversation_id", "user_id"],
+    ):
+        report.conversations += 1
+        conversation_id = conv["conversation_id"]
+        try:
+            postings = []
+            for message in _conversation_messages(messages_table, conversation_id):
+                report.messages += 1
+                postings.extend(build_postings(conv["user_id"], message))
+            if dry_run:
+                logger.info(
+                    "[DRY RUN] Would write %d postings for conversation %s",
+                    len(postings),
+                    conversation_id,
+                )
+            else:
+                with index_table.batch_writer(
+                    overwrite_by_pkeys=["user_id", "term_key"]
+                ) as batch:
+                    for posting in postings:
+                        batch.put_item(Item=posting)
+            report.postings += len(postings)
+        except Exception:
+            logger.exception("Failed to index conversation %s", conversation_id)
+            report.failed += 1
+
+    return report
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    """CLI entry point for the message search index backfill."""
+    parser = argparse.ArgumentParser(
+        description="Backfill MessageSearchIndex from existing messages"
+    )
+    parser.add_argument(
+        "--region",
+        default="us-east-1",
+        help="AWS region (default: us-east-1)",
+    )
+    parser.add_argument(
+        "--dynamodb-endpoint",
+        help="DynamoDB endpoint URL (for local dev)",
+    )
+    parser.add_argument(
+        "--table-prefix",
+        default="",
+        help="Table name prefix (default: none)",
+    )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=DEFAULT_SEGMENTS,
+        help=f"Parallel scan segments (default: {DEFAULT_SEGMENTS})",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Preview postings without writing them",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable debug logging",
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    ddb_kwargs: dict = {"region_name": args.region}
+    if args.dynamodb_endpoint:
+        ddb_kwargs["endpoint_url"] = args.dynamodb_endpoint
+    dynamodb_resource = aws.resource("dynamodb", **ddb_kwargs)
+
+    report = backfill_message_index(
+        dynamodb_resource,
+        table_prefix=args.table_prefix,
+        dry_run=args.dry_run,
+        total_segments=args.segments,
+    )
+
+    mode = "DRY RUN " if args.dry_run else ""
+    print(
+        f"\n{mode}Backfill complete: "
+        f"{report.conversations} conversations, "
+        f"{report.messages} messages, "
+        f"{report.postings} postings, "
+        f"{report.failed} failed"
+    )
+
+    if report.failed > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Micro-benchmark for InMemoryRepository reads.
+
+InMemoryRepository stores immutable records and returns them from every
+read without copying. This tool measures query and get throughput of that
+implementation against a baseline that keeps plain dicts and deep-copies
+each item on the way out, which is how the repository used to protect
+its store from callers.
+
+Items are shaped like chat messages: a few scalar attributes plus a list
+of nested content blocks, so the copy cost is representative.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import time
+from typing import Any, Callable
+
+from app.dal.in_memory import InMemoryRepository
+
+
+class DeepCopyRepository(InMemoryRepository):
+    """Baseline: mutable stored items, deep-copied on every read."""
+
+    def create(self, item: dict[str, Any]) -> dict[str, Any]:
+        item = copy.deepcopy(item)
+        self._table.put(item)
+        return copy.deepcopy(item)
+
+    @staticmethod
+    def _project(item: dict[str, Any], projection: list[str] | None) -> dict:
+        return copy.deepcopy(InMemoryRepository._project(item, projection))
+
+
+def make_item(conversation: int, n: int, blocks: int) -> dict[str, Any]:
+    """A message-like item with *blocks* nested content blocks."""
+    return {
+        "conversation_id": f"conv-{conversation}",
+        "sort_key": f"2026-01-01T00:00:{n:05d}Z#{n}",
+        "role": "assistant" if n % 2 else "user",
+        "model": "model-1",
+        "tokens": {"input": 100 + n, "output": 200 + n},
+        "content": [
+            {"type": "text", "text": f"block {b} of message {n} " * 4}
+            for b in range(blocks)
+        ],
+    }
+
+
+def load(
+    repo: InMemoryRepository, conversations: int, messages: int, blocks: int
+) -> None:
+    for conversation in range(conversations):
+        for n in range(messages):
+            repo.create(make_item(conversation, n, blocks))
+
+
+def measure(fn: Callable[[], int], seconds: float) -> float:
+    """Items per second returned by repeated calls to *fn*."""
+    items = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        items += fn()
+        elapsed = time.perf_counter() - start
+    return items / elapsed
+
+
+def workloads(
+    repo: InMemoryRepository, conversations: int, messages: int, page_size: int
+) -> dict[str, Callable[[], int]]:
+    """Read workloads against *repo*, each returning the items it read."""
+    keys = [
+        repo._extract_key(make_item(c, n, 0))
+        for c in range(conversations)
+        for n in range(0, messages, max(1, messages // 10))
+    ]
+
+    def query() -> int:
+        return sum(
+            repo.query(f"conv-{c}", limit=page_size).count for c in range(conversations)
+        )
+
+    def query_all() -> int:
+        return sum(
+            len(repo.query_all(f"conv-{c}", page_size=page_size))
+            for c in range(conversations)
+        )
+
+    def get() -> int:
+        return sum(repo.get_by_id(key) is not None for key in keys)
+
+    return {"query": query, "query_all": query_all, "get_by_id": get}
+
+
+def run(
+    conversations: int, messages: int, blocks: int, page_size: int, seconds: float
+) -> dict[str, dict[str, float]]:
+    """Throughput per implementation, keyed by workload."""
+    implementations = {"deepcopy": DeepCopyRepository, "frozen": InMemoryRepository}
+    results: dict[str, dict[str, float]] = {}
+    for label, cls in implementations.items():
+        repo = cls("conversation_id", "sort_key")
+        load(repo, conversations, messages, blocks)
+        results[label] = {
+            name: measure(fn, seconds)
+            for name, fn in workloads(repo, conversations, messages, page_size).items()
+        }
+    return results
+
+
+def main() -> None:
+    """CLI entry point for the InMemoryRepository benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Compare InMemoryRepository read throughput with deep copies"
+    )
+    parser.add_argument(
+        "--conversations",
+        type=int,
+        default=20,
+        help="Partitions to load (default: 20)",
+    )
+    parser.add_argument(
+        "--messages",
+        type=int,
+        default=200,
+        help="Items per partition (default: 200)",
+    )
+    parser.add_argument(
+        "--blocks",
+        type=int,
+        default=4,
+        help="Nested content blocks per item (default: 4)",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=50,
+        help="Query page size (default: 50)",
+    )
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        default=2.0,
+        help="Time spent on each measurement (default: 2.0)",
+    )
+
+    args = parser.parse_args()
+
+    results = run(
+        args.conversations, args.messages, args.blocks, args.page_size, args.seconds
+    )
+
+    print(f"{'workload':<12}{'deepcopy':>14}{'frozen':>14}{'speedup':>10}")
+    for workload in results["frozen"]:
+        before = results["deepcopy"][workload]
+        after = results["frozen"][workload]
+        print(
+            f"{workload:<12}{before:>12,.0f}/s{after:>12,.0f}/s{after / before:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
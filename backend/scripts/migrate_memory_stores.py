@@ -18,8 +18,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
-import boto3
-
+from app import aws
 from app.models.agentcore import FamilyMemoryStoresItem
 from app.services.family_memory_registry import FamilyMemoryStoreRegistry
 
@@ -352,11 +351,9 @@ def main() -> None:
     ddb_kwargs: dict = {"region_name": args.region}
     if args.dynamodb_endpoint:
         ddb_kwargs["endpoint_url"] = args.dynamodb_endpoint
-    dynamodb_resource = boto3.resource("dynamodb", **ddb_kwargs)
+    dynamodb_resource = aws.resource("dynamodb", **ddb_kwargs)
 
-    agentcore_client = boto3.client(
-        "bedrock-agentcore", region_name=args.region
-    )
+    agentcore_client = aws.client("bedrock-agentcore", region_name=args.region)
 
     registry = FamilyMemoryStoreRegistry(
         dynamodb_resource=dynamodb_resource,
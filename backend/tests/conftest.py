@@ -1,15 +1,17 @@
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
-import boto3
 import pytest
 
-# Use a SEPARATE DynamoDB Local instance for tests (port 8001) so that
-# running the test suite does not wipe development data on port 8000.
-# Start the test instance before running tests:
+# Tests run against the in-process DynamoDB (app.dal.memory) by default.
+# To run them against DynamoDB Local instead, use a SEPARATE instance (not
+# the development one on port 8000, which the suite would wipe):
 #   docker run --rm -p 8001:8000 amazon/dynamodb-local -jar DynamoDBLocal.jar -inMemory -sharedDb
-_TEST_DYNAMODB_ENDPOINT = os.environ.get(
-    "TEST_DYNAMODB_ENDPOINT", "http://localhost:8001"
-)
+#   TEST_DYNAMODB_ENDPOINT=http://localhost:8001 python -m pytest tests/
+_TEST_DYNAMODB_ENDPOINT = os.environ.get("TEST_DYNAMODB_ENDPOINT", "memory://test")
 
 os.environ["DYNAMODB_ENDPOINT"] = _TEST_DYNAMODB_ENDPOINT
 os.environ["AWS_REGION"] = "us-east-1"
@@ -20,13 +22,13 @@ os.environ["COGNITO_USER_POOL_ID"] = "us-east-1_TestPool"
 os.environ["COGNITO_CLIENT_ID"] = "testclientid123"
 os.environ["COGNITO_REGION"] = "us-east-1"
 
-from app import create_app  # noqa: E402
+from app import aws, create_app  # noqa: E402
 from app.config import Config  # noqa: E402
 
 
 @pytest.fixture(scope="session")
 def dynamo_client():
-    return boto3.client(
+    return aws.client(
         "dynamodb",
         endpoint_url=_TEST_DYNAMODB_ENDPOINT,
         region_name="us-east-1",
@@ -51,3 +53,64 @@ def app(dynamo_client):
 @pytest.fixture()
 def client(app):
     return app.test_client()
+
+
+class FakeSearchServer:
+    """Local stand-in for DuckDuckGo's HTML endpoint.
+
+    Serves ``html`` (a format string receiving ``query``) and records the
+    query of every request it receives. ``delay`` slows each response.
+    """
+
+    html = (
+        "<html><body>"
+        '<a class="result__a" href="https://example.com/{query}">Result for {query}</a>'
+        '<a class="result__snippet">About <b>{query}</b> today.</a>'
+        "</body></html>"
+    )
+
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+        self.delay = 0.0
+        self.status = 200
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query).get("q", [""])[0]
+                server.queries.append(query)
+                time.sleep(server.delay)
+                body = server.html.format(query=query).encode()
+                self.send_response(server.status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/html/"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture()
+def search_server(monkeypatch):
+    """A fake search server wired into the process-wide search service."""
+    from app.services import web_search
+
+    server = FakeSearchServer()
+    monkeypatch.setattr(
+        web_search,
+        "_service",
+        web_search.WebSearchService(base_url=server.url, timeout=2),
+    )
+    yield server
+    server.close()
@@ -0,0 +1,154 @@
+"""Tests for the shared agent runtime (event loop, admission, bridging)."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services.agent_runtime import AgentRuntime, AgentRuntimeBusy
+
+
+@pytest.fixture()
+def runtime():
+    rt = AgentRuntime(max_concurrency=2, max_queue=1, queue_timeout=5)
+    yield rt
+    rt.shutdown()
+
+
+def _job(*chunks, delay=0.0):
+    async def run(emit):
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            await emit({"type": "text_delta", "content": chunk})
+
+    return run
+
+
+def test_streams_events_in_order(runtime):
+    job = runtime.submit(runtime.reserve(), _job("a", "b", "c"))
+    assert [e["content"] for e in job.events()] == ["a", "b", "c"]
+
+
+def test_runs_share_one_loop_concurrently(runtime):
+    start = time.monotonic()
+    jobs = [runtime.submit(runtime.reserve(), _job("x", delay=0.2)) for _ in range(2)]
+    for job in jobs:
+        list(job.events())
+    assert time.monotonic() - start < 0.35
+
+
+def test_rejects_when_queue_full(runtime):
+    reservations = [runtime.reserve() for _ in range(3)]
+    with pytest.raises(AgentRuntimeBusy):
+        runtime.reserve()
+    assert runtime.stats()["rejected"] == 1
+
+    reservations[0].release()
+    reservations[0].release()  # idempotent
+    runtime.reserve()
+
+
+def test_excess_runs_wait_for_a_slot(runtime):
+    jobs = [runtime.submit(runtime.reserve(), _job("x", delay=0.2)) for _ in range(3)]
+    time.sleep(0.05)
+    stats = runtime.stats()
+    assert stats["active"] == 2
+    assert stats["queue_depth"] == 1
+
+    for job in jobs:
+        list(job.events())
+    stats = runtime.stats()
+    assert stats["active"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["wait_max_ms"] >= 150
+
+
+def test_job_exception_becomes_error_event(runtime):
+    async def boom(emit):
+        raise RuntimeError("bedrock down")
+
+    events = list(runtime.submit(runtime.reserve(), boom).events())
+    assert events[-1]["type"] == "error"
+    assert runtime.stats()["queue_depth"] == 0
+
+
+def test_closing_consumer_cancels_run(runtime):
+    cancelled = []
+
+    async def endless(emit):
+        try:
+            while True:
+                await emit({"type": "text_delta", "content": "."})
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    stream = runtime.submit(runtime.reserve(), endless).events()
+    next(stream)
+    stream.close()
+    time.sleep(0.1)
+
+    assert cancelled == [True]
+    assert runtime.stats()["queue_depth"] == 0
+
+
+def test_chat_returns_429_when_runtime_full(app, client):
+    from app.services.agent_runtime import get_agent_runtime
+
+    app.config["USE_AGENT_ORCHESTRATOR"] = True
+    resp = client.post(
+        "/api/auth/register",
+        json={
+            "invite_code": "FAMILY",
+            "device_name": "Phone",
+            "platform": "ios",
+            "display_name": "Tester",
+        },
+    )
+    token = resp.get_json()["device_token"]
+
+    with app.app_context():
+        runtime = get_agent_runtime()
+    with patch.object(runtime, "reserve", side_effect=AgentRuntimeBusy("busy")):
+        resp = client.post(
+            "/api/chat",
+            json={"message": "Hi"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "5"
+
+
+def test_runtime_is_exported_on_metrics_and_performance_config(app, client):
+    from app.services.agent_runtime import get_agent_runtime
+    from app.services.agentcore_performance import get_performance_config
+
+    app.config.update(
+        AGENT_MAX_CONCURRENCY=1,
+        AGENT_MAX_QUEUE=1,
+        AGENT_QUEUE_TIMEOUT_SECONDS=7,
+        PROMPT_CONTEXT_BUDGET_SECONDS=0.5,
+        METRICS_TOKEN="scrape-secret",
+    )
+    with app.app_context():
+        runtime = get_agent_runtime()
+        runtime.reserve()
+        runtime.reserve()
+        with pytest.raises(AgentRuntimeBusy):
+            runtime.reserve()
+        config = get_performance_config()
+
+    assert config["agent_runtime"]["max_concurrency"] == 1
+    assert config["agent_runtime"]["queue_timeout_seconds"] == 7.0
+    assert config["agent_runtime"]["stats"]["rejected"] == 1
+    assert config["prompt_context"]["budget_seconds"] == 0.5
+
+    text = client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    ).text
+    assert "# TYPE homeagent_agent_runtime_queue_depth gauge" in text
+    assert "homeagent_agent_runtime_queue_depth 2" in text
+    assert "homeagent_agent_runtime_rejected_total 1" in text
@@ -1,7 +1,5 @@
 """Tests for the default agent tools (time and search)."""
 
-from unittest.mock import patch, MagicMock
-
 import pytest
 
 
@@ -28,48 +26,36 @@ class TestWebSearchTool:
 
         assert web_search is not None
 
-    @patch("app.agents.search_tool.requests.get")
-    def test_search_request_failure_no_query_leak(self, mock_get):
+    def test_search_request_failure_no_query_leak(self, search_server):
         from app.agents.search_tool import web_search
 
-        import requests as req
-        mock_get.side_effect = req.RequestException("Network error")
+        search_server.status = 503
         result = web_search._tool_func(query="sensitive health query", max_results=3)
         assert "temporarily unavailable" in result.lower()
         assert "sensitive health query" not in result
 
-    @patch("app.agents.search_tool.requests.get")
-    def test_search_no_results(self, mock_get):
+    def test_search_no_results(self, search_server):
         from app.agents.search_tool import web_search
 
-        mock_resp = MagicMock()
-        mock_resp.status_code = 200
-        mock_resp.text = "<html><body>No results</body></html>"
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+        search_server.html = "<html><body>No results</body></html>"
 
         result = web_search._tool_func(query="xyznonexistent", max_results=3)
         assert "No results" in result
 
-    @patch("app.agents.search_tool.requests.get")
-    def test_search_parses_results(self, mock_get):
+    def test_search_parses_results(self, search_server):
         from app.agents.search_tool import web_search
 
-        html = """
+        search_server.html = """
         <html><body>
         <a class="result__a" href="https://example.com">Example Title</a>
         <a class="result__snippet">This is a snippet about the topic.</a>
         </body></html>
         """
-        mock_resp = MagicMock()
-        mock_resp.status_code = 200
-        mock_resp.text = html
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
 
         result = web_search._tool_func(query="test", max_results=5)
         assert "Example Title" in result
         assert "snippet about the topic" in result
+        assert "URL: https://example.com" in result
 
 
 class TestDefaultToolsIntegration:
@@ -0,0 +1,122 @@
+"""Tests for the shared boto3 client factory."""
+
+import json
+
+import pytest
+from botocore.awsrequest import AWSResponse
+
+from app import aws
+
+
+@pytest.fixture(autouse=True)
+def fresh_factory():
+    aws.reset()
+    yield
+    aws.configure(
+        max_pool_connections=aws.DEFAULT_MAX_POOL_CONNECTIONS,
+        max_attempts=aws.DEFAULT_MAX_ATTEMPTS,
+    )
+    aws.reset()
+
+
+def test_clients_are_cached_per_service_region_and_endpoint():
+    s3 = aws.client("s3", region_name="us-east-1")
+    assert aws.client("s3", region_name="us-east-1") is s3
+    assert aws.client("s3", region_name="us-west-2") is not s3
+    minio = aws.client("s3", region_name="us-east-1", endpoint_url="http://minio:9000")
+    assert minio is not s3
+    assert aws.client("sqs", region_name="us-east-1") is not s3
+
+
+def test_clients_use_tuned_pool_and_retries():
+    aws.configure(max_pool_connections=80, max_attempts=5)
+    config = aws.client("s3", region_name="us-east-1").meta.config
+    assert config.max_pool_connections == 80
+    assert config.retries == {"mode": "standard", "total_max_attempts": 5}
+
+
+def test_only_the_dal_resource_leaves_retries_to_the_dal():
+    aws.configure(max_attempts=5)
+    config = {"AWS_REGION": "us-east-1"}
+    shared = aws.dynamodb_resource(config)
+    dal = aws.dal_dynamodb_resource(config)
+    assert dal is not shared
+    assert aws.dal_dynamodb_resource(dict(config)) is dal
+    assert shared.meta.client.meta.config.retries == {
+        "mode": "standard",
+        "total_max_attempts": 5,
+    }
+    assert dal.meta.client.meta.config.retries == {
+        "mode": "standard",
+        "total_max_attempts": aws.DAL_MAX_ATTEMPTS,
+    }
+
+
+def test_non_dal_table_write_survives_a_throttle(app, monkeypatch):
+    from app.models.dynamo import get_table
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    monkeypatch.setitem(app.config, "DYNAMODB_ENDPOINT", "http://dynamodb.test")
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    sent = []
+
+    def respond(request, **kwargs):
+        sent.append(request)
+        if len(sent) == 1:
+            code = "ProvisionedThroughputExceededException"
+            body = {"__type": code, "message": "slow down"}
+            return AWSResponse(request.url, 400, {}, _Raw(body))
+        return AWSResponse(request.url, 200, {}, _Raw({}))
+
+    with app.app_context():
+        table = get_table("Users")
+        table.meta.client.meta.events.register("before-send.dynamodb", respond)
+        table.put_item(Item={"user_id": "u1"})
+
+    assert len(sent) == 2
+
+
+class _Raw:
+    """Minimal urllib3-style body for a canned ``AWSResponse``."""
+
+    def __init__(self, body):
+        self._body = json.dumps(body).encode()
+
+    def stream(self, **kwargs):
+        yield self._body
+
+
+def test_configure_drops_clients_built_with_other_settings():
+    before = aws.client("s3", region_name="us-east-1")
+    aws.configure(max_pool_connections=aws.DEFAULT_MAX_POOL_CONNECTIONS)
+    assert aws.client("s3", region_name="us-east-1") is before
+    aws.configure(max_pool_connections=7)
+    assert aws.client("s3", region_name="us-east-1") is not before
+
+
+def test_path_style_and_explicit_credentials():
+    s3 = aws.client(
+        "s3",
+        region_name="us-east-1",
+        endpoint_url="http://minio:9000",
+        path_style=True,
+        aws_access_key_id="local",
+        aws_secret_access_key="locallocal",
+    )
+    assert s3.meta.config.s3 == {"addressing_style": "path"}
+    assert s3.meta.config.max_pool_connections == aws.DEFAULT_MAX_POOL_CONNECTIONS
+    assert s3._request_signer._credentials.access_key == "local"
+
+
+def test_forked_child_builds_its_own_clients(monkeypatch):
+    s3 = aws.client("s3", region_name="us-east-1")
+    monkeypatch.setattr(aws, "_pid", -1)  # as if this process were a fork
+    assert aws.client("s3", region_name="us-east-1") is not s3
+
+
+def test_dynamodb_resource_follows_app_config():
+    config = {"AWS_REGION": "us-east-1", "DYNAMODB_ENDPOINT": "http://localhost:8000"}
+    resource = aws.dynamodb_resource(config)
+    assert aws.dynamodb_resource(dict(config)) is resource
+    assert resource.meta.client.meta.endpoint_url == "http://localhost:8000"
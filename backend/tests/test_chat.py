@@ -106,3 +106,26 @@ def test_chat_invalid_conversation(mock_bedrock, client):
         headers={"Authorization": f"Bearer {token}"},
     )
     assert resp.status_code == 404
+
+
+@patch("app.routes.chat.stream_chat")
+def test_chat_indexes_messages_after_streaming(mock_bedrock, client):
+    token = _register(client)
+    calls = []
+
+    def stream(messages, system_prompt=None, images=None):
+        calls.append("stream")
+        yield from _mock_stream_chat(messages)
+
+    mock_bedrock.side_effect = stream
+    with patch(
+        "app.routes.chat.index_stored_message",
+        side_effect=lambda user_id, message: calls.append(message["role"]),
+    ):
+        resp = client.post(
+            "/api/chat",
+            json={"message": "Hi there!"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert _parse_sse(resp.data)[-1]["type"] == "message_done"
+    assert calls == ["stream", "user", "assistant"]
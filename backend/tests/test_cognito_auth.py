@@ -17,11 +17,11 @@ def _cognito_client_error(code: str, message: str) -> ClientError:
 # ---------------------------------------------------------------------------
 
 
-@patch("app.services.cognito.boto3")
-def test_signup_success(mock_boto3, client):
+@patch("app.services.cognito.aws")
+def test_signup_success(mock_aws_clients, client):
     """Test successful owner signup via Cognito."""
     mock_cognito = MagicMock()
-    mock_boto3.client.return_value = mock_cognito
+    mock_aws_clients.client.return_value = mock_cognito
     mock_cognito.sign_up.return_value = {"UserSub": "cognito-sub-123"}
 
     response = client.post(
@@ -38,11 +38,11 @@ def test_signup_success(mock_boto3, client):
     assert data["email"] == "owner@example.com"
 
 
-@patch("app.services.cognito.boto3")
-def test_signup_duplicate_email(mock_boto3, client):
+@patch("app.services.cognito.aws")
+def test_signup_duplicate_email(mock_aws_clients, client):
     """Test signup with an email that already exists in Cognito."""
     mock_cognito = MagicMock()
-    mock_boto3.client.return_value = mock_cognito
+    mock_aws_clients.client.return_value = mock_cognito
     mock_cognito.sign_up.side_effect = _cognito_client_error(
         "UsernameExistsException", "An account with the given email already exists."
     )
@@ -117,11 +117,11 @@ def test_signup_password_no_special_char(client):
 # ---------------------------------------------------------------------------
 
 
-@patch("app.services.cognito.boto3")
-def test_confirm_success(mock_boto3, client):
+@patch("app.services.cognito.aws")
+def test_confirm_success(mock_aws_clients, client):
     """Test successful email confirmation."""
     mock_cognito = MagicMock()
-    mock_boto3.client.return_value = mock_cognito
+    mock_aws_clients.client.return_value = mock_cognito
     mock_cognito.confirm_sign_up.return_value = {}
 
     response = client.post(
@@ -135,11 +135,11 @@ def test_confirm_success(mock_boto3, client):
     assert response.get_json()["confirmed"] is True
 
 
-@patch("app.services.cognito.boto3")
-def test_confirm_invalid_code(mock_boto3, client):
+@patch("app.services.cognito.aws")
+def test_confirm_invalid_code(mock_aws_clients, client):
     """Test confirmation with wrong code."""
     mock_cognito = MagicMock()
-    mock_boto3.client.return_value = mock_cognito
+    mock_aws_clients.client.return_value = mock_cognito
     mock_cognito.confirm_sign_up.side_effect = _cognito_client_error(
         "CodeMismatchException", "Invalid verification code provided."
     )
@@ -169,11 +169,11 @@ def test_confirm_missing_fields(client):
 # ---------------------------------------------------------------------------
 
 
-@patch("app.services.cognito.boto3")
-def test_login_success(mock_boto3, client):
+@patch("app.services.cognito.aws")
+def test_login_success(mock_aws_clients, client):
     """Test successful login returns tokens and user info."""
     mock_cognito = MagicMock()
-    mock_boto3.client.return_value = mock_cognito
+    mock_aws_clients.client.return_value = mock_cognito
 
     # First, sign up the user to create the DynamoDB record
     mock_cognito.sign_up.return_value = {"UserSub": "cognito-sub-456"}
@@ -214,11 +214,11 @@ def test_login_success(mock_boto3, client):
     assert data["user"]["role"] == "owner"
 
 
-@patch("app.services.cognito.boto3")
-def test_login_wrong_password(mock_boto3, client):
+@patch("app.services.cognito.aws")
+def test_login_wrong_password(mock_aws_clients, client):
     """Test login with incorrect credentials."""
     mock_cognito = MagicMock()
-    mock_boto3.client.return_value = mock_cognito
+    mock_aws_clients.client.return_value = mock_cognito
     mock_cognito.initiate_auth.side_effect = _cognito_client_error(
         "NotAuthorizedException", "Incorrect username or password."
     )
@@ -234,11 +234,11 @@ def test_login_wrong_password(mock_boto3, client):
     assert "Incorrect email or password" in response.get_json()["error"]
 
 
-@patch("app.services.cognito.boto3")
-def test_login_unconfirmed_user(mock_boto3, client):
+@patch("app.services.cognito.aws")
+def test_login_unconfirmed_user(mock_aws_clients, client):
     """Test login when email is not yet confirmed."""
     mock_cognito = MagicMock()
-    mock_boto3.client.return_value = mock_cognito
+    mock_aws_clients.client.return_value = mock_cognito
     mock_cognito.initiate_auth.side_effect = _cognito_client_error(
         "UserNotConfirmedException", "User is not confirmed."
     )
@@ -268,11 +268,11 @@ def test_login_missing_fields(client):
 # ---------------------------------------------------------------------------
 
 
-@patch("app.services.cognito.boto3")
-def test_resend_code_success(mock_boto3, client):
+@patch("app.services.cognito.aws")
+def test_resend_code_success(mock_aws_clients, client):
     """Test resending verification code."""
     mock_cognito = MagicMock()
-    mock_boto3.client.return_value = mock_cognito
+    mock_aws_clients.client.return_value = mock_cognito
     mock_cognito.resend_confirmation_code.return_value = {}
 
     response = client.post(
@@ -283,11 +283,11 @@ def test_resend_code_success(mock_boto3, client):
     assert response.get_json()["sent"] is True
 
 
-@patch("app.services.cognito.boto3")
-def test_resend_code_rate_limited(mock_boto3, client):
+@patch("app.services.cognito.aws")
+def test_resend_code_rate_limited(mock_aws_clients, client):
     """Test resend code when rate limited."""
     mock_cognito = MagicMock()
-    mock_boto3.client.return_value = mock_cognito
+    mock_aws_clients.client.return_value = mock_cognito
     mock_cognito.resend_confirmation_code.side_effect = _cognito_client_error(
         "LimitExceededException", "Attempt limit exceeded, please try after some time."
     )
@@ -404,11 +404,11 @@ def test_device_token_auth_still_works(client):
 # ---------------------------------------------------------------------------
 
 
-@patch("app.services.cognito.boto3")
-def test_signup_creates_owner_role(mock_boto3, client):
+@patch("app.services.cognito.aws")
+def test_signup_creates_owner_role(mock_aws_clients, client):
     """Test that signup creates a user with role=owner."""
     mock_cognito = MagicMock()
-    mock_boto3.client.return_value = mock_cognito
+    mock_aws_clients.client.return_value = mock_cognito
     mock_cognito.sign_up.return_value = {"UserSub": "cognito-sub-owner"}
 
     response = client.post(
@@ -40,3 +40,21 @@ def test_delete_nonexistent_conversation(client):
 def test_get_messages_requires_auth(client):
     response = client.get("/api/conversations/test123/messages")
     assert response.status_code == 401
+
+
+def test_list_conversations_returns_only_list_fields(app):
+    from app.dal import get_dal
+    from app.services.conversation import (
+        CONVERSATION_LIST_FIELDS,
+        create_conversation,
+        list_conversations,
+    )
+
+    with app.app_context():
+        conv = create_conversation("user1", "Weekend plans")
+        get_dal().conversations.update(
+            {"conversation_id": conv["conversation_id"]}, {"summary": "long text"}
+        )
+        (item,) = list_conversations("user1")["conversations"]
+        assert item["title"] == "Weekend plans"
+        assert set(item) == set(CONVERSATION_LIST_FIELDS)
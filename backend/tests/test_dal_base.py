@@ -0,0 +1,849 @@
+"""Tests for BaseRepository / InMemoryRepository batch operations and caching."""
+
+import time
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from app.dal.base import BaseRepository, RepositoryConfig
+from app.dal.in_memory import InMemoryRepository
+from app.dal.throttle import (
+    AdaptiveRateLimiter,
+    RateLimitPolicy,
+    RetryPolicy,
+    reset_limiters,
+)
+
+CONFIG = RepositoryConfig(table_name="Items", partition_key="pk", sort_key="sk")
+
+
+@pytest.fixture()
+def dynamodb():
+    with mock_aws():
+        resource = boto3.resource("dynamodb", region_name="us-east-1")
+        resource.create_table(
+            TableName="Items",
+            KeySchema=[
+                {"AttributeName": "pk", "KeyType": "HASH"},
+                {"AttributeName": "sk", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "pk", "AttributeType": "S"},
+                {"AttributeName": "sk", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield resource
+
+
+class FlakyResource:
+    """Wraps a DynamoDB resource; batch calls follow a script first.
+
+    Each script entry is either a ClientError code to raise or a number of
+    trailing requests to hand back as unprocessed.
+    """
+
+    def __init__(self, resource, script):
+        self._resource = resource
+        self.script = list(script)
+        self.calls = []
+
+    def Table(self, name):
+        return self._resource.Table(name)
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        self.calls.append(RequestItems)
+        step = self.script.pop(0) if self.script else 0
+        if isinstance(step, str):
+            raise ClientError(
+                {"Error": {"Code": step, "Message": step}}, "BatchWriteItem"
+            )
+        ((table, requests),) = RequestItems.items()
+        keep = max(len(requests) - step, 0)
+        response = {}
+        if keep:
+            response = self._resource.batch_write_item(
+                RequestItems={table: requests[:keep]}
+            )
+        if step:
+            response["UnprocessedItems"] = {table: requests[keep:]}
+        return response
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        self.calls.append(RequestItems)
+        step = self.script.pop(0) if self.script else 0
+        if isinstance(step, str):
+            raise ClientError(
+                {"Error": {"Code": step, "Message": step}}, "BatchGetItem"
+            )
+        ((table, request),) = RequestItems.items()
+        keys = request["Keys"]
+        keep = max(len(keys) - step, 0)
+        response = {"Responses": {table: []}}
+        if keep:
+            response = self._resource.batch_get_item(
+                RequestItems={table: {"Keys": keys[:keep]}}
+            )
+        if step:
+            response["UnprocessedKeys"] = {table: {"Keys": keys[keep:]}}
+        return response
+
+
+def _items(n, pk="p"):
+    return [{"pk": pk, "sk": f"{i:04d}", "n": i} for i in range(n)]
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(RetryPolicy, "delay", lambda self, attempt: 0)
+    reset_limiters()
+    yield
+    reset_limiters()
+
+
+class TestBatchWrite:
+    def test_batch_put_chunks_by_25(self, dynamodb):
+        flaky = FlakyResource(dynamodb, [])
+        repo = BaseRepository(CONFIG, flaky)
+
+        result = repo.batch_put(_items(60))
+
+        assert result.ok
+        assert result.written == 60
+        assert [len(c["Items"]) for c in flaky.calls] == [25, 25, 10]
+        assert len(repo.query("p", limit=100).items) == 60
+
+    def test_concurrent_chunks(self, dynamodb):
+        repo = BaseRepository(CONFIG, dynamodb)
+        result = repo.batch_put(_items(120), max_workers=4)
+        assert result.written == 120
+        assert len(repo.query("p", limit=200).items) == 120
+
+    def test_duplicate_keys_collapse_last_wins(self, dynamodb):
+        repo = BaseRepository(CONFIG, dynamodb)
+        result = repo.batch_put(
+            [{"pk": "p", "sk": "a", "v": 1}, {"pk": "p", "sk": "a", "v": 2}]
+        )
+        assert result.written == 1
+        assert repo.get_by_id({"pk": "p", "sk": "a"})["v"] == 2
+
+    def test_mixed_puts_and_deletes(self, dynamodb):
+        repo = BaseRepository(CONFIG, dynamodb)
+        repo.batch_put(_items(3))
+        result = repo.batch_write(
+            puts=[{"pk": "p", "sk": "new"}],
+            deletes=[{"pk": "p", "sk": "0000"}, {"pk": "p", "sk": "0001"}],
+        )
+        assert result.written == 3
+        assert [i["sk"] for i in repo.query("p").items] == ["0002", "new"]
+
+    def test_unprocessed_items_are_retried(self, dynamodb):
+        flaky = FlakyResource(dynamodb, [10, 4])
+        repo = BaseRepository(CONFIG, flaky)
+
+        result = repo.batch_put(_items(25))
+
+        assert result.ok and result.written == 25
+        assert [len(c["Items"]) for c in flaky.calls] == [25, 10, 4]
+        assert len(repo.query("p", limit=100).items) == 25
+
+    def test_exhausted_retries_report_failures(self, dynamodb):
+        flaky = FlakyResource(dynamodb, [2, 2, 2, 2])
+        repo = BaseRepository(CONFIG, flaky)
+
+        result = repo.batch_put(_items(5))
+
+        assert result.written == 3
+        assert [(f.action, f.key, f.reason) for f in result.failures] == [
+            ("put", {"pk": "p", "sk": "0003"}, "unprocessed"),
+            ("put", {"pk": "p", "sk": "0004"}, "unprocessed"),
+        ]
+
+    def test_throttling_is_retried_and_errors_reported(self, dynamodb):
+        flaky = FlakyResource(dynamodb, ["ProvisionedThroughputExceededException"])
+        repo = BaseRepository(CONFIG, flaky)
+        assert repo.batch_put(_items(2)).written == 2
+
+        flaky.script = ["ValidationException"]
+        result = repo.batch_write(deletes=[{"pk": "p", "sk": "0000"}])
+        assert result.written == 0
+        assert result.failures[0].action == "delete"
+        assert result.failures[0].reason == "ValidationException"
+
+
+class TestBatchGet:
+    def test_chunks_dedupes_and_omits_missing(self, dynamodb):
+        flaky = FlakyResource(dynamodb, [])
+        repo = BaseRepository(CONFIG, flaky)
+        repo.batch_put(_items(250))
+        flaky.calls.clear()
+
+        keys = [{"pk": "p", "sk": f"{i:04d}"} for i in range(260)]
+        result = repo.batch_get(keys + keys[:5], max_workers=3)
+
+        assert result.ok
+        assert len(result.items) == 250
+        assert sorted(len(c["Items"]["Keys"]) for c in flaky.calls) == [60, 100, 100]
+
+    def test_unprocessed_keys_retried_per_chunk(self, dynamodb):
+        flaky = FlakyResource(dynamodb, [])
+        repo = BaseRepository(CONFIG, flaky)
+        repo.batch_put(_items(100))
+        flaky.script = [30, 5]
+        flaky.calls.clear()
+
+        result = repo.batch_get([{"pk": "p", "sk": f"{i:04d}"} for i in range(100)])
+
+        assert result.ok
+        assert len(result.items) == 100
+        assert [len(c["Items"]["Keys"]) for c in flaky.calls] == [100, 30, 5]
+
+    def test_exhausted_retries_flag_unprocessed_keys(self, dynamodb):
+        flaky = FlakyResource(dynamodb, [])
+        repo = BaseRepository(CONFIG, flaky)
+        repo.batch_put(_items(4))
+        flaky.script = [1, 1, 1, "ThrottlingException"]
+
+        result = repo.batch_get([{"pk": "p", "sk": f"{i:04d}"} for i in range(4)])
+
+        assert not result.ok
+        assert len(result.items) == 3
+        assert result.unprocessed_keys == [{"pk": "p", "sk": "0003"}]
+
+    def test_non_throttle_errors_raise(self, dynamodb):
+        from app.dal.exceptions import DataAccessError
+
+        repo = BaseRepository(CONFIG, FlakyResource(dynamodb, ["ValidationException"]))
+        with pytest.raises(DataAccessError):
+            repo.batch_get([{"pk": "p", "sk": "0000"}])
+
+    def test_empty(self, dynamodb):
+        assert BaseRepository(CONFIG, dynamodb).batch_get([]).items == []
+
+
+class TestInMemoryBatchWrite:
+    def test_batch_write(self):
+        repo = InMemoryRepository("pk", "sk")
+        assert repo.batch_put(_items(30)).written == 30
+        result = repo.batch_write(
+            puts=[{"pk": "p", "sk": "0000", "n": 99}],
+            deletes=[{"pk": "p", "sk": "0001"}],
+        )
+        assert result.ok
+        assert repo.get_by_id({"pk": "p", "sk": "0000"})["n"] == 99
+        assert repo.get_by_id({"pk": "p", "sk": "0001"}) is None
+        keys = [
+            {"pk": "p", "sk": "0000"},
+            {"pk": "p", "sk": "0000"},
+            {"pk": "p", "sk": "0001"},
+        ]
+        assert len(repo.batch_get(keys).items) == 1
+
+
+CACHED = RepositoryConfig(
+    table_name="Items", partition_key="pk", sort_key="sk", cache_ttl_seconds=60
+)
+
+
+class CountingResource(FlakyResource):
+    """Counts get_item calls made through tables it hands out."""
+
+    def __init__(self, resource):
+        super().__init__(resource, [])
+        self.gets = 0
+
+    def Table(self, name):
+        table = self._resource.Table(name)
+        original = table.get_item
+
+        def get_item(**kwargs):
+            self.gets += 1
+            return original(**kwargs)
+
+        table.get_item = get_item
+        return table
+
+
+class TestItemCache:
+    def test_get_by_id_reads_through_and_caches_misses(self, dynamodb):
+        counting = CountingResource(dynamodb)
+        repo = BaseRepository(CACHED, counting)
+        dynamodb.Table("Items").put_item(Item={"pk": "p", "sk": "a", "v": 1})
+
+        assert repo.get_by_id({"pk": "p", "sk": "a"})["v"] == 1
+        assert repo.get_by_id({"pk": "p", "sk": "a"})["v"] == 1
+        assert repo.get_by_id({"pk": "p", "sk": "zz"}) is None
+        assert repo.get_by_id({"pk": "p", "sk": "zz"}) is None
+
+        assert counting.gets == 2
+        stats = repo.cache_stats()
+        assert (stats["hits"], stats["negative_hits"], stats["misses"]) == (1, 1, 2)
+
+    def test_returned_items_are_copies(self, dynamodb):
+        repo = BaseRepository(CACHED, dynamodb)
+        repo.create({"pk": "p", "sk": "a", "tags": ["x"]})
+        repo.get_by_id({"pk": "p", "sk": "a"})["tags"].append("mutated")
+        assert repo.get_by_id({"pk": "p", "sk": "a"})["tags"] == ["x"]
+
+    def test_writes_through_repository_keep_cache_fresh(self, dynamodb):
+        counting = CountingResource(dynamodb)
+        repo = BaseRepository(CACHED, counting)
+        key = {"pk": "p", "sk": "a"}
+
+        assert repo.get_by_id(key) is None  # negative entry
+        repo.create({**key, "v": 1})
+        assert repo.get_by_id(key)["v"] == 1
+        repo.update(key, {"v": 2})
+        assert repo.get_by_id(key)["v"] == 2
+        repo.put({**key, "v": 3})
+        assert repo.get_by_id(key)["v"] == 3
+        repo.delete(key)
+        assert repo.get_by_id(key) is None
+        repo.batch_put([{**key, "v": 4}])
+        assert repo.get_by_id(key)["v"] == 4
+        repo.batch_delete([key])
+        assert repo.get_by_id(key) is None
+        assert counting.gets == 4  # initial miss + after each delete/batch write
+
+    def test_ttl_and_lru_bounds(self, dynamodb, monkeypatch):
+        config = RepositoryConfig(
+            table_name="Items",
+            partition_key="pk",
+            sort_key="sk",
+            cache_ttl_seconds=10,
+            cache_max_entries=2,
+        )
+        repo = BaseRepository(config, dynamodb)
+        for sk in ("a", "b", "c"):
+            repo.get_by_id({"pk": "p", "sk": sk})
+        assert repo.cache_stats()["entries"] == 2
+        assert repo.cache_stats()["evictions"] == 1
+
+        now = [1000.0]
+        monkeypatch.setattr("app.dal.cache.time.monotonic", lambda: now[0])
+        repo.get_by_id({"pk": "p", "sk": "d"})
+        now[0] += 11
+        misses = repo.cache_stats()["misses"]
+        repo.get_by_id({"pk": "p", "sk": "d"})
+        assert repo.cache_stats()["misses"] == misses + 1
+
+    def test_batch_get_serves_cached_keys(self, dynamodb):
+        flaky = FlakyResource(dynamodb, [])
+        repo = BaseRepository(CACHED, flaky)
+        repo.batch_put(_items(3))
+        repo.get_by_id({"pk": "p", "sk": "0000"})
+        repo.get_by_id({"pk": "p", "sk": "missing"})
+        flaky.calls.clear()
+
+        keys = [{"pk": "p", "sk": sk} for sk in ("0000", "0001", "0002", "missing")]
+        result = repo.batch_get(keys)
+        assert sorted(i["sk"] for i in result.items) == ["0000", "0001", "0002"]
+        assert [len(c["Items"]["Keys"]) for c in flaky.calls] == [2]
+
+        flaky.calls.clear()
+        assert len(repo.batch_get(keys).items) == 3
+        assert flaky.calls == []
+
+    def test_uncached_repository_reports_no_stats(self, dynamodb):
+        assert BaseRepository(CONFIG, dynamodb).cache_stats() is None
+
+
+def test_dal_cache_stats_lists_cached_tables(app):
+    from app.dal import get_dal
+
+    with app.app_context():
+        dal = get_dal()
+        dal.users.get_by_id({"user_id": "nobody"})
+        stats = dal.cache_stats()
+
+    assert set(stats) == {"Users", "MemberProfiles", "Families", "StorageConfig"}
+    assert stats["Users"]["misses"] == 1
+
+
+def test_dal_cache_stats_are_exported_on_metrics(app, client):
+    from app.dal import get_dal
+
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+    with app.app_context():
+        get_dal().users.get_by_id({"user_id": "nobody"})
+        get_dal().users.get_by_id({"user_id": "nobody"})
+
+    text = client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    ).text
+    assert "# TYPE homeagent_dal_item_cache_hits_total counter" in text
+    assert 'homeagent_dal_item_cache_misses_total{table="Users"} 1' in text
+    assert 'homeagent_dal_item_cache_negative_hits_total{table="Users"} 1' in text
+
+
+class TestIdentityMap:
+    def _repo(self, dynamodb, identity_map):
+        counting = CountingResource(dynamodb)
+        repo = BaseRepository(CONFIG, counting)
+        repo.identity_map_provider = lambda: identity_map
+        return repo, counting
+
+    def test_repeat_reads_hit_the_map(self, dynamodb):
+        from app.dal.identity_map import IdentityMap
+
+        identity_map = IdentityMap()
+        repo, counting = self._repo(dynamodb, identity_map)
+        dynamodb.Table("Items").put_item(Item={"pk": "p", "sk": "a", "v": 1})
+
+        for _ in range(3):
+            assert repo.get_by_id({"pk": "p", "sk": "a"})["v"] == 1
+            assert repo.get_by_id({"pk": "p", "sk": "none"}) is None
+        assert repo.batch_get([{"pk": "p", "sk": "a"}]).items[0]["v"] == 1
+
+        assert counting.gets == 2
+        assert identity_map.hits == 5
+
+    def test_writes_update_the_map(self, dynamodb):
+        from app.dal.identity_map import IdentityMap
+
+        repo, counting = self._repo(dynamodb, IdentityMap())
+        key = {"pk": "p", "sk": "a"}
+        assert repo.get_by_id(key) is None
+        repo.create({**key, "v": 1})
+        assert repo.get_by_id(key)["v"] == 1
+        repo.update(key, {"v": 2})
+        assert repo.get_by_id(key)["v"] == 2
+        dynamodb.Table("Items").put_item(Item={**key, "v": 3})  # raw write
+        repo.invalidate(key)
+        assert repo.get_by_id(key)["v"] == 3
+        assert counting.gets == 2
+
+    def test_no_map_outside_a_request(self, dynamodb):
+        counting = CountingResource(dynamodb)
+        repo = BaseRepository(CONFIG, counting)
+        repo.get_by_id({"pk": "p", "sk": "a"})
+        repo.get_by_id({"pk": "p", "sk": "a"})
+        assert counting.gets == 2
+
+
+def test_dal_identity_map_is_per_request(app):
+    from app.dal import get_dal
+
+    with app.app_context():
+        dal = get_dal()
+        dal.users.create({"user_id": "u1", "name": "Ann"})
+        dal.users._cache = None  # isolate the identity map from the worker cache
+
+    table = dal.users._table
+    calls = []
+    original = table.get_item
+    table.get_item = lambda **kw: calls.append(kw) or original(**kw)
+
+    for expected_calls in (1, 2):
+        with app.test_request_context():
+            for _ in range(3):
+                assert dal.users.get_by_id({"user_id": "u1"})["name"] == "Ann"
+        assert len(calls) == expected_calls
+
+
+class TestQueryIter:
+    @pytest.fixture()
+    def repo(self, dynamodb):
+        repo = BaseRepository(CONFIG, dynamodb)
+        repo.batch_put(_items(23))
+        pages = []
+        original = repo._table.query
+
+        def query(**kwargs):
+            pages.append(kwargs.get("Limit"))
+            return original(**kwargs)
+
+        repo._table.query = query
+        repo.pages = pages
+        return repo
+
+    def test_streams_every_page(self, repo):
+        items = list(repo.query_iter("p", page_size=5))
+        assert [i["n"] for i in items] == list(range(23))
+        assert len(repo.pages) == 5
+
+    def test_is_lazy_and_prefetches_one_page(self, repo):
+        it = repo.query_iter("p", page_size=5)
+        assert repo.pages == []
+        next(it)
+        # first page plus the second, fetched in the background
+        deadline = time.monotonic() + 2
+        while len(repo.pages) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(repo.pages) == 2
+        it.close()
+
+    def test_max_items_caps_results_and_requests(self, repo):
+        items = repo.query_all("p", page_size=5, max_items=7, prefetch=False)
+        assert [i["n"] for i in items] == list(range(7))
+        assert repo.pages == [5, 2]
+
+    def test_filter_skips_empty_pages(self, repo):
+        from boto3.dynamodb.conditions import Attr
+
+        items = repo.query_all(
+            "p", page_size=4, scan_forward=False, filter_expression=Attr("n").gte(20)
+        )
+        assert [i["n"] for i in items] == [22, 21, 20]
+
+    def test_in_memory(self):
+        repo = InMemoryRepository("pk", "sk")
+        repo.batch_put(_items(12))
+        assert len(repo.query_all("p", page_size=5)) == 12
+        assert [i["n"] for i in repo.query_iter("p", page_size=5, max_items=6)] == list(
+            range(6)
+        )
+
+
+class TestParallelScan:
+    @pytest.fixture()
+    def repo(self, dynamodb):
+        repo = BaseRepository(CONFIG, dynamodb)
+        items = _items(40) + _items(40, pk="q")
+        for item in items:
+            item["status"] = "active" if item["n"] % 2 else "done"
+        repo.batch_put(items)
+        calls = []
+        original = repo._table.scan
+
+        def scan(**kwargs):
+            calls.append(kwargs)
+            return original(**kwargs)
+
+        repo._table.scan = scan
+        repo.calls = calls
+        return repo
+
+    def test_reads_every_segment_and_page(self, repo):
+        items = list(repo.parallel_scan(total_segments=3, page_size=7))
+        assert sorted((i["pk"], i["sk"]) for i in items) == sorted(
+            (pk, f"{n:04d}") for pk in "pq" for n in range(40)
+        )
+        assert {c["Segment"] for c in repo.calls} == {0, 1, 2}
+        assert {c["TotalSegments"] for c in repo.calls} == {3}
+        assert len(repo.calls) > 3
+
+    def test_filter_and_escaped_projection(self, repo):
+        from boto3.dynamodb.conditions import Attr
+
+        items = list(
+            repo.parallel_scan(
+                filter_expression=Attr("status").eq("active") & Attr("pk").eq("q"),
+                projection=["sk", "status"],
+            )
+        )
+        assert len(items) == 20
+        assert all(set(i) == {"sk", "status"} for i in items)
+        assert repo.calls[0]["ProjectionExpression"] == "#p0, #p1"
+
+    def test_single_segment_omits_segment_args(self, repo):
+        assert len(list(repo.parallel_scan(total_segments=1, page_size=30))) == 80
+        assert all("Segment" not in c for c in repo.calls)
+
+    def test_early_close_stops_issuing_requests(self, repo):
+        scan = repo.parallel_scan(total_segments=1, page_size=5)
+        next(scan)
+        scan.close()
+        time.sleep(0.05)
+        assert len(repo.calls) <= 2
+
+    def test_throttled_pages_are_retried(self, repo, monkeypatch):
+        original = repo._table.scan
+        errors = ["ProvisionedThroughputExceededException"]
+
+        def scan(**kwargs):
+            if errors:
+                code = errors.pop()
+                raise ClientError({"Error": {"Code": code, "Message": code}}, "Scan")
+            return original(**kwargs)
+
+        repo._table.scan = scan
+        assert len(list(repo.parallel_scan(total_segments=2))) == 80
+
+    def test_other_errors_are_translated(self, repo):
+        from app.dal.exceptions import DataAccessError
+
+        def scan(**kwargs):
+            raise ClientError(
+                {"Error": {"Code": "ValidationException", "Message": "x"}}, "Scan"
+            )
+
+        repo._table.scan = scan
+        with pytest.raises(DataAccessError):
+            list(repo.parallel_scan())
+
+    def test_capacity_budget_paces_requests(self, repo):
+        original = repo._table.scan
+
+        def scan(**kwargs):
+            page = original(**kwargs)
+            page["ConsumedCapacity"] = {"CapacityUnits": 1.0}
+            return page
+
+        repo._table.scan = scan
+        start = time.monotonic()
+        # 4 pages at 1 unit each, 20 units/s: the last three wait ~50ms apiece
+        list(
+            repo.parallel_scan(
+                total_segments=1, page_size=25, max_capacity_per_second=20
+            )
+        )
+        assert time.monotonic() - start >= 0.14
+
+    def test_in_memory(self):
+        repo = InMemoryRepository("pk", "sk")
+        repo.batch_put(_items(5))
+        assert sorted(i["n"] for i in repo.parallel_scan()) == [0, 1, 2, 3, 4]
+        assert list(repo.parallel_scan(projection=["n"]))[0] == {"n": 0}
+
+
+class TestProjection:
+    @pytest.fixture()
+    def table(self, dynamodb):
+        table = dynamodb.Table("Items")
+        for i in range(3):
+            table.put_item(
+                Item={
+                    "pk": "p",
+                    "sk": f"{i}",
+                    "status": "ok",
+                    "name": f"n{i}",
+                    "blob": "x" * 100,
+                }
+            )
+        return table
+
+    def test_get_by_id_escapes_reserved_names(self, table, dynamodb):
+        repo = BaseRepository(CONFIG, dynamodb)
+        item = repo.get_by_id({"pk": "p", "sk": "0"}, projection=["status", "name"])
+        assert item == {"status": "ok", "name": "n0"}
+        assert repo.get_by_id({"pk": "p", "sk": "9"}, projection=["name"]) is None
+
+    def test_projected_get_reads_full_item_on_cached_table(self, table, dynamodb):
+        counting = CountingResource(dynamodb)
+        repo = BaseRepository(CACHED, counting)
+        key = {"pk": "p", "sk": "0"}
+
+        assert repo.get_by_id(key, projection=["name"]) == {"name": "n0"}
+        # the full item was read and remembered, so neither read hits the table
+        assert repo.get_by_id(key)["blob"] == "x" * 100
+        assert repo.get_by_id(key, projection=["name"]) == {"name": "n0"}
+        assert counting.gets == 1
+
+    def test_query_and_iterators(self, table, dynamodb):
+        from boto3.dynamodb.conditions import Attr
+
+        repo = BaseRepository(CONFIG, dynamodb)
+        page = repo.query("p", projection=["sk", "name"])
+        assert page.items[0] == {"sk": "0", "name": "n0"}
+        items = repo.query_all(
+            "p",
+            page_size=1,
+            projection=["name"],
+            filter_expression=Attr("status").eq("ok"),
+        )
+        assert items == [{"name": "n0"}, {"name": "n1"}, {"name": "n2"}]
+
+    def test_batch_get_includes_key_attributes(self, table, dynamodb):
+        repo = BaseRepository(CACHED, dynamodb)
+        repo.get_by_id({"pk": "p", "sk": "0"})  # cached full item
+        keys = [{"pk": "p", "sk": s} for s in ("0", "1", "9")]
+        result = repo.batch_get(keys, projection=["name"])
+        assert sorted(result.items, key=lambda i: i["sk"]) == [
+            {"pk": "p", "sk": "0", "name": "n0"},
+            {"pk": "p", "sk": "1", "name": "n1"},
+        ]
+        assert repo.get_by_id({"pk": "p", "sk": "1"})["blob"] == "x" * 100
+
+    def test_in_memory(self):
+        repo = InMemoryRepository("pk", "sk")
+        repo.create({"pk": "p", "sk": "0", "name": "n0", "blob": "x"})
+        assert repo.get_by_id({"pk": "p", "sk": "0"}, projection=["name"]) == {
+            "name": "n0"
+        }
+        assert repo.query("p", projection=["name"]).items == [{"name": "n0"}]
+        assert repo.batch_get([{"pk": "p", "sk": "0"}], projection=["name"]).items == [
+            {"name": "n0", "pk": "p", "sk": "0"}
+        ]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestAdaptiveRateLimiter:
+    def _limiter(self, **policy):
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(RateLimitPolicy(**policy), clock, clock.sleep)
+        return limiter, clock
+
+    def test_passes_everything_until_throttled(self):
+        limiter, clock = self._limiter()
+        for _ in range(1000):
+            limiter.acquire()
+        assert clock.slept == []
+        assert limiter.rate is None
+
+    def test_throttle_halves_the_observed_rate(self):
+        limiter, clock = self._limiter(max_rate=1000, min_rate=1)
+        for _ in range(10):
+            for _ in range(40):
+                limiter.acquire()
+            clock.now += 0.1
+        limiter.on_throttle()
+        assert limiter.rate == pytest.approx(200)
+
+        # The bucket starts empty: requests are spaced at the new rate.
+        for _ in range(10):
+            limiter.acquire()
+        assert sum(clock.slept) == pytest.approx(10 / 200)
+
+    def test_additive_increase_until_unlimited(self):
+        limiter, clock = self._limiter(max_rate=12, min_rate=10, increase=2)
+        limiter.on_throttle()
+        assert limiter.rate == 10
+        for _ in range(10):
+            limiter.on_success()
+        assert 11.5 < limiter.rate < 12
+        while limiter.active:
+            limiter.on_success()
+        assert limiter.rate is None
+
+    def test_throttles_within_cooldown_count_once(self):
+        limiter, clock = self._limiter(min_rate=1)
+        limiter.on_throttle()
+        first = limiter.rate
+        limiter.on_throttle()
+        assert limiter.rate == first
+        clock.now += 1
+        limiter.on_throttle()
+        assert limiter.rate == max(1, first / 2)
+        assert limiter.stats()["throttles"] == 3
+
+    def test_retry_delay_is_full_jitter(self, monkeypatch):
+        monkeypatch.undo()
+        policy = RetryPolicy(base_seconds=0.1, cap_seconds=0.5)
+        delays = [policy.delay(attempt) for attempt in range(10) for _ in range(20)]
+        assert all(0 <= d <= 0.5 for d in delays)
+        assert max(delays) > 0.2
+
+
+def _throttle(operation):
+    code = "ProvisionedThroughputExceededException"
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+
+class TestThrottleRetries:
+    def _flaky_get(self, repo, failures, error=_throttle):
+        calls = []
+        original = repo._table.get_item
+
+        def get_item(**kwargs):
+            calls.append(kwargs)
+            if len(calls) <= failures:
+                raise error("GetItem")
+            return original(**kwargs)
+
+        repo._table.get_item = get_item
+        return calls
+
+    def test_throttled_reads_are_retried(self, dynamodb):
+        repo = BaseRepository(CONFIG, dynamodb)
+        repo.put({"pk": "p", "sk": "a"})
+        calls = self._flaky_get(repo, failures=2)
+
+        assert repo.get_by_id({"pk": "p", "sk": "a"}) == {"pk": "p", "sk": "a"}
+        assert len(calls) == 3
+        assert repo.rate_limit_stats()["active"] is True
+
+    def test_throttling_error_once_retries_run_out(self, dynamodb):
+        from app.dal.exceptions import ThrottlingError
+
+        config = RepositoryConfig(
+            table_name="Items",
+            partition_key="pk",
+            sort_key="sk",
+            retry=RetryPolicy(max_attempts=2),
+            rate_limit=None,
+        )
+        repo = BaseRepository(config, dynamodb)
+        calls = self._flaky_get(repo, failures=10)
+
+        with pytest.raises(ThrottlingError):
+            repo.get_by_id({"pk": "p", "sk": "a"})
+        assert len(calls) == 3
+        assert repo.rate_limit_stats() is None
+
+    def test_transient_errors_are_retried_without_slowing_the_table(self, dynamodb):
+        from botocore.exceptions import EndpointConnectionError
+
+        def unavailable(operation):
+            return ClientError(
+                {
+                    "Error": {"Code": "ServiceUnavailable", "Message": "down"},
+                    "ResponseMetadata": {"HTTPStatusCode": 503},
+                },
+                operation,
+            )
+
+        def reset(operation):
+            return EndpointConnectionError(endpoint_url="http://dynamodb")
+
+        repo = BaseRepository(CONFIG, dynamodb)
+        repo.put({"pk": "p", "sk": "a"})
+        for error in (unavailable, reset):
+            repo._table = dynamodb.Table("Items")
+            calls = self._flaky_get(repo, failures=2, error=error)
+            assert repo.get_by_id({"pk": "p", "sk": "a"}) == {"pk": "p", "sk": "a"}
+            assert len(calls) == 3
+        assert repo.rate_limit_stats()["throttles"] == 0
+
+    def test_other_errors_are_not_retried(self, dynamodb):
+        from app.dal.exceptions import DataAccessError
+
+        def invalid(operation):
+            code = "ValidationException"
+            return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+        repo = BaseRepository(CONFIG, dynamodb)
+        calls = self._flaky_get(repo, failures=1, error=invalid)
+        with pytest.raises(DataAccessError):
+            repo.get_by_id({"pk": "p", "sk": "a"})
+        assert len(calls) == 1
+
+    def test_repositories_share_the_table_limiter(self, dynamodb):
+        first = BaseRepository(CONFIG, dynamodb)
+        second = BaseRepository(CONFIG, dynamodb)
+        self._flaky_get(first, failures=1)
+        first.get_by_id({"pk": "p", "sk": "a"})
+        assert second.rate_limit_stats()["throttles"] == 1
+
+    def test_conflicting_table_policies_are_rejected(self, dynamodb):
+        BaseRepository(CONFIG, dynamodb)
+        other = RepositoryConfig(
+            table_name="Items",
+            partition_key="pk",
+            sort_key="sk",
+            rate_limit=RateLimitPolicy(max_rate=50.0),
+        )
+        with pytest.raises(ValueError, match="already rate limited"):
+            BaseRepository(other, dynamodb)
+
+    def test_unprocessed_batch_items_slow_the_table(self, dynamodb):
+        flaky = FlakyResource(dynamodb, [5])
+        repo = BaseRepository(CONFIG, flaky)
+
+        assert repo.batch_put(_items(10)).ok
+        assert repo.rate_limit_stats()["throttles"] == 1
+        assert repo.rate_limit_stats()["active"] is True
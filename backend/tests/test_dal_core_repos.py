@@ -120,6 +120,13 @@ def dynamodb():
                 {"AttributeName": "family_id", "AttributeType": "S"},
                 {"AttributeName": "user_id", "AttributeType": "S"},
             ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "user_id-index",
+                    "KeySchema": [{"AttributeName": "user_id", "KeyType": "HASH"}],
+                    "Projection": {"ProjectionType": "ALL"},
+                },
+            ],
             BillingMode="PAY_PER_REQUEST",
         )
 
@@ -324,3 +331,14 @@ class TestMembershipRepository:
         repo = MembershipRepository(dynamodb)
         result = repo.query_by_family("nonexistent")
         assert result.count == 0
+
+    def test_get_family_id_for_user(self, dynamodb):
+        repo = MembershipRepository(dynamodb)
+        repo.create({"family_id": "f1", "user_id": "u1", "role": "admin"})
+        repo.create({"family_id": "f2", "user_id": "u2", "role": "member"})
+        assert repo.get_family_id_for_user("u1") == "f1"
+        assert repo.get_family_id_for_user("u2") == "f2"
+
+    def test_get_family_id_for_user_not_found(self, dynamodb):
+        repo = MembershipRepository(dynamodb)
+        assert repo.get_family_id_for_user("u999") is None
@@ -48,6 +48,8 @@ class TestDAL:
             "storage_config",
             "oauth_tokens",
             "oauth_state",
+            "token_usage",
+            "message_search",
         ]
         for attr in expected:
             assert hasattr(dal, attr), f"DAL missing attribute: {attr}"
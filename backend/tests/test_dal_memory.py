@@ -0,0 +1,409 @@
+"""Tests for the in-memory DynamoDB backend and expression evaluator.
+
+Table-level tests run against both the in-memory backend and moto, so the
+two must agree.
+"""
+
+import copy
+import json
+import pickle
+from decimal import Decimal
+
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from app import aws
+from app.dal import DAL
+from app.dal.base import GSIConfig
+from app.dal.exceptions import ConditionalCheckError, DuplicateEntityError
+from app.dal.expressions import (
+    ExpressionError,
+    apply_update,
+    compile_condition,
+    compile_projection,
+    compile_update,
+    project_paths,
+)
+from app.dal.in_memory import InMemoryRepository
+from app.dal.memory import MemoryDynamoDB
+from app.dal.records import FrozenDict, FrozenList, freeze, thaw
+
+ORDERS = {
+    "TableName": "Orders",
+    "KeySchema": [
+        {"AttributeName": "pk", "KeyType": "HASH"},
+        {"AttributeName": "sk", "KeyType": "RANGE"},
+    ],
+    "AttributeDefinitions": [
+        {"AttributeName": "pk", "AttributeType": "S"},
+        {"AttributeName": "sk", "AttributeType": "S"},
+        {"AttributeName": "owner", "AttributeType": "S"},
+        {"AttributeName": "total", "AttributeType": "N"},
+    ],
+    "GlobalSecondaryIndexes": [
+        {
+            "IndexName": "owner-index",
+            "KeySchema": [
+                {"AttributeName": "owner", "KeyType": "HASH"},
+                {"AttributeName": "total", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        }
+    ],
+    "BillingMode": "PAY_PER_REQUEST",
+}
+
+
+@pytest.fixture(params=["memory", "moto"])
+def table(request):
+    if request.param == "memory":
+        resource = MemoryDynamoDB()
+        resource.create_table(**ORDERS)
+        yield resource.Table("Orders")
+        return
+    with mock_aws():
+        resource = boto3.resource("dynamodb", region_name="us-east-1")
+        resource.create_table(**ORDERS)
+        yield resource.Table("Orders")
+
+
+def _fill(table, count=10, pk="a"):
+    for n in range(count):
+        item = {"pk": pk, "sk": f"{n:03d}", "n": n, "total": n * 10}
+        if n % 2 == 0:
+            item["owner"] = "ann"
+        table.put_item(Item=item)
+
+
+class TestExpressions:
+    def test_conditions(self):
+        item = {"a": Decimal(3), "s": "hello", "tags": {"x", "y"}, "m": {"l": [1, 2]}}
+        cases = {
+            "a = :three AND begins_with(s, :he)": True,
+            "a BETWEEN :one AND :two": False,
+            "a IN (:one, :three) AND NOT attribute_exists(missing)": True,
+            "contains(tags, :x) OR a < :one": True,
+            "size(s) = :five AND attribute_type(a, :n)": True,
+            "#m.l[1] = :two AND (a > :three OR s <> :he)": True,
+            "missing = :one OR missing <> :one": False,
+        }
+        values = {
+            ":one": Decimal(1),
+            ":two": Decimal(2),
+            ":three": Decimal(3),
+            ":five": Decimal(5),
+            ":he": "he",
+            ":x": "x",
+            ":n": "N",
+        }
+        for expression, expected in cases.items():
+            condition = compile_condition(expression, {"#m": "m"}, values)
+            assert condition(item) is expected, expression
+
+    def test_boto3_conditions(self):
+        condition = compile_condition(Attr("a").gt(1) & Attr("s").begins_with("h"))
+        assert condition({"a": 2, "s": "hi"})
+        assert not condition({"a": 2, "s": "x"})
+
+    def test_errors(self):
+        with pytest.raises(ExpressionError):
+            compile_condition("a = :missing", values={})
+        with pytest.raises(ExpressionError):
+            compile_condition("a = = :v", values={":v": 1})
+
+    def test_update_actions(self):
+        item = {"pk": "a", "n": Decimal(1), "l": [1], "s": {"a", "b"}, "gone": 1}
+        actions = compile_update(
+            "SET n = n + :one, l = list_append(l, :more), c = if_not_exists(c, :zero) "
+            "REMOVE gone ADD hits :one DELETE s :a",
+            values={
+                ":one": Decimal(1),
+                ":more": [2],
+                ":zero": Decimal(0),
+                ":a": {"a"},
+            },
+        )
+        updated = apply_update(item, actions)
+        assert updated == {
+            "pk": "a",
+            "n": 2,
+            "l": [1, 2],
+            "c": 0,
+            "hits": 1,
+            "s": {"b"},
+        }
+        assert item["n"] == 1  # the original is untouched
+
+    def test_projection(self):
+        item = {"a": 1, "m": {"x": 1, "y": 2}, "l": [10, 20, 30]}
+        paths = compile_projection("a, #m.x, l[2]", {"#m": "m"})
+        assert project_paths(item, paths) == {"a": 1, "m": {"x": 1}, "l": [30]}
+
+
+class TestTable:
+    def test_put_condition_and_return_values(self, table):
+        table.put_item(Item={"pk": "a", "sk": "1", "v": 1})
+        with pytest.raises(ClientError) as exc:
+            table.put_item(
+                Item={"pk": "a", "sk": "1"},
+                ConditionExpression="attribute_not_exists(pk)",
+            )
+        assert exc.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+        assert isinstance(
+            exc.value, table.meta.client.exceptions.ConditionalCheckFailedException
+        )
+        old = table.put_item(
+            Item={"pk": "a", "sk": "1", "v": 2}, ReturnValues="ALL_OLD"
+        )
+        assert old["Attributes"] == {"pk": "a", "sk": "1", "v": 1}
+        assert table.get_item(Key={"pk": "a", "sk": "1"})["Item"]["v"] == 2
+
+    def test_update_expression(self, table):
+        table.put_item(Item={"pk": "a", "sk": "1", "status": "old"})
+        response = table.update_item(
+            Key={"pk": "a", "sk": "1"},
+            UpdateExpression="SET #s = :s ADD #v :one",
+            ExpressionAttributeNames={"#s": "status", "#v": "views"},
+            ExpressionAttributeValues={":s": "new", ":one": 1},
+            ReturnValues="UPDATED_NEW",
+        )
+        assert response["Attributes"] == {"status": "new", "views": 1}
+        with pytest.raises(ClientError) as exc:
+            table.update_item(
+                Key={"pk": "a", "sk": "1"},
+                UpdateExpression="SET #s = :s",
+                ConditionExpression="#v > :ten",
+                ExpressionAttributeNames={"#s": "status", "#v": "views"},
+                ExpressionAttributeValues={":s": "x", ":ten": 10},
+            )
+        assert exc.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+    def test_key_condition_ranges(self, table):
+        _fill(table)
+
+        def sks(**kwargs):
+            items = table.query(**kwargs)["Items"]
+            return [item["sk"] for item in items]
+
+        assert sks(KeyConditionExpression=Key("pk").eq("a") & Key("sk").lt("002")) == [
+            "000",
+            "001",
+        ]
+        assert sks(
+            KeyConditionExpression=Key("pk").eq("a") & Key("sk").between("003", "005"),
+            ScanIndexForward=False,
+        ) == ["005", "004", "003"]
+        assert sks(
+            KeyConditionExpression="pk = :pk AND begins_with(sk, :p)",
+            ExpressionAttributeValues={":pk": "a", ":p": "00"},
+        ) == [f"{n:03d}" for n in range(10)]
+
+    def test_limit_filter_and_pagination(self, table):
+        _fill(table)
+        seen = []
+        kwargs = {
+            "KeyConditionExpression": Key("pk").eq("a"),
+            "FilterExpression": Attr("n").gte(3),
+            "Limit": 4,
+        }
+        pages = 0
+        while True:
+            page = table.query(**kwargs)
+            pages += 1
+            assert page["ScannedCount"] <= 4
+            seen.extend(item["n"] for item in page["Items"])
+            if "LastEvaluatedKey" not in page:
+                break
+            kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+        assert seen == list(range(3, 10))
+        assert pages == 3
+
+    def test_gsi_query_is_sparse_and_sorted(self, table):
+        _fill(table)
+        page = table.query(
+            IndexName="owner-index",
+            KeyConditionExpression=Key("owner").eq("ann") & Key("total").gt(20),
+            ScanIndexForward=False,
+        )
+        assert [item["total"] for item in page["Items"]] == [80, 60, 40]
+        table.delete_item(Key={"pk": "a", "sk": "008"})
+        page = table.query(
+            IndexName="owner-index", KeyConditionExpression=Key("owner").eq("ann")
+        )
+        assert [item["n"] for item in page["Items"]] == [0, 2, 4, 6]
+
+    def test_scan_segments_cover_table_once(self, table):
+        for pk in "abcdef":
+            _fill(table, count=3, pk=pk)
+        seen = []
+        for segment in range(3):
+            kwargs = {"Segment": segment, "TotalSegments": 3, "Limit": 2}
+            while True:
+                page = table.scan(**kwargs)
+                seen.extend((item["pk"], item["sk"]) for item in page["Items"])
+                if "LastEvaluatedKey" not in page:
+                    break
+                kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+        assert sorted(seen) == sorted(
+            (pk, f"{n:03d}") for pk in "abcdef" for n in range(3)
+        )
+
+    def test_validation(self, table):
+        with pytest.raises(TypeError):
+            table.put_item(Item={"pk": "a", "sk": "1", "f": 1.5})
+        with pytest.raises(ClientError) as exc:
+            table.get_item(Key={"pk": "a"})
+        assert exc.value.response["Error"]["Code"] == "ValidationException"
+
+
+class TestMemoryDatabase:
+    def test_missing_table_and_control_plane(self):
+        resource = MemoryDynamoDB()
+        client = resource.meta.client
+        with pytest.raises(client.exceptions.ResourceNotFoundException):
+            resource.Table("Nope").get_item(Key={"pk": "a"})
+        with pytest.raises(client.exceptions.ResourceNotFoundException):
+            resource.Table("Nope").load()
+        resource.create_table(**ORDERS)
+        resource.Table("Orders").load()
+        with pytest.raises(client.exceptions.ResourceInUseException):
+            client.create_table(**ORDERS)
+        resource.Table("Orders").put_item(Item={"pk": "a", "sk": "1", "user": "u"})
+        client.update_table(
+            TableName="Orders",
+            GlobalSecondaryIndexUpdates=[
+                {
+                    "Create": {
+                        "IndexName": "user-index",
+                        "KeySchema": [{"AttributeName": "user", "KeyType": "HASH"}],
+                        "Projection": {"ProjectionType": "KEYS_ONLY"},
+                    }
+                }
+            ],
+        )
+        description = client.describe_table(TableName="Orders")["Table"]
+        assert {gsi["IndexName"] for gsi in description["GlobalSecondaryIndexes"]} == {
+            "owner-index",
+            "user-index",
+        }
+        # Backfilled, and projected per the index's projection type.
+        page = resource.Table("Orders").query(
+            IndexName="user-index", KeyConditionExpression=Key("user").eq("u")
+        )
+        assert page["Items"] == [{"pk": "a", "sk": "1", "user": "u"}]
+        assert client.list_tables()["TableNames"] == ["Orders"]
+
+    def test_memory_endpoint_is_shared_through_aws(self):
+        config = {"AWS_REGION": "us-east-1", "DYNAMODB_ENDPOINT": "memory://shared"}
+        resource = aws.dynamodb_resource(config)
+        assert isinstance(resource, MemoryDynamoDB)
+        assert aws.client("dynamodb", "us-east-1", "memory://shared") is (
+            resource.meta.client
+        )
+        other = aws.dynamodb_resource({**config, "DYNAMODB_ENDPOINT": "memory://other"})
+        assert other is not resource
+
+    def test_dal_creates_its_tables(self):
+        dal = DAL(MemoryDynamoDB(), table_prefix="t-", identity_map=False)
+        dal.devices.create({"device_id": "d1", "device_token": "tok", "user_id": "u"})
+        dal.devices.create({"device_id": "d2", "device_token": "tok2", "user_id": "u"})
+        assert dal.devices.get_by_token("tok2")["device_id"] == "d2"
+        assert {d["device_id"] for d in dal.devices.query_by_user("u").items} == {
+            "d1",
+            "d2",
+        }
+        with pytest.raises(DuplicateEntityError):
+            dal.devices.create({"device_id": "d1"})
+
+
+class TestInMemoryRepository:
+    @pytest.fixture()
+    def repo(self):
+        repo = InMemoryRepository(
+            "pk",
+            "sk",
+            has_version=True,
+            gsi_definitions=[GSIConfig("n-index", partition_key="kind", sort_key="n")],
+        )
+        for n in range(12):
+            repo.create({"pk": "p", "sk": f"{n:03d}", "n": n, "kind": "odd" * (n % 2)})
+        return repo
+
+    def test_sort_condition_filter_and_cursor(self, repo):
+        page = repo.query("p", sort_condition=Key("sk").gte("004"), limit=3)
+        assert [item["n"] for item in page.items] == [4, 5, 6]
+        page = repo.query(
+            "p", sort_condition=Key("sk").gte("004"), limit=3, cursor=page.next_cursor
+        )
+        assert [item["n"] for item in page.items] == [7, 8, 9]
+        filtered = repo.query_all("p", filter_expression=Attr("n").lt(3))
+        assert [item["n"] for item in filtered] == [0, 1, 2]
+
+    def test_gsi_query(self, repo):
+        items = repo.query_all("odd", index_name="n-index", scan_forward=False)
+        assert [item["n"] for item in items] == [11, 9, 7, 5, 3, 1]
+
+    def test_conditional_writes(self, repo):
+        with pytest.raises(DuplicateEntityError):
+            repo.create({"pk": "p", "sk": "000"})
+        repo.update({"pk": "p", "sk": "000"}, {"n": 100}, expected_version=1)
+        with pytest.raises(ConditionalCheckError):
+            repo.update({"pk": "p", "sk": "000"}, {"n": 1}, expected_version=1)
+        assert repo.get_by_id({"pk": "p", "sk": "000"})["version"] == 2
+
+    def test_reads_return_the_stored_record(self, repo):
+        key = {"pk": "p", "sk": "000"}
+        item = repo.get_by_id(key)
+        assert repo.get_by_id(key) is item
+        assert repo.query("p", limit=1).items[0] is item
+        with pytest.raises(TypeError):
+            item["n"] = 5
+        assert repo.get_by_id(key)["n"] == 0
+
+    def test_update_shares_untouched_attributes(self):
+        repo = InMemoryRepository("pk")
+        created = repo.create({"pk": "a", "tags": ["x"], "meta": {"k": 1}})
+        updated = repo.update({"pk": "a"}, {"meta": {"k": 2}})
+        assert updated["tags"] is created["tags"]
+        assert created["meta"] == {"k": 1} and updated["meta"] == {"k": 2}
+        with pytest.raises(TypeError):
+            updated["meta"]["k"] = 3
+
+
+class TestRecords:
+    def test_freeze_is_deep_and_immutable(self):
+        record = freeze({"a": [1, {"b": 2}], "s": {"x"}, "raw": bytearray(b"z")})
+        assert isinstance(record["a"], FrozenList)
+        assert isinstance(record["a"][1], FrozenDict)
+        assert record["s"] == frozenset({"x"}) and record["raw"] == b"z"
+        for mutate in (
+            lambda: record.update(c=1),
+            lambda: record.pop("a"),
+            lambda: record["a"].append(3),
+            lambda: record["a"][1].setdefault("c", 1),
+        ):
+            with pytest.raises(TypeError):
+                mutate()
+        assert freeze(record) is record
+
+    def test_behaves_like_a_plain_item(self):
+        item = {"a": [1, {"b": 2}], "n": Decimal("1.5")}
+        record = freeze(item)
+        assert record == item and {**record, "c": 1} == {**item, "c": 1}
+        assert json.dumps(freeze({"a": [1]})) == '{"a": [1]}'
+        assert pickle.loads(pickle.dumps(record)) == record
+        assert isinstance(pickle.loads(pickle.dumps(record)), FrozenDict)
+
+    def test_copies_are_mutable(self):
+        record = freeze({"a": [1, {"b": 2}], "s": {"x"}})
+        deep = copy.deepcopy(record)
+        assert deep == thaw(record) == record
+        deep["a"][1]["b"] = 3
+        deep["s"].add("y")
+        assert record["a"][1]["b"] == 2
+        shallow = copy.copy(record)
+        shallow["c"] = 1
+        assert type(shallow) is dict and "c" not in record
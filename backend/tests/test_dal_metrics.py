@@ -0,0 +1,241 @@
+"""Tests for the DAL metrics registry and the /metrics endpoint."""
+
+import json
+import subprocess
+import sys
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from app.dal.base import BaseRepository, RepositoryConfig
+from app.dal.exceptions import (
+    DuplicateEntityError,
+    EntityNotFoundError,
+    ThrottlingError,
+)
+from app.dal.metrics import (
+    DAL_METRICS,
+    MetricsRegistry,
+    merge_snapshots,
+    render_prometheus,
+)
+from app.dal.throttle import reset_limiters
+
+CONFIG = RepositoryConfig(table_name="Items", partition_key="pk")
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    DAL_METRICS.reset()
+    reset_limiters()
+    yield
+    DAL_METRICS.reset()
+    reset_limiters()
+
+
+def _series(snapshot, table, op):
+    for t, o, series in snapshot["latency"]:
+        if (t, o) == (table, op):
+            return series
+    return None
+
+
+def test_histogram_buckets_and_render():
+    registry = MetricsRegistry(buckets=(0.01, 0.1))
+    registry.observe("Users", "get", 0.005)
+    registry.observe("Users", "get", 0.05)
+    registry.observe("Users", "get", 3.0)
+    registry.record_error("Users", "get", "ThrottlingError")
+    registry.record_capacity("Users", "get", 1.5)
+
+    text = render_prometheus(registry.snapshot())
+
+    bucket = (
+        'homeagent_dal_request_duration_seconds_bucket{table="Users",operation="get"'
+    )
+    assert f'{bucket},le="0.01"}} 1' in text
+    assert f'{bucket},le="0.1"}} 2' in text
+    assert f'{bucket},le="+Inf"}} 3' in text
+    assert (
+        'homeagent_dal_request_duration_seconds_count{table="Users",operation="get"} 3'
+        in text
+    )
+    assert (
+        'homeagent_dal_errors_total{table="Users",operation="get",'
+        'error="ThrottlingError"} 1' in text
+    )
+    assert (
+        'homeagent_dal_consumed_capacity_units_total{table="Users",operation="get"} 1.5'
+        in text
+    )
+
+
+def test_workers_are_merged_through_the_multiproc_dir(tmp_path):
+    worker_a, worker_b = MetricsRegistry(), MetricsRegistry()
+    worker_a.observe("Users", "get", 0.01)
+    worker_b.observe("Users", "get", 0.02)
+    worker_b.record_error("Users", "get", "DataAccessError")
+    # Both registries live in this process; move worker_a's file aside as if
+    # another pid had written it.
+    worker_a.flush(str(tmp_path))
+    (own,) = tmp_path.iterdir()
+    own.rename(tmp_path / "dal-1.json")
+
+    merged = worker_b.collect(str(tmp_path))
+
+    assert sum(_series(merged, "Users", "get")[:-1]) == 2
+    assert merged["errors"] == [["Users", "get", "DataAccessError", 1]]
+
+
+def test_exited_workers_keep_counters_but_not_gauges(tmp_path):
+    exited = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    pid = int(exited.stdout)
+    samples = [
+        ["homeagent_runs_total", "counter", "Runs.", {}, 4],
+        ["homeagent_runs_active", "gauge", "Active runs.", {}, 1],
+    ]
+    snapshot = {"buckets": [], "latency": [], "errors": [], "capacity": []}
+    (tmp_path / f"dal-{pid}.json").write_text(
+        json.dumps({**snapshot, "samples": samples})
+    )
+    live = MetricsRegistry()
+    live.register_collector("runs", lambda: [tuple(s) for s in samples])
+
+    merged = live.collect(str(tmp_path))
+
+    values = {name: value for name, _, _, _, value in merged["samples"]}
+    assert values == {"homeagent_runs_total": 8, "homeagent_runs_active": 1}
+
+
+def test_merge_sums_counters():
+    a = {
+        "buckets": [1.0],
+        "latency": [["T", "get", [1, 0, 0.5]]],
+        "errors": [],
+        "capacity": [["T", "get", 2.0]],
+    }
+    b = {
+        "buckets": [1.0],
+        "latency": [["T", "get", [0, 1, 3.0]]],
+        "errors": [],
+        "capacity": [["T", "get", 0.5]],
+    }
+    merged = merge_snapshots([a, b])
+    assert merged["latency"] == [["T", "get", [1, 1, 3.5]]]
+    assert merged["capacity"] == [["T", "get", 2.5]]
+
+
+def test_collector_samples_are_merged_and_rendered():
+    workers = [MetricsRegistry(), MetricsRegistry()]
+    for depth, worker in enumerate(workers, start=1):
+        worker.register_collector(
+            "queue",
+            lambda depth=depth: [
+                ("homeagent_queue_depth", "gauge", "Queued jobs.", {"q": "a"}, depth)
+            ],
+        )
+    workers[1].register_collector("broken", lambda: 1 / 0)
+
+    merged = merge_snapshots([worker.snapshot() for worker in workers])
+    text = render_prometheus(merged)
+
+    assert "# TYPE homeagent_queue_depth gauge" in text
+    assert 'homeagent_queue_depth{q="a"} 3' in text
+
+
+def test_repository_calls_are_recorded():
+    with mock_aws():
+        resource = boto3.resource("dynamodb", region_name="us-east-1")
+        resource.create_table(
+            TableName="Items",
+            KeySchema=[{"AttributeName": "pk", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "pk", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        repo = BaseRepository(CONFIG, resource)
+        repo.create({"pk": "a"})
+        with pytest.raises(DuplicateEntityError):
+            repo.create({"pk": "a"})
+        with pytest.raises(EntityNotFoundError):
+            repo.update({"pk": "zz"}, {"v": 1})
+        repo.get_by_id({"pk": "a"})
+        repo.query("a")
+
+    snapshot = DAL_METRICS.snapshot()
+    assert sum(_series(snapshot, "Items", "create")[:-1]) == 2
+    assert _series(snapshot, "Items", "get") is not None
+    assert sorted(snapshot["errors"]) == [
+        ["Items", "create", "DuplicateEntityError", 1],
+        ["Items", "update", "EntityNotFoundError", 1],
+    ]
+    assert {op for _, op, _ in snapshot["capacity"]} >= {"create", "get"}
+
+
+def test_translated_client_errors_are_counted():
+    class Failing:
+        def Table(self, name):
+            return self
+
+        def get_item(self, **kwargs):
+            raise ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "slow"}}, "GetItem"
+            )
+
+    repo = BaseRepository(CONFIG, Failing())
+    with pytest.raises(ThrottlingError):
+        repo.get_by_id({"pk": "a"})
+    assert DAL_METRICS.snapshot()["errors"] == [["Items", "get", "ThrottlingError", 1]]
+
+
+def _register(client):
+    reg = client.post(
+        "/api/auth/register",
+        json={
+            "invite_code": "FAMILY",
+            "device_name": "Test iPhone",
+            "platform": "ios",
+            "display_name": "Admin",
+        },
+    )
+    return reg.get_json()["device_token"]
+
+
+def test_metrics_endpoint_requires_auth(app, client):
+    assert client.get("/metrics").status_code == 401
+
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+    assert (
+        client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code
+        == 401
+    )
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    assert "# TYPE homeagent_dal_request_duration_seconds histogram" in response.text
+
+
+def test_admins_can_read_metrics(client):
+    token = _register(client)
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert 'table="Users"' in response.text
+
+
+def test_rate_limiters_are_rendered():
+    from app.dal.throttle import RateLimitPolicy, limiter_for
+
+    limiter = limiter_for("t-Items", RateLimitPolicy())
+    limiter.on_throttle()
+
+    text = render_prometheus(DAL_METRICS.snapshot())
+
+    assert 'homeagent_dal_rate_limit_throttles_total{table="t-Items"} 1' in text
+    assert 'homeagent_dal_rate_limit_active{table="t-Items"} 1' in text
+    assert 'homeagent_dal_rate_limit_requests_per_second{table="t-Items"}' in text
@@ -284,3 +284,45 @@ def test_get_family_no_family(client):
         headers=_auth_headers(member_token),
     )
     assert resp.status_code == 404
+
+
+def test_family_settings_defaults_and_update(client):
+    """Settings expose all feature gates and updates are visible immediately."""
+    _, token = _register_admin(client)
+
+    resp = client.get("/api/family/settings", headers=_auth_headers(token))
+    assert resp.status_code == 200
+    settings = resp.get_json()["settings"]
+    assert settings["web_search_enabled"] is True
+    assert settings["health_extraction_enabled"] is True
+
+    resp = client.put(
+        "/api/family/settings",
+        json={"web_search_enabled": False},
+        headers=_auth_headers(token),
+    )
+    assert resp.status_code == 200
+
+    # Served from cache, but the update invalidated the stale entry
+    resp = client.get("/api/family/settings", headers=_auth_headers(token))
+    settings = resp.get_json()["settings"]
+    assert settings["web_search_enabled"] is False
+    assert settings["health_extraction_enabled"] is True
+
+
+def test_family_feature_gate_served_from_cache(client, app):
+    """Repeated gate checks hit neither Users nor Families after the first."""
+    from unittest.mock import patch
+
+    from app.services.family import is_family_feature_enabled
+
+    user_id, _ = _register_admin(client)
+
+    with app.app_context():
+        assert is_family_feature_enabled(user_id, "web_search_enabled") is True
+        with patch("app.services.family.get_dal") as mock_dal:
+            assert is_family_feature_enabled(user_id, "web_search_enabled") is True
+            assert (
+                is_family_feature_enabled(user_id, "health_extraction_enabled") is True
+            )
+            mock_dal.assert_not_called()
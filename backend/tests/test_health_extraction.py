@@ -35,8 +35,8 @@ def test_extraction_valid_observations(app):
             json.dumps(observations)
         )
 
-        with patch("boto3.client", return_value=mock_bedrock):
-            with patch("boto3.resource") as mock_resource:
+        with patch("app.aws.client", return_value=mock_bedrock):
+            with patch("app.aws.resource") as mock_resource:
                 mock_table = MagicMock()
                 mock_resource.return_value.Table.return_value = mock_table
 
@@ -64,8 +64,8 @@ def test_extraction_empty_array(app):
         mock_bedrock = MagicMock()
         mock_bedrock.converse.return_value = _mock_converse_response("[]")
 
-        with patch("boto3.client", return_value=mock_bedrock):
-            with patch("boto3.resource") as mock_resource:
+        with patch("app.aws.client", return_value=mock_bedrock):
+            with patch("app.aws.resource") as mock_resource:
                 mock_table = MagicMock()
                 mock_resource.return_value.Table.return_value = mock_table
 
@@ -89,7 +89,7 @@ def test_extraction_malformed_json(app):
             "This is not JSON at all"
         )
 
-        with patch("boto3.client", return_value=mock_bedrock):
+        with patch("app.aws.client", return_value=mock_bedrock):
             # Should not raise
             extract_health_observations(
                 user_id="user1",
@@ -107,7 +107,7 @@ def test_extraction_bedrock_error(app):
         mock_bedrock = MagicMock()
         mock_bedrock.converse.side_effect = Exception("Bedrock is down")
 
-        with patch("boto3.client", return_value=mock_bedrock):
+        with patch("app.aws.client", return_value=mock_bedrock):
             # Should not raise
             extract_health_observations(
                 user_id="user1",
@@ -135,8 +135,8 @@ def test_extraction_invalid_category_defaults_to_general(app):
             json.dumps(observations)
         )
 
-        with patch("boto3.client", return_value=mock_bedrock):
-            with patch("boto3.resource") as mock_resource:
+        with patch("app.aws.client", return_value=mock_bedrock):
+            with patch("app.aws.resource") as mock_resource:
                 mock_table = MagicMock()
                 mock_resource.return_value.Table.return_value = mock_table
 
@@ -166,8 +166,8 @@ def test_extraction_skips_empty_summary(app):
             json.dumps(observations)
         )
 
-        with patch("boto3.client", return_value=mock_bedrock):
-            with patch("boto3.resource") as mock_resource:
+        with patch("app.aws.client", return_value=mock_bedrock):
+            with patch("app.aws.resource") as mock_resource:
                 mock_table = MagicMock()
                 mock_resource.return_value.Table.return_value = mock_table
 
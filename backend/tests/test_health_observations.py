@@ -107,6 +107,18 @@ def test_delete_all_observations(app):
         assert obs == []
 
 
+def test_list_and_delete_all_observations_span_pages(app):
+    with app.app_context():
+        for i in range(120):
+            create_observation(user_id="user7", category="diet", summary=f"Obs {i}")
+
+        assert len(list_observations("user7")) == 120
+        assert len(list_observations("user7", category="diet")) == 120
+
+        delete_all_observations("user7")
+        assert list_observations("user7") == []
+
+
 def test_delete_all_observations_no_records(app):
     """delete_all_observations should not error when there are no records."""
     with app.app_context():
@@ -0,0 +1,132 @@
+"""Tests for the health advisor tools' per-invocation read context."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.agents.health_tools import ACCESS_DENIED, HealthToolContext, build_health_tools
+
+RECORD = {
+    "record_id": "r1",
+    "record_type": "allergy",
+    "data": {"allergen": "peanuts"},
+    "created_at": "2025-01-01",
+    "updated_at": "2025-01-01",
+}
+OBSERVATION = {
+    "category": "sleep",
+    "summary": "Sleeps late",
+    "observed_at": "2025-01-02",
+}
+
+
+@pytest.fixture()
+def services():
+    mocks = {
+        "relationships": MagicMock(
+            return_value=[{"related_user_id": "kid", "relationship_type": "child"}]
+        ),
+        "profile": MagicMock(return_value={"display_name": "Pat", "health_notes": ""}),
+        "records": MagicMock(return_value=[RECORD]),
+        "observations": MagicMock(return_value=[OBSERVATION]),
+        "create_observation": MagicMock(return_value={"observation_id": "o1"}),
+    }
+    with (
+        patch("app.services.family_tree.get_relationships", mocks["relationships"]),
+        patch("app.services.profile.get_profile", mocks["profile"]),
+        patch("app.services.health_records.list_health_records", mocks["records"]),
+        patch(
+            "app.services.health_observations.list_observations", mocks["observations"]
+        ),
+        patch(
+            "app.services.health_observations.create_observation",
+            mocks["create_observation"],
+        ),
+    ):
+        yield mocks
+
+
+def _tools(**config):
+    return {t.tool_name: t for t in build_health_tools("parent", config)}
+
+
+def test_advisor_workflow_reads_each_item_once(services):
+    tools = _tools()
+
+    tools["get_family_health_context"]()
+    for target in ("parent", "kid"):
+        tools["get_health_summary"](target_user_id=target)
+        tools["get_family_health_records"](target_user_id=target)
+        tools["get_health_observations"](target_user_id=target)
+        tools["get_health_observations"](target_user_id=target)
+
+    assert services["relationships"].call_count == 1
+    assert services["profile"].call_count == 2  # parent + kid
+    assert services["records"].call_count == 2  # one per member
+    assert services["observations"].call_count == 2
+
+
+def test_filters_are_memoized_separately(services):
+    tools = _tools()
+
+    tools["get_family_health_records"](target_user_id="kid")
+    tools["get_family_health_records"](target_user_id="kid", record_type="allergy")
+
+    assert [c.kwargs["record_type"] for c in services["records"].call_args_list] == [
+        None,
+        "allergy",
+    ]
+
+
+def test_outsider_is_denied_without_data_reads(services):
+    tools = _tools()
+
+    assert tools["get_health_summary"](target_user_id="stranger") == ACCESS_DENIED
+    assert tools["get_health_observations"](target_user_id="stranger") == ACCESS_DENIED
+    services["records"].assert_not_called()
+    services["observations"].assert_not_called()
+    assert services["relationships"].call_count == 1
+
+
+def test_saving_an_observation_refreshes_reads(services):
+    tools = _tools()
+
+    tools["get_health_observations"](target_user_id="kid")
+    tools["save_health_observation"](
+        target_user_id="kid", category="sleep", summary="Naps"
+    )
+    tools["get_health_observations"](target_user_id="kid")
+
+    assert services["observations"].call_count == 2
+
+
+def test_new_invocation_gets_fresh_context(services):
+    _tools()["get_health_summary"](target_user_id="kid")
+    _tools()["get_health_summary"](target_user_id="kid")
+
+    assert services["records"].call_count == 2
+
+
+def test_concurrent_reads_share_one_fetch():
+    calls = []
+
+    def slow_load():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    ctx = HealthToolContext("parent")
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(ctx._memo(("k",), slow_load)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["value"] * 5
+    assert len(calls) == 1
@@ -0,0 +1,131 @@
+"""Unit tests for the FamilyMembers user_id-index backfill tool."""
+
+from __future__ import annotations
+
+import boto3
+from moto import mock_aws
+
+from scripts.backfill_membership_user_index import (
+    INDEX_NAME,
+    backfill_user_family_ids,
+    ensure_user_index,
+)
+
+REGION = "us-east-1"
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _create_tables(resource, with_index: bool = False):
+    params = {
+        "TableName": "FamilyMembers",
+        "KeySchema": [
+            {"AttributeName": "family_id", "KeyType": "HASH"},
+            {"AttributeName": "user_id", "KeyType": "RANGE"},
+        ],
+        "AttributeDefinitions": [
+            {"AttributeName": "family_id", "AttributeType": "S"},
+            {"AttributeName": "user_id", "AttributeType": "S"},
+        ],
+        "BillingMode": "PAY_PER_REQUEST",
+    }
+    if with_index:
+        params["GlobalSecondaryIndexes"] = [
+            {
+                "IndexName": INDEX_NAME,
+                "KeySchema": [{"AttributeName": "user_id", "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ]
+    resource.create_table(**params)
+    resource.create_table(
+        TableName="Users",
+        KeySchema=[{"AttributeName": "user_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "user_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def _index_names(client) -> set[str]:
+    table = client.describe_table(TableName="FamilyMembers")["Table"]
+    return {gsi["IndexName"] for gsi in table.get("GlobalSecondaryIndexes", [])}
+
+
+# ---------------------------------------------------------------------------
+# ensure_user_index
+# ---------------------------------------------------------------------------
+
+
+class TestEnsureUserIndex:
+    @mock_aws
+    def test_creates_missing_index(self):
+        resource = boto3.resource("dynamodb", region_name=REGION)
+        client = boto3.client("dynamodb", region_name=REGION)
+        _create_tables(resource)
+
+        assert ensure_user_index(client, poll_interval=0) is True
+        assert INDEX_NAME in _index_names(client)
+
+    @mock_aws
+    def test_existing_index_is_noop(self):
+        resource = boto3.resource("dynamodb", region_name=REGION)
+        client = boto3.client("dynamodb", region_name=REGION)
+        _create_tables(resource, with_index=True)
+
+        assert ensure_user_index(client) is False
+
+    @mock_aws
+    def test_dry_run_does_not_create(self):
+        resource = boto3.resource("dynamodb", region_name=REGION)
+        client = boto3.client("dynamodb", region_name=REGION)
+        _create_tables(resource)
+
+        assert ensure_user_index(client, dry_run=True) is True
+        assert INDEX_NAME not in _index_names(client)
+
+
+# ---------------------------------------------------------------------------
+# backfill_user_family_ids
+# ---------------------------------------------------------------------------
+
+
+class TestBackfillUserFamilyIds:
+    @mock_aws
+    def test_sets_missing_and_stale_family_ids(self):
+        resource = boto3.resource("dynamodb", region_name=REGION)
+        _create_tables(resource)
+        members = resource.Table("FamilyMembers")
+        users = resource.Table("Users")
+        members.put_item(Item={"family_id": "f1", "user_id": "u1"})
+        members.put_item(Item={"family_id": "f1", "user_id": "u2"})
+        members.put_item(Item={"family_id": "f2", "user_id": "u3"})
+        users.put_item(Item={"user_id": "u1", "family_id": "f1"})
+        users.put_item(Item={"user_id": "u2"})
+        users.put_item(Item={"user_id": "u3", "family_id": "stale"})
+
+        report = backfill_user_family_ids(resource)
+
+        assert report.scanned == 3
+        assert report.updated == 2
+        assert report.unchanged == 1
+        assert report.failed == 0
+        assert users.get_item(Key={"user_id": "u2"})["Item"]["family_id"] == "f1"
+        assert users.get_item(Key={"user_id": "u3"})["Item"]["family_id"] == "f2"
+
+    @mock_aws
+    def test_dry_run_leaves_users_untouched(self):
+        resource = boto3.resource("dynamodb", region_name=REGION)
+        _create_tables(resource)
+        resource.Table("FamilyMembers").put_item(
+            Item={"family_id": "f1", "user_id": "u1"}
+        )
+        users = resource.Table("Users")
+        users.put_item(Item={"user_id": "u1"})
+
+        report = backfill_user_family_ids(resource, dry_run=True)
+
+        assert report.updated == 1
+        assert "family_id" not in users.get_item(Key={"user_id": "u1"})["Item"]
@@ -4,23 +4,6 @@ import pytest
 from unittest.mock import patch, MagicMock
 
 
-@pytest.fixture
-def app():
-    from app import create_app
-    from app.config import Config
-
-    config = Config()
-    config.DYNAMODB_ENDPOINT = "http://localhost:8000"
-    config.ADMIN_INVITE_CODE = None
-    app = create_app(config)
-    return app
-
-
-@pytest.fixture
-def client(app):
-    return app.test_client()
-
-
 @pytest.fixture
 def auth_headers():
     return {"Authorization": "Bearer test-token"}
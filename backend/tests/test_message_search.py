@@ -0,0 +1,189 @@
+"""Tests for the conversation full-text index and search endpoint."""
+
+from app import aws
+from app.agents.health_tools import build_health_tools
+from app.dal import get_dal
+from app.services.conversation import (
+    add_message,
+    create_conversation,
+    delete_conversation,
+)
+from app.services.message_search import (
+    TERM_POSTINGS_LIMIT,
+    build_postings,
+    search_messages,
+    tokenize,
+)
+from scripts.backfill_message_search_index import backfill_message_index
+
+
+def _register(client):
+    resp = client.post(
+        "/api/auth/register",
+        json={
+            "invite_code": "FAMILY",
+            "device_name": "Phone",
+            "platform": "ios",
+            "display_name": "Tester",
+        },
+    )
+    data = resp.get_json()
+    return {"Authorization": f"Bearer {data['device_token']}"}, data["user_id"]
+
+
+def _search(client, headers, q):
+    resp = client.get(
+        "/api/conversations/search", query_string={"q": q}, headers=headers
+    )
+    assert resp.status_code == 200
+    return resp.get_json()["results"]
+
+
+def test_tokenize_words_and_cjk_bigrams():
+    assert tokenize("The baby has a FEVER, fever again") == ["baby", "fever", "again"]
+    assert tokenize("孩子发烧") == ["孩子", "子发", "发烧"]
+    assert tokenize("a I") == []
+
+
+def test_search_endpoint_finds_indexed_messages(app, client):
+    headers, user_id = _register(client)
+    with app.app_context():
+        conv = create_conversation(user_id, "Health")
+        cid = conv["conversation_id"]
+        add_message(
+            cid, "user", "My son has a fever and a sore throat", user_id=user_id
+        )
+        add_message(cid, "assistant", "Give fluids and watch the fever.")
+        add_message(cid, "user", "孩子发烧了怎么办", user_id=user_id)
+
+    hits = _search(client, headers, "fever")
+    assert len(hits) == 2
+    assert hits[0]["role"] == "assistant"  # newest first
+    assert hits[0]["conversation_id"] == cid
+
+    assert len(_search(client, headers, "sore thr")) == 1  # all words, by prefix
+    assert len(_search(client, headers, "fever throat")) == 1
+    assert len(_search(client, headers, "throat, fluids")) == 2
+    assert len(_search(client, headers, "发烧")) == 1
+    assert _search(client, headers, "headache") == []
+
+
+def test_search_requires_query_and_is_per_user(app, client):
+    headers, user_id = _register(client)
+    with app.app_context():
+        mine = create_conversation(user_id, "Mine")
+        add_message(mine["conversation_id"], "user", "insulin dosage", user_id=user_id)
+        theirs = create_conversation("someone-else", "Theirs")
+        add_message(theirs["conversation_id"], "user", "insulin pump")
+
+    resp = client.get("/api/conversations/search", headers=headers)
+    assert resp.status_code == 400
+    hits = _search(client, headers, "insulin")
+    assert [h["conversation_id"] for h in hits] == [mine["conversation_id"]]
+
+
+def test_search_covers_whole_history(app):
+    with app.app_context():
+        conv = create_conversation("user-1", "Long chat")
+        cid = conv["conversation_id"]
+        add_message(cid, "user", "allergic to peanuts", user_id="user-1")
+        for i in range(55):
+            add_message(cid, "user", f"filler message {i}", user_id="user-1")
+        add_message(cid, "user", "also allergic to penicillin", user_id="user-1")
+
+        hits = search_messages("user-1", ["allergic"])
+        assert [h["snippet"] for h in hits] == [
+            "also allergic to penicillin",
+            "allergic to peanuts",
+        ]
+
+
+def test_delete_conversation_removes_postings(app):
+    with app.app_context():
+        conv = create_conversation("user-1", "Temp")
+        add_message(conv["conversation_id"], "user", "migraine again", user_id="user-1")
+        assert search_messages("user-1", ["migraine"])
+
+        delete_conversation(conv["conversation_id"])
+
+        assert search_messages("user-1", ["migraine"]) == []
+        assert get_dal().message_search.query("user-1").items == []
+
+
+def test_health_tool_uses_index(app):
+    with app.app_context():
+        conv = create_conversation("user-1", "Sleep")
+        add_message(
+            conv["conversation_id"], "user", "Toddler wakes at night", user_id="user-1"
+        )
+        tools = {t.tool_name: t for t in build_health_tools("user-1", {})}
+
+        result = tools["search_health_conversations"](keywords="night, diet")
+
+    assert result.startswith("Found 1 matches")
+    assert "[night]" in result
+    assert "Toddler wakes at night" in result
+
+
+def test_backfill_indexes_existing_messages(app):
+    with app.app_context():
+        conv = create_conversation("user-1", "Old")
+        get_dal().messages.create(
+            {
+                "conversation_id": conv["conversation_id"],
+                "sort_key": "2024-01-01T00:00:00+00:00#01OLD",
+                "message_id": "01OLD",
+                "role": "user",
+                "content": "old asthma question",
+                "created_at": "2024-01-01T00:00:00+00:00",
+            }
+        )
+        assert search_messages("user-1", ["asthma"]) == []
+
+        resource = aws.dynamodb_resource(app.config)
+        report = backfill_message_index(resource)
+
+        assert report.messages == 1
+        assert report.failed == 0
+        assert [h["message_id"] for h in search_messages("user-1", ["asthma"])] == [
+            "01OLD"
+        ]
+
+
+def _index(user_id, n, content, start=0):
+    """Index *n* messages directly, older ones first, without storing them."""
+    postings = []
+    for i in range(start, start + n):
+        created = f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00"
+        message = {
+            "conversation_id": "conv-1",
+            "message_id": f"m{i:04d}",
+            "sort_key": f"{created}#m{i:04d}",
+            "role": "user",
+            "created_at": created,
+            "content": content,
+        }
+        postings += build_postings(user_id, message)
+    get_dal().message_search.put_postings(postings)
+
+
+def test_exact_term_is_not_crowded_out_by_longer_terms(app):
+    with app.app_context():
+        _index("user-1", 2, "back pain", start=0)
+        _index("user-1", 250, "took a painkiller", start=10)
+
+        hits = search_messages("user-1", ["pain"], limit=300)
+
+    assert {"m0000", "m0001"} <= {h["message_id"] for h in hits}
+    # longer terms still match and fill the rest of the first read
+    assert len(hits) == TERM_POSTINGS_LIMIT
+
+
+def test_phrase_reads_back_until_terms_intersect(app):
+    with app.app_context():
+        _index("user-1", 1, "fever and rash", start=0)
+        _index("user-1", TERM_POSTINGS_LIMIT + 50, "fever again", start=1)
+
+        hits = search_messages("user-1", ["fever rash"])
+
+    assert [h["message_id"] for h in hits] == ["m0000"]
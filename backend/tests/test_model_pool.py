@@ -0,0 +1,47 @@
+"""Tests for the shared BedrockModel pool and Agent factory."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.agents.model_pool import ModelPool, build_agent, get_model_pool
+
+
+@pytest.fixture()
+def fake_bedrock():
+    with patch(
+        "strands.models.BedrockModel", side_effect=lambda **kw: MagicMock(**kw)
+    ) as mock:
+        yield mock
+
+
+def test_same_settings_share_one_model(fake_bedrock):
+    pool = ModelPool()
+    first = pool.get("model-a", streaming=False, temperature=0.5, max_tokens=4096)
+    second = pool.get("model-a", streaming=False, temperature=0.5, max_tokens=4096)
+
+    assert first is second
+    assert fake_bedrock.call_count == 1
+
+
+def test_different_settings_get_separate_models(fake_bedrock):
+    pool = ModelPool()
+    streaming = pool.get("model-a", streaming=True, temperature=0.7, max_tokens=4096)
+    blocking = pool.get("model-a", streaming=False, temperature=0.7, max_tokens=4096)
+    other = pool.get("model-b", streaming=True, temperature=0.7, max_tokens=4096)
+
+    assert len({id(streaming), id(blocking), id(other)}) == 3
+    assert len(pool) == 3
+
+
+def test_build_agent_reuses_pooled_model(fake_bedrock):
+    get_model_pool().clear()
+    with patch("strands.Agent") as mock_agent:
+        build_agent("model-a", streaming=False, temperature=0.5, system_prompt="A")
+        build_agent("model-a", streaming=False, temperature=0.5, system_prompt="B")
+
+    models = [c.kwargs["model"] for c in mock_agent.call_args_list]
+    assert models[0] is models[1]
+    assert [c.kwargs["system_prompt"] for c in mock_agent.call_args_list] == ["A", "B"]
+    assert fake_bedrock.call_count == 1
+    get_model_pool().clear()
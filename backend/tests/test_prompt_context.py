@@ -0,0 +1,136 @@
+"""Tests for the prompt-context fan-out executor."""
+
+import threading
+
+from flask import current_app, g
+
+from app.services.prompt_context import (
+    MAX_STRAGGLERS_PER_SECTION,
+    _stragglers,
+    configured_budget,
+    fan_out,
+    get_fan_out_stats,
+)
+
+
+def _outcome(section, outcome):
+    return get_fan_out_stats().get(section, {}).get(outcome, 0)
+
+
+def test_runs_sections_concurrently():
+    # Each section only returns once all three are running at the same time.
+    barrier = threading.Barrier(3, timeout=5)
+
+    def section(value):
+        def _fn():
+            barrier.wait()
+            return value
+
+        return _fn
+
+    result = fan_out(
+        {"a": section(1), "b": section(2), "c": section(3)}, budget_seconds=10
+    )
+
+    assert result == {"a": 1, "b": 2, "c": 3}
+
+
+def test_sections_missing_budget_are_omitted():
+    before = _outcome("budget_slow", "timed_out")
+    release = threading.Event()
+
+    try:
+        result = fan_out(
+            {"budget_fast": lambda: "ok", "budget_slow": release.wait},
+            budget_seconds=0.05,
+        )
+    finally:
+        release.set()
+
+    assert result == {"budget_fast": "ok"}
+    assert _outcome("budget_slow", "timed_out") == before + 1
+
+
+def test_overdue_reads_are_bounded_per_section():
+    release = threading.Event()
+    tasks = {"stuck": release.wait, "healthy": lambda: "ok"}
+    skipped = _outcome("stuck", "skipped")
+
+    try:
+        for _ in range(MAX_STRAGGLERS_PER_SECTION):
+            assert fan_out(tasks, budget_seconds=0.05) == {"healthy": "ok"}
+        assert len(_stragglers["stuck"]) == MAX_STRAGGLERS_PER_SECTION
+
+        # The stuck section is no longer submitted; the others still run.
+        assert fan_out(tasks, budget_seconds=10) == {"healthy": "ok"}
+        assert _outcome("stuck", "skipped") == skipped + 1
+    finally:
+        release.set()
+
+    # Finished reads leave the straggler set from their done callbacks.
+    tick = threading.Event()
+    for _ in range(100):
+        if not _stragglers["stuck"]:
+            break
+        tick.wait(0.01)
+    assert not _stragglers["stuck"]
+
+
+def test_configured_budget_follows_app_config(app):
+    with app.app_context():
+        app.config["PROMPT_CONTEXT_BUDGET_SECONDS"] = 0.25
+        assert configured_budget() == 0.25
+
+
+def test_failed_sections_are_omitted():
+    def boom():
+        raise RuntimeError("table unavailable")
+
+    result = fan_out({"failing": boom, "fine": lambda: 42})
+
+    assert result == {"fine": 42}
+    assert get_fan_out_stats()["failing"]["failed"] >= 1
+
+
+def test_section_outcomes_are_exported_on_metrics():
+    from app.dal.metrics import DAL_METRICS, render_prometheus
+
+    fan_out({"exported": lambda: 1}, budget_seconds=1.0)
+
+    text = render_prometheus(DAL_METRICS.snapshot())
+    assert "# TYPE homeagent_prompt_context_sections_total counter" in text
+    assert (
+        'homeagent_prompt_context_sections_total{section="exported",'
+        'outcome="completed"}' in text
+    )
+
+
+def test_empty_tasks():
+    assert fan_out({}) == {}
+
+
+def test_flask_context_visible_to_sections(app):
+    with app.test_request_context():
+        g.marker = "request-scoped"
+        result = fan_out(
+            {
+                "region": lambda: current_app.config["AWS_REGION"],
+                "marker": lambda: g.marker,
+            }
+        )
+
+    assert result == {"region": "us-east-1", "marker": "request-scoped"}
+
+
+def test_build_system_prompt_skips_missing_sections(app):
+    from app.services.agent_orchestrator import _build_system_prompt
+
+    with app.app_context():
+        prompt = _build_system_prompt(
+            "any-user",
+            "Base prompt.",
+            {"profile": {"display_name": "Alice"}, "shared_context": None},
+        )
+
+    assert "Alice" in prompt
+    assert "Family relationships" not in prompt
@@ -0,0 +1,84 @@
+"""Tests for batched record writes in storage migration and import."""
+
+from unittest.mock import MagicMock, patch
+
+from app.dal.batch import BatchWriteFailure, BatchWriteResult
+from app.services.storage_migration import StorageMigrator
+from app.storage.base import StorageProvider
+from app.storage.local_provider import LocalProvider
+
+
+def _records(n, user_id="u1"):
+    return [
+        {"user_id": user_id, "record_id": f"r{i:03d}", "record_type": "allergy"}
+        for i in range(n)
+    ]
+
+
+class BatchingTarget(LocalProvider):
+    """LocalProvider that records batch sizes and forbids single puts."""
+
+    def __init__(self, user_id):
+        super().__init__(user_id)
+        self.batches = []
+
+    def put_record(self, collection, record, *, condition_expression=None):
+        raise AssertionError("bulk paths must use put_records")
+
+    def put_records(self, collection, records):
+        self.batches.append((collection, len(records)))
+        return super().put_records(collection, records)
+
+
+def test_local_provider_put_records(app):
+    with app.app_context():
+        provider = LocalProvider("u1")
+        assert provider.put_records("health_records", _records(30)) == []
+        assert (
+            provider.get_record(
+                "health_records", {"user_id": "u1", "record_id": "r029"}
+            )["record_type"]
+            == "allergy"
+        )
+
+
+def test_local_provider_reports_unwritten_records(app):
+    failure = BatchWriteFailure(
+        "put", {"user_id": "u1", "record_id": "r001"}, "throttled"
+    )
+    with (
+        app.app_context(),
+        patch(
+            "app.dal.base.BaseRepository.batch_put",
+            return_value=BatchWriteResult(written=2, failures=[failure]),
+        ),
+    ):
+        failed = LocalProvider("u1").put_records("health_records", _records(3))
+    assert [r["record_id"] for r in failed] == ["r001"]
+
+
+def test_migration_writes_records_in_batches(app):
+    source = MagicMock(spec=StorageProvider)
+    source.query_records.side_effect = lambda collection, key: (
+        _records(130) if collection == "health_records" else []
+    )
+    target = BatchingTarget("u1")
+
+    with app.app_context():
+        progress = StorageMigrator().migrate("u1", source, target)
+
+    assert progress.status == "completed", progress.errors
+    assert progress.migrated_records == 130
+    assert target.batches == [("health_records", 100), ("health_records", 30)]
+
+
+def test_import_writes_records_in_batches(app):
+    with app.app_context():
+        source = LocalProvider("u1")
+        source.put_records("health_records", _records(5))
+        archive = StorageMigrator().export_data("u1", source)
+        target = BatchingTarget("u1")
+        progress = StorageMigrator().import_data("u1", target, archive)
+
+    assert progress.migrated_records == 5, progress.errors
+    assert ("health_records", 5) in target.batches
@@ -0,0 +1,170 @@
+"""Tests for concurrent, streaming sub-agent tools."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from strands import Agent
+from strands.models import Model
+
+from app.agents.custom_agent import create_custom_agent_tool
+from app.agents.sub_agent_stream import stream_sub_agent
+
+
+class ScriptedModel(Model):
+    """Model that replays one scripted turn per ``stream`` call."""
+
+    def __init__(self, turns):
+        self.turns = list(turns)
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {}
+
+    async def structured_output(
+        self, output_model, prompt, system_prompt=None, **kwargs
+    ):
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        for event in self.turns.pop(0):
+            yield event
+
+
+def _text_turn(text):
+    return [
+        {"messageStart": {"role": "assistant"}},
+        {"contentBlockDelta": {"delta": {"text": text}}},
+        {"contentBlockStop": {}},
+        {"messageStop": {"stopReason": "end_turn"}},
+    ]
+
+
+def _tool_turn(*calls):
+    events = [{"messageStart": {"role": "assistant"}}]
+    for tool_use_id, name, query in calls:
+        events += [
+            {
+                "contentBlockStart": {
+                    "start": {"toolUse": {"toolUseId": tool_use_id, "name": name}}
+                }
+            },
+            {
+                "contentBlockDelta": {
+                    "delta": {"toolUse": {"input": json.dumps({"query": query})}}
+                }
+            },
+            {"contentBlockStop": {}},
+        ]
+    events.append({"messageStop": {"stopReason": "tool_use"}})
+    return events
+
+
+class SlowSubAgent:
+    """Sub-agent stand-in that takes a while and streams its answer."""
+
+    def __init__(self, answer, delay=0.2):
+        self.answer = answer
+        self.delay = delay
+
+    async def stream_async(self, query):
+        await asyncio.sleep(self.delay)
+        for word in self.answer.split(" "):
+            yield {"data": word + " "}
+        yield {"result": SimpleNamespace(message=self.answer)}
+
+
+def _collect(gen):
+    async def run():
+        return [item async for item in gen]
+
+    return asyncio.run(run())
+
+
+def test_stream_sub_agent_reports_progress_then_answer():
+    updates = _collect(
+        stream_sub_agent(SlowSubAgent("word " * 30, delay=0), "q", "helper", "sorry")
+    )
+
+    assert updates[0] == {"agent": "helper", "status": "started"}
+    streamed = [
+        u for u in updates if isinstance(u, dict) and u["status"] == "streaming"
+    ]
+    assert len(streamed) > 1
+    assert all(len(u["content"]) >= 40 for u in streamed[:-1])
+    assert updates[-2] == {"agent": "helper", "status": "done"}
+    assert updates[-1] == "word " * 30
+
+
+def test_stream_sub_agent_failure_returns_apology():
+    class Broken:
+        async def stream_async(self, query):
+            raise RuntimeError("bedrock down")
+            yield  # pragma: no cover
+
+    updates = _collect(stream_sub_agent(Broken(), "q", "helper", "sorry"))
+
+    assert updates[-2] == {"agent": "helper", "status": "error"}
+    assert updates[-1] == "sorry"
+
+
+def test_orchestrator_runs_sub_agents_concurrently_and_streams_progress(app):
+    from app.services.agent_orchestrator import stream_agent_chat
+
+    tools = [
+        create_custom_agent_tool(
+            template={"agent_type": name, "name": name, "system_prompt": "x"},
+            config={},
+            user_id="user-1",
+            model_id="model",
+        )
+        for name in ("chef", "coach")
+    ]
+    sub_agents = iter([SlowSubAgent("eat greens"), SlowSubAgent("run daily")])
+    model = ScriptedModel(
+        [
+            _tool_turn(("t1", "ask_chef", "dinner?"), ("t2", "ask_coach", "exercise?")),
+            _text_turn("Here is your plan."),
+        ]
+    )
+
+    def orchestrator_agent(model_id, **kwargs):
+        for key in ("streaming", "max_tokens", "temperature"):
+            kwargs.pop(key, None)
+        return Agent(model=model, callback_handler=None, **kwargs)
+
+    with (
+        app.test_request_context(),
+        patch(
+            "app.agents.custom_agent.build_agent",
+            side_effect=lambda *a, **k: next(sub_agents),
+        ),
+        patch("app.agents.model_pool.build_agent", side_effect=orchestrator_agent),
+    ):
+        events = list(
+            stream_agent_chat(
+                [{"role": "user", "content": "plan my day"}], "user-1", tools=tools
+            )
+        )
+
+    progress = [e for e in events if e["type"] == "tool_progress"]
+    assert {(e["tool_name"], e["status"]) for e in progress} >= {
+        ("ask_chef", "started"),
+        ("ask_chef", "done"),
+        ("ask_coach", "started"),
+        ("ask_coach", "done"),
+    }
+    # Both sub-agents started before either finished.
+    statuses = [(e["agent"], e["status"]) for e in progress]
+    first_done = min(
+        statuses.index(("chef", "done")), statuses.index(("coach", "done"))
+    )
+    assert statuses.index(("chef", "started")) < first_done
+    assert statuses.index(("coach", "started")) < first_done
+
+    assert events[-1]["type"] == "message_done"
+    assert events[-1]["content"] == "Here is your plan."
@@ -0,0 +1,74 @@
+"""Tests for the per-user sub-agent tool cache."""
+
+from unittest.mock import patch
+
+from app.agents.personal import build_sub_agent_tools
+from app.agents.tool_cache import SubAgentToolCache, get_tool_cache
+from app.services.agent_config import delete_agent_config, put_agent_config
+from app.services.agent_template import get_template_by_type, update_template
+
+MODEL_ID = "test-model"
+
+
+def _fake_tool(agent_type, config, user_id, model_id):
+    def tool_fn():
+        return agent_type
+
+    return tool_fn
+
+
+@patch("app.agents.personal.create_agent_tool", side_effect=_fake_tool)
+def test_repeat_build_does_no_reads(mock_create, app):
+    with app.app_context():
+        put_agent_config("user-1", "health_advisor")
+        first = build_sub_agent_tools("user-1", MODEL_ID)
+
+        with patch("app.agents.personal.get_agent_configs") as mock_configs:
+            second = build_sub_agent_tools("user-1", MODEL_ID)
+
+    assert len(first) == 1
+    assert second == first
+    mock_configs.assert_not_called()
+    assert mock_create.call_count == 1
+
+
+@patch("app.agents.personal.create_agent_tool", side_effect=_fake_tool)
+def test_put_and_delete_config_invalidate(mock_create, app):
+    with app.app_context():
+        put_agent_config("user-1", "health_advisor")
+        build_sub_agent_tools("user-1", MODEL_ID)
+
+        put_agent_config("user-1", "logistics_assistant")
+        assert len(build_sub_agent_tools("user-1", MODEL_ID)) == 2
+
+        delete_agent_config("user-1", "logistics_assistant")
+        assert len(build_sub_agent_tools("user-1", MODEL_ID)) == 1
+
+
+@patch("app.agents.personal.create_agent_tool", side_effect=_fake_tool)
+def test_template_update_invalidates_users_of_that_type(mock_create, app):
+    with app.app_context():
+        put_agent_config("user-1", "health_advisor")
+        put_agent_config("user-2", "logistics_assistant")
+        build_sub_agent_tools("user-1", MODEL_ID)
+        build_sub_agent_tools("user-2", MODEL_ID)
+        cache = get_tool_cache()
+        assert len(cache) == 2
+
+        template = get_template_by_type("health_advisor")
+        update_template(template["template_id"], description="Updated")
+
+        assert cache.get("user-1", MODEL_ID) == (None, False)
+        assert cache.get("user-2", MODEL_ID)[0] is not None
+
+
+@patch("app.agents.personal.create_agent_tool", side_effect=_fake_tool)
+def test_stale_entry_with_same_fingerprint_is_reused(mock_create, app):
+    with app.app_context():
+        app.extensions["sub_agent_tool_cache"] = SubAgentToolCache(ttl_seconds=0)
+        put_agent_config("user-1", "health_advisor")
+        first = build_sub_agent_tools("user-1", MODEL_ID)
+        second = build_sub_agent_tools("user-1", MODEL_ID)
+
+    assert second == first
+    assert mock_create.call_count == 1
@@ -0,0 +1,94 @@
+"""Tests for the version-stamped agent template catalog."""
+
+from unittest.mock import patch
+
+from app.dal import get_dal
+from app.services.agent_template import (
+    create_template,
+    get_template_by_type,
+    list_templates,
+    update_template,
+)
+from app.services.template_catalog import (
+    CATALOG_VERSION_ID,
+    TemplateCatalog,
+    bump_catalog_version,
+    get_template_catalog,
+    read_catalog_version,
+)
+
+
+def test_seeding_bumps_catalog_version(app):
+    with app.app_context():
+        table = get_dal().agent_templates._table
+        assert read_catalog_version(table) >= 1
+
+
+def test_list_excludes_version_item(app):
+    with app.app_context():
+        templates = list_templates()
+
+    assert templates
+    assert all(t["template_id"] != CATALOG_VERSION_ID for t in templates)
+    assert "health_advisor" in {t["agent_type"] for t in templates}
+
+
+def test_hot_reads_are_dictionary_lookups(app):
+    with app.app_context():
+        get_template_by_type("health_advisor")  # warm the catalog
+        table = get_dal().agent_templates._table
+
+        with (
+            patch.object(table, "scan") as mock_scan,
+            patch.object(table, "query") as mock_query,
+            patch.object(table, "get_item") as mock_get,
+        ):
+            template = get_template_by_type("health_advisor")
+            listed = list_templates()
+
+    assert template["agent_type"] == "health_advisor"
+    assert listed
+    mock_scan.assert_not_called()
+    mock_query.assert_not_called()
+    mock_get.assert_not_called()
+
+
+def test_local_writes_apply_without_reload(app):
+    with app.app_context():
+        list_templates()
+        table = get_dal().agent_templates._table
+
+        with patch.object(table, "scan") as mock_scan:
+            created = create_template(
+                name="Meal Planner",
+                agent_type="meal_planner",
+                description="Plans meals",
+                system_prompt="You plan meals.",
+            )
+            update_template(created["template_id"], description="Plans dinners")
+            template = get_template_by_type("meal_planner")
+
+    assert template["description"] == "Plans dinners"
+    mock_scan.assert_not_called()
+
+
+def test_other_worker_write_triggers_reload(app):
+    with app.app_context():
+        app.extensions["template_catalog"] = TemplateCatalog(check_interval=0)
+        assert get_template_by_type("meal_planner") is None
+
+        # Simulate another worker writing directly and bumping the version.
+        table = get_dal().agent_templates._table
+        table.put_item(
+            Item={
+                "template_id": "tmpl-other",
+                "agent_type": "meal_planner",
+                "name": "Meal Planner",
+                "description": "Plans meals",
+                "system_prompt": "You plan meals.",
+            }
+        )
+        bump_catalog_version(table)
+
+        catalog = get_template_catalog()
+        assert catalog.get_by_type(table, "meal_planner")["template_id"] == "tmpl-other"
@@ -0,0 +1,140 @@
+"""Tests for token usage and latency accounting."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.services.agentcore_runtime import AgentCoreRuntimeClient
+from app.services.usage import GenerationTimer, build_usage, usage_from_bedrock
+
+USAGE = {
+    "input_tokens": 120,
+    "output_tokens": 30,
+    "cache_read_tokens": 100,
+    "ttft_ms": 250,
+    "generation_ms": 900,
+}
+
+
+def _register(client):
+    resp = client.post(
+        "/api/auth/register",
+        json={
+            "invite_code": "FAMILY",
+            "device_name": "Test iPhone",
+            "platform": "ios",
+            "display_name": "Tester",
+        },
+    )
+    data = resp.get_json()
+    return data["device_token"], data["user_id"]
+
+
+def _mock_stream_chat(messages, system_prompt=None, images=None):
+    yield {"type": "text_delta", "content": "Hello"}
+    yield {
+        "type": "message_done",
+        "content": "Hello",
+        "input_tokens": 120,
+        "output_tokens": 30,
+        "usage": dict(USAGE),
+    }
+
+
+def test_usage_from_bedrock():
+    assert usage_from_bedrock(
+        {
+            "inputTokens": 5,
+            "outputTokens": 7,
+            "totalTokens": 12,
+            "cacheReadInputTokens": 3,
+        }
+    ) == {"input_tokens": 5, "output_tokens": 7, "cache_read_tokens": 3}
+    assert usage_from_bedrock(None) == {
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_tokens": 0,
+    }
+
+
+def test_build_usage_without_tokens_has_no_ttft():
+    usage = build_usage(None, GenerationTimer())
+    assert usage["ttft_ms"] is None
+    assert usage["input_tokens"] == 0
+
+
+def test_parse_runtime_usage():
+    raw = json.dumps({"result": "hi", "usage": {"inputTokens": 9, "outputTokens": 4}})
+    assert AgentCoreRuntimeClient._parse_runtime_usage(raw)["input_tokens"] == 9
+    assert (
+        AgentCoreRuntimeClient._parse_runtime_usage("plain text")["input_tokens"] == 0
+    )
+
+
+@patch("app.routes.chat.stream_chat", side_effect=_mock_stream_chat)
+def test_chat_records_message_and_counters(mock_bedrock, app, client):
+    token, user_id = _register(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for _ in range(2):
+        resp = client.post("/api/chat", json={"message": "Hi"}, headers=headers)
+        assert resp.status_code == 200
+        resp.get_data()
+    conversation_id = json.loads(resp.data.decode().split("data: ")[1])[
+        "conversation_id"
+    ]
+
+    messages = client.get(
+        f"/api/conversations/{conversation_id}/messages", headers=headers
+    ).get_json()["messages"]
+    assistant = [m for m in messages if m["role"] == "assistant"][0]
+    assert int(assistant["tokens_used"]) == 150
+    assert int(assistant["usage"]["cache_read_tokens"]) == 100
+
+    resp = client.get(f"/api/admin/usage/users/{user_id}", headers=headers)
+    assert resp.status_code == 200
+    all_time = resp.get_json()["usage"]["all"]
+    assert all_time["messages"] == 2
+    assert all_time["input_tokens"] == 240
+    assert all_time["output_tokens"] == 60
+    assert all_time["avg_ttft_ms"] == 250
+
+    family_id = client.get("/api/family", headers=headers).get_json()["family"][
+        "family_id"
+    ]
+    resp = client.get(f"/api/admin/usage/families/{family_id}", headers=headers)
+    assert resp.get_json()["usage"]["all"]["messages"] == 2
+
+
+def test_orchestrator_reports_strands_usage(app):
+    from app.services.agent_orchestrator import stream_agent_chat
+
+    class FakeAgent:
+        def __init__(self, **kwargs):
+            pass
+
+        async def stream_async(self, message):
+            yield {"data": "Hi"}
+            metrics = SimpleNamespace(
+                accumulated_usage={
+                    "inputTokens": 40,
+                    "outputTokens": 2,
+                    "totalTokens": 42,
+                }
+            )
+            yield {"result": SimpleNamespace(metrics=metrics)}
+
+    with (
+        app.test_request_context(),
+        patch("strands.Agent", FakeAgent),
+        patch("strands.models.BedrockModel", MagicMock()),
+    ):
+        events = list(
+            stream_agent_chat([{"role": "user", "content": "hi"}], "user-1", tools=[])
+        )
+
+    done = events[-1]
+    assert done["type"] == "message_done"
+    assert done["input_tokens"] == 40
+    assert done["usage"]["output_tokens"] == 2
+    assert done["usage"]["ttft_ms"] is not None
@@ -0,0 +1,217 @@
+"""Tests for embedders, the per-user vector index and prompt recall."""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.services.embeddings import HashedNgramEmbedder
+from app.services.vector_index import VectorIndex, chunk_text
+
+DOCS = [
+    ("c1", "My daughter is allergic to peanuts and tree nuts"),
+    ("c1", "We planted tomatoes and basil in the garden"),
+    ("c2", "The car needs an oil change next week"),
+    ("c2", "Grandpa takes metformin for his diabetes"),
+]
+
+
+def _chunks(docs=DOCS):
+    return [
+        {"text": text, "conversation_id": cid, "message_id": f"m{i}"}
+        for i, (cid, text) in enumerate(docs)
+    ]
+
+
+@pytest.fixture(params=["float32", "int8"])
+def index(request, tmp_path):
+    idx = VectorIndex(
+        tmp_path / "u1", HashedNgramEmbedder(dim=256), dtype=request.param
+    )
+    idx.add(_chunks())
+    return idx
+
+
+def test_hashed_embedder_is_deterministic_and_normalized():
+    embedder = HashedNgramEmbedder(dim=64)
+    a, b = embedder.embed(["peanut allergy", "peanut allergy"])
+    assert np.array_equal(a, b)
+    assert np.isclose(np.linalg.norm(a), 1.0)
+
+    query, near, far = embedder.embed(
+        ["peanut allergies", "allergic to peanuts", "oil change"]
+    )
+    assert query @ near > query @ far
+
+
+def test_chunk_text_overlaps_on_word_boundaries():
+    text = " ".join(f"word{i}" for i in range(300))
+    chunks = chunk_text(text, size=200, overlap=50)
+    assert len(chunks) > 1
+    assert all(len(c) <= 200 for c in chunks)
+    assert all(not c.startswith(" ") and "word" in c.split(" ")[0] for c in chunks)
+    assert chunk_text("") == []
+
+
+def test_search_ranks_relevant_chunk_first(index):
+    hits = index.search("peanut allergy", k=2)
+    assert hits[0]["message_id"] == "m0"
+    assert hits[0]["score"] >= hits[1]["score"]
+
+    hits = index.search("diabetes medication", k=1)
+    assert hits[0]["message_id"] == "m3"
+
+
+def test_exclude_conversation_and_min_score(index):
+    hits = index.search("peanut allergy", k=4, exclude_conversation_id="c1")
+    assert {h["conversation_id"] for h in hits} == {"c2"}
+    assert index.search("peanut allergy", k=4, min_score=0.99) == []
+
+
+def test_index_persists_and_appends_incrementally(tmp_path):
+    embedder = HashedNgramEmbedder(dim=128)
+    VectorIndex(tmp_path / "u1", embedder, "int8").add(_chunks())
+
+    reopened = VectorIndex(tmp_path / "u1", embedder, "int8")
+    assert len(reopened) == 4
+    reopened.add(_chunks([("c3", "Soccer practice moved to Saturday")]))
+
+    assert len(reopened) == 5
+    assert isinstance(reopened._vectors, np.memmap)
+    assert (tmp_path / "u1" / "vectors.bin").stat().st_size == 5 * 128  # int8 rows
+    assert reopened.search("soccer saturday", k=1)[0]["conversation_id"] == "c3"
+
+
+def test_orphan_rows_from_interrupted_append_are_dropped(tmp_path):
+    embedder = HashedNgramEmbedder(dim=32)
+    idx = VectorIndex(tmp_path / "u1", embedder)
+    idx.add(_chunks()[:2])
+    with open(tmp_path / "u1" / "vectors.bin", "ab") as f:
+        f.write(np.ones(32, dtype=np.float32).tobytes())  # row with no metadata
+
+    assert len(idx) == 2
+    idx.add(_chunks()[2:])
+    assert len(idx) == 4
+    assert idx.search("oil change", k=1)[0]["message_id"] == "m2"
+
+
+def test_remove_conversation_rewrites_index(index):
+    assert index.remove_conversation("c1") == 2
+    assert len(index) == 2
+    assert {h["conversation_id"] for h in index.search("peanut", k=4)} == {"c2"}
+    assert "peanuts" not in (index.path / "chunks.jsonl").read_text()
+
+
+def test_interrupted_rewrite_is_completed_by_next_reader(index):
+    import os
+
+    real_replace = os.replace
+    calls = []
+
+    def crash_after_first(src, dst):
+        if calls:
+            raise KeyboardInterrupt("crash")
+        calls.append(dst)
+        real_replace(src, dst)
+
+    with patch("app.services.vector_index.os.replace", crash_after_first):
+        with pytest.raises(KeyboardInterrupt):
+            index.remove_conversation("c1")
+    assert (index.path / "rewrite").exists()  # vectors replaced, chunks not
+
+    reopened = VectorIndex(index.path, index.embedder, index.dtype.name)
+    assert len(reopened) == 2
+    assert {h["conversation_id"] for h in reopened.search("peanut", k=4)} == {"c2"}
+    assert reopened.search("diabetes medication", k=1)[0]["message_id"] == "m3"
+    assert not (index.path / "rewrite").exists()
+
+
+def test_embedder_change_reembeds_from_stored_text(tmp_path):
+    VectorIndex(tmp_path / "u1", HashedNgramEmbedder(dim=64)).add(_chunks())
+
+    idx = VectorIndex(tmp_path / "u1", HashedNgramEmbedder(dim=32))
+    assert len(idx) == 4
+    assert (tmp_path / "u1" / "vectors.bin").stat().st_size == 4 * 32 * 4
+    assert idx.search("tomatoes garden", k=1)[0]["message_id"] == "m1"
+
+
+def test_recall_is_injected_into_agent_prompt(app, tmp_path):
+    from app.services.agent_orchestrator import stream_agent_chat
+    from app.services.conversation import (
+        add_message,
+        create_conversation,
+        delete_conversation,
+    )
+    from app.services.vector_index import recall
+
+    app.config.update(VECTOR_MEMORY_ENABLED=True, VECTOR_INDEX_DIR=str(tmp_path))
+    captured = {}
+
+    class FakeAgent:
+        def __init__(self, **kwargs):
+            captured.update(kwargs)
+
+        async def stream_async(self, message):
+            yield {"data": "ok"}
+
+    with app.test_request_context():
+        old = create_conversation("user-1", "Old")
+        add_message(
+            old["conversation_id"],
+            "user",
+            "Lily is allergic to peanuts",
+            user_id="user-1",
+        )
+        current = create_conversation("user-1", "New")
+        add_message(
+            current["conversation_id"],
+            "user",
+            "Snack ideas for Lily?",
+            user_id="user-1",
+        )
+
+        with (
+            patch("strands.Agent", FakeAgent),
+            patch("strands.models.BedrockModel", MagicMock()),
+        ):
+            list(
+                stream_agent_chat(
+                    [
+                        {
+                            "role": "user",
+                            "content": "Snack ideas for Lily with her allergies?",
+                        }
+                    ],
+                    "user-1",
+                    conversation_id=current["conversation_id"],
+                    tools=[],
+                )
+            )
+
+        assert "Lily is allergic to peanuts" in captured["system_prompt"]
+        assert "Snack ideas for Lily?" not in captured["system_prompt"]
+
+        delete_conversation(old["conversation_id"])
+        assert recall("user-1", "peanut allergy") == []
+
+
+def test_vector_index_failure_does_not_block_conversation_delete(app, tmp_path):
+    from app.dal import get_dal
+    from app.services.conversation import (
+        add_message,
+        create_conversation,
+        delete_conversation,
+    )
+
+    app.config.update(VECTOR_MEMORY_ENABLED=True, VECTOR_INDEX_DIR=str(tmp_path))
+    with app.test_request_context():
+        conv = create_conversation("user-1", "Old")
+        add_message(conv["conversation_id"], "user", "hello there", user_id="user-1")
+        with patch.object(
+            VectorIndex, "remove_conversation", side_effect=OSError("disk")
+        ):
+            delete_conversation(conv["conversation_id"])
+        assert (
+            get_dal().messages.query_by_conversation(conv["conversation_id"]).items
+            == []
+        )
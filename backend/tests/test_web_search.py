@@ -0,0 +1,122 @@
+"""Tests for the cached, coalesced web search service."""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from app.services.web_search import (
+    WebSearchService,
+    normalize_query,
+    parse_results,
+)
+
+
+def test_normalize_query():
+    assert normalize_query("  Weather   TOMORROW\n") == "weather tomorrow"
+
+
+def test_parser_joins_inline_markup_and_stops_at_limit():
+    page = "".join(
+        f'<a class="result__a" href="https://e.com/{i}">Title <b>{i}</b></a>'
+        f'<a class="result__snippet">Snippet &amp; <b>more</b></a>'
+        for i in range(12)
+    )
+    results = parse_results(page, limit=3)
+    assert len(results) == 3
+    assert results[0] == {
+        "title": "Title 0",
+        "url": "https://e.com/0",
+        "snippet": "Snippet & more",
+    }
+
+
+def test_repeat_queries_are_served_from_cache(search_server):
+    service = WebSearchService(base_url=search_server.url)
+
+    first = service.search("School closures", max_results=5)
+    second = service.search("  school   CLOSURES ", max_results=1)
+
+    assert search_server.queries == ["School closures"]
+    assert second == first[:1]
+    stats = service.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_expired_entries_are_refetched(search_server):
+    service = WebSearchService(base_url=search_server.url, ttl_seconds=0.05)
+    service.search("pollen count")
+    time.sleep(0.1)
+    service.search("pollen count")
+    assert len(search_server.queries) == 2
+
+
+def test_cache_is_bounded(search_server):
+    service = WebSearchService(base_url=search_server.url, max_entries=2)
+    for q in ("a1", "b2", "c3", "a1"):
+        service.search(q)
+    assert search_server.queries == ["a1", "b2", "c3", "a1"]
+    assert service.stats()["entries"] == 2
+
+
+def test_concurrent_identical_queries_share_one_request(search_server):
+    search_server.delay = 0.3
+    service = WebSearchService(base_url=search_server.url)
+    barrier = threading.Barrier(5)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(service.search("weather tomorrow"))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert search_server.queries == ["weather tomorrow"]
+    assert len(results) == 5 and all(r == results[0] for r in results)
+    stats = service.stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 4
+
+
+def test_failures_are_not_cached(search_server):
+    service = WebSearchService(base_url=search_server.url)
+    search_server.status = 500
+    with pytest.raises(requests.HTTPError):
+        service.search("flu clinic")
+
+    search_server.status = 200
+    assert service.search("flu clinic")[0]["title"] == "Result for flu clinic"
+    stats = service.stats()
+    assert stats["errors"] == 1
+    assert stats["misses"] == 2
+
+
+def test_web_search_tool_uses_shared_service(search_server):
+    from app.agents.search_tool import web_search
+    from app.services.web_search import get_web_search_stats
+
+    web_search._tool_func(query="farmers market hours")
+    result = web_search._tool_func(query="Farmers Market Hours")
+
+    assert "Result for farmers market hours" in result
+    assert len(search_server.queries) == 1
+    assert get_web_search_stats()["hits"] == 1
+
+
+def test_shared_service_is_exported_on_metrics(search_server):
+    from app.dal.metrics import DAL_METRICS, render_prometheus
+    from app.services.web_search import get_search_service
+
+    get_search_service().search("bus schedule")
+    get_search_service().search("Bus Schedule")
+
+    text = render_prometheus(DAL_METRICS.snapshot())
+    assert "# TYPE homeagent_web_search_cache_hits_total counter" in text
+    assert "homeagent_web_search_cache_hits_total 1" in text
+    assert "homeagent_web_search_cache_misses_total 1" in text
@@ -317,6 +317,36 @@ class DataStack(cdk.Stack):
             time_to_live_attribute="expires_at",
         )
 
+        # TokenUsage table (per-user / per-family token and latency counters)
+        self.tables["TokenUsage"] = dynamodb.Table(
+            self,
+            "TokenUsageTable",
+            table_name="TokenUsage",
+            partition_key=dynamodb.Attribute(
+                name="scope", type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="period", type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=cdk.RemovalPolicy.RETAIN,
+        )
+
+        # MessageSearchIndex table (per-user inverted index over messages)
+        self.tables["MessageSearchIndex"] = dynamodb.Table(
+            self,
+            "MessageSearchIndexTable",
+            table_name="MessageSearchIndex",
+            partition_key=dynamodb.Attribute(
+                name="user_id", type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="term_key", type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=cdk.RemovalPolicy.RETAIN,
+        )
+
 
         # Families table (family units)
         self.tables["Families"] = dynamodb.Table(
@@ -351,6 +381,13 @@ class DataStack(cdk.Stack):
             billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
             removal_policy=cdk.RemovalPolicy.RETAIN,
         )
+        self.tables["FamilyMembers"].add_global_secondary_index(
+            index_name="user_id-index",
+            partition_key=dynamodb.Attribute(
+                name="user_id", type=dynamodb.AttributeType.STRING
+            ),
+            projection_type=dynamodb.ProjectionType.ALL,
+        )
 
         # FamilyGroups table (AgentCore identity family resolution)
         self.tables["FamilyGroups"] = dynamodb.Table(
@@ -100,10 +100,16 @@ export interface RegisterResponse {
 }
 
 export interface SSEEvent {
-  type: 'text_delta' | 'message_done' | 'error';
+  type: 'text_delta' | 'tool_progress' | 'message_done' | 'error';
   content?: string;
   conversation_id?: string;
   message_id?: string;
+  // tool_progress only
+  tool_name?: string;
+  tool_use_id?: string;
+  agent?: string;
+  status?: 'started' | 'tool' | 'streaming' | 'done' | 'error';
+  tool?: string;
 }
 
 export interface VoiceEvent {